@@ -0,0 +1,40 @@
+"""geo_cache
+
+Revision ID: a8c6f2d1b930
+Revises: e5a7c3d9b421
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a8c6f2d1b930"
+down_revision: Union[str, Sequence[str], None] = "e5a7c3d9b421"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Geocode and distance-matrix cache."""
+    op.create_table(
+        "geo_cache",
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.Column("value_json", sa.Text(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index(
+        op.f("ix_geo_cache_expires_at"), "geo_cache", ["expires_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_geo_cache_expires_at"), table_name="geo_cache")
+    op.drop_table("geo_cache")
@@ -0,0 +1,87 @@
+"""route_price_stats
+
+Revision ID: b4e9d7a2c613
+Revises: a8c6f2d1b930
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b4e9d7a2c613"
+down_revision: Union[str, Sequence[str], None] = "a8c6f2d1b930"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Route cells on mobility_trips and per-user route fare stats."""
+    op.add_column(
+        "mobility_trips", sa.Column("origin_cell", sa.String(length=12), nullable=True)
+    )
+    op.add_column(
+        "mobility_trips",
+        sa.Column("destination_cell", sa.String(length=12), nullable=True),
+    )
+    op.add_column(
+        "mobility_trips", sa.Column("created_at", sa.DateTime(), nullable=True)
+    )
+    op.create_index(
+        "ix_mobility_trips_user_route",
+        "mobility_trips",
+        ["user_id", "origin_cell", "destination_cell"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_mobility_trips_user_created",
+        "mobility_trips",
+        ["user_id", "created_at"],
+        unique=False,
+    )
+
+    op.create_table(
+        "route_price_stats",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("origin_cell", sa.String(length=12), nullable=False),
+        sa.Column("destination_cell", sa.String(length=12), nullable=False),
+        sa.Column("currency", sa.String(), nullable=False),
+        sa.Column("trip_count", sa.Integer(), nullable=False),
+        sa.Column("price_total", sa.Float(), nullable=False),
+        sa.Column("p50", sa.Float(), nullable=True),
+        sa.Column("p90", sa.Float(), nullable=True),
+        sa.Column("recent_prices_json", sa.JSON(), nullable=True),
+        sa.Column("last_trip_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users_v2.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "user_id",
+            "origin_cell",
+            "destination_cell",
+            "currency",
+            name="ux_route_stats_user_route",
+        ),
+    )
+    op.create_index(
+        "ix_route_stats_user_count",
+        "route_price_stats",
+        ["user_id", "trip_count"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_route_stats_user_count", table_name="route_price_stats")
+    op.drop_table("route_price_stats")
+    op.drop_index("ix_mobility_trips_user_created", table_name="mobility_trips")
+    op.drop_index("ix_mobility_trips_user_route", table_name="mobility_trips")
+    op.drop_column("mobility_trips", "created_at")
+    op.drop_column("mobility_trips", "destination_cell")
+    op.drop_column("mobility_trips", "origin_cell")
@@ -0,0 +1,63 @@
+"""history_keyset_indexes
+
+Revision ID: b7d2e41c9a10
+Revises: fa3544f15155
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d2e41c9a10"
+down_revision: Union[str, Sequence[str], None] = "fa3544f15155"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """(user_id, time, id) indexes for keyset pagination of the history timeline."""
+    op.create_index(
+        "idx_transactions_user_date_id",
+        "transactions_v2",
+        ["user_id", "transaction_date", "id"],
+        unique=False,
+    )
+    op.drop_index("idx_transactions_user_date", table_name="transactions_v2")
+    op.create_index(
+        "idx_health_summary_user_date_id",
+        "health_daily_summaries",
+        ["user_id", "date", "id"],
+        unique=False,
+    )
+    op.drop_index("idx_health_summary_user_date", table_name="health_daily_summaries")
+    op.create_index(
+        "idx_viv_logs_user_ts_id",
+        "viv_logs",
+        ["user_id", "timestamp", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_viv_logs_user_ts_id", table_name="viv_logs")
+    op.create_index(
+        "idx_health_summary_user_date",
+        "health_daily_summaries",
+        ["user_id", "date"],
+        unique=False,
+    )
+    op.drop_index(
+        "idx_health_summary_user_date_id", table_name="health_daily_summaries"
+    )
+    op.create_index(
+        "idx_transactions_user_date",
+        "transactions_v2",
+        ["user_id", "transaction_date"],
+        unique=False,
+    )
+    op.drop_index("idx_transactions_user_date_id", table_name="transactions_v2")
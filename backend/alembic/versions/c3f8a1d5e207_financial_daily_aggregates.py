@@ -0,0 +1,52 @@
+"""financial_daily_aggregates
+
+Revision ID: c3f8a1d5e207
+Revises: b7d2e41c9a10
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f8a1d5e207"
+down_revision: Union[str, Sequence[str], None] = "b7d2e41c9a10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Per-user daily transaction rollups.
+
+    Populate with scripts/backfill_financial_aggregates.py after upgrading.
+    """
+    op.create_table(
+        "financial_daily_aggregates",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("txn_count", sa.Integer(), nullable=False),
+        sa.Column("income_total", sa.Float(), nullable=False),
+        sa.Column("income_count", sa.Integer(), nullable=False),
+        sa.Column("income_sq_total", sa.Float(), nullable=False),
+        sa.Column("expense_total", sa.Float(), nullable=False),
+        sa.Column("expense_count", sa.Integer(), nullable=False),
+        sa.Column("bill_total", sa.Float(), nullable=False),
+        sa.Column("category_spend_json", sa.JSON(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users_v2.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "day", name="ux_fin_agg_user_day"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("financial_daily_aggregates")
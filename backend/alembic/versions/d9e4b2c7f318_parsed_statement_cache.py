@@ -0,0 +1,59 @@
+"""parsed_statement_cache
+
+Revision ID: d9e4b2c7f318
+Revises: c3f8a1d5e207
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d9e4b2c7f318"
+down_revision: Union[str, Sequence[str], None] = "c3f8a1d5e207"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Content-addressed cache of parsed statements."""
+    op.create_table(
+        "parsed_statement_cache",
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("text_hash", sa.String(length=64), nullable=True),
+        sa.Column("parsed_json", sa.JSON(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("hits", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("last_used_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("content_hash"),
+    )
+    op.create_index(
+        op.f("ix_parsed_statement_cache_text_hash"),
+        "parsed_statement_cache",
+        ["text_hash"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_parsed_statement_cache_last_used_at"),
+        "parsed_statement_cache",
+        ["last_used_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_parsed_statement_cache_last_used_at"),
+        table_name="parsed_statement_cache",
+    )
+    op.drop_index(
+        op.f("ix_parsed_statement_cache_text_hash"),
+        table_name="parsed_statement_cache",
+    )
+    op.drop_table("parsed_statement_cache")
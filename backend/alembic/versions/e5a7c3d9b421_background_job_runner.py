@@ -0,0 +1,72 @@
+"""background_job_runner
+
+Revision ID: e5a7c3d9b421
+Revises: d9e4b2c7f318
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5a7c3d9b421"
+down_revision: Union[str, Sequence[str], None] = "d9e4b2c7f318"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Execution columns for services.job_runner and the CANCELLED status."""
+    if op.get_bind().dialect.name == "postgresql":
+        # ADD VALUE cannot run inside a transaction block before PG 12
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE jobstatus ADD VALUE IF NOT EXISTS 'CANCELLED'")
+
+    with op.batch_alter_table("background_jobs") as batch_op:
+        batch_op.add_column(sa.Column("payload_json", sa.JSON(), nullable=True))
+        batch_op.add_column(
+            sa.Column("run_after", sa.DateTime(timezone=True), nullable=True)
+        )
+        batch_op.add_column(
+            sa.Column("attempts", sa.Integer(), server_default="0", nullable=False)
+        )
+        batch_op.add_column(
+            sa.Column("max_attempts", sa.Integer(), server_default="1", nullable=False)
+        )
+        batch_op.add_column(
+            sa.Column("locked_by", sa.String(length=100), nullable=True)
+        )
+        batch_op.add_column(
+            sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True)
+        )
+        batch_op.add_column(
+            sa.Column(
+                "cancel_requested",
+                sa.Boolean(),
+                server_default=sa.false(),
+                nullable=False,
+            )
+        )
+    op.create_index(
+        "ix_bgjob_status_run_after",
+        "background_jobs",
+        ["status", "run_after"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema (the CANCELLED enum value is left in place)."""
+    op.drop_index("ix_bgjob_status_run_after", table_name="background_jobs")
+    with op.batch_alter_table("background_jobs") as batch_op:
+        batch_op.drop_column("cancel_requested")
+        batch_op.drop_column("heartbeat_at")
+        batch_op.drop_column("locked_by")
+        batch_op.drop_column("max_attempts")
+        batch_op.drop_column("attempts")
+        batch_op.drop_column("run_after")
+        batch_op.drop_column("payload_json")
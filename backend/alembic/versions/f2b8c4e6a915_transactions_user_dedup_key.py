@@ -0,0 +1,42 @@
+"""transactions_user_dedup_key
+
+Revision ID: f2b8c4e6a915
+Revises: b4e9d7a2c613
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2b8c4e6a915"
+down_revision: Union[str, Sequence[str], None] = "b4e9d7a2c613"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Scope transactions_v2.deduplication_key uniqueness to the user."""
+    op.create_index(
+        "ux_transactions_user_dedup_key",
+        "transactions_v2",
+        ["user_id", "deduplication_key"],
+        unique=True,
+    )
+    op.drop_index(
+        op.f("ix_transactions_v2_deduplication_key"), table_name="transactions_v2"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        op.f("ix_transactions_v2_deduplication_key"),
+        "transactions_v2",
+        ["deduplication_key"],
+        unique=True,
+    )
+    op.drop_index("ux_transactions_user_dedup_key", table_name="transactions_v2")
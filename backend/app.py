@@ -67,7 +67,7 @@ def create_app() -> FastAPI:
     AUTH0_CLIENT_ID = settings.AUTH0_CLIENT_ID
     AUTH0_CLIENT_SECRET = settings.AUTH0_CLIENT_SECRET
 
-    import requests
+    from core.http_client import get_http_client
     from fastapi.responses import JSONResponse
     from fastapi import Body
 
@@ -94,8 +94,8 @@ def create_app() -> FastAPI:
             "scope": "openid profile email offline_access",
         }
 
-        resp = requests.post(url, json=payload)
-        if not resp.ok:
+        resp = await get_http_client("auth0").post(url, json=payload)
+        if not resp.is_success:
             print(f"Auth0 Login Failed: {resp.text}")
             return JSONResponse(status_code=resp.status_code, content=resp.json())
 
@@ -112,8 +112,8 @@ def create_app() -> FastAPI:
             "connection": "Username-Password-Authentication",
             "name": data.name,
         }
-        resp = requests.post(url, json=payload)
-        if not resp.ok:
+        resp = await get_http_client("auth0").post(url, json=payload)
+        if not resp.is_success:
             return JSONResponse(status_code=resp.status_code, content=resp.json())
         return resp.json()
 
@@ -216,8 +216,10 @@ def create_app() -> FastAPI:
         test_routes,
         growth_routes,
         admin_routes,
+        analytics_routes,
         api_routes_chat,
         api_routes_goals,
+        api_routes_jobs,
         recommendation_routes,
         partner_routes,
         api_routes,
@@ -250,9 +252,11 @@ def create_app() -> FastAPI:
     app.include_router(test_routes.router, prefix="/api")
     app.include_router(growth_routes.router, prefix="/api")
     app.include_router(admin_routes.router, prefix="/api")
+    app.include_router(analytics_routes.router, prefix="/api")
     app.include_router(api_routes_chat.router, prefix="/api")
     app.include_router(consent_routes.router, prefix="/api")
     app.include_router(api_routes_goals.router, prefix="/api")
+    app.include_router(api_routes_jobs.router, prefix="/api")
 
     # Recommendation & Partners
     app.include_router(recommendation_routes.router, prefix="/api/home")
@@ -652,6 +656,20 @@ def create_app() -> FastAPI:
                     "ALTER TABLE financial_scores ADD COLUMN IF NOT EXISTS total_assets_value FLOAT DEFAULT 0.0",
                     "ALTER TABLE recurring_bills ADD COLUMN IF NOT EXISTS status VARCHAR DEFAULT 'active'",
                     "ALTER TABLE recurring_bills ADD COLUMN IF NOT EXISTS is_verified BOOLEAN DEFAULT FALSE",
+                    "ALTER TYPE jobstatus ADD VALUE IF NOT EXISTS 'CANCELLED'",
+                    "ALTER TABLE background_jobs ADD COLUMN IF NOT EXISTS payload_json JSON",
+                    "ALTER TABLE background_jobs ADD COLUMN IF NOT EXISTS run_after TIMESTAMPTZ",
+                    "ALTER TABLE background_jobs ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0",
+                    "ALTER TABLE background_jobs ADD COLUMN IF NOT EXISTS max_attempts INTEGER NOT NULL DEFAULT 1",
+                    "ALTER TABLE background_jobs ADD COLUMN IF NOT EXISTS locked_by VARCHAR(100)",
+                    "ALTER TABLE background_jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMPTZ",
+                    "ALTER TABLE background_jobs ADD COLUMN IF NOT EXISTS cancel_requested BOOLEAN NOT NULL DEFAULT FALSE",
+                    "CREATE INDEX IF NOT EXISTS ix_bgjob_status_run_after ON background_jobs (status, run_after)",
+                    "ALTER TABLE mobility_trips ADD COLUMN IF NOT EXISTS origin_cell VARCHAR(12)",
+                    "ALTER TABLE mobility_trips ADD COLUMN IF NOT EXISTS destination_cell VARCHAR(12)",
+                    "ALTER TABLE mobility_trips ADD COLUMN IF NOT EXISTS created_at TIMESTAMP",
+                    "CREATE INDEX IF NOT EXISTS ix_mobility_trips_user_route ON mobility_trips (user_id, origin_cell, destination_cell)",
+                    "CREATE INDEX IF NOT EXISTS ix_mobility_trips_user_created ON mobility_trips (user_id, created_at)",
                 ]
                 for q in queries:
                     try:
@@ -714,6 +732,26 @@ def create_app() -> FastAPI:
         except Exception as gov_e:
             logger.error(f"Responsible-AI governance init failed: {gov_e}")
 
+        # Stage 7 audit rows (pipeline traces / decision records) are written
+        # in batches by a background worker instead of on the request path.
+        try:
+            from services.intelligence.trace_sink import get_trace_sink
+
+            await get_trace_sink().start()
+        except Exception as sink_e:
+            logger.error(f"Trace sink start failed: {sink_e}")
+
+        # Queued long operations (statement parsing, score recalculation,
+        # demo refresh) run on the job runner.
+        try:
+            if core.config.get_settings().JOB_RUNNER_ENABLED:
+                import services.job_handlers  # noqa: F401 (registers handlers)
+                from services.job_runner import get_job_runner
+
+                await get_job_runner().start()
+        except Exception as runner_e:
+            logger.error(f"Job runner start failed: {runner_e}")
+
         # Refresh the demo/persona accounts with data current up to today
         # (no-op for real users). Also runs on a schedule so it stays fresh.
         try:
@@ -732,6 +770,26 @@ def create_app() -> FastAPI:
     async def shutdown_event():
         scheduler.stop()
 
+        from services.intelligence.trace_sink import get_trace_sink
+
+        await get_trace_sink().stop()
+
+        from services.job_runner import get_job_runner
+
+        await get_job_runner().stop()
+
+        from services.ocr_engine import shutdown_pools
+
+        shutdown_pools()
+
+        from core.http_client import close_http_clients
+
+        await close_http_clients()
+
+        from models.database import dispose_async_engine
+
+        await dispose_async_engine()
+
     print("App Factory Completed.")
     return app
 
@@ -8,10 +8,10 @@ import jwt
 from jwt.exceptions import PyJWTError as JWTError
 from jwt.algorithms import RSAAlgorithm
 from typing import Optional
-import httpx
 from functools import lru_cache
 
 from core.auth0_config import get_auth0_settings
+from core.http_client import get_sync_http_client
 
 
 security = HTTPBearer()
@@ -24,7 +24,7 @@ def get_auth0_public_key():
     jwks_url = f"https://{settings.AUTH0_DOMAIN}/.well-known/jwks.json"
 
     try:
-        response = httpx.get(jwks_url)
+        response = get_sync_http_client("auth0").get(jwks_url)
         response.raise_for_status()
         return response.json()
     except Exception as e:
@@ -65,6 +65,13 @@ class Settings:
     DB_PASS = os.getenv("DB_PASS")
     DB_NAME = os.getenv("DB_NAME")
 
+    # Connection pool sizing (applies to Postgres / Cloud SQL engines, sync and async)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
     # Security & Auth
     APP_NAME = os.getenv("APP_NAME", "LFSD")
     SECRET_KEY = os.getenv("SECRET_KEY")
@@ -78,6 +85,33 @@ class Settings:
     AUTH0_CLIENT_ID = os.getenv("AUTH0_CLIENT_ID")
     AUTH0_CLIENT_SECRET = os.getenv("AUTH0_CLIENT_SECRET")
 
+    # Bank statement parsing: JSON list of extra per-bank layout templates
+    # (see services/statement_layout.py)
+    STATEMENT_TEMPLATES_PATH = os.getenv("STATEMENT_TEMPLATES_PATH")
+    # OCR fallback for scanned pages: rasterization DPI and process pool size
+    # (0 = one worker per CPU available to the process)
+    OCR_DPI = int(os.getenv("OCR_DPI", "300"))
+    OCR_WORKERS = int(os.getenv("OCR_WORKERS", "0"))
+    # Parsed-statement cache size cap (LRU eviction above it; 0 disables)
+    STATEMENT_CACHE_MAX_BYTES = int(
+        os.getenv("STATEMENT_CACHE_MAX_BYTES", str(256 * 1024 * 1024))
+    )
+    # Background job runner (services/job_runner.py): set false on processes
+    # that should only enqueue; concurrency is per process
+    JOB_RUNNER_ENABLED = os.getenv("JOB_RUNNER_ENABLED", "true").lower() == "true"
+    JOB_RUNNER_CONCURRENCY = int(os.getenv("JOB_RUNNER_CONCURRENCY", "4"))
+    # Scheduled health sync (services/integrations/health_sync.py): users
+    # synced in parallel, and history fetched for a connection's first sync
+    HEALTH_SYNC_CONCURRENCY = int(os.getenv("HEALTH_SYNC_CONCURRENCY", "16"))
+    HEALTH_SYNC_BACKFILL_DAYS = int(os.getenv("HEALTH_SYNC_BACKFILL_DAYS", "7"))
+    # Geocode / route cache (services/productivity/geo_cache.py): in-process
+    # LRU size in front of Redis (REDIS_URL) or the geo_cache table
+    GEO_CACHE_MAX_ENTRIES = int(os.getenv("GEO_CACHE_MAX_ENTRIES", "20000"))
+    # Price comparison (services/mobility/mobility_aggregator.py): latency
+    # budget before partial results are returned, and quote cache lifetime
+    MOBILITY_QUOTE_BUDGET_MS = int(os.getenv("MOBILITY_QUOTE_BUDGET_MS", "2500"))
+    MOBILITY_QUOTE_TTL_S = int(os.getenv("MOBILITY_QUOTE_TTL_S", "60"))
+
     # Responsible-AI governance layer. OFF by default: turning it on enforces
     # consent, PII redaction, and the policy gate on AI advisory requests.
     RAI_GOVERNANCE_ENABLED = (
@@ -85,6 +119,9 @@ class Settings:
     )
     RAI_CONSENT_PURPOSE = os.getenv("RAI_CONSENT_PURPOSE", "ai_advisory")
     RAI_CONSENT_POLICY_VERSION = os.getenv("RAI_CONSENT_POLICY_VERSION", "v1")
+    # HMAC key for governance verification checkpoints; unset disables
+    # checkpointing and every verification runs from genesis
+    RAI_CHECKPOINT_KEY = os.getenv("RAI_CHECKPOINT_KEY")
 
     def __init__(self):
         pass
@@ -0,0 +1,262 @@
+"""
+HTTP Clients — one pooled httpx client per provider, shared app-wide.
+
+Integrations used to open a fresh httpx.AsyncClient (or call a blocking
+requests/httpx function) per call, paying DNS + TCP + TLS on every request.
+They now borrow a long-lived client from this registry:
+
+    async with http_client("google") as client:   # never closes the pool
+        response = await client.get(...)
+
+Each provider has a ProviderPolicy: timeouts, keep-alive pool limits and a
+retry policy. Retries happen in the transport, so call sites stay plain:
+
+    - connection failures (request never sent): retried for every method
+    - 429/502/503/504 and read timeouts: retried for idempotent methods only
+    - exponential backoff with jitter; Retry-After is honoured up to the cap
+
+HTTP/2 is negotiated when the optional `h2` package is installed
+(pip install "httpx[http2]"); otherwise clients speak HTTP/1.1 with
+keep-alive.
+
+Lifecycle: clients are created lazily on first use and closed by
+close_http_clients() on application shutdown. A client is bound to the
+event loop that created it; use from another loop (scripts, tests running
+asyncio.run repeatedly) gets a fresh client. Synchronous callers (JWKS
+fetch, background analytics) use get_sync_http_client().
+"""
+
+import asyncio
+import importlib.util
+import logging
+import random
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+@dataclass(frozen=True)
+class ProviderPolicy:
+    """Connection pool, timeout and retry settings for one provider."""
+
+    timeout_s: float = 15.0
+    connect_timeout_s: float = 5.0
+    max_connections: int = 50
+    max_keepalive: int = 10
+    keepalive_expiry_s: float = 30.0
+    retries: int = 2  # extra attempts after the first
+    backoff_base_s: float = 0.25
+    backoff_max_s: float = 4.0
+    retry_statuses: Tuple[int, ...] = (429, 502, 503, 504)
+
+
+DEFAULT_POLICY = ProviderPolicy()
+
+PROVIDER_POLICIES: Dict[str, ProviderPolicy] = {
+    # Google Fit / Calendar / OAuth token endpoint
+    "google": ProviderPolicy(timeout_s=20.0, connect_timeout_s=10.0),
+    "google_maps": ProviderPolicy(
+        timeout_s=10.0, max_connections=100, max_keepalive=20
+    ),
+    "microsoft": ProviderPolicy(timeout_s=30.0, connect_timeout_s=10.0),
+    "apple_health": ProviderPolicy(),
+    # Ride quotes sit on an interactive path: fail fast, retry once
+    "uber": ProviderPolicy(timeout_s=8.0, retries=1),
+    "careem": ProviderPolicy(timeout_s=8.0, retries=1),
+    "rta": ProviderPolicy(timeout_s=10.0, connect_timeout_s=2.0, retries=1),
+    "skyscanner": ProviderPolicy(timeout_s=45.0, connect_timeout_s=10.0),
+    "whatsapp": ProviderPolicy(),
+    # Login/registration: never replay a credential POST
+    "auth0": ProviderPolicy(timeout_s=10.0, retries=0),
+    # Fire-and-forget telemetry
+    "analytics": ProviderPolicy(
+        timeout_s=2.0, connect_timeout_s=2.0, max_connections=10, retries=0
+    ),
+}
+
+
+def _retry_delay(policy: ProviderPolicy, attempt: int, retry_after=None) -> float:
+    if retry_after is not None:
+        try:
+            return min(float(retry_after), policy.backoff_max_s)
+        except ValueError:
+            pass  # HTTP-date form: fall back to backoff
+    delay = min(policy.backoff_max_s, policy.backoff_base_s * 2**attempt)
+    return delay * random.uniform(0.5, 1.0)
+
+
+class RetryingTransport(httpx.AsyncBaseTransport):
+    """Wraps a transport with the provider's retry/backoff policy."""
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        policy: ProviderPolicy,
+        stats: Dict[str, int],
+    ):
+        self._transport = transport
+        self.policy = policy
+        self.stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        idempotent = request.method in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            self.stats["requests"] += 1
+            try:
+                response = await self._transport.handle_async_request(request)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout):
+                # Nothing reached the server: safe to resend any method
+                if attempt >= self.policy.retries:
+                    self.stats["errors"] += 1
+                    raise
+                delay = _retry_delay(self.policy, attempt)
+            except (
+                httpx.ReadTimeout,
+                httpx.ReadError,
+                httpx.WriteError,
+                httpx.RemoteProtocolError,
+            ):
+                # The request may have reached the server; a stale pooled
+                # keep-alive connection usually fails this way. Idempotent only.
+                if not idempotent or attempt >= self.policy.retries:
+                    self.stats["errors"] += 1
+                    raise
+                delay = _retry_delay(self.policy, attempt)
+            else:
+                if (
+                    response.status_code not in self.policy.retry_statuses
+                    or not idempotent
+                    or attempt >= self.policy.retries
+                ):
+                    return response
+                delay = _retry_delay(
+                    self.policy, attempt, response.headers.get("Retry-After")
+                )
+                await response.aclose()
+            attempt += 1
+            self.stats["retries"] += 1
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class HTTPClientRegistry:
+    """Lazily created, per-provider pooled clients."""
+
+    def __init__(
+        self,
+        policies: Optional[Dict[str, ProviderPolicy]] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.policies = PROVIDER_POLICIES if policies is None else policies
+        # Tests inject a MockTransport; production uses real connection pools
+        self._transport = transport
+        self._clients: Dict[str, Tuple[httpx.AsyncClient, Any]] = {}
+        self._sync_clients: Dict[str, httpx.Client] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _policy(self, provider: str) -> ProviderPolicy:
+        return self.policies.get(provider, DEFAULT_POLICY)
+
+    def _limits(self, policy: ProviderPolicy) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=policy.max_connections,
+            max_keepalive_connections=policy.max_keepalive,
+            keepalive_expiry=policy.keepalive_expiry_s,
+        )
+
+    def _timeout(self, policy: ProviderPolicy) -> httpx.Timeout:
+        return httpx.Timeout(policy.timeout_s, connect=policy.connect_timeout_s)
+
+    def get(self, provider: str) -> httpx.AsyncClient:
+        """The provider's shared AsyncClient (created on first use)."""
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(provider)
+        if entry and entry[1] is loop and not entry[0].is_closed:
+            return entry[0]
+
+        policy = self._policy(provider)
+        inner = self._transport or httpx.AsyncHTTPTransport(
+            http2=HTTP2_AVAILABLE, limits=self._limits(policy)
+        )
+        stats = self._stats.setdefault(
+            provider, {"requests": 0, "retries": 0, "errors": 0, "clients": 0}
+        )
+        stats["clients"] += 1
+        client = httpx.AsyncClient(
+            transport=RetryingTransport(inner, policy, stats),
+            timeout=self._timeout(policy),
+        )
+        self._clients[provider] = (client, loop)
+        return client
+
+    def get_sync(self, provider: str) -> httpx.Client:
+        """Blocking counterpart for sync code paths (connect retries only)."""
+        client = self._sync_clients.get(provider)
+        if client is None or client.is_closed:
+            policy = self._policy(provider)
+            client = httpx.Client(
+                transport=httpx.HTTPTransport(
+                    retries=policy.retries, limits=self._limits(policy)
+                ),
+                timeout=self._timeout(policy),
+            )
+            self._sync_clients[provider] = client
+        return client
+
+    async def aclose(self) -> None:
+        """Close every client (application shutdown)."""
+        clients, self._clients = self._clients, {}
+        for provider, (client, loop) in clients.items():
+            if loop is asyncio.get_running_loop():
+                await client.aclose()
+        sync_clients, self._sync_clients = self._sync_clients, {}
+        for client in sync_clients.values():
+            client.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "http2": HTTP2_AVAILABLE,
+            "providers": {name: dict(s) for name, s in self._stats.items()},
+        }
+
+
+_registry: Optional[HTTPClientRegistry] = None
+
+
+def get_http_registry() -> HTTPClientRegistry:
+    global _registry
+    if _registry is None:
+        _registry = HTTPClientRegistry()
+    return _registry
+
+
+def get_http_client(provider: str) -> httpx.AsyncClient:
+    """Shared pooled AsyncClient for provider. Do not close it."""
+    return get_http_registry().get(provider)
+
+
+def get_sync_http_client(provider: str) -> httpx.Client:
+    """Shared pooled blocking Client for provider. Do not close it."""
+    return get_http_registry().get_sync(provider)
+
+
+@asynccontextmanager
+async def http_client(provider: str):
+    """`async with` form of get_http_client(); leaves the pool open on exit."""
+    yield get_http_client(provider)
+
+
+async def close_http_clients() -> None:
+    if _registry is not None:
+        await _registry.aclose()
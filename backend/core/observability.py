@@ -5,11 +5,17 @@ from models.database import SessionLocal
 from models.logging_models import AuditLog, ActivityFeed, Notification
 from datetime import datetime
 import uuid
+import asyncio
 import threading  # For firing async tasks if needed, or just run sync for now
 
 import functools
 import inspect
 
+from core.http_client import get_http_client, get_sync_http_client
+
+# GA4 sends scheduled on the event loop (asyncio keeps only weak references)
+_pending_events = set()
+
 
 class GA4Events:
     USER_LOGIN = "user_login"
@@ -77,9 +83,6 @@ class Observability:
             pass
 
         try:
-            # Basic Fire-and-Forget implementation
-            import httpx
-
             measurement_id = "G-XXXXXXXXXX"  # TODO: Move to config
             api_secret = "wu89723h...."  # TODO: Move to config
 
@@ -94,13 +97,26 @@ class Observability:
                 "events": [{"name": event_name, "params": params}],
             }
 
-            # Fire sync for now to keep it simple, or use background task if within FastAPI context
-            # For this static method, we'll swallow errors to avoid breaking app flow
-            httpx.post(
-                f"https://www.google-analytics.com/mp/collect?measurement_id={measurement_id}&api_secret={api_secret}",
-                json=payload,
-                timeout=2.0,
-            )
+            url = f"https://www.google-analytics.com/mp/collect?measurement_id={measurement_id}&api_secret={api_secret}"
+            # Fire-and-forget on the shared "analytics" pool: scheduled on the
+            # running loop when called from a request, blocking otherwise
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is None:
+                get_sync_http_client("analytics").post(url, json=payload)
+                return
+
+            async def send():
+                try:
+                    await get_http_client("analytics").post(url, json=payload)
+                except Exception as e:
+                    logger.warning(f"Failed to send GA4 event: {e}")
+
+            task = loop.create_task(send())
+            _pending_events.add(task)  # keep a reference until it finishes
+            task.add_done_callback(_pending_events.discard)
         except Exception as e:
             logger.warning(f"Failed to send GA4 event: {e}")
 
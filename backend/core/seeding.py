@@ -10,6 +10,7 @@ from models.models import (
     CalendarEvent,
     LifeGoal,
 )
+from services.financial_aggregates import record_transactions
 
 
 def seed_user_data(db: Session, user_id: str, profile: str = "finance"):
@@ -69,6 +70,7 @@ def _add_financial_data(db: Session, user_id: str):
         {"days": 10, "amt": -67.89, "merch": "Amazon", "cat": "shopping"},
         {"days": 14, "amt": -120.00, "merch": "Equinox", "cat": "health"},
     ]
+    seeded = []
     for txn in transactions:
         t = FinancialTransaction(
             id=str(uuid.uuid4()),
@@ -80,6 +82,8 @@ def _add_financial_data(db: Session, user_id: str):
             transaction_date=today - timedelta(days=txn["days"]),
         )
         db.add(t)
+        seeded.append(t)
+    record_transactions(db, seeded)
 
 
 def _add_life_goals(db: Session, user_id: str):
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import math
 import random
@@ -149,17 +150,13 @@ class MobilityExecutor(BaseExecutor):
         # Dubai-centre fallback
         return (25.2048, 55.2708)
 
-    async def _get_driving_info(
-        self, origin: str, destination: str, distance_fallback: float
-    ):
-        """Try Google Distance Matrix; fall back to haversine-based estimate."""
+    async def _get_road_distance(self, origin: str, destination: str):
+        """Road distance (km) from the Google Distance Matrix, or None."""
         try:
-            api_dist = await self.maps_service.get_distance(origin, destination)
-            if api_dist is not None:
-                return max(api_dist, 2.0), None  # (distance_km, duration_min or None)
+            return await self.maps_service.get_distance(origin, destination)
         except Exception as e:
             logger.warning(f"Distance matrix failed: {e}")
-        return max(distance_fallback, 2.0), None
+            return None
 
     # ----- scoring -----
 
@@ -182,20 +179,21 @@ class MobilityExecutor(BaseExecutor):
         origin = entities.get("origin", "Current Location")
         destination = entities.get("destination", "Airport")
 
-        # 1. Geocode
-        start_coords = await self._resolve_location(origin)
-        end_coords = await self._resolve_location(destination)
+        # 1. Geocode both ends and fetch the road distance concurrently
+        # (all three are independent and usually served by the geo cache)
+        start_coords, end_coords, road_km = await asyncio.gather(
+            self._resolve_location(origin),
+            self._resolve_location(destination),
+            self._get_road_distance(origin, destination),
+        )
 
-        # 2. Distance
+        # 2. Distance: road distance, else straight-line estimate
         haversine_dist = (
             _haversine(start_coords[0], start_coords[1], end_coords[0], end_coords[1])
             if start_coords and end_coords
             else 15.0
         )
-
-        distance_km, duration_api = await self._get_driving_info(
-            origin, destination, haversine_dist
-        )
+        distance_km = max(road_km if road_km is not None else haversine_dist, 2.0)
 
         # Base driving time estimate (avg 40 km/h in Dubai)
         base_drive_min = round(distance_km / 40.0 * 60)
@@ -2,9 +2,19 @@
 Database connection and session management.
 
 This module provides SQLAlchemy engine and session management for the application.
+
+Two session paths are available:
+    - ``get_db``       — synchronous ``Session`` (legacy, used by most routes)
+    - ``get_async_db`` — ``AsyncSession`` on a pooled async engine
+      (asyncpg for Postgres / Cloud SQL, aiosqlite for local SQLite).
+      Routes can migrate to it one at a time; it never blocks the event loop.
 """
 
+from typing import AsyncIterator, Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 import core.config
@@ -17,6 +27,22 @@ import pg8000
 import os
 
 
+def _pool_kwargs() -> dict:
+    """Pool sizing for server databases (not used for SQLite)."""
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+# One connector per process: it caches instance metadata and ephemeral certs,
+# so building a new one per connection adds a refresh round trip every time.
+_connector: Optional[Connector] = None
+
+
 def getconn():
     if not settings.INSTANCE_CONNECTION_NAME:
         # If no instance connection name, unlikely to work for Cloud SQL,
@@ -44,8 +70,10 @@ def getconn():
         )
     else:
         # Fallback to Public IP Connector
-        connector = Connector()
-        conn = connector.connect(
+        global _connector
+        if _connector is None:
+            _connector = Connector()
+        conn = _connector.connect(
             instance_connection_name,
             "pg8000",
             user=db_user,
@@ -62,6 +90,7 @@ if settings.INSTANCE_CONNECTION_NAME:
         "postgresql+pg8000://",
         creator=getconn,
         echo=settings.DEBUG,
+        **_pool_kwargs(),
     )
 elif settings.DATABASE_URL and settings.DATABASE_URL.startswith("postgres"):
     # Direct Postgres Connection (e.g. Supabase, standard URL)
@@ -75,6 +104,7 @@ elif settings.DATABASE_URL and settings.DATABASE_URL.startswith("postgres"):
     engine = create_engine(
         db_url,
         echo=settings.DEBUG,
+        **_pool_kwargs(),
     )
 else:
     # Local SQLite Fallback
@@ -118,6 +148,144 @@ def get_db():
         db.close()
 
 
+# ---------------------------------------------------------------------------
+# Async engine (lazy: drivers are only imported when the async path is used)
+# ---------------------------------------------------------------------------
+
+_async_engine = None
+_AsyncSessionLocal = None
+_async_connector = None
+
+
+async def getconn_async():
+    """Async Cloud SQL connection (asyncpg) — unix socket on Cloud Run, else connector."""
+    global _async_connector
+    import asyncpg
+
+    instance_connection_name = settings.INSTANCE_CONNECTION_NAME
+    unix_socket_path = f"/cloudsql/{instance_connection_name}"
+    if os.path.exists(unix_socket_path):
+        return await asyncpg.connect(
+            user=settings.DB_USER,
+            password=settings.DB_PASS,
+            database=settings.DB_NAME,
+            host=unix_socket_path,
+        )
+
+    if _async_connector is None:
+        from google.cloud.sql.connector import create_async_connector
+
+        _async_connector = await create_async_connector()
+    return await _async_connector.connect_async(
+        instance_connection_name,
+        "asyncpg",
+        user=settings.DB_USER,
+        password=settings.DB_PASS,
+        db=settings.DB_NAME,
+        ip_type="public",
+    )
+
+
+def to_async_url(url: str):
+    """
+    Map a sync database URL to its async driver equivalent.
+
+    Returns (async_url, connect_args). ``sslmode`` is a libpq option that
+    asyncpg does not accept, so it is translated into the ``ssl`` argument.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    connect_args: dict = {}
+
+    if backend == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite"), connect_args
+
+    if backend == "postgresql":
+        query = dict(parsed.query)
+        sslmode = query.pop("sslmode", "require")
+        if sslmode != "disable":
+            connect_args["ssl"] = sslmode
+        return (
+            parsed.set(drivername="postgresql+asyncpg", query=query),
+            connect_args,
+        )
+
+    raise ValueError(f"No async driver mapping for database backend '{backend}'")
+
+
+def get_async_engine():
+    """Build (once) and return the process-wide AsyncEngine."""
+    global _async_engine
+    if _async_engine is not None:
+        return _async_engine
+
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    if settings.INSTANCE_CONNECTION_NAME:
+        _async_engine = create_async_engine(
+            "postgresql+asyncpg://",
+            async_creator=getconn_async,
+            echo=settings.DEBUG,
+            **_pool_kwargs(),
+        )
+    elif settings.DATABASE_URL and settings.DATABASE_URL.startswith("postgres"):
+        db_url = settings.DATABASE_URL
+        if db_url.startswith("postgres://"):
+            db_url = "postgresql://" + db_url[len("postgres://") :]
+        async_url, connect_args = to_async_url(db_url)
+        _async_engine = create_async_engine(
+            async_url,
+            connect_args=connect_args,
+            echo=settings.DEBUG,
+            **_pool_kwargs(),
+        )
+    else:
+        async_url, _ = to_async_url(str(engine.url))
+        _async_engine = create_async_engine(async_url, echo=settings.DEBUG)
+
+    return _async_engine
+
+
+def get_async_sessionmaker():
+    """Return the AsyncSession factory bound to the async engine."""
+    global _AsyncSessionLocal
+    if _AsyncSessionLocal is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        # expire_on_commit=False: attributes stay loaded after commit, so
+        # handlers can serialize ORM objects without an implicit (sync) refresh.
+        _AsyncSessionLocal = async_sessionmaker(
+            bind=get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _AsyncSessionLocal
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    Dependency function to get an async database session.
+
+    Usage in FastAPI routes:
+        @router.get("/items")
+        async def get_items(db: AsyncSession = Depends(get_async_db)):
+            result = await db.execute(select(Item))
+            ...
+    """
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    """Close pooled async connections (call on application shutdown)."""
+    global _async_engine, _AsyncSessionLocal, _async_connector
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _async_connector is not None:
+        await _async_connector.close_async()
+    _async_engine = None
+    _AsyncSessionLocal = None
+    _async_connector = None
+
+
 def init_db():
     """Initialize the database by creating all tables."""
     # Import models to register them with Base
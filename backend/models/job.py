@@ -9,6 +9,7 @@ import uuid
 from datetime import datetime, timezone
 
 from sqlalchemy import (
+    Boolean,
     Column,
     String,
     Integer,
@@ -36,6 +37,7 @@ class JobStatus(str, enum.Enum):
     PROCESSING = "processing"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
 
 
 class BackgroundJob(Base):
@@ -55,6 +57,8 @@ class BackgroundJob(Base):
         # Indexes for queries
         Index("ix_bgjob_status_updated", "status", "updated_at"),
         Index("ix_bgjob_expires_at", "expires_at"),
+        # Runner claim query: pending jobs that are due
+        Index("ix_bgjob_status_run_after", "status", "run_after"),
     )
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
@@ -78,6 +82,16 @@ class BackgroundJob(Base):
     result_json = Column(JSON, nullable=False, default=dict)
     error_message = Column(Text, nullable=True)
 
+    # Execution (services.job_runner). run_after is NULL for jobs that are
+    # only tracked while the work runs inline; the runner never claims them.
+    payload_json = Column(JSON, nullable=True)  # Handler input, cleared when done
+    run_after = Column(DateTime(timezone=True), nullable=True)  # Due time / backoff
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=1, nullable=False)
+    locked_by = Column(String(100), nullable=True)  # Worker holding the lease
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    cancel_requested = Column(Boolean, default=False, nullable=False)
+
     # ✅ Timezone-aware timestamps
     created_at = Column(
         DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
@@ -372,12 +372,58 @@ class Statement(Base):
     )
 
 
+class ParsedStatementCache(Base):
+    """
+    Content-addressed cache of parsed statements (services.statement_cache).
+
+    Keyed by a hash of the uploaded file; text_hash (normalized text layer)
+    also matches re-exports of the same statement. Entries describe a file,
+    not an upload, so there is no user_id.
+    """
+
+    __tablename__ = "parsed_statement_cache"
+    __table_args__ = {"extend_existing": True}
+
+    content_hash = Column(String(64), primary_key=True)
+    text_hash = Column(String(64), nullable=True, index=True)
+    parsed_json = Column(JSON, nullable=False)  # ParsedStatement, JSON mode
+    size_bytes = Column(Integer, nullable=False)
+    hits = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)  # LRU
+
+
+class GeoCacheEntry(Base):
+    """
+    Geocode / route cache entry (services.productivity.geo_cache), the L2
+    tier when Redis is not configured. value_json is JSON text; "null" is a
+    cached "not found".
+    """
+
+    __tablename__ = "geo_cache"
+    __table_args__ = {"extend_existing": True}
+
+    key = Column(String(255), primary_key=True)
+    value_json = Column(Text, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
 class FinancialTransaction(Base):
     """The Deep Dive into spending."""
 
     __tablename__ = "transactions_v2"
     __table_args__ = (
-        Index("idx_transactions_user_date", "user_id", "transaction_date"),
+        # Keyset pagination of the history timeline: (user, time, id) seeks
+        Index("idx_transactions_user_date_id", "user_id", "transaction_date", "id"),
+        # Statement import dedup is per user: identical rows of two users coexist
+        Index(
+            "ux_transactions_user_dedup_key",
+            "user_id",
+            "deduplication_key",
+            unique=True,
+        ),
         {"extend_existing": True},
     )
 
@@ -405,7 +451,7 @@ class FinancialTransaction(Base):
     location_lon = Column(Float, nullable=True)
 
     # Governance
-    deduplication_key = Column(String, unique=True, index=True, nullable=True)
+    deduplication_key = Column(String, nullable=True)
 
     user = relationship("User", back_populates="transactions")
     account = relationship("FinancialAccount", back_populates="transactions")
@@ -413,6 +459,36 @@ class FinancialTransaction(Base):
     order = relationship("Order", back_populates="transaction", uselist=False)
 
 
+class FinancialDailyAggregate(Base):
+    """
+    Per-user daily rollup of transactions_v2, maintained on write.
+
+    Scores and summaries read rolling windows from here instead of
+    rescanning transactions (see services.financial_aggregates).
+    """
+
+    __tablename__ = "financial_daily_aggregates"
+    __table_args__ = (
+        UniqueConstraint("user_id", "day", name="ux_fin_agg_user_day"),
+        {"extend_existing": True},
+    )
+
+    id = Column(String, primary_key=True, default=generate_uuid)
+    user_id = Column(String, ForeignKey("users_v2.id"), nullable=False)
+    day = Column(Date, nullable=False)
+
+    txn_count = Column(Integer, nullable=False, default=0)
+    income_total = Column(Float, nullable=False, default=0.0)  # Sum of positives
+    income_count = Column(Integer, nullable=False, default=0)
+    income_sq_total = Column(Float, nullable=False, default=0.0)  # For stdev
+    expense_total = Column(Float, nullable=False, default=0.0)  # ABS of negatives
+    expense_count = Column(Integer, nullable=False, default=0)
+    bill_total = Column(Float, nullable=False, default=0.0)  # Subset of expenses
+    category_spend_json = Column(JSON, nullable=True)  # {"Groceries": 85.5, ...}
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class RecurringBill(Base):
     """Verified recurring commitments."""
 
@@ -442,7 +518,7 @@ class RecurringBill(Base):
 class HealthDailySummary(Base):
     __tablename__ = "health_daily_summaries"
     __table_args__ = (
-        Index("idx_health_summary_user_date", "user_id", "date"),
+        Index("idx_health_summary_user_date_id", "user_id", "date", "id"),
         {"extend_existing": True},
     )
 
@@ -524,7 +600,13 @@ class CalendarEvent(Base):
 
 class MobilityTrip(Base):
     __tablename__ = "mobility_trips"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index(
+            "ix_mobility_trips_user_route", "user_id", "origin_cell", "destination_cell"
+        ),
+        Index("ix_mobility_trips_user_created", "user_id", "created_at"),
+        {"extend_existing": True},
+    )
 
     id = Column(String, primary_key=True, default=generate_uuid)
     user_id = Column(String, ForeignKey("users_v2.id"), nullable=False, index=True)
@@ -541,10 +623,53 @@ class MobilityTrip(Base):
     origin_lon = Column(Float, nullable=True)
     destination_lat = Column(Float, nullable=True)
     destination_lon = Column(Float, nullable=True)
+    # Geohash cells of both ends, set on write (services.mobility.route_stats)
+    origin_cell = Column(String(12), nullable=True)
+    destination_cell = Column(String(12), nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
 
     user = relationship("User", back_populates="mobility_trips")
 
 
+class RoutePriceStats(Base):
+    """
+    Per-user fare statistics for a route (origin cell -> destination cell),
+    maintained on write by services.mobility.route_stats.
+
+    trip_count / price_total cover every fare; p50 / p90 are over the last
+    PRICE_WINDOW fares kept in recent_prices_json (oldest first).
+    """
+
+    __tablename__ = "route_price_stats"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "origin_cell",
+            "destination_cell",
+            "currency",
+            name="ux_route_stats_user_route",
+        ),
+        Index("ix_route_stats_user_count", "user_id", "trip_count"),
+        {"extend_existing": True},
+    )
+
+    id = Column(String, primary_key=True, default=generate_uuid)
+    user_id = Column(String, ForeignKey("users_v2.id"), nullable=False)
+    origin_cell = Column(String(12), nullable=False)
+    destination_cell = Column(String(12), nullable=False)
+    currency = Column(String, nullable=False)
+
+    trip_count = Column(Integer, nullable=False, default=0)
+    price_total = Column(Float, nullable=False, default=0.0)
+    p50 = Column(Float, nullable=True)
+    p90 = Column(Float, nullable=True)
+    recent_prices_json = Column(JSON, nullable=True)
+
+    last_trip_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 # ============================================================================
 # 5. Intelligence Layer (The Audit Trail)
 # ============================================================================
@@ -554,7 +679,10 @@ class VivLog(Base):
     """Tracks WHY Viv gave specific advice."""
 
     __tablename__ = "viv_logs"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index("idx_viv_logs_user_ts_id", "user_id", "timestamp", "id"),
+        {"extend_existing": True},
+    )
 
     id = Column(String, primary_key=True, default=generate_uuid)
     user_id = Column(String, ForeignKey("users_v2.id"), nullable=False, index=True)
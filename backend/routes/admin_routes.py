@@ -254,3 +254,176 @@ async def get_api_billing(
         raise HTTPException(status_code=403, detail="Not authorized")
     service = BillingService(db)
     return service.get_api_integration_costs()
+
+
+# --- Intelligence Pipeline Internals ---
+
+
+@router.get(
+    "/intelligence/stats", summary="Pipeline trace sink, cache and LLM gateway stats"
+)
+async def get_intelligence_stats(current_user=Depends(get_current_user)):
+    if getattr(current_user, "role", None) != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    from services.intelligence.cache import get_pipeline_cache
+    from services.intelligence.llm_gateway import get_llm_gateway
+    from services.intelligence.trace_sink import get_trace_sink
+
+    return {
+        "trace_sink": get_trace_sink().stats(),
+        "cache": get_pipeline_cache().stats(),
+        "llm_gateway": get_llm_gateway().stats(),
+    }
+
+
+# --- Statement Parsing ---
+
+
+@router.get(
+    "/statements/cache", summary="Parsed-statement cache hit/miss counters and size"
+)
+async def get_statement_cache_stats(
+    current_user=Depends(get_current_user), db: Session = Depends(get_db)
+):
+    if getattr(current_user, "role", None) != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    from services.statement_cache import StatementCache
+
+    return StatementCache(db).stats()
+
+
+@router.get("/jobs/runner", summary="Background job runner counters")
+async def get_job_runner_stats(current_user=Depends(get_current_user)):
+    if getattr(current_user, "role", None) != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    from services.job_runner import get_job_runner
+
+    return get_job_runner().stats()
+
+
+@router.get("/health-sync/runs", summary="Recent health sync runs and their metrics")
+async def get_health_sync_runs(
+    limit: int = 10,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    if getattr(current_user, "role", None) != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    from models.job import BackgroundJob
+
+    runs = (
+        db.query(BackgroundJob)
+        .filter(BackgroundJob.job_type == "health_sync")
+        .order_by(BackgroundJob.created_at.desc())
+        .limit(min(limit, 100))
+    )
+    return [
+        {
+            "job_id": run.id,
+            "status": run.status,
+            "created_at": run.created_at,
+            "metrics": run.result_json,
+            "error": run.error_message,
+        }
+        for run in runs
+    ]
+
+
+@router.get("/http-clients", summary="Shared HTTP client pools: requests, retries")
+async def get_http_client_stats(current_user=Depends(get_current_user)):
+    if getattr(current_user, "role", None) != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    from core.http_client import get_http_registry
+
+    return get_http_registry().stats()
+
+
+@router.get("/geo-cache", summary="Geocode / route cache hit rates by tier")
+async def get_geo_cache_stats(current_user=Depends(get_current_user)):
+    if getattr(current_user, "role", None) != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    from services.productivity.geo_cache import get_geo_cache
+
+    return get_geo_cache().stats()
+
+
+@router.get(
+    "/mobility/providers",
+    summary="Mobility provider latency, circuit state and quote cache",
+)
+async def get_mobility_provider_stats(current_user=Depends(get_current_user)):
+    if getattr(current_user, "role", None) != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    from services.mobility.mobility_aggregator import get_quote_cache
+    from services.mobility.provider_guard import get_provider_guard
+
+    return {
+        "providers": get_provider_guard().stats(),
+        "quote_cache": get_quote_cache().stats(),
+    }
+
+
+@router.post(
+    "/governance/verify",
+    summary="Queue a hash-chain verification of the governance logs",
+)
+async def start_governance_verification(
+    full: bool = False,
+    workers: int = 1,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Queues a "governance_verify" job and returns its id; poll
+    GET /api/jobs/{job_id} for progress and the report. Incremental from the
+    last signed checkpoint unless ?full=true.
+    """
+    if getattr(current_user, "role", None) != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    from services.job_manager import JobManager
+
+    job_id = JobManager(db).enqueue(
+        "governance_verify",
+        payload={"full": full, "workers": max(1, min(workers, 8))},
+        user_id=current_user.id,
+        source="admin",
+        max_attempts=1,
+        dedupe_key="governance_verify",
+    )
+    return {"status": "queued", "job_id": job_id}
+
+
+@router.get(
+    "/governance/verify",
+    summary="Recent governance verification runs and current checkpoints",
+)
+async def get_governance_verification(
+    limit: int = 10,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    if getattr(current_user, "role", None) != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    from models.job import BackgroundJob
+    from services.governance_bridge import verification_status
+
+    runs = (
+        db.query(BackgroundJob)
+        .filter(BackgroundJob.job_type == "governance_verify")
+        .order_by(BackgroundJob.created_at.desc())
+        .limit(min(limit, 100))
+    )
+    return {
+        "checkpoints": verification_status(),
+        "runs": [
+            {
+                "job_id": run.id,
+                "status": run.status,
+                "progress": run.progress,
+                "created_at": run.created_at,
+                "report": run.result_json,
+                "error": run.error_message,
+            }
+            for run in runs
+        ],
+    }
@@ -2,13 +2,20 @@
 Analytics routes for viewing user interactions and usage patterns.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy import func
-from typing import List, Dict, Any
+from sqlalchemy.orm import Session
+
+from core.authentication import get_current_user
+from core.rate_limiting import limiter
 from models.database import get_db
-from models.models import ActivityFeed, MobilityTrip, Order
-import json
+from models.models import ActivityFeed, MobilityTrip
+from services.mobility.route_stats import popular_routes
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
 
 @router.get("/interactions")
@@ -61,14 +68,16 @@ async def get_price_history(
     # Exclude trips without cost
     query = query.filter(MobilityTrip.cost_amount.isnot(None))
 
+    # Newest first on the (user_id, created_at) index
     trips = (
-        query.order_by(MobilityTrip.id.desc()).limit(limit).all()
-    )  # No timestamp directly on Trip?
-    # MoblityTrip has pickup_time
+        query.order_by(MobilityTrip.created_at.desc(), MobilityTrip.id.desc())
+        .limit(limit)
+        .all()
+    )
 
     results = []
     for t in trips:
-        ts = t.pickup_time or datetime.utcnow()
+        ts = t.pickup_time or t.created_at or datetime.utcnow()
         results.append(
             {
                 "id": t.id,
@@ -78,6 +87,10 @@ async def get_price_history(
                 "currency": t.currency,
                 "start": {"lat": t.origin_lat, "lon": t.origin_lon},
                 "end": {"lat": t.destination_lat, "lon": t.destination_lon},
+                "route": {
+                    "origin_cell": t.origin_cell,
+                    "destination_cell": t.destination_cell,
+                },
                 "timestamp": ts.isoformat(),
             }
         )
@@ -92,41 +105,26 @@ async def get_popular_routes(
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> Dict[str, Any]:
-    """Get user's most requested routes."""
-    user_id = current_user.id
+    """
+    Get user's most requested routes.
 
-    # Group by lat/lon roughly?
-    # For now, simplistic exact match on coords (unlikely to hit often without snapping)
-    # or just return raw list
-
-    routes = (
-        db.query(
-            MobilityTrip.origin_lat,
-            MobilityTrip.origin_lon,
-            MobilityTrip.destination_lat,
-            MobilityTrip.destination_lon,
-            func.count(MobilityTrip.id).label("count"),
-            func.avg(MobilityTrip.cost_amount).label("avg_price"),
-        )
-        .filter(MobilityTrip.user_id == user_id)
-        .group_by(
-            MobilityTrip.origin_lat,
-            MobilityTrip.origin_lon,
-            MobilityTrip.destination_lat,
-            MobilityTrip.destination_lon,
-        )
-        .order_by(func.count(MobilityTrip.id).desc())
-        .limit(10)
-        .all()
-    )
+    Trips are bucketed into geohash cells when written, so nearby pickups
+    and drop-offs aggregate; stats come from the maintained route rows.
+    """
+    routes = popular_routes(db, current_user.id, limit=10)
 
     return {
         "routes": [
             {
-                "start": {"lat": r.origin_lat, "lon": r.origin_lon},
-                "end": {"lat": r.destination_lat, "lon": r.destination_lon},
-                "request_count": r.count,
-                "average_price": round(r.avg_price, 2) if r.avg_price else 0,
+                "start": r["start"],
+                "end": r["end"],
+                "origin_cell": r["origin_cell"],
+                "destination_cell": r["destination_cell"],
+                "request_count": r["count"],
+                "average_price": r["avg"],
+                "p50_price": r["p50"],
+                "p90_price": r["p90"],
+                "currency": r["currency"],
             }
             for r in routes
         ]
@@ -196,7 +196,7 @@ async def google_auth_callback(
         # modify the service usage (but service insists on user_id).
 
         # Let's extract the exchange logic carefully.
-        import requests
+        from core.http_client import get_http_client
 
         token_payload = {
             "client_id": service.CLIENT_ID,
@@ -206,7 +206,9 @@ async def google_auth_callback(
             "redirect_uri": service.REDIRECT_URI,
         }
 
-        token_resp = requests.post(service.TOKEN_URL, data=token_payload, timeout=10)
+        token_resp = await get_http_client("google").post(
+            service.TOKEN_URL, data=token_payload, timeout=10
+        )
         if token_resp.status_code != 200:
             raise Exception(f"Failed to exchange code: {token_resp.text}")
 
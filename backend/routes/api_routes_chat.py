@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Body, Path
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from models.database import get_db
 from models.chat_models import ChatSession, ChatHistory
@@ -136,3 +137,91 @@ async def handle_message(
         logger.error(traceback.format_exc())
         logger.error(f"ERROR in chat_message: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
+
+
+def _sse(event: str, payload: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+@router.post("/{session_id}/message/stream")
+async def stream_message(
+    session_id: int = Path(...),
+    data: ChatMessageRequest = Body(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Streaming variant of handle_message (Server-Sent Events).
+
+    Events, in order: "stage" (pipeline progress), "text" (early template
+    or clarification text) or "token" (LLM chunks), then "final" with the
+    same payload handle_message returns. The assistant message is saved
+    before "final" is sent.
+    """
+    user_id = current_user.id
+    message = data.message
+
+    if not message:
+        raise HTTPException(status_code=400, detail="Message cannot be empty")
+
+    chat_session = (
+        db.query(ChatSession).filter(ChatSession.session_id == session_id).first()
+    )
+    if not chat_session:
+        raise HTTPException(status_code=404, detail="Chat session not found")
+    if chat_session.user_id != user_id:
+        raise HTTPException(
+            status_code=403, detail="Unauthorized access to this session"
+        )
+
+    db.add(
+        ChatHistory(
+            session_id=session_id,
+            user_id=user_id,
+            message_type="user",
+            content=message,
+            timestamp=datetime.utcnow(),
+            input_tokens=0,
+            output_tokens=0,
+        )
+    )
+    db.commit()
+
+    history = [{"role": "user", "content": message}]
+    context = {"user_id": user_id}
+    if chat_session.context:
+        context["session_context"] = chat_session.context
+
+    gemini_service = GeminiService(db)
+
+    async def events():
+        try:
+            async for event in gemini_service.stream_response(history, context):
+                payload = {"elapsed_ms": event["elapsed_ms"], **event["data"]}
+                if event["event"] == "final":
+                    token_usage = event["data"].get("usage", {})
+                    db.add(
+                        ChatHistory(
+                            session_id=session_id,
+                            user_id=user_id,
+                            message_type="assistant",
+                            content=event["data"].get("text", ""),
+                            timestamp=datetime.utcnow(),
+                            input_tokens=token_usage.get("input_tokens", 0),
+                            output_tokens=token_usage.get("output_tokens", 0),
+                            model_used="gemini-1.5-flash",
+                        )
+                    )
+                    db.commit()
+                yield _sse(event["event"], payload)
+        except Exception as e:
+            logger.error(f"ERROR in chat stream: {str(e)}", exc_info=True)
+            db.rollback()
+            yield _sse("error", {"detail": "Internal Server Error"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -6,6 +6,7 @@ from models.database import get_db
 # from leniency import Leniency # Removed invalid import
 from services.finance_service import FinanceService
 from services.statement_processing_service import StatementService
+from services.job_manager import JobManager
 from core.authentication import get_current_user
 from models.models import User, FinancialScore
 from datetime import datetime
@@ -81,11 +82,18 @@ async def upload_statement(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
+    """
+    Parse uploaded statements. With "background": true in the body each file
+    is queued as a "statement_parse" job and only the job ids are returned;
+    poll GET /api/jobs/{job_id} for progress and the result.
+    """
     try:
         data = await request.json()
         files_data = data.get("files", [])
+        background = bool(data.get("background", False))
 
         service = StatementService(db)
+        jobs = JobManager(db)
         results = []
 
         for file_data in files_data:
@@ -99,6 +107,18 @@ async def upload_statement(
             if "," in content_b64:
                 content_b64 = content_b64.split(",")[1]
 
+            if background:
+                job_id = jobs.enqueue(
+                    "statement_parse",
+                    payload={"filename": filename, "content": content_b64},
+                    user_id=current_user.id,
+                    source="upload",
+                )
+                results.append(
+                    {"status": "queued", "filename": filename, "job_id": job_id}
+                )
+                continue
+
             file_bytes = base64.b64decode(content_b64)
 
             result = await service.process_statement(
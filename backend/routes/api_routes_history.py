@@ -13,9 +13,12 @@ from pydantic import BaseModel
 from models.database import get_db
 from models.models import FinancialTransaction, VivLog, HealthDailySummary, User
 from core.authentication import get_current_user
+from services.history_service import HistoryService, InvalidCursorError
 
 router = APIRouter(prefix="/api/history", tags=["history"])
 
+MAX_PAGE_SIZE = 200
+
 # Pydantic Models
 # ============================================================================
 
@@ -113,6 +116,76 @@ def group_by_date(items: List[HistoryItem]) -> List[HistoryDayGroup]:
     return [HistoryDayGroup(**group) for group in sorted_groups]
 
 
+def _transaction_item(txn: FinancialTransaction, ts: datetime) -> HistoryItem:
+    return HistoryItem(
+        id=txn.id,
+        type="transaction",
+        title=txn.merchant_name or "Transaction",
+        subtitle=txn.category_primary,
+        amount=txn.amount,
+        timestamp=ts.isoformat(),
+        tags=[txn.category_primary] if txn.category_primary else [],
+        sourceService="financials",
+        icon="Money",
+        importance="medium",
+        raw={
+            "id": txn.id,
+            "amount": txn.amount,
+            "category": txn.category_primary,
+            "merchant": txn.merchant_name,
+        },
+    )
+
+
+def _viv_log_item(log: VivLog, ts: datetime) -> HistoryItem:
+    return HistoryItem(
+        id=log.id,
+        type="viv_log",
+        title=log.user_intent or "Viv Activity",
+        subtitle=(
+            log.decision_logic[:50] + "..." if log.decision_logic else "AI Decision"
+        ),
+        timestamp=ts.isoformat(),
+        tags=["ai", "viv"],
+        sourceService="viv",
+        icon="Robot",
+        importance="low",
+        raw={
+            "id": log.id,
+            "intent": log.user_intent,
+            "logic": log.decision_logic,
+        },
+    )
+
+
+def _health_item(summary: HealthDailySummary, ts: datetime) -> HistoryItem:
+    # ts is the summary date at noon (HealthDailySummary uses Date, not DateTime)
+    return HistoryItem(
+        id=str(summary.id),
+        type="health",
+        title="Daily Health Summary",
+        subtitle=f"Sleep: {summary.sleep_quality_score or 0}% | Steps: {summary.steps_count or 0}",
+        metricValue=float(summary.sleep_quality_score or 0),
+        timestamp=ts.isoformat(),
+        tags=["health", "summary"],
+        sourceService="health",
+        icon="Health",
+        importance="medium",
+        raw={
+            "id": str(summary.id),
+            "sleep": summary.sleep_quality_score,
+            "steps": summary.steps_count,
+        },
+    )
+
+
+_ITEM_BUILDERS = {
+    "transaction": _transaction_item,
+    "viv_log": _viv_log_item,
+    "health": _health_item,
+}
+
+
 # ============================================================================
 # API Endpoints
 # ============================================================================
@@ -131,10 +204,10 @@ async def get_unified_history(
     - Transactions
     - Viv Logs (AI decisions)
     - Health Summaries
-    """
-    user_id = current_user.id
-    all_items = []
 
+    Keyset-paginated: pass the returned nextCursor to get the next page.
+    totalCount is the number of items in this page.
+    """
     # Parse date range
     start_date = None
     end_date = None
@@ -144,130 +217,29 @@ async def get_unified_history(
         if request.filters.dateRange.get("end"):
             end_date = datetime.fromisoformat(request.filters.dateRange.get("end"))
 
-    # Fetch transactions
-    if not request.filters.types or "transaction" in request.filters.types:
-        transactions = db.query(FinancialTransaction).filter(
-            FinancialTransaction.user_id == user_id
-        )
-        if start_date and end_date:
-            transactions = transactions.filter(
-                FinancialTransaction.transaction_date >= start_date,
-                FinancialTransaction.transaction_date <= end_date,
-            )
-
-        for txn in transactions.limit(request.limit).all():
-            all_items.append(
-                HistoryItem(
-                    id=txn.id,
-                    type="transaction",
-                    title=txn.merchant_name or "Transaction",
-                    subtitle=txn.category_primary,
-                    amount=txn.amount,
-                    timestamp=txn.transaction_date.isoformat(),
-                    tags=[txn.category_primary] if txn.category_primary else [],
-                    sourceService="financials",
-                    icon="Money",
-                    importance="medium",
-                    raw={
-                        "id": txn.id,
-                        "amount": txn.amount,
-                        "category": txn.category_primary,
-                        "merchant": txn.merchant_name,
-                    },
-                )
-            )
-
-    # Fetch Viv Logs
-    if not request.filters.types or "viv_log" in request.filters.types:
-        logs = db.query(VivLog).filter(VivLog.user_id == user_id)
-        if start_date and end_date:
-            logs = logs.filter(
-                VivLog.timestamp >= start_date, VivLog.timestamp <= end_date
-            )
-
-        for log in logs.limit(request.limit).all():
-            all_items.append(
-                HistoryItem(
-                    id=log.id,
-                    type="viv_log",
-                    title=log.user_intent or "Viv Activity",
-                    subtitle=(
-                        log.decision_logic[:50] + "..."
-                        if log.decision_logic
-                        else "AI Decision"
-                    ),
-                    timestamp=log.timestamp.isoformat(),
-                    tags=["ai", "viv"],
-                    sourceService="viv",
-                    icon="Robot",
-                    importance="low",
-                    raw={
-                        "id": log.id,
-                        "intent": log.user_intent,
-                        "logic": log.decision_logic,
-                    },
-                )
-            )
-
-    # Fetch Health Summaries
-    if not request.filters.types or "health" in request.filters.types:
-        summaries = db.query(HealthDailySummary).filter(
-            HealthDailySummary.user_id == user_id
+    limit = max(1, min(request.limit, MAX_PAGE_SIZE))
+    try:
+        page = HistoryService(db).get_timeline(
+            current_user.id,
+            types=request.filters.types,
+            start=start_date,
+            end=end_date,
+            search=request.filters.searchQuery,
+            limit=limit,
+            cursor=request.cursor,
         )
-        if start_date and end_date:
-            # Date comparison (HealthDailySummary uses Date, not DateTime)
-            summaries = summaries.filter(
-                HealthDailySummary.date >= start_date.date(),
-                HealthDailySummary.date <= end_date.date(),
-            )
-
-        for summary in summaries.limit(request.limit).all():
-            # Create a timestamp from the date (noon)
-            ts = datetime.combine(summary.date, datetime.min.time()) + timedelta(
-                hours=12
-            )
-
-            all_items.append(
-                HistoryItem(
-                    id=str(summary.id),
-                    type="health",
-                    title="Daily Health Summary",
-                    subtitle=f"Sleep: {summary.sleep_quality_score or 0}% | Steps: {summary.steps_count or 0}",
-                    metricValue=float(summary.sleep_quality_score or 0),
-                    timestamp=ts.isoformat(),
-                    tags=["health", "summary"],
-                    sourceService="health",
-                    icon="Health",
-                    importance="medium",
-                    raw={
-                        "id": str(summary.id),
-                        "sleep": summary.sleep_quality_score,
-                        "steps": summary.steps_count,
-                    },
-                )
-            )
-
-    # Sort all items by timestamp (newest first)
-    all_items.sort(key=lambda x: x.timestamp, reverse=True)
-
-    # Apply search filter
-    if request.filters.searchQuery:
-        query = request.filters.searchQuery.lower()
-        all_items = [
-            item
-            for item in all_items
-            if query in item.title.lower()
-            or (item.subtitle and query in item.subtitle.lower())
-        ]
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    # Group by date
-    groups = group_by_date(all_items[: request.limit])
+    items = [
+        _ITEM_BUILDERS[entry.type](entry.row, entry.timestamp) for entry in page.entries
+    ]
 
     return HistoryResponse(
-        groups=groups,
-        totalCount=len(all_items),
-        hasMore=len(all_items) > request.limit,
-        nextCursor=None,
+        groups=group_by_date(items),
+        totalCount=len(items),
+        hasMore=page.has_more,
+        nextCursor=page.next_cursor,
     )
 
 
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from core.authentication import get_current_user
+from models.database import get_db
+from models.job import BackgroundJob
+from models.models import User
+from services.job_manager import JobManager
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+def _owned_job(job_id: str, current_user: User, db: Session) -> BackgroundJob:
+    job = db.query(BackgroundJob).filter(BackgroundJob.id == job_id).first()
+    is_admin = getattr(current_user, "role", None) == "admin"
+    if not job or (job.user_id != current_user.id and not is_admin):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/{job_id}", summary="Background job status, progress and result")
+async def get_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    _owned_job(job_id, current_user, db)
+    return JobManager(db).get_job(job_id)
+
+
+@router.post("/{job_id}/cancel", summary="Cancel a queued or running job")
+async def cancel_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    A queued job is cancelled at once; a running one stops at its next
+    heartbeat, so its status may still read "processing" for a few seconds.
+    """
+    _owned_job(job_id, current_user, db)
+    status = JobManager(db).request_cancel(job_id)
+    return {"job_id": job_id, "status": status}
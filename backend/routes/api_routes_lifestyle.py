@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
-from models.database import get_db
+from models.database import get_db, get_async_db
 
 from services.lifestyle_service import LifestyleService
 from core.authentication import get_current_user
@@ -40,10 +41,11 @@ async def get_recommendations(
 
 @router.get("/goals", summary="Get life goals")
 async def get_goals(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
 ):
     service = LifestyleService(db)
-    return {"data": service.get_goals(current_user.id)}
+    return {"data": await service.get_goals_async(current_user.id)}
 
 
 @router.post("/goals", summary="Create a life goal")
@@ -16,7 +16,6 @@ from models.models import User, VivIndex, FinancialScore
 from services.time_scoring import calculate_productivity_score
 from services.financial_scoring import calculate_financial_health_score
 from services.health_scoring import calculate_health_score
-from services.time_service import calculate_time_score
 from datetime import timedelta
 
 router = APIRouter()
@@ -518,121 +517,29 @@ async def debug_fix_permissions(db: Session = Depends(get_db)):
 
 @router.post("/debug/trigger_calc")
 async def debug_trigger_calc(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    background: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
 ):
     """
     Trigger complete calculation of scores (Finance, Health, Time) for current user.
     Populates FinancialScore, TimeScore, and VivIndex tables from raw data.
+
+    With ?background=true the recalculation is queued as a "score_recalc" job
+    and the job id is returned at once (poll GET /api/jobs/{job_id}).
     """
     try:
-        user_id = current_user.id
-        # Clear any stale transaction (Cloud SQL pooled connections)
-        try:
-            db.rollback()
-        except Exception:
-            pass
-
-        onboarding = current_user.profile_json if current_user.profile_json else {}
-        fin_val = 50.0
-        health_val = 50.0
-        time_val = 50.0
-        ts = None
-
-        # 1. Time/Productivity Score — isolated
-        try:
-            from models.models import TimeScore
+        if background:
+            from services.job_manager import JobManager
 
-            ts = calculate_time_score(db, user_id, window_days=30)
-            if ts:
-                time_val = ts.overall_score
-        except Exception as e:
-            logger.warning(f"Time score calculation failed (continuing): {e}")
-            try:
-                db.rollback()
-            except Exception:
-                pass
-
-        # 2. Financial Score — isolated
-        try:
-            fin_data = calculate_financial_health_score(user_id, onboarding, db)
-            if fin_data:
-                fin_val = fin_data.get("overall_score", 50.0)
-        except Exception as e:
-            logger.warning(f"Financial score calculation failed (continuing): {e}")
-            try:
-                db.rollback()
-            except Exception:
-                pass
-
-        # 3. Health Score — isolated
-        try:
-            hs_data = calculate_health_score(user_id, onboarding, db)
-            if hs_data:
-                health_val = hs_data.get("score", 50.0)
-        except Exception as e:
-            logger.warning(f"Health score calculation failed (continuing): {e}")
-            try:
-                db.rollback()
-            except Exception:
-                pass
-
-        # 4. Try to fetch persisted scores (may be better than computed)
-        try:
-            latest_fs = (
-                db.query(FinancialScore)
-                .filter(FinancialScore.user_id == user_id)
-                .order_by(FinancialScore.timestamp.desc())
-                .first()
+            job_id = JobManager(db).enqueue(
+                "score_recalc", user_id=current_user.id, source="api"
             )
-            if latest_fs:
-                fin_val = latest_fs.overall_score
-        except Exception:
-            try:
-                db.rollback()
-            except Exception:
-                pass
+            return {"status": "queued", "job_id": job_id}
 
-        try:
-            from models.models import TimeScore
-
-            latest_ts = (
-                db.query(TimeScore)
-                .filter(TimeScore.user_id == user_id)
-                .order_by(TimeScore.timestamp.desc())
-                .first()
-            )
-            if latest_ts:
-                time_val = latest_ts.overall_score
-        except Exception:
-            try:
-                db.rollback()
-            except Exception:
-                pass
+        from services.score_recalculation import recalculate_scores
 
-        # 5. Always create a VivIndex snapshot
-        try:
-            db.rollback()  # ensure clean transaction
-        except Exception:
-            pass
-
-        viv_index = VivIndex(
-            id=str(uuid.uuid4()),
-            user_id=user_id,
-            financial_score=fin_val,
-            health_score=health_val,
-            time_score=time_val,
-            snapshot_reason="Manual Recalculation",
-            timestamp=datetime.utcnow(),
-            confidence=1.0,
-        )
-        db.add(viv_index)
-        db.commit()
-
-        return {
-            "status": "success",
-            "message": "Scores recalculation complete",
-            "scores": {"financial": fin_val, "health": health_val, "time": time_val},
-        }
+        return recalculate_scores(db, current_user)
     except Exception as e:
         import traceback
 
@@ -78,19 +78,19 @@ async def auth0_callback(payload: Auth0CallbackPayload, db: Session = Depends(ge
 
         # Access Token might not have email/name claims.
         # Fetch user info from Auth0 /userinfo endpoint
-        import requests
         from core.auth0_config import get_auth0_settings
+        from core.http_client import get_http_client
 
         settings = get_auth0_settings()
 
         userinfo_url = f"https://{settings.AUTH0_DOMAIN}/userinfo"
-        userinfo_resp = requests.get(
+        userinfo_resp = await get_http_client("auth0").get(
             userinfo_url,
             headers={"Authorization": f"Bearer {payload.token}"},
             timeout=10,
         )
 
-        if not userinfo_resp.ok:
+        if not userinfo_resp.is_success:
             logger.error(f"Failed to fetch userinfo: {userinfo_resp.text}")
             # Fallback to token claims if userinfo fails (unlikely)
             user_info = token_payload
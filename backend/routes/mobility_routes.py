@@ -49,9 +49,12 @@ async def compare_prices(
         None, description="Comma-separated list of providers (uber,careem,bolt)"
     ),
     current_user=Depends(get_current_user),
+    db: Session = Depends(get_db),
 ):
     """
     Compare ride prices across multiple mobility providers.
+
+    Includes "price_prior": the user's past fares on this route, if any.
     """
     aggregator = get_mobility_aggregator()
 
@@ -59,7 +62,13 @@ async def compare_prices(
 
     try:
         results = await aggregator.compare_prices(
-            current_user.id, start_lat, start_lng, end_lat, end_lng, provider_list
+            current_user.id,
+            start_lat,
+            start_lng,
+            end_lat,
+            end_lng,
+            provider_list,
+            db=db,
         )
 
         return {"success": True, "data": results}
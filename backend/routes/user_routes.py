@@ -33,6 +33,7 @@ from models.models import (
 # from core.authentication import get_password_hash # Removed for Auth0 migration
 import uuid
 from models.api_models import UserUpdateRequest
+from services.financial_aggregates import record_transactions
 from services.financial_scoring import calculate_financial_health_score
 from services.health_scoring import calculate_health_score
 from services.time_scoring import calculate_productivity_score
@@ -106,6 +107,7 @@ async def register_user(user_data: dict, db: Session = Depends(get_db)):
 
             # Add transactions
             transactions_data = session.data_json.get("transactions", [])
+            imported = []
             for t_data in transactions_data:
                 # Basic mapping
                 t_date = datetime.utcnow()
@@ -129,6 +131,8 @@ async def register_user(user_data: dict, db: Session = Depends(get_db)):
                     transaction_date=t_date,
                 )
                 db.add(transaction)
+                imported.append(transaction)
+            record_transactions(db, imported)
 
             # Clean up session
             db.delete(session)
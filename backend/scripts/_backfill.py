@@ -0,0 +1,42 @@
+"""
+Shared loop for the per-user backfill scripts.
+
+Each backfill recomputes one user's derived rows from scratch and commits
+them on their own, so a run is safe to repeat and stops at the first user
+that fails.
+"""
+
+from typing import Callable, Iterable, Tuple
+
+from sqlalchemy.orm import Session
+
+from models.database import SessionLocal
+
+
+def backfill_users(
+    user_ids: Callable[[Session], Iterable[Tuple[str]]],
+    rebuild: Callable[[Session, str], int],
+    what: str,
+    unit: str,
+) -> int:
+    """
+    Run rebuild(db, user_id) for every user id row user_ids(db) yields.
+    `what` names the rebuilt rows and `unit` what rebuild() counts, for the
+    progress output. Returns the process exit code.
+    """
+    db = SessionLocal()
+    try:
+        uids = [uid for (uid,) in user_ids(db)]
+        print(f"Rebuilding {what} for {len(uids)} users...")
+        for uid in uids:
+            try:
+                count = rebuild(db, uid)
+                db.commit()
+                print(f"   ✅ {uid}: {count} {unit}")
+            except Exception as e:
+                db.rollback()
+                print(f"   ❌ {uid}: {e}")
+                return 1
+        return 0
+    finally:
+        db.close()
@@ -0,0 +1,31 @@
+"""
+Financial Aggregates Backfill
+
+Rebuilds financial_daily_aggregates from transactions_v2 for every user
+that has transactions. Run once after applying the migration that creates
+the table; afterwards the write paths keep it current incrementally.
+
+Safe to re-run: each user's rollup is recomputed from scratch and
+committed on its own.
+"""
+
+import sys
+
+from _backfill import backfill_users
+from models.models import FinancialTransaction
+from services.financial_aggregates import rebuild_user
+
+
+def backfill() -> int:
+    return backfill_users(
+        lambda db: db.query(FinancialTransaction.user_id)
+        .filter(FinancialTransaction.user_id.isnot(None))
+        .distinct(),
+        rebuild_user,
+        "daily financial aggregates",
+        "days",
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(backfill())
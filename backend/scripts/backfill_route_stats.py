@@ -0,0 +1,29 @@
+"""
+Route Stats Backfill
+
+Assigns geohash route cells to existing mobility_trips and rebuilds
+route_price_stats for every user with trips. Run once after applying the
+migration that adds them; afterwards record_trips() keeps them current.
+
+Safe to re-run: each user's stats are recomputed from scratch and
+committed on their own.
+"""
+
+import sys
+
+from _backfill import backfill_users
+from models.models import MobilityTrip
+from services.mobility.route_stats import rebuild_user
+
+
+def backfill() -> int:
+    return backfill_users(
+        lambda db: db.query(MobilityTrip.user_id).distinct(),
+        rebuild_user,
+        "route stats",
+        "routes",
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(backfill())
@@ -28,6 +28,7 @@ from models.models import (
     TimeScore,
     HealthProfile,
 )
+from services.financial_aggregates import rebuild_user
 from core.authentication import get_password_hash
 from core.config import get_settings
 from sqlalchemy import text
@@ -245,6 +246,7 @@ def seed_rich_finance_data(user_id):
                 timestamp=datetime.now(timezone.utc) - timedelta(weeks=12 - i),
             )
         )
+    rebuild_user(db, user_id)
     db.commit()
 
 
@@ -425,6 +427,7 @@ def seed_minimal_finance_data(user_id):
             user_id=user_id, overall_score=50, timestamp=datetime.now(timezone.utc)
         )
     )
+    rebuild_user(db, user_id)
     db.commit()
 
 
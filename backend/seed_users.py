@@ -26,6 +26,7 @@ from models.models import (
     TimeScore,
     HealthProfile,
 )
+from services.financial_aggregates import rebuild_user
 from core.config import get_settings
 from sqlalchemy import text
 
@@ -216,6 +217,7 @@ def seed_rich_finance_data(user_id):
                     timestamp=datetime.now(timezone.utc) - timedelta(weeks=12 - i),
                 )
             )
+        rebuild_user(db, user_id)
         db.commit()
     except Exception as e:
         print(f"Error seeding finance: {e}")
@@ -382,6 +384,7 @@ def seed_minimal_finance_data(user_id):
             user_id=user_id, overall_score=50, timestamp=datetime.now(timezone.utc)
         )
     )
+    rebuild_user(db, user_id)
     db.commit()
 
 
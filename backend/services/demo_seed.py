@@ -36,6 +36,7 @@ HEALTH_WINDOW_DAYS = 30  # => a 30-day check-in streak ending today
 def _clear_synthetic(db: Session, uid: str) -> None:
     from models.models import (
         FinancialAccount,
+        FinancialDailyAggregate,
         FinancialScore,
         FinancialTransaction,
         HealthDailySummary,
@@ -47,6 +48,7 @@ def _clear_synthetic(db: Session, uid: str) -> None:
 
     # FK-safe order: transactions before accounts.
     for model in (
+        FinancialDailyAggregate,
         FinancialTransaction,
         FinancialAccount,
         Statement,
@@ -70,6 +72,7 @@ def _regenerate(db: Session, user) -> None:
         Statement,
         VivIndex,
     )
+    from services.financial_aggregates import record_transactions
 
     uid = user.id
     now = datetime.now(timezone.utc)
@@ -113,8 +116,10 @@ def _regenerate(db: Session, user) -> None:
     )
 
     # --- Transactions: rolling 90 days ending today --------------------
+    seeded = []
+
     def _txn(acct, amt, desc, cat, when):
-        db.add(
+        seeded.append(
             FinancialTransaction(
                 user_id=uid,
                 account_id=acct,
@@ -137,6 +142,8 @@ def _regenerate(db: Session, user) -> None:
             _txn(checking.id, -85.50, "Grocery Market", "Groceries", d)
         if day % 7 == 0:
             _txn(credit.id, -60.0, "Dining Out", "Dining", d)
+    db.add_all(seeded)
+    record_transactions(db, seeded)
 
     # --- Health check-ins: last 30 days ending today (streak = 30) -----
     for day in range(HEALTH_WINDOW_DAYS):
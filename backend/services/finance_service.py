@@ -1,8 +1,9 @@
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import List, Optional, Literal
 import uuid
 from models.models import FinancialAccount, FinancialTransaction
+from services.financial_aggregates import get_window, record_transactions
 
 try:
     from models.investment_portfolios import InvestmentPortfolio
@@ -124,6 +125,7 @@ class FinanceService:
             currency_code=transaction_data.get("currency_code", "USD"),
         )
         self.db.add(transaction)
+        record_transactions(self.db, [transaction])
         self.db.commit()
         self.db.refresh(transaction)
         return transaction
@@ -155,52 +157,16 @@ class FinanceService:
         - Income = Sum of Positive Txns
         - Expenses = Sum of ABS(Negative Txns)
         - Bills = Subset of Expenses (do NOT double count in total expenses, but return separate metric)
-        """
-        cutoff_date = datetime.utcnow() - timedelta(days=30)
 
-        transactions = (
-            self.db.query(FinancialTransaction)
-            .filter(
-                FinancialTransaction.user_id == user_id,
-                FinancialTransaction.transaction_date >= cutoff_date,
-            )
-            .all()
-        )
+        Reads the last 30 days of daily aggregates, not the raw transactions.
+        """
+        window = get_window(self.db, user_id, days=30)
 
         current_investments = self.get_portfolio_performance(user_id)["total_value"]
 
-        income = 0.0
-        expenses = 0.0
-        recurring_bills = 0.0
-
-        bill_categories = {
-            "subscription",
-            "bills",
-            "utilities",
-            "recurring",
-            "insurance",
-            "rent",
-        }
-
-        for txn in transactions:
-            amount = txn.amount or 0.0
-
-            if amount > 0:
-                income += amount
-            else:
-                abs_amt = abs(amount)
-                expenses += abs_amt
-
-                # Check for Bill (Normalized check)
-                cat_primary = (txn.category_primary or "").lower()
-                cat_detailed = (txn.category_detailed or "").lower()
-
-                if (
-                    cat_primary in bill_categories
-                    or cat_detailed in bill_categories
-                    or txn.is_recurring
-                ):
-                    recurring_bills += abs_amt
+        income = window.income_total
+        expenses = window.expense_total
+        recurring_bills = window.bill_total
 
         monthly_savings = income - expenses
 
@@ -0,0 +1,217 @@
+"""
+Financial Aggregates — incremental per-user daily rollups of transactions.
+
+Every write path that inserts FinancialTransaction rows folds them into
+FinancialDailyAggregate in the same unit of work (record_transactions),
+so the rollup commits or rolls back together with the rows it describes.
+
+Consumers (monthly summary, financial health score, wellbeing index)
+read a rolling window with get_window(), which touches at most one row
+per day regardless of how many transactions the user has.
+
+rebuild_user() recomputes a user's rollup from scratch; it backs the
+backfill script and the dev seeders that bulk-insert transactions.
+"""
+
+import math
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from models.models import FinancialDailyAggregate, FinancialTransaction
+
+# Expense categories counted as bills (matched lowercased against
+# category_primary / category_detailed), in addition to is_recurring rows
+BILL_CATEGORIES = frozenset(
+    {"subscription", "bills", "utilities", "recurring", "insurance", "rent"}
+)
+
+UNCATEGORIZED = "Uncategorized"
+
+
+@dataclass
+class FinancialWindow:
+    """Sums over a rolling window of daily aggregates."""
+
+    days: int
+    txn_count: int = 0
+    income_total: float = 0.0
+    income_count: int = 0
+    income_sq_total: float = 0.0
+    expense_total: float = 0.0
+    expense_count: int = 0
+    bill_total: float = 0.0
+    category_spend: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def net(self) -> float:
+        return self.income_total - self.expense_total
+
+    @property
+    def income_mean(self) -> float:
+        return self.income_total / self.income_count if self.income_count else 0.0
+
+    @property
+    def income_stdev(self) -> float:
+        """Sample standard deviation of individual income amounts."""
+        n = self.income_count
+        if n < 2:
+            return 0.0
+        variance = (self.income_sq_total - n * self.income_mean**2) / (n - 1)
+        return math.sqrt(max(variance, 0.0))
+
+
+def is_bill(txn: FinancialTransaction) -> bool:
+    return (
+        (txn.category_primary or "").lower() in BILL_CATEGORIES
+        or (txn.category_detailed or "").lower() in BILL_CATEGORIES
+        or bool(txn.is_recurring)
+    )
+
+
+def _day(ts: Optional[date]) -> date:
+    if ts is None:
+        return datetime.utcnow().date()
+    # transaction_date is sometimes assigned a plain date before flush
+    return ts.date() if isinstance(ts, datetime) else ts
+
+
+def _fold(row: FinancialDailyAggregate, txns: List[FinancialTransaction]) -> None:
+    """Add a batch of same-day transactions to an aggregate row."""
+    spend = dict(row.category_spend_json or {})
+    for txn in txns:
+        amount = float(txn.amount)
+        row.txn_count = (row.txn_count or 0) + 1
+        if amount > 0:
+            row.income_total = (row.income_total or 0.0) + amount
+            row.income_count = (row.income_count or 0) + 1
+            row.income_sq_total = (row.income_sq_total or 0.0) + amount * amount
+        elif amount < 0:
+            outflow = -amount
+            row.expense_total = (row.expense_total or 0.0) + outflow
+            row.expense_count = (row.expense_count or 0) + 1
+            if is_bill(txn):
+                row.bill_total = (row.bill_total or 0.0) + outflow
+            category = txn.category_primary or UNCATEGORIZED
+            spend[category] = round(spend.get(category, 0.0) + outflow, 2)
+    # Reassign so the JSON column is flagged dirty
+    row.category_spend_json = spend
+
+
+def record_transactions(
+    db: Session, transactions: Iterable[FinancialTransaction]
+) -> None:
+    """
+    Fold newly inserted transactions into their daily aggregates.
+
+    Call before the commit that persists the transactions. Existing day
+    rows are locked (SELECT ... FOR UPDATE) so concurrent imports for the
+    same user serialize; two first-writers racing to create the same day
+    row hit the unique constraint and the losing unit of work rolls back
+    as a whole, so the rollup never drifts from the rows.
+    """
+    buckets: Dict[Tuple[str, date], List[FinancialTransaction]] = defaultdict(list)
+    for txn in transactions:
+        if txn.user_id is None or txn.amount is None:
+            continue
+        buckets[(txn.user_id, _day(txn.transaction_date))].append(txn)
+    if not buckets:
+        return
+
+    days_by_user: Dict[str, set] = defaultdict(set)
+    for user_id, day in buckets:
+        days_by_user[user_id].add(day)
+
+    for user_id, days in days_by_user.items():
+        existing = {
+            row.day: row
+            for row in db.query(FinancialDailyAggregate)
+            .filter(
+                FinancialDailyAggregate.user_id == user_id,
+                FinancialDailyAggregate.day.in_(days),
+            )
+            .with_for_update()
+            .all()
+        }
+        for day in sorted(days):
+            row = existing.get(day)
+            if row is None:
+                row = FinancialDailyAggregate(user_id=user_id, day=day)
+                db.add(row)
+            _fold(row, buckets[(user_id, day)])
+
+
+def rebuild_user(db: Session, user_id: str, batch_size: int = 1000) -> int:
+    """
+    Recompute a user's aggregates from transactions_v2.
+
+    Does not commit. Returns the number of day rows written.
+    """
+    db.query(FinancialDailyAggregate).filter(
+        FinancialDailyAggregate.user_id == user_id
+    ).delete(synchronize_session=False)
+
+    rows: Dict[date, FinancialDailyAggregate] = {}
+    query = (
+        db.query(
+            FinancialTransaction.amount,
+            FinancialTransaction.transaction_date,
+            FinancialTransaction.category_primary,
+            FinancialTransaction.category_detailed,
+            FinancialTransaction.is_recurring,
+        )
+        .filter(
+            FinancialTransaction.user_id == user_id,
+            FinancialTransaction.amount.isnot(None),
+        )
+        .execution_options(yield_per=batch_size)
+    )
+    # Column rows only: no ORM identity map growth on large histories
+    for txn in query:
+        day = _day(txn.transaction_date)
+        row = rows.get(day)
+        if row is None:
+            row = rows[day] = FinancialDailyAggregate(user_id=user_id, day=day)
+        _fold(row, [txn])
+    db.add_all(rows.values())
+
+    logger.info(f"Rebuilt {len(rows)} daily financial aggregates for {user_id}")
+    return len(rows)
+
+
+def get_window(
+    db: Session, user_id: str, days: int, now: Optional[datetime] = None
+) -> FinancialWindow:
+    """
+    Sum the user's aggregates over the last `days` days.
+
+    Day granularity: the window starts at the beginning of the cutoff day,
+    so it may include a few hours more than a timestamp cutoff would.
+    """
+    since = _day(now) - timedelta(days=days)
+    window = FinancialWindow(days=days)
+    rows = (
+        db.query(FinancialDailyAggregate)
+        .filter(
+            FinancialDailyAggregate.user_id == user_id,
+            FinancialDailyAggregate.day >= since,
+        )
+        .all()
+    )
+    spend: Dict[str, float] = defaultdict(float)
+    for row in rows:
+        window.txn_count += row.txn_count or 0
+        window.income_total += row.income_total or 0.0
+        window.income_count += row.income_count or 0
+        window.income_sq_total += row.income_sq_total or 0.0
+        window.expense_total += row.expense_total or 0.0
+        window.expense_count += row.expense_count or 0
+        window.bill_total += row.bill_total or 0.0
+        for category, amount in (row.category_spend_json or {}).items():
+            spend[category] += amount
+    window.category_spend = {k: round(v, 2) for k, v in spend.items()}
+    return window
@@ -3,14 +3,13 @@ Financial Scoring Engine (8 Pillars Model for Progressive Disclosure)
 """
 
 import math
-import statistics
-from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 from loguru import logger
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
-from models.models import FinancialTransaction, User, FinancialScore, RecurringBill
+from models.models import User, FinancialScore, RecurringBill
+from services.financial_aggregates import FinancialWindow, get_window
 
 # ============================================================================
 # Constants & Thresholds
@@ -57,41 +56,10 @@ def calculate_financial_health_score(
 
     try:
         # 1. Gather Data
-        # Get User's transactions if they exist
-        from services.finance_service import FinanceService
-
-        # Check actual transaction count in DB
-        tx_count = len(
-            db.query(FinancialTransaction)
-            .filter(FinancialTransaction.user_id == user_id)
-            .limit(11)
-            .all()
-        )
-        has_statements = tx_count > 10
-
-        # Fetch all txns for calculation (optimize in prod to last 90 days)
-        cutoff = datetime.utcnow() - timedelta(days=90)
-        transactions = (
-            db.query(FinancialTransaction)
-            .filter(
-                FinancialTransaction.user_id == user_id,
-                FinancialTransaction.transaction_date >= cutoff,
-            )
-            .all()
-        )
+        # Last 90 days of daily aggregates; cost is independent of volume
+        window = get_window(db, user_id, days=90)
 
-        # DEFENSIVE: Filter bad transactions
-        valid_transactions = []
-        for t in transactions:
-            if t.amount is not None:
-                try:
-                    float(t.amount)
-                    valid_transactions.append(t)
-                except:
-                    pass
-        transactions = valid_transactions
-
-        has_statements = len(transactions) > 10
+        has_statements = window.txn_count > 10
         if is_manual_mode:
             has_statements = False
 
@@ -104,42 +72,36 @@ def calculate_financial_health_score(
 
         # Pillar 1: Cashflow Stability
         cashflow_score = _compute_cashflow_stability(
-            transactions, onboarding_data, has_statements
+            window, onboarding_data, has_statements
         )
 
         # Pillar 2: Bills Coverage
         bills_score = _compute_bills_coverage(
-            transactions, onboarding_data, has_statements, verified_bills
+            window, onboarding_data, has_statements, verified_bills
         )
 
         # Pillar 3: Discretionary Control
         discretionary_score = _compute_discretionary_control(
-            transactions, onboarding_data, has_statements, verified_bills
+            window, onboarding_data, has_statements, verified_bills
         )
 
         # Pillar 4: Savings Rate
-        savings_score = _compute_savings_rate(
-            transactions, onboarding_data, has_statements
-        )
+        savings_score = _compute_savings_rate(window, onboarding_data, has_statements)
 
         # Pillar 5: Emergency Buffer
         liquid_cash = float(onboarding_data.get("cash_balance", 0) or 0)
         buffer_score = _compute_emergency_buffer(
-            transactions, onboarding_data, has_statements, liquid_cash=liquid_cash
+            window, onboarding_data, has_statements, liquid_cash=liquid_cash
         )
 
         # Pillar 6: Debt Load
-        debt_score = _compute_debt_load(transactions, onboarding_data, has_statements)
+        debt_score = _compute_debt_load(window, onboarding_data, has_statements)
 
         # Pillar 7: Net Worth Momentum
-        nw_score = _compute_networth_momentum(
-            transactions, onboarding_data, has_statements
-        )
+        nw_score = _compute_networth_momentum(window, onboarding_data, has_statements)
 
         # Pillar 8: Investment Health
-        inv_score = _compute_investment_health(
-            transactions, onboarding_data, has_statements
-        )
+        inv_score = _compute_investment_health(window, onboarding_data, has_statements)
 
         # 3. Aggregate
         total_score = (
@@ -178,8 +140,8 @@ def calculate_financial_health_score(
         try:
             # Basic totals calculation logic (kept similar to before but adapted)
             if has_statements:
-                total_inc = sum([t.amount for t in transactions if t.amount > 0])
-                total_out = abs(sum([t.amount for t in transactions if t.amount < 0]))
+                total_inc = window.income_total
+                total_out = window.expense_total
                 # Try to deduce bills from transactions or fallback
                 monthly_bills = (
                     sum([b.amount for b in verified_bills])
@@ -248,7 +210,7 @@ def calculate_financial_health_score(
 
 
 def _compute_cashflow_stability(
-    transactions: List[FinancialTransaction],
+    window: FinancialWindow,
     onboarding_data: Dict[str, Any],
     has_statements: bool,
 ) -> float:
@@ -258,11 +220,10 @@ def _compute_cashflow_stability(
     max_score = 10
 
     if has_statements:
-        incomes = [t.amount for t in transactions if t.amount > 0]
-        if len(incomes) > 2:
+        if window.income_count > 2:
             try:
-                mean = statistics.mean(incomes)
-                stdev = statistics.stdev(incomes)
+                mean = window.income_mean
+                stdev = window.income_stdev
                 cv = stdev / mean  # Coefficient of Variation
                 # CV < 0.2 is very stable (score 10), CV > 1.0 is unstable (score 2)
                 if cv < 0.2:
@@ -279,7 +240,7 @@ def _compute_cashflow_stability(
 
 
 def _compute_bills_coverage(
-    transactions: List[FinancialTransaction],
+    window: FinancialWindow,
     onboarding_data: Dict[str, Any],
     has_statements: bool,
     bills: List[RecurringBill],
@@ -305,7 +266,7 @@ def _compute_bills_coverage(
 
 
 def _compute_discretionary_control(
-    transactions: List[FinancialTransaction],
+    window: FinancialWindow,
     onboarding_data: Dict[str, Any],
     has_statements: bool,
     bills: List[RecurringBill],
@@ -318,7 +279,7 @@ def _compute_discretionary_control(
         inc = float(onboarding_data.get("monthly_income", 0) or 1)
 
         if has_statements:
-            total_out = abs(sum([t.amount for t in transactions if t.amount < 0]))
+            total_out = window.expense_total
             bill_total = sum([b.amount for b in bills])
             disc_spend = (total_out / 3) - bill_total  # Estimated monthly
         else:
@@ -336,7 +297,7 @@ def _compute_discretionary_control(
 
 
 def _compute_savings_rate(
-    transactions: List[FinancialTransaction],
+    window: FinancialWindow,
     onboarding_data: Dict[str, Any],
     has_statements: bool,
 ) -> float:
@@ -347,8 +308,8 @@ def _compute_savings_rate(
         sav = float(onboarding_data.get("monthly_savings", 0) or 0)
 
         if has_statements:
-            total_inc = sum([t.amount for t in transactions if t.amount > 0])
-            total_out = abs(sum([t.amount for t in transactions if t.amount < 0]))
+            total_inc = window.income_total
+            total_out = window.expense_total
             calc_sav = (total_inc - total_out) / 3
             if calc_sav > sav:
                 sav = calc_sav
@@ -362,7 +323,7 @@ def _compute_savings_rate(
 
 
 def _compute_emergency_buffer(
-    transactions: List[FinancialTransaction],
+    window: FinancialWindow,
     onboarding_data: Dict[str, Any],
     has_statements: bool,
     liquid_cash: float = 0,
@@ -397,7 +358,7 @@ def _compute_emergency_buffer(
 
 
 def _compute_debt_load(
-    transactions: List[FinancialTransaction],
+    window: FinancialWindow,
     onboarding_data: Dict[str, Any],
     has_statements: bool,
 ) -> float:
@@ -417,7 +378,7 @@ def _compute_debt_load(
 
 
 def _compute_networth_momentum(
-    transactions: List[FinancialTransaction],
+    window: FinancialWindow,
     onboarding_data: Dict[str, Any],
     has_statements: bool,
 ) -> float:
@@ -438,7 +399,7 @@ def _compute_networth_momentum(
 
 
 def _compute_investment_health(
-    transactions: List[FinancialTransaction],
+    window: FinancialWindow,
     onboarding_data: Dict[str, Any],
     has_statements: bool,
 ) -> float:
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 
@@ -13,7 +14,7 @@ import core.config
 import google.generativeai as genai
 import logging
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import Any, AsyncIterator, Dict, List
 from services.connection_service import ConnectionService
 from services.finance_service import FinanceService
 from services.integrations.uber_service import UberService
@@ -61,6 +62,13 @@ class GeminiService:
 
         self.calendar_service = GoogleCalendarService(db=self.db)
 
+    @property
+    def llm_client(self):
+        """Gateway client for self.model (shares the process-wide LLM limits)."""
+        from services.intelligence.llm_gateway import get_llm_gateway
+
+        return get_llm_gateway().client(self.model, tier=1)
+
     def get_connections(self, user_id: str) -> List[Dict[str, str]]:
         """
         Get a list of connected services for the current user.
@@ -85,10 +93,7 @@ class GeminiService:
 
             return MockResponse()
 
-        # Ensure we don't block event loop
-        import asyncio
-
-        return await asyncio.to_thread(self.model.generate_content, prompt, **kwargs)
+        return await self.llm_client.generate(prompt, **kwargs)
 
     async def get_ride_estimates(
         self, start_address: str, end_address: str
@@ -252,10 +257,7 @@ class GeminiService:
             return {"intent": "general_conversation", "original_text": text}
 
         try:
-            import asyncio
-
-            response = await asyncio.to_thread(
-                self.model.generate_content,
+            response = await self.llm_client.generate(
                 prompt.format(text=text, history=history_text),
                 generation_config={"response_mime_type": "application/json"},
             )
@@ -1086,8 +1088,6 @@ class GeminiService:
         """
 
         try:
-            import asyncio
-
             response = await self._generate_content_safe(prompt)
             advice = response.text.strip()
 
@@ -1501,37 +1501,88 @@ class GeminiService:
             logger.error(f"Audit Log Failed: {e}")
             self.db.rollback()
 
-    async def generate_response(
+    async def stream_response(
         self, history: List[Dict[str, str]], context: Dict[str, Any]
-    ) -> str:
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Generate response using the HELM Intelligence Pipeline.
-
-        Primary path: IntelligencePipeline (7-stage deterministic-probabilistic).
-        Fallback path: Legacy monolithic code (preserved for safety).
+        Streaming counterpart of generate_response.
 
-        Set USE_LEGACY_PIPELINE=true in env to force legacy path.
+        Yields {"event", "data", "elapsed_ms"} dicts from
+        IntelligencePipeline.process_stream(). The last event is always
+        "final", whose data has the same shape as generate_response's JSON.
+        Governance denials, orchestrator answers and the legacy path are
+        not streamed: they produce a single "final" event.
         """
         import os
 
-        logger.info("generate_response called (HELM Intelligence Pipeline)")
+        if os.getenv("USE_LEGACY_PIPELINE", "false").lower() == "true":
+            payload = await self.generate_response(history, context)
+            yield {"event": "final", "data": json.loads(payload), "elapsed_ms": 0.0}
+            return
 
-        # Extract user info
         user_id = context.get("user_id", "user-123")
-        last_message = ""
-        if history:
-            last_message = (
-                history[-1].get("content", "")
-                if isinstance(history[-1], dict)
-                else str(history[-1])
+        last_message = self._last_message(history)
+
+        blocked, last_message = self._governance_gate(user_id, last_message, history)
+        if blocked is None:
+            blocked = await self._try_orchestrator(
+                last_message, user_id, context, history
             )
-        else:
-            last_message = "Hello"
+        if blocked is not None:
+            yield {"event": "final", "data": blocked, "elapsed_ms": 0.0}
+            return
+
+        from services.intelligence.schemas import PipelineResult
+
+        try:
+            pipeline = self._build_pipeline()
+        except Exception as e:
+            logger.error("Intelligence Pipeline unavailable: %s", e, exc_info=True)
+            yield {
+                "event": "final",
+                "data": {
+                    "type": "error",
+                    "text": "I encountered an issue processing your request.",
+                    "usage": {"input_tokens": 0, "output_tokens": 0},
+                },
+                "elapsed_ms": 0.0,
+            }
+            return
+
+        async for event in pipeline.process_stream(
+            raw_input=last_message,
+            user_id=user_id,
+            session_metadata=self._pipeline_session_metadata(context, history),
+        ):
+            data = event.data
+            if event.event == "final":
+                result = PipelineResult.model_validate(data)
+                data = self._format_pipeline_result(result)
+                data["pipeline"]["time_to_first_byte_ms"] = round(
+                    result.trace.timings.time_to_first_byte_ms, 2
+                )
+            yield {"event": event.event, "data": data, "elapsed_ms": event.elapsed_ms}
+
+    @staticmethod
+    def _last_message(history: List[Dict[str, str]]) -> str:
+        """Text of the newest history entry ("Hello" for an empty history)."""
+        if not history:
+            return "Hello"
+        last = history[-1]
+        return last.get("content", "") if isinstance(last, dict) else str(last)
+
+    def _governance_gate(
+        self, user_id: str, last_message: str, history: List[Dict[str, str]]
+    ):
+        """
+        Responsible-AI governance gate (flag-gated; no-op when disabled).
+
+        Consent is required ONLY for requests that analyze the user's financial
+        data — a greeting or a non-financial question is not gated. PII is
+        redacted from all inbound content before it can reach an LLM.
 
-        # --- Responsible-AI governance gate (flag-gated; no-op when disabled) ---
-        # Consent is required ONLY for requests that analyze the user's financial
-        # data — a greeting or a non-financial question is not gated. PII is
-        # redacted from all inbound content before it can reach an LLM.
+        Returns (consent_required payload or None, possibly-redacted message).
+        """
         try:
             from services import governance_bridge as _gov
 
@@ -1544,12 +1595,13 @@ class GeminiService:
                         "DENY",
                         "No consent for financial analysis.",
                     )
-                    return json.dumps(
+                    return (
                         {
                             "type": "consent_required",
                             "text": _gov.consent_required_message(),
                             "usage": {"input_tokens": 0, "output_tokens": 0},
-                        }
+                        },
+                        last_message,
                     )
                 last_message = _gov.redact(last_message)
                 for _m in history or []:
@@ -1564,8 +1616,18 @@ class GeminiService:
                     )
         except Exception as _ge:
             logger.error(f"[GOV] governance gate error (continuing): {_ge}")
+        return None, last_message
+
+    async def _try_orchestrator(
+        self,
+        last_message: str,
+        user_id: str,
+        context: Dict[str, Any],
+        history: List[Dict[str, str]],
+    ):
+        """Tool-first Orchestrator; returns a response payload or None."""
+        import os
 
-        # --- ORCHESTRATOR LAYER INJECTION (Tool-first, LLM-last) ---
         try:
             use_legacy = os.getenv("USE_LEGACY_PIPELINE", "false").lower() == "true"
             if use_legacy:
@@ -1592,7 +1654,7 @@ class GeminiService:
                 )
                 import uuid as _uuid
 
-                response_data = {
+                return {
                     "type": "orchestrated_response",
                     "text": human_answer,
                     "data": metadata.get("options", {}),
@@ -1602,7 +1664,6 @@ class GeminiService:
                         "execution_id": "orchestrator-" + str(_uuid.uuid4()),
                     },
                 }
-                return json.dumps(response_data)
             else:
                 logger.info(
                     f"[ORCH] Not handled (is_orchestrator={metadata.get('is_orchestrator')}). Falling through to pipeline."
@@ -1613,60 +1674,97 @@ class GeminiService:
                 exc_info=True,
             )
             # fallback to standard AI pipeline
+        return None
+
+    def _build_pipeline(self):
+        """IntelligencePipeline wired to this service's model."""
+        from services.intelligence.pipeline import IntelligencePipeline
+
+        return IntelligencePipeline(
+            db=self.db,
+            llm_model=self.model,
+            heavy_llm_model=self.model,  # Same model for now; Phase 2 splits
+            llm_api_key=settings.GEMINI_API_KEY,
+        )
+
+    @staticmethod
+    def _pipeline_session_metadata(
+        context: Dict[str, Any], history: List[Dict[str, str]]
+    ) -> Dict[str, Any]:
+        return {
+            "session_id": context.get("session_id"),
+            "conversation_history": history,
+            "device_type": context.get("device_type"),
+            "locale": context.get("locale", "en"),
+            # Browser-provided coordinates for location-aware intents
+            # (e.g. local_search). None when the client didn't share it.
+            "location": context.get("location"),
+        }
+
+    @staticmethod
+    def _format_pipeline_result(result) -> Dict[str, Any]:
+        """Format a PipelineResult for existing chat route compatibility."""
+        return {
+            "type": result.response.response_type,
+            "text": result.response.text,
+            "data": result.response.data,
+            "usage": {
+                "input_tokens": result.trace.total_input_tokens,
+                "output_tokens": result.trace.total_output_tokens,
+            },
+            "pipeline": {
+                "tier": result.tier,
+                "execution_id": result.trace.execution_id,
+            },
+        }
+
+    async def generate_response(
+        self, history: List[Dict[str, str]], context: Dict[str, Any]
+    ) -> str:
+        """
+        Generate response using the HELM Intelligence Pipeline.
+
+        Primary path: IntelligencePipeline (7-stage deterministic-probabilistic).
+        Fallback path: Legacy monolithic code (preserved for safety).
+
+        Set USE_LEGACY_PIPELINE=true in env to force legacy path.
+        """
+        import os
+
+        logger.info("generate_response called (HELM Intelligence Pipeline)")
+
+        # Extract user info
+        user_id = context.get("user_id", "user-123")
+        last_message = self._last_message(history)
+
+        blocked, last_message = self._governance_gate(user_id, last_message, history)
+        if blocked is not None:
+            return json.dumps(blocked)
+
+        # --- ORCHESTRATOR LAYER INJECTION (Tool-first, LLM-last) ---
+        orchestrated = await self._try_orchestrator(
+            last_message, user_id, context, history
+        )
+        if orchestrated is not None:
+            return json.dumps(orchestrated)
 
         # --- Pipeline Path (Primary) ---
         use_legacy = os.getenv("USE_LEGACY_PIPELINE", "false").lower() == "true"
         if not use_legacy:
             try:
-                from services.intelligence.pipeline import IntelligencePipeline
-
-                # Build session metadata
-                session_metadata = {
-                    "session_id": context.get("session_id"),
-                    "conversation_history": history,
-                    "device_type": context.get("device_type"),
-                    "locale": context.get("locale", "en"),
-                    # Browser-provided coordinates for location-aware intents
-                    # (e.g. local_search). None when the client didn't share it.
-                    "location": context.get("location"),
-                }
-
-                # Instantiate pipeline with current models
-                pipeline = IntelligencePipeline(
-                    db=self.db,
-                    llm_model=self.model,
-                    heavy_llm_model=self.model,  # Same model for now; Phase 2 splits
-                    llm_api_key=settings.GEMINI_API_KEY,
-                )
-
                 # Process through 7-stage pipeline
-                result = await pipeline.process(
+                result = await self._build_pipeline().process(
                     raw_input=last_message,
                     user_id=user_id,
-                    session_metadata=session_metadata,
+                    session_metadata=self._pipeline_session_metadata(context, history),
                 )
 
-                # Format response for existing chat route compatibility
-                response_data = {
-                    "type": result.response.response_type,
-                    "text": result.response.text,
-                    "data": result.response.data,
-                    "usage": {
-                        "input_tokens": result.trace.total_input_tokens,
-                        "output_tokens": result.trace.total_output_tokens,
-                    },
-                    "pipeline": {
-                        "tier": result.tier,
-                        "execution_id": result.trace.execution_id,
-                    },
-                }
-
                 logger.info(
                     "Pipeline response: tier=%d, execution_id=%s",
                     result.tier,
                     result.trace.execution_id,
                 )
-                return json.dumps(response_data)
+                return json.dumps(self._format_pipeline_result(result))
 
             except Exception as e:
                 logger.error(
@@ -1751,8 +1849,6 @@ class GeminiService:
                 """
 
                 # 3. Call LLM
-                import asyncio
-
                 response = await self._generate_content_safe(analyst_prompt)
 
                 # Log for monitoring
@@ -2002,8 +2098,6 @@ Your goal is to *actively* optimize the user's life by balancing **Current Metri
                 self._log_interaction(user_id, intent_data, final_response, viv_context)
                 return json.dumps(final_response)
 
-            import asyncio
-
             response = await self._generate_content_safe(
                 prompt, generation_config={"response_mime_type": "application/json"}
             )
@@ -2137,16 +2231,12 @@ Your goal is to *actively* optimize the user's life by balancing **Current Metri
 
             logger.debug("DEBUG: Calling Gemini generate_content (async)...")
 
-            # Use a simpler timeout approach - just return mock data if it takes too long
-            # This is a temporary workaround until we can properly cancel the Gemini API call
+            # Return mock data if it takes too long; the gateway cancels the call
             try:
-                response = await asyncio.wait_for(
-                    asyncio.to_thread(
-                        self.model.generate_content,
-                        content_parts,
-                        generation_config={"response_mime_type": "application/json"},
-                    ),
+                response = await self.llm_client.generate(
+                    content_parts,
                     timeout=30.0,
+                    generation_config={"response_mime_type": "application/json"},
                 )
 
                 logger.debug("DEBUG: Gemini response received")
@@ -22,7 +22,7 @@ import re
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import core.config
 
@@ -122,8 +122,12 @@ def _components():
 
     st.create_all(engine)  # idempotent; provisions rai_* tables
 
-    consent = ConsentService(st.SqlConsentStore(engine))
-    decisions = st.SqlDecisionLog(engine)
+    settings = core.config.get_settings()
+    # A dedicated key: unset means no checkpoints (every run is a full one).
+    checkpoint_key = settings.RAI_CHECKPOINT_KEY or None
+    consent_store = st.SqlConsentStore(engine, checkpoint_key=checkpoint_key)
+    consent = ConsentService(consent_store)
+    decisions = st.SqlDecisionLog(engine, checkpoint_key=checkpoint_key)
     policy = ExecutionPolicy(
         PolicyConfig(
             actions={
@@ -131,7 +135,7 @@ def _components():
                 "ai_advisory": ActionPolicy(
                     risk_class=RiskClass.LOW,
                     requires_consent=True,
-                    consent_purpose=core.config.get_settings().RAI_CONSENT_PURPOSE,
+                    consent_purpose=settings.RAI_CONSENT_PURPOSE,
                 ),
             }
         ),
@@ -141,6 +145,7 @@ def _components():
     )
     return {
         "consent": consent,
+        "consent_store": consent_store,
         "decisions": decisions,
         "redactor": PIIRedactor(),
         "policy": policy,
@@ -261,6 +266,43 @@ def decision_activity(user_id: str, limit: int = 20) -> list:
         return []
 
 
+def verify_logs(
+    full: bool = False,
+    workers: int = 1,
+    progress: Optional[Callable[[int], None]] = None,
+) -> dict:
+    """
+    Verify the consent and decision hash chains (admin / background job).
+
+    Resumes from each log's signed checkpoint unless ``full``. Raises when
+    governance is off; a tampered log is reported, not raised.
+    """
+    if not enabled():
+        raise RuntimeError("Responsible-AI governance is disabled")
+    comps = _components()
+    stores = [("consent", comps["consent_store"]), ("decisions", comps["decisions"])]
+    reports = {}
+    for i, (name, store) in enumerate(stores):
+
+        def step(pct: int, i: int = i) -> None:
+            if progress is not None:
+                progress((100 * i + pct) // len(stores))
+
+        reports[name] = store.verify(full=full, workers=workers, progress=step)
+    return {"ok": all(r["ok"] for r in reports.values()), "logs": reports}
+
+
+def verification_status() -> dict:
+    """Each log's latest checkpoint (what the next incremental run resumes from)."""
+    if not enabled():
+        return {}
+    comps = _components()
+    return {
+        "consent": comps["consent_store"].latest_checkpoint(),
+        "decisions": comps["decisions"].latest_checkpoint(),
+    }
+
+
 def consent_required_message(purpose: Optional[str] = None) -> str:
     return (
         "To answer questions about your finances, I need your consent to "
@@ -0,0 +1,260 @@
+"""
+History Service — keyset-paginated unified timeline.
+
+Merges transactions, Viv logs and daily health summaries into one timeline
+ordered by (timestamp, type, id), newest first.
+
+Each source is read with its own ordered, index-backed query that seeks
+past the cursor and fetches at most `limit + 1` rows; the per-source
+streams are then k-way merged. Page cost depends only on the page size,
+not on how deep the user has scrolled.
+
+Cursors are opaque (urlsafe base64 of the last item's timestamp, type and
+id). Type filters select sources; date range and text search are applied
+in SQL.
+"""
+
+import base64
+import heapq
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+from sqlalchemy import String, and_, cast, func, literal, or_
+from sqlalchemy.orm import Session
+
+from models.models import FinancialTransaction, HealthDailySummary, VivLog
+
+# Health summaries are dated; they sit at noon on the timeline
+HEALTH_TIME_OF_DAY = timedelta(hours=12)
+
+TIMELINE_TYPES = ("transaction", "viv_log", "health")
+
+# (timestamp, type, id) of a timeline item
+TimelineKey = Tuple[datetime, str, str]
+
+
+class InvalidCursorError(ValueError):
+    """The cursor was not produced by this service."""
+
+
+@dataclass
+class TimelineEntry:
+    """One timeline item: its sort key and the ORM row behind it."""
+
+    timestamp: datetime
+    type: str
+    id: str
+    row: Any
+
+    @property
+    def key(self) -> TimelineKey:
+        return (self.timestamp, self.type, self.id)
+
+
+@dataclass
+class TimelinePage:
+    entries: List[TimelineEntry] = field(default_factory=list)
+    has_more: bool = False
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(key: TimelineKey) -> str:
+    ts, kind, item_id = key
+    raw = json.dumps([ts.isoformat(), kind, item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> TimelineKey:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        ts, kind, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(ts), str(kind), str(item_id)
+    except Exception as e:
+        raise InvalidCursorError("Invalid history cursor") from e
+
+
+def _like(query: str) -> str:
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class HistoryService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_timeline(
+        self,
+        user_id: str,
+        types: Optional[Iterable[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        search: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> TimelinePage:
+        """
+        Return one page of the user's timeline, newest first.
+
+        Raises InvalidCursorError for a malformed cursor.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        wanted = set(types or ()) or set(TIMELINE_TYPES)
+        search = (search or "").strip() or None
+
+        sources: List[Callable[..., List[TimelineEntry]]] = []
+        if "transaction" in wanted:
+            sources.append(self._transactions)
+        if "viv_log" in wanted:
+            sources.append(self._viv_logs)
+        if "health" in wanted:
+            sources.append(self._health_summaries)
+
+        streams = [
+            source(user_id, start, end, search, limit + 1, after) for source in sources
+        ]
+        merged = heapq.merge(*streams, key=lambda e: e.key, reverse=True)
+
+        entries: List[TimelineEntry] = []
+        has_more = False
+        for entry in merged:
+            if len(entries) == limit:
+                has_more = True
+                break
+            entries.append(entry)
+
+        return TimelinePage(
+            entries=entries,
+            has_more=has_more,
+            next_cursor=encode_cursor(entries[-1].key) if has_more else None,
+        )
+
+    # ------------------------------------------------------------------
+    # Sources — each returns up to `limit` entries ordered by key, desc
+    # ------------------------------------------------------------------
+
+    def _transactions(self, user_id, start, end, search, limit, after):
+        ts_col = FinancialTransaction.transaction_date
+        query = self.db.query(FinancialTransaction).filter(
+            FinancialTransaction.user_id == user_id
+        )
+        if start:
+            query = query.filter(ts_col >= start)
+        if end:
+            query = query.filter(ts_col <= end)
+        if search:
+            pattern = _like(search)
+            query = query.filter(
+                or_(
+                    func.coalesce(
+                        FinancialTransaction.merchant_name, "Transaction"
+                    ).ilike(pattern, escape="\\"),
+                    FinancialTransaction.category_primary.ilike(pattern, escape="\\"),
+                )
+            )
+        if after:
+            query = query.filter(
+                self._before(ts_col, FinancialTransaction.id, "transaction", after)
+            )
+        rows = (
+            query.order_by(ts_col.desc(), FinancialTransaction.id.desc())
+            .limit(limit)
+            .all()
+        )
+        return [TimelineEntry(r.transaction_date, "transaction", r.id, r) for r in rows]
+
+    def _viv_logs(self, user_id, start, end, search, limit, after):
+        ts_col = VivLog.timestamp
+        query = self.db.query(VivLog).filter(VivLog.user_id == user_id)
+        if start:
+            query = query.filter(ts_col >= start)
+        if end:
+            query = query.filter(ts_col <= end)
+        if search:
+            pattern = _like(search)
+            query = query.filter(
+                or_(
+                    func.coalesce(VivLog.user_intent, "Viv Activity").ilike(
+                        pattern, escape="\\"
+                    ),
+                    # Subtitle: first 50 chars of the logic, or "AI Decision"
+                    func.coalesce(
+                        func.substr(VivLog.decision_logic, 1, 50), "AI Decision"
+                    ).ilike(pattern, escape="\\"),
+                )
+            )
+        if after:
+            query = query.filter(self._before(ts_col, VivLog.id, "viv_log", after))
+        rows = query.order_by(ts_col.desc(), VivLog.id.desc()).limit(limit).all()
+        return [TimelineEntry(r.timestamp, "viv_log", r.id, r) for r in rows]
+
+    def _health_summaries(self, user_id, start, end, search, limit, after):
+        day = HealthDailySummary.date
+        query = self.db.query(HealthDailySummary).filter(
+            HealthDailySummary.user_id == user_id
+        )
+        if start:
+            query = query.filter(day >= start.date())
+        if end:
+            query = query.filter(day <= end.date())
+        if search and search.lower() not in "daily health summary":
+            subtitle = (
+                literal("Sleep: ")
+                + cast(func.coalesce(HealthDailySummary.sleep_quality_score, 0), String)
+                + literal("% | Steps: ")
+                + cast(func.coalesce(HealthDailySummary.steps_count, 0), String)
+            )
+            query = query.filter(subtitle.ilike(_like(search), escape="\\"))
+        if after:
+            query = query.filter(self._health_before(after))
+        rows = (
+            query.order_by(day.desc(), HealthDailySummary.id.desc()).limit(limit).all()
+        )
+        return [
+            TimelineEntry(
+                datetime.combine(r.date, time.min) + HEALTH_TIME_OF_DAY,
+                "health",
+                str(r.id),
+                r,
+            )
+            for r in rows
+        ]
+
+    # ------------------------------------------------------------------
+    # Keyset predicates
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _before(ts_col, id_col, kind: str, after: TimelineKey):
+        """
+        SQL for (ts, kind, id) < after, with kind constant for the source.
+
+        Kept as plain ts/id comparisons so the (user_id, ts, id) index
+        serves the seek.
+        """
+        after_ts, after_kind, after_id = after
+        if kind < after_kind:
+            return ts_col <= after_ts
+        if kind > after_kind:
+            return ts_col < after_ts
+        return or_(ts_col < after_ts, and_(ts_col == after_ts, id_col < after_id))
+
+    @classmethod
+    def _health_before(cls, after: TimelineKey):
+        """_before for health rows, whose timestamp is date + HEALTH_TIME_OF_DAY."""
+        after_ts, after_kind, after_id = after
+        pivot = after_ts - HEALTH_TIME_OF_DAY
+        day = HealthDailySummary.date
+        if pivot.time() != time.min:
+            # No health row sits exactly at after_ts
+            return day <= pivot.date()
+        pivot_day: date = pivot.date()
+        if "health" < after_kind:
+            return day <= pivot_day
+        if "health" > after_kind:
+            return day < pivot_day
+        return or_(
+            day < pivot_day,
+            and_(day == pivot_day, HealthDailySummary.id < after_id),
+        )
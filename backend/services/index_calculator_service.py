@@ -16,10 +16,10 @@ from models.models import (
     User,
     VivIndex,
     FinancialAccount,
-    FinancialTransaction,
     HealthDailySummary,
     VivLog,
 )
+from services.financial_aggregates import get_window
 
 logger = logging.getLogger(__name__)
 
@@ -57,20 +57,12 @@ def calculate_financial_wellbeing_index(user_id: str, db: Session) -> Dict[str,
             if str(acc.account_type).lower() in ["credit", "loan", "liability"]
         )
 
-        # 2. Fetch Transactions (Flow)
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        transactions = (
-            db.query(FinancialTransaction)
-            .filter(
-                FinancialTransaction.user_id == user_id,
-                FinancialTransaction.transaction_date >= thirty_days_ago,
-            )
-            .all()
-        )
+        # 2. Transaction flow over the last 30 days (daily aggregates)
+        window = get_window(db, user_id, days=30)
 
         # Income vs Expenses
-        income = sum(t.amount for t in transactions if t.amount > 0)
-        expenses = sum(abs(t.amount) for t in transactions if t.amount < 0)
+        income = window.income_total
+        expenses = window.expense_total
 
         if income <= 1.0:  # Prevent division by near-zero or zero
             return {"value": 50.0, "confidence": 0.1}
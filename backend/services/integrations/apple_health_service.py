@@ -6,7 +6,6 @@ Implements secure JWT generation, token lifecycle management, and
 controlled data simulation for development.
 """
 
-import httpx
 import logging
 import jwt
 import json
@@ -19,6 +18,7 @@ from urllib.parse import urlencode
 from sqlalchemy.orm import Session
 from models.models import Connection, HealthDataSample
 import core.config
+from core.http_client import http_client
 from services.connection_service import ConnectionService
 from services.audit_service import AuditService
 
@@ -53,7 +53,6 @@ class AppleHealthService:
         self.private_key = self.settings.APPLE_PRIVATE_KEY
 
         self.redirect_uri = self.settings.APP_BASE_URL + "/health/apple/callback"
-        self.timeout = httpx.Timeout(15.0)
 
     def get_auth_url(self, state: str) -> str:
         """
@@ -117,7 +116,7 @@ class AppleHealthService:
                     "redirect_uri": self.redirect_uri,
                 }
 
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
+                async with http_client("apple_health") as client:
                     response = await client.post(self.TOKEN_URL, data=payload)
                     response.raise_for_status()
                     data = response.json()
@@ -9,11 +9,14 @@ and normalized data ingestion.
 import httpx
 import logging
 import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
 import core.config
+from core.http_client import get_http_client
 from typing import Dict, Any, List, Optional
 from urllib.parse import urlencode, quote
 
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
 from models.models import Connection, HealthDataSample
 from services.connection_service import ConnectionService
@@ -42,10 +45,11 @@ class GoogleFitService:
         "https://www.googleapis.com/auth/fitness.heart_rate.read",
     ]
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, client: Optional[httpx.AsyncClient] = None):
         self.db = db
         self.settings = core.config.get_settings()
         self.connection_service = ConnectionService(db)
+        self.client_id = self.settings.GOOGLE_CLIENT_ID
         self.client_secret = self.settings.GOOGLE_CLIENT_SECRET
 
         # In production, this should be the public URL of the platform
@@ -55,9 +59,13 @@ class GoogleFitService:
             else "http://localhost:3000/health/google/callback"
         )
 
-        # Shared httpx client configuration
-        self.timeout = httpx.Timeout(15.0, connect=5.0)
-        self.retry_count = 3
+        # Requests go through the shared pooled "google" client
+        # (core/http_client.py) unless a client is injected
+        self.client = client
+
+    @asynccontextmanager
+    async def _http(self):
+        yield self.client or get_http_client("google")
 
     def get_auth_url(self, state: str) -> str:
         """
@@ -93,7 +101,7 @@ class GoogleFitService:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self._http() as client:
                 response = await client.post(self.TOKEN_URL, data=payload)
                 response.raise_for_status()
                 data = response.json()
@@ -179,7 +187,7 @@ class GoogleFitService:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self._http() as client:
                 response = await client.post(self.TOKEN_URL, data=payload)
                 response.raise_for_status()
                 data = response.json()
@@ -236,6 +244,18 @@ class GoogleFitService:
             hour=0, minute=0, second=0, microsecond=0
         )
 
+        try:
+            buckets = await self.fetch_buckets(token, start_time, end_time)
+            await self._process_aggregated_data(user_id, buckets)
+
+        except Exception as e:
+            logger.error(f"Sync failed for user {user_id}: {e}")
+            raise RuntimeError("Cloud sync temporarily unavailable.")
+
+    async def fetch_buckets(
+        self, token: str, start_time: datetime, end_time: datetime
+    ) -> List[Dict]:
+        """Daily aggregate buckets for [start_time, end_time]."""
         # Data aggregation request (Daily Buckets)
         body = {
             "aggregateBy": [
@@ -252,25 +272,26 @@ class GoogleFitService:
 
         headers = {"Authorization": f"Bearer {token}"}
 
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.API_BASE}/dataset:aggregate", headers=headers, json=body
-                )
-                response.raise_for_status()
-                data = response.json()
-
-            await self._process_aggregated_data(user_id, data.get("bucket", []))
-
-        except Exception as e:
-            logger.error(f"Sync failed for user {user_id}: {e}")
-            raise RuntimeError("Cloud sync temporarily unavailable.")
+        async with self._http() as client:
+            response = await client.post(
+                f"{self.API_BASE}/dataset:aggregate", headers=headers, json=body
+            )
+            response.raise_for_status()
+            return response.json().get("bucket", [])
 
     async def _process_aggregated_data(self, user_id: str, buckets: List[Dict]):
+        """Upsert the buckets' daily samples for user_id and commit."""
+        self.store_samples(user_id, self.aggregate_buckets(buckets))
+        self.db.commit()
+        logger.info(f"Successfully synced {len(buckets)} days for {user_id}")
+
+    @staticmethod
+    def aggregate_buckets(buckets: List[Dict]) -> List[Dict[str, Any]]:
         """
         Parses Google's complex binned dataset structure into flat daily samples.
         Normalizes timestamps to avoid date duplication.
         """
+        samples = []
         for bucket in buckets:
             # Normalize to the START of the day in UTC
             bucket_start_ms = int(bucket["startTimeMillis"])
@@ -278,7 +299,6 @@ class GoogleFitService:
                 bucket_start_ms / 1000, tz=timezone.utc
             ).date()
 
-            # Prepare an upsert object
             daily_metrics = {
                 "steps": 0,
                 "calories": 0.0,
@@ -315,44 +335,51 @@ class GoogleFitService:
                 else 0
             )
 
-            # Atomic Upsert logic bounded by User + Date + Source
             # Normalizing to DateTime for the model while keeping 'date' semantic
-            dt_day = datetime.combine(
-                date_normalized, datetime.min.time(), tzinfo=timezone.utc
+            samples.append(
+                {
+                    "date": datetime.combine(
+                        date_normalized, datetime.min.time(), tzinfo=timezone.utc
+                    ),
+                    "steps": daily_metrics["steps"],
+                    "calories_kcal": round(daily_metrics["calories"], 2),
+                    "distance_m": round(daily_metrics["distance"], 2),
+                    "active_minutes": daily_metrics["active_mins"],
+                    "avg_hr_bpm": int(avg_hr),
+                }
             )
+        return samples
 
-            existing = (
-                self.db.query(HealthDataSample)
-                .filter(
-                    HealthDataSample.user_id == user_id,
-                    HealthDataSample.source == self.PROVIDER,
-                    HealthDataSample.date == dt_day,
-                )
-                .first()
+    def store_samples(self, user_id: str, samples: List[Dict[str, Any]]) -> int:
+        """
+        Bulk upsert daily samples keyed by User + Date + Source: one query
+        finds the existing days, then one executemany UPDATE and one
+        executemany INSERT. Does not commit.
+        """
+        if not samples:
+            return 0
+        existing = dict(
+            self.db.query(HealthDataSample.date, HealthDataSample.id).filter(
+                HealthDataSample.user_id == user_id,
+                HealthDataSample.source == self.PROVIDER,
+                HealthDataSample.date.in_([s["date"] for s in samples]),
             )
-
-            if existing:
-                existing.steps = daily_metrics["steps"]
-                existing.calories_kcal = round(daily_metrics["calories"], 2)
-                existing.distance_m = round(daily_metrics["distance"], 2)
-                existing.active_minutes = daily_metrics["active_mins"]
-                existing.avg_hr_bpm = int(avg_hr)
-                existing.updated_at = datetime.now(timezone.utc)
+        )
+        # Stored datetimes may come back naive (SQLite): match on the UTC day
+        existing = {day.date(): sample_id for day, sample_id in existing.items()}
+
+        updates, inserts = [], []
+        for sample in samples:
+            sample_id = existing.get(sample["date"].date())
+            if sample_id:
+                updates.append({"id": sample_id, **sample})
             else:
-                new_sample = HealthDataSample(
-                    user_id=user_id,
-                    source=self.PROVIDER,
-                    date=dt_day,
-                    steps=daily_metrics["steps"],
-                    calories_kcal=round(daily_metrics["calories"], 2),
-                    distance_m=round(daily_metrics["distance"], 2),
-                    active_minutes=daily_metrics["active_mins"],
-                    avg_hr_bpm=int(avg_hr),
-                )
-                self.db.add(new_sample)
-
-        self.db.commit()
-        logger.info(f"Successfully synced {len(buckets)} days for {user_id}")
+                inserts.append({"user_id": user_id, "source": self.PROVIDER, **sample})
+        if updates:
+            self.db.execute(update(HealthDataSample), updates)
+        if inserts:
+            self.db.execute(insert(HealthDataSample), inserts)
+        return len(samples)
 
 
 import json
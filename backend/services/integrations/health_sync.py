@@ -0,0 +1,179 @@
+"""
+Health Sync — scheduled fan-out sync of connected Google Fit accounts.
+
+The scheduler used to walk every connection serially in one executor thread
+and always fetch the last day. HealthSyncOrchestrator instead:
+
+    connected google_fit ids ──► asyncio.Queue ──► N workers (concurrency)
+                                                   │  shared "google" client
+                                                   ▼
+                             fetch since high-water mark ──► bulk upsert
+
+High-water mark: after a successful sync the fetch end time is stored in
+the connection's metadata_json ("sync_high_water"). The next run fetches
+from the start of that UTC day (the last daily bucket was partial), so only
+new data is requested; a first sync backfills HEALTH_SYNC_BACKFILL_DAYS.
+A failed connection keeps its mark and catches up on the next run.
+
+Each run returns its metrics (throughput, data lag before the sync) and the
+scheduler records them as the result of a "health_sync" BackgroundJob.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+import core.config
+from core.http_client import get_http_client
+from models.models import Connection
+
+logger = logging.getLogger(__name__)
+
+PROVIDER = "google_fit"
+CURSOR_KEY = "sync_high_water"
+
+# Upper bound on one fetch window (also GoogleFitService's safety bound)
+MAX_WINDOW_DAYS = 60
+
+
+def sync_window(
+    metadata: Dict[str, Any], now: datetime, backfill_days: int
+) -> Tuple[datetime, Optional[datetime]]:
+    """(fetch start, previous high-water mark or None on a first sync)."""
+    cursor = metadata.get(CURSOR_KEY)
+    high_water = datetime.fromisoformat(cursor) if cursor else None
+    start = high_water or now - timedelta(days=backfill_days)
+    start = max(start, now - timedelta(days=MAX_WINDOW_DAYS))
+    return start.replace(hour=0, minute=0, second=0, microsecond=0), high_water
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct * len(ordered)))]
+
+
+class HealthSyncOrchestrator:
+    """One sync run over every connected Google Fit account."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Any]] = None,
+        concurrency: Optional[int] = None,
+        backfill_days: Optional[int] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        settings = core.config.get_settings()
+        self._session_factory = session_factory
+        self.concurrency = concurrency or settings.HEALTH_SYNC_CONCURRENCY
+        self.backfill_days = backfill_days or settings.HEALTH_SYNC_BACKFILL_DAYS
+        self._client = client
+
+    async def run(
+        self, progress: Optional[Callable[[int], None]] = None
+    ) -> Dict[str, Any]:
+        """Sync every connection; returns the run's metrics."""
+        started = time.monotonic()
+        started_at = datetime.now(timezone.utc)
+        connection_ids = await asyncio.to_thread(self._connection_ids)
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for connection_id in connection_ids:
+            queue.put_nowait(connection_id)
+        results: List[Dict[str, Any]] = []
+
+        async def worker(client: httpx.AsyncClient):
+            while not queue.empty():
+                connection_id = queue.get_nowait()
+                results.append(await self._sync_connection(connection_id, client))
+                if progress:
+                    progress(100 * len(results) // len(connection_ids))
+
+        workers = min(self.concurrency, len(connection_ids))
+        client = self._client or get_http_client("google")
+        await asyncio.gather(*(worker(client) for _ in range(workers)))
+
+        stats = self._stats(results, started_at, time.monotonic() - started)
+        logger.info("Health sync run: %s", stats)
+        return stats
+
+    def _connection_ids(self) -> List[str]:
+        with self._new_session() as db:
+            rows = db.query(Connection.id).filter(
+                Connection.provider == PROVIDER, Connection.status == "connected"
+            )
+            return [row.id for row in rows]
+
+    async def _sync_connection(
+        self, connection_id: str, client: httpx.AsyncClient
+    ) -> Dict[str, Any]:
+        """Fetch and store one connection's new data; never raises."""
+        from services.integrations.google_fit_service import GoogleFitService
+
+        db = self._new_session()
+        try:
+            connection = await asyncio.to_thread(db.get, Connection, connection_id)
+            service = GoogleFitService(db, client=client)
+            now = datetime.now(timezone.utc)
+            metadata = json.loads(connection.metadata_json or "{}")
+            start, high_water = sync_window(metadata, now, self.backfill_days)
+
+            token = await service.get_valid_token(connection)
+            buckets = await service.fetch_buckets(token, start, now)
+            samples = service.aggregate_buckets(buckets)
+
+            def store() -> int:
+                written = service.store_samples(connection.user_id, samples)
+                # Re-read: a token refresh may have rewritten the metadata
+                db.refresh(connection)
+                current = json.loads(connection.metadata_json or "{}")
+                current[CURSOR_KEY] = now.isoformat()
+                connection.metadata_json = json.dumps(current)
+                db.commit()
+                return written
+
+            written = await asyncio.to_thread(store)
+            lag = (now - high_water).total_seconds() if high_water else None
+            return {"ok": True, "samples": written, "lag_s": lag}
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Health sync failed for connection {connection_id}: {e}")
+            return {"ok": False, "samples": 0, "lag_s": None}
+        finally:
+            db.close()
+
+    def _stats(
+        self, results: List[Dict[str, Any]], started_at: datetime, elapsed: float
+    ) -> Dict[str, Any]:
+        synced = [r for r in results if r["ok"]]
+        lags = [r["lag_s"] for r in synced if r["lag_s"] is not None]
+        samples = sum(r["samples"] for r in synced)
+        return {
+            "started_at": started_at.isoformat(),
+            "concurrency": self.concurrency,
+            "connections": len(results),
+            "synced": len(synced),
+            "failed": len(results) - len(synced),
+            "backfilled": len(synced) - len(lags),
+            "samples_upserted": samples,
+            "duration_s": round(elapsed, 3),
+            "connections_per_s": round(len(results) / elapsed, 2) if elapsed else 0.0,
+            "samples_per_s": round(samples / elapsed, 2) if elapsed else 0.0,
+            # Data lag: how stale each connection's data was before this run
+            "lag_s": {
+                "p50": round(_percentile(lags, 0.5), 1) if lags else None,
+                "p95": round(_percentile(lags, 0.95), 1) if lags else None,
+                "max": round(max(lags), 1) if lags else None,
+            },
+        }
+
+    def _new_session(self):
+        if self._session_factory is None:
+            from models.database import SessionLocal
+
+            self._session_factory = SessionLocal
+        return self._session_factory()
@@ -8,6 +8,7 @@ Operational implementation using real API and User Context.
 import httpx
 from typing import Optional, Dict, Any, List
 import core.config
+from core.http_client import http_client
 from models.models import Connection
 from sqlalchemy.orm import Session
 from loguru import logger
@@ -100,7 +101,7 @@ class UberService:
             params["end_longitude"] = end_longitude
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_client("uber") as client:
                 response = await client.get(
                     f"{self.BASE_URL}/estimates/price",
                     params=params,
@@ -168,7 +169,7 @@ class UberService:
             return {"error": f"Missing location data: {e}"}
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_client("uber") as client:
                 response = await client.post(
                     f"{self.BASE_URL}/requests",
                     json=payload,
@@ -10,19 +10,43 @@ Three cache namespaces:
     - resp:{template}:{hash}  — Response fragments (5-min TTL)
 
 Uses Redis as primary backend (via REDIS_URL config).
-Falls back to in-memory dict when Redis is unavailable.
+Falls back to an in-memory store when Redis is unavailable, bounded by
+MEMORY_MAX_ENTRIES (LRU) and swept for expired entries every
+MEMORY_SWEEP_S seconds.
+
+Redis layout (v2):
+    helm:ver:{user_id}          — user version counter (INCR on invalidation)
+    helm:ctx:{user_id}          — hash {ver, val}: one key per user, so a
+                                  read pipelines GET ver + HMGET in ONE trip
+    helm:{ns}:{key}             — intent / resp values
+    helm:tags:{user_id}:{ns}    — set of a user's keys in a namespace, so
+                                  invalidation touches only that user's keys
+                                  (no keyspace SCAN)
+
+Values are JSON, zlib-compressed above COMPRESS_MIN_BYTES, with a one-byte
+format marker.
+
+ContextFrames additionally go through the process-wide ContextCache
+(bounded LRU + TTL, single-flight loads), shared by every PipelineCache
+instance — it is the L1 in front of Redis, or the only ctx store without it.
 """
 
 from __future__ import annotations
 
 import hashlib
 import logging
+import os
+import threading
 import time
+import zlib
+from collections import OrderedDict
 from enum import Enum
-from typing import Any, Dict, List, Optional, Type, TypeVar
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Type, TypeVar
 
 from pydantic import BaseModel
 
+from .context_cache import ContextCache, get_context_cache
+
 logger = logging.getLogger("intelligence.cache")
 
 T = TypeVar("T", bound=BaseModel)
@@ -34,6 +58,17 @@ DEFAULT_TTLS = {
     "resp": 300,  # 5 minutes
 }
 
+VERSION_TTL_S = 86400  # 24h TTL on version keys
+
+# In-memory fallback bounds (intent / resp entries; ctx lives in ContextCache)
+MEMORY_MAX_ENTRIES = 10_000
+MEMORY_SWEEP_S = 60
+
+# Values at least this large are zlib-compressed before going to Redis
+COMPRESS_MIN_BYTES = 1024
+_FMT_JSON = b"j"
+_FMT_ZLIB = b"z"
+
 
 # ============================================================================
 # Invalidation Events
@@ -77,24 +112,41 @@ class PipelineCache:
     Unified cache for the HELM pipeline.
 
     Primary: Redis (if available via REDIS_URL).
-    Fallback: In-memory dict with TTL expiry.
+    Fallback: In-memory LRU with TTL expiry (max_memory_entries).
+
+    Context entries are versioned per-user (ctx:{user_id}:{version} in
+    memory, a {ver, val} hash in Redis). Version is incremented on
+    invalidation events to prevent stale reads.
 
-    Cache keys are versioned per-user: ctx:{user_id}:{version}.
-    Version is incremented on invalidation events to prevent stale reads.
+    The 'ctx' namespace is served from the shared ContextCache first.
     """
 
-    def __init__(self, redis_url: Optional[str] = None):
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        context_cache: Optional[ContextCache] = None,
+        redis_client: Any = None,
+        max_memory_entries: int = MEMORY_MAX_ENTRIES,
+    ):
         self._redis = None
-        self._memory_store: Dict[str, tuple] = {}  # key -> (json_str, expiry_ts)
+        self._context = context_cache or get_context_cache()
+        # key -> (json_str, expiry_ts, tag), least recently used first
+        self._memory_store: "OrderedDict[str, tuple]" = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self._max_memory_entries = max_memory_entries
+        self._next_sweep = time.time() + MEMORY_SWEEP_S
+        self._evictions = 0
         self._version_store: Dict[str, int] = {}  # user_id -> version counter
+        self._tag_store: Dict[str, set] = {}  # "user_id:ns" -> {keys}
+        self._lookups: Dict[str, Dict[str, int]] = {}  # ns -> {hits, misses}
 
-        if redis_url:
+        if redis_client is not None:
+            self._redis = redis_client
+        elif redis_url:
             try:
                 import redis
 
-                self._redis = redis.Redis.from_url(
-                    redis_url, decode_responses=True, socket_timeout=2
-                )
+                self._redis = redis.Redis.from_url(redis_url, socket_timeout=2)
                 self._redis.ping()
                 logger.info("Pipeline cache: Redis connected at %s", redis_url)
             except Exception as e:
@@ -115,7 +167,14 @@ class PipelineCache:
         For 'ctx' namespace, automatically appends current user version
         to the key for correctness.
         """
-        full_key = self._build_key(namespace, key)
+        if namespace == "ctx":
+            return self._get_context(key, model_class)
+        value = self._get_model(self._build_key(namespace, key), model_class)
+        counters = self._lookups.setdefault(namespace, {"hits": 0, "misses": 0})
+        counters["hits" if value is not None else "misses"] += 1
+        return value
+
+    def _get_model(self, full_key: str, model_class: Type[T]) -> Optional[T]:
         json_str = self._get_raw(full_key)
         if json_str is None:
             return None
@@ -132,15 +191,76 @@ class PipelineCache:
         key: str,
         value: BaseModel,
         ttl: Optional[int] = None,
+        user_id: Optional[str] = None,
     ) -> None:
-        """Cache a Pydantic model with versioned key."""
-        full_key = self._build_key(namespace, key)
+        """
+        Cache a Pydantic model with versioned key.
+
+        For hash-keyed namespaces pass user_id so the entry is tagged and
+        dropped by that user's invalidation events.
+        """
         ttl = ttl or DEFAULT_TTLS.get(namespace, 300)
+        if namespace == "ctx":
+            version = self.get_user_version(key)
+            self._context.set(key, value, version, ttl)
+            if self._redis:
+                self._write_context(key, version, value, ttl)
+            return
+
+        full_key = self._build_key(namespace, key)
         json_str = value.model_dump_json()
-        self._set_raw(full_key, json_str, ttl)
+        if self._redis:
+            try:
+                pipe = self._redis.pipeline(transaction=False)
+                pipe.setex(full_key, ttl, self._encode(json_str))
+                if user_id:
+                    tag_key = self._tag_key(user_id, namespace)
+                    pipe.sadd(tag_key, full_key)
+                    pipe.expire(tag_key, ttl)
+                pipe.execute()
+                return
+            except Exception:
+                pass
+        tag = f"{user_id}:{namespace}" if user_id else None
+        self._memory_put(full_key, json_str, ttl, tag)
+
+    async def get_or_load_context(
+        self,
+        user_id: str,
+        model_class: Type[T],
+        loader: Callable[[], Awaitable[T]],
+    ) -> T:
+        """
+        Cached ContextFrame for a user, loading it on a miss.
+
+        Concurrent misses for the same user share one loader call
+        (single-flight) instead of all hitting the database. With Redis,
+        the version and the stored frame come back in one round trip.
+        """
+        if not self._redis:
+            version = self.get_user_version(user_id)
+            return await self._context.get_or_load(user_id, version, loader)
+
+        version, blob = self._read_context(user_id)
+
+        async def load() -> T:
+            # L2 (Redis) before going to the source
+            if blob is not None:
+                cached = self._decode_model(blob, model_class)
+                if cached is not None:
+                    return cached
+            value = await loader()
+            self._write_context(user_id, version, value, DEFAULT_TTLS["ctx"])
+            return value
+
+        return await self._context.get_or_load(user_id, version, load)
 
     def invalidate(self, namespace: str, key: str) -> None:
         """Remove a specific cache entry."""
+        if namespace == "ctx":
+            self._context.invalidate(key)
+            if self._redis:
+                self._delete_raw(f"helm:ctx:{key}")
         full_key = self._build_key(namespace, key)
         self._delete_raw(full_key)
 
@@ -168,20 +288,42 @@ class PipelineCache:
         )
 
         # If "ctx" is affected, bump user version (invalidates all versioned keys)
-        if "ctx" in affected:
-            self._bump_version(user_id)
+        bump = "ctx" in affected
+
+        # intent and resp are hash-keyed and normally expire via TTL; for
+        # preference/crisis changes, drop the user's tagged keys explicitly.
+        tagged = [ns for ns in ("intent", "resp") if ns in affected]
 
-        # Explicitly delete non-versioned entries if needed
-        # (intent and resp are hash-keyed, they expire via TTL;
-        #  but for preference/crisis changes, we nuke all user-specific keys)
-        if "intent" in affected or "resp" in affected:
-            self._delete_by_pattern(f"helm:intent:*{user_id}*")
-            self._delete_by_pattern(f"helm:resp:*{user_id}*")
+        if self._redis and self._invalidate_redis(user_id, bump, tagged):
+            return
+
+        if bump:
+            self._bump_version(user_id)
+        with self._memory_lock:
+            for ns in tagged:
+                for full_key in self._tag_store.pop(f"{user_id}:{ns}", ()):
+                    self._memory_store.pop(full_key, None)
 
     # ------------------------------------------------------------------
     # Versioning
     # ------------------------------------------------------------------
 
+    def _get_context(self, user_id: str, model_class: Type[T]) -> Optional[T]:
+        """ctx lookup: shared L1 first, then Redis (promoting hits into L1)."""
+        if self._redis:
+            version, blob = self._read_context(user_id)
+        else:
+            version, blob = self.get_user_version(user_id), None
+        cached = self._context.get(user_id, version)
+        if isinstance(cached, model_class):
+            return cached
+        if blob is None:
+            return None
+        value = self._decode_model(blob, model_class)
+        if value is not None:
+            self._context.set(user_id, value, version)
+        return value
+
     def get_user_version(self, user_id: str) -> int:
         """Get current cache version for a user."""
         # Try Redis
@@ -195,11 +337,15 @@ class PipelineCache:
 
     def _bump_version(self, user_id: str) -> int:
         """Increment user's cache version counter."""
+        # The shared L1 outlives this instance's version counter
+        self._context.invalidate(user_id)
         ver_key = f"helm:ver:{user_id}"
         if self._redis:
             try:
-                new_ver = self._redis.incr(ver_key)
-                self._redis.expire(ver_key, 86400)  # 24h TTL on version key
+                pipe = self._redis.pipeline(transaction=False)
+                pipe.incr(ver_key)
+                pipe.expire(ver_key, VERSION_TTL_S)
+                new_ver, _ = pipe.execute()
                 return new_ver
             except Exception:
                 pass
@@ -214,6 +360,10 @@ class PipelineCache:
             return f"helm:{namespace}:{key}:v{version}"
         return f"helm:{namespace}:{key}"
 
+    @staticmethod
+    def _tag_key(user_id: str, namespace: str) -> str:
+        return f"helm:tags:{user_id}:{namespace}"
+
     # ------------------------------------------------------------------
     # Key generation helpers
     # ------------------------------------------------------------------
@@ -225,38 +375,135 @@ class PipelineCache:
         return hashlib.sha256(combined.encode()).hexdigest()[:16]
 
     # ------------------------------------------------------------------
-    # Backend: Redis or in-memory
+    # Serialization
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _encode(json_str: str) -> bytes:
+        """JSON → marker-prefixed bytes, compressed when large."""
+        data = json_str.encode()
+        if len(data) >= COMPRESS_MIN_BYTES:
+            return _FMT_ZLIB + zlib.compress(data)
+        return _FMT_JSON + data
+
+    @staticmethod
+    def _decode(raw: Any) -> str:
+        """Inverse of _encode; unprefixed values are read as plain JSON."""
+        if isinstance(raw, str):
+            return raw
+        marker, payload = raw[:1], raw[1:]
+        if marker == _FMT_ZLIB:
+            return zlib.decompress(payload).decode()
+        if marker == _FMT_JSON:
+            return payload.decode()
+        return raw.decode()
+
+    def _decode_model(self, blob: Any, model_class: Type[T]) -> Optional[T]:
+        try:
+            return model_class.model_validate_json(self._decode(blob))
+        except Exception as e:
+            logger.warning("Cache deserialize error for ctx blob: %s", e)
+            return None
+
+    # ------------------------------------------------------------------
+    # Backend: Redis (pipelined) or in-memory
+    # ------------------------------------------------------------------
+
+    def _read_context(self, user_id: str) -> tuple:
+        """
+        One round trip: (current_version, stored_blob_or_None).
+
+        The blob is only returned when it was written for the current version.
+        """
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.get(f"helm:ver:{user_id}")
+            pipe.hmget(f"helm:ctx:{user_id}", "ver", "val")
+            raw_ver, (blob_ver, blob) = pipe.execute()
+        except Exception:
+            return self._version_store.get(user_id, 0), None
+        version = int(raw_ver) if raw_ver else 0
+        if blob is None or blob_ver is None or int(blob_ver) != version:
+            return version, None
+        return version, blob
+
+    def _write_context(
+        self, user_id: str, version: int, value: BaseModel, ttl: int
+    ) -> None:
+        """One round trip: HSET {ver, val} + EXPIRE."""
+        ctx_key = f"helm:ctx:{user_id}"
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.hset(
+                ctx_key,
+                mapping={"ver": version, "val": self._encode(value.model_dump_json())},
+            )
+            pipe.expire(ctx_key, ttl)
+            pipe.execute()
+        except Exception as e:
+            logger.debug("Redis ctx write failed for %s: %s", user_id, e)
+
+    def _invalidate_redis(
+        self, user_id: str, bump: bool, namespaces: List[str]
+    ) -> bool:
+        """
+        Version bump + tagged-key deletion in at most two round trips:
+        INCR/EXPIRE/SMEMBERS pipelined, then one DEL for everything found.
+        """
+        try:
+            ver_key = f"helm:ver:{user_id}"
+            tag_keys = [self._tag_key(user_id, ns) for ns in namespaces]
+
+            pipe = self._redis.pipeline(transaction=False)
+            if bump:
+                pipe.incr(ver_key)
+                pipe.expire(ver_key, VERSION_TTL_S)
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            results = pipe.execute()
+        except Exception:
+            return False
+
+        if bump:
+            self._context.invalidate(user_id)
+        members = [key for found in results[2 if bump else 0 :] for key in found]
+        if tag_keys:
+            try:
+                self._redis.delete(*members, *tag_keys)
+            except Exception:
+                pass
+        return True
+
     def _get_raw(self, key: str) -> Optional[str]:
         """Get raw string from backend."""
         if self._redis:
             try:
                 val = self._redis.get(key)
                 if val is not None:
-                    return val
+                    return self._decode(val)
                 return None
             except Exception:
                 pass
 
-        entry = self._memory_store.get(key)
-        if entry is None:
-            return None
-        json_str, expiry = entry
-        if time.time() > expiry:
-            del self._memory_store[key]
-            return None
-        return json_str
+        with self._memory_lock:
+            entry = self._memory_store.get(key)
+            if entry is None:
+                return None
+            if time.time() > entry[1]:
+                self._memory_drop(key)
+                return None
+            self._memory_store.move_to_end(key)
+            return entry[0]
 
     def _set_raw(self, key: str, value: str, ttl: int) -> None:
         """Set raw string in backend."""
         if self._redis:
             try:
-                self._redis.setex(key, ttl, value)
+                self._redis.setex(key, ttl, self._encode(value))
                 return
             except Exception:
                 pass
-        self._memory_store[key] = (value, time.time() + ttl)
+        self._memory_put(key, value, ttl)
 
     def _delete_raw(self, key: str) -> None:
         """Delete from backend."""
@@ -265,44 +512,51 @@ class PipelineCache:
                 self._redis.delete(key)
             except Exception:
                 pass
-        self._memory_store.pop(key, None)
-
-    def _delete_by_pattern(self, pattern: str) -> None:
-        """Delete keys matching pattern (in-memory only, Redis uses SCAN)."""
-        if self._redis:
-            try:
-                cursor = 0
-                while True:
-                    cursor, keys = self._redis.scan(cursor, match=pattern, count=100)
-                    if keys:
-                        self._redis.delete(*keys)
-                    if cursor == 0:
-                        break
-            except Exception:
-                pass
+        with self._memory_lock:
+            self._memory_drop(key)
 
-        # In-memory: delete matching keys
-        to_delete = [k for k in self._memory_store if self._matches_pattern(k, pattern)]
-        for k in to_delete:
-            del self._memory_store[k]
-
-    @staticmethod
-    def _matches_pattern(key: str, pattern: str) -> bool:
-        """Simple glob-like pattern matching for in-memory keys."""
-        parts = pattern.split("*")
-        if len(parts) == 1:
-            return key == pattern
-        pos = 0
-        for i, part in enumerate(parts):
-            if not part:
-                continue
-            idx = key.find(part, pos)
-            if idx == -1:
-                return False
-            if i == 0 and idx != 0:
-                return False
-            pos = idx + len(part)
-        return True
+    def _memory_put(
+        self, key: str, value: str, ttl: int, tag: Optional[str] = None
+    ) -> None:
+        """Store in the in-memory fallback, sweeping and evicting to fit."""
+        now = time.time()
+        with self._memory_lock:
+            if now >= self._next_sweep:
+                self._sweep_expired(now)
+            self._memory_drop(key)
+            self._memory_store[key] = (value, now + ttl, tag)
+            if tag:
+                self._tag_store.setdefault(tag, set()).add(key)
+            while len(self._memory_store) > self._max_memory_entries:
+                self._memory_drop(next(iter(self._memory_store)))
+                self._evictions += 1
+
+    def _memory_drop(self, key: str) -> None:
+        """Remove an in-memory entry and its tag (caller holds the lock)."""
+        entry = self._memory_store.pop(key, None)
+        if entry is None or not entry[2]:
+            return
+        keys = self._tag_store.get(entry[2])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._tag_store[entry[2]]
+
+    def _sweep_expired(self, now: float) -> None:
+        """Drop every expired in-memory entry (caller holds the lock)."""
+        expired = [k for k, entry in self._memory_store.items() if now > entry[1]]
+        for key in expired:
+            self._memory_drop(key)
+        self._next_sweep = now + MEMORY_SWEEP_S
+
+    def namespace_stats(self, namespace: str) -> Dict[str, Any]:
+        """Hit/miss counters for a hash-keyed namespace (intent, resp)."""
+        counters = self._lookups.get(namespace, {"hits": 0, "misses": 0})
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            **counters,
+            "hit_rate": round(counters["hits"] / lookups, 3) if lookups else 0.0,
+        }
 
     @property
     def backend(self) -> str:
@@ -314,11 +568,34 @@ class PipelineCache:
         if self._redis:
             try:
                 info = self._redis.info("keyspace")
-                return {"backend": "redis", "info": info}
+                return {
+                    "backend": "redis",
+                    "info": info,
+                    "context": self._context.stats(),
+                    "namespaces": {
+                        ns: self.namespace_stats(ns) for ns in self._lookups
+                    },
+                }
             except Exception:
                 pass
         return {
             "backend": "memory",
             "entries": len(self._memory_store),
+            "max_entries": self._max_memory_entries,
+            "evictions": self._evictions,
             "versions": len(self._version_store),
+            "context": self._context.stats(),
+            "namespaces": {ns: self.namespace_stats(ns) for ns in self._lookups},
         }
+
+
+# Process-wide cache shared by every pipeline instance (one Redis client)
+_pipeline_cache: Optional[PipelineCache] = None
+
+
+def get_pipeline_cache() -> PipelineCache:
+    """Return the process-wide PipelineCache (Redis when REDIS_URL is set)."""
+    global _pipeline_cache
+    if _pipeline_cache is None:
+        _pipeline_cache = PipelineCache(redis_url=os.getenv("REDIS_URL"))
+    return _pipeline_cache
@@ -14,10 +14,10 @@ Performance target: < 50ms (cache hit), < 200ms (cache miss).
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
 from datetime import datetime, date, timezone
-from typing import Any, Dict, Optional
 
 from sqlalchemy.orm import Session
 
@@ -32,10 +32,6 @@ from .schemas import (
 
 logger = logging.getLogger("intelligence.context_assembler")
 
-# In-memory cache (fallback when Redis unavailable)
-_context_cache: Dict[str, tuple] = {}  # user_id -> (ContextFrame, expiry_timestamp)
-CACHE_TTL_SECONDS = 300  # 5 minutes
-
 
 class ContextAssembler:
     """
@@ -44,8 +40,10 @@ class ContextAssembler:
     Responsibilities:
         - Assemble user context from profile store, scores, and history
         - Compress context to ~200 tokens for LLM consumption
-        - Cache hot profiles (5-minute TTL)
         - Graceful fallback to defaults if data is missing
+
+    Caching of hot profiles lives in the shared ContextCache (via
+    PipelineCache.get_or_load_context), not here.
     """
 
     def __init__(self, db: Session):
@@ -53,86 +51,62 @@ class ContextAssembler:
 
     async def assemble(self, envelope: InputEnvelope) -> ContextFrame:
         """
-        Build a ContextFrame for the given user.
+        Build a ContextFrame for the given user from the database.
 
-        Checks cache first, then assembles from database.
+        The (synchronous) DB work runs in a worker thread so the event loop
+        stays free for stages running concurrently with this one.
         """
         user_id = envelope.user_id
 
-        # Check cache
-        cached = self._get_cached(user_id)
-        if cached is not None:
-            logger.debug("Context cache HIT for user %s", user_id)
-            return cached
-
-        # Assemble from DB
-        logger.debug("Context cache MISS for user %s — assembling from DB", user_id)
         start = time.monotonic()
-        context = self._assemble_from_db(user_id)
+        context = await asyncio.to_thread(self._assemble_from_db, user_id)
         elapsed_ms = (time.monotonic() - start) * 1000
         logger.info("Context assembled in %.1fms for user %s", elapsed_ms, user_id)
-
-        # Cache it
-        self._set_cached(user_id, context)
-
         return context
 
     def invalidate_cache(self, user_id: str) -> None:
         """Invalidate cached context for a user (call after data mutations)."""
-        _context_cache.pop(user_id, None)
+        from .context_cache import get_context_cache
+
+        get_context_cache().invalidate(user_id)
 
     # ------------------------------------------------------------------
     # Private: Database assembly
     # ------------------------------------------------------------------
 
     def _assemble_from_db(self, user_id: str) -> ContextFrame:
-        """Pull all context from database and build ContextFrame."""
-        try:
-            from models.models import (
-                User,
-                VivIndex,
-                LifeGoal,
-                HealthDailySummary,
-                FinancialAccount,
-                FinancialTransaction,
-            )
-            from models.models_scores import DBUserScore
+        """
+        Pull all context from database and build ContextFrame.
 
-            user = self.db.query(User).filter(User.id == user_id).first()
+        Two round trips regardless of how much data the user has:
+            1. the user row with every "latest row" lookup outer-joined in
+               (VivIndex, FinancialScore, today's HealthDailySummary,
+               DBUserScore) plus the account balance total
+            2. life goals and recurring commitments, UNION ALL'd together
+        """
+        try:
+            row = self._fetch_profile_row(user_id)
 
-            if not user:
+            if row is None:
                 logger.warning("User %s not found — returning default context", user_id)
                 return ContextFrame(user_id=user_id)
 
+            user, viv, fin_score, health_summary, user_score, total_balance = row
+
             # --- HELM Scores ---
-            helm_scores = self._load_helm_scores(user_id, VivIndex)
+            helm_scores = self._helm_scores_from(viv)
 
             # --- Financial Snapshot ---
-            financial = self._load_financial_snapshot(user, user_id)
+            financial = self._financial_snapshot_from(fin_score, total_balance)
 
             # --- Health Baseline ---
-            health = self._load_health_baseline(user, user_id, HealthDailySummary)
+            health = self._health_baseline_from(user, health_summary)
 
             # --- Time Baseline ---
-            time_baseline = self._load_time_baseline(user_id, DBUserScore)
-
-            # --- Life Goals ---
-            life_goals = [
-                {
-                    "title": g.title,
-                    "target_amount": g.target_amount,
-                    "saved_amount": g.saved_amount,
-                    "deadline": (
-                        g.deadline.isoformat() if getattr(g, "deadline", None) else None
-                    ),
-                    "priority": g.priority,
-                    "pillar": g.pillar if hasattr(g, "pillar") else "wealth",
-                }
-                for g in (user.life_goals or [])
-            ]
-
-            # --- Memory: recurring commitments (subscriptions/bills) ---
-            commitments = self._load_commitments(user_id)
+            time_baseline = self._time_baseline_from(user_id, user_score)
+
+            # --- Life Goals + Memory: recurring commitments ---
+            life_goals, commitments = self._fetch_goals_and_commitments(user_id)
 
             # --- Crisis Detection ---
             crisis_dims = []
@@ -174,118 +148,191 @@ class ContextAssembler:
             logger.error("Failed to assemble context for user %s: %s", user_id, e)
             return ContextFrame(user_id=user_id)
 
-    def _load_helm_scores(self, user_id: str, VivIndex) -> HelmScores:
-        """Load latest VivIndex scores."""
-        latest = (
-            self.db.query(VivIndex)
-            .filter(VivIndex.user_id == user_id)
+    # ------------------------------------------------------------------
+    # Private: Batched queries
+    # ------------------------------------------------------------------
+
+    def _fetch_profile_row(self, user_id: str):
+        """
+        Round trip 1: user + latest score rows + balance total.
+
+        Returns (User, VivIndex|None, FinancialScore|None,
+        HealthDailySummary|None, DBUserScore|None, total_balance) or None.
+        """
+        from sqlalchemy import func, select
+
+        from models.models import (
+            FinancialAccount,
+            FinancialScore,
+            HealthDailySummary,
+            User,
+            VivIndex,
+        )
+        from models.models_scores import DBUserScore
+
+        latest_viv = (
+            select(VivIndex.id)
+            .where(VivIndex.user_id == user_id)
             .order_by(VivIndex.timestamp.desc())
-            .first()
+            .limit(1)
+            .scalar_subquery()
         )
-        if latest:
-            return HelmScores(
-                wealth=latest.financial_score or 50.0,
-                health=latest.health_score or 50.0,
-                time=latest.time_score or 50.0,
+        latest_fin = (
+            select(FinancialScore.id)
+            .where(FinancialScore.user_id == user_id)
+            .order_by(FinancialScore.timestamp.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        today_health = (
+            select(HealthDailySummary.id)
+            .where(
+                HealthDailySummary.user_id == user_id,
+                HealthDailySummary.date == date.today(),
             )
-        return HelmScores()
-
-    def _load_commitments(self, user_id: str) -> list:
-        """Load verified recurring commitments (subscriptions/bills) for memory."""
-        try:
-            from models.models import RecurringBill
+            .limit(1)
+            .scalar_subquery()
+        )
+        total_balance = (
+            select(func.coalesce(func.sum(FinancialAccount.current_balance), 0.0))
+            .where(FinancialAccount.user_id == user_id)
+            .scalar_subquery()
+        )
 
-            bills = (
-                self.db.query(RecurringBill)
-                .filter(RecurringBill.user_id == user_id)
-                .all()
+        stmt = (
+            select(
+                User,
+                VivIndex,
+                FinancialScore,
+                HealthDailySummary,
+                DBUserScore,
+                total_balance.label("total_balance"),
             )
-            return [
-                {
-                    "name": b.name,
-                    "amount": float(b.amount or 0.0),
-                    "cadence": b.cadence or "monthly",
-                }
-                for b in bills
-            ]
-        except Exception as e:
-            logger.debug("No commitments loaded for %s: %s", user_id, e)
-            return []
+            .select_from(User)
+            .outerjoin(VivIndex, VivIndex.id == latest_viv)
+            .outerjoin(FinancialScore, FinancialScore.id == latest_fin)
+            .outerjoin(HealthDailySummary, HealthDailySummary.id == today_health)
+            .outerjoin(DBUserScore, DBUserScore.user_id == User.id)
+            .where(User.id == user_id)
+            .limit(1)
+        )
+        return self.db.execute(stmt).first()
 
-    def _load_financial_snapshot(self, user, user_id: str) -> FinancialSnapshot:
-        """Build compressed financial context."""
-        try:
-            from models.models import FinancialScore
+    def _fetch_goals_and_commitments(self, user_id: str) -> tuple:
+        """
+        Round trip 2: life goals and recurring bills in one UNION ALL.
 
-            score = (
-                self.db.query(FinancialScore)
-                .filter(FinancialScore.user_id == user_id)
-                .order_by(FinancialScore.timestamp.desc())
-                .first()
-            )
+        Both are small per-user lists; they share one row shape
+        (kind, name, amount, saved, target_date, priority, label) where
+        label is the goal pillar or the bill cadence.
+        """
+        from sqlalchemy import (
+            DateTime,
+            Float,
+            String,
+            cast,
+            literal,
+            null,
+            select,
+            union_all,
+        )
 
-            if score:
-                return FinancialSnapshot(
-                    total_balance=sum(
-                        a.current_balance for a in (user.financial_accounts or [])
-                    ),
-                    monthly_income=score.total_monthly_income or 0.0,
-                    monthly_expenses=(score.total_monthly_expenses or 0.0)
-                    + (score.total_monthly_bills or 0.0),
-                    monthly_savings=score.total_monthly_savings or 0.0,
+        from models.models import LifeGoal, RecurringBill
+
+        goals_q = select(
+            literal("goal").label("kind"),
+            LifeGoal.title.label("name"),
+            LifeGoal.target_amount.label("amount"),
+            LifeGoal.saved_amount.label("saved"),
+            LifeGoal.target_date.label("target_date"),
+            LifeGoal.priority.label("priority"),
+            LifeGoal.pillar.label("label"),
+        ).where(LifeGoal.user_id == user_id)
+        bills_q = select(
+            literal("bill").label("kind"),
+            RecurringBill.name.label("name"),
+            RecurringBill.amount.label("amount"),
+            cast(null(), Float).label("saved"),
+            cast(null(), DateTime).label("target_date"),
+            cast(null(), String).label("priority"),
+            RecurringBill.cadence.label("label"),
+        ).where(RecurringBill.user_id == user_id)
+
+        life_goals, commitments = [], []
+        for r in self.db.execute(union_all(goals_q, bills_q)):
+            if r.kind == "goal":
+                life_goals.append(
+                    {
+                        "title": r.name,
+                        "target_amount": r.amount,
+                        "saved_amount": r.saved,
+                        "deadline": (
+                            r.target_date.isoformat() if r.target_date else None
+                        ),
+                        "priority": r.priority,
+                        "pillar": r.label or "wealth",
+                    }
                 )
             else:
-                # Fallback: derive from accounts
-                total_balance = sum(
-                    a.current_balance for a in (user.financial_accounts or [])
+                commitments.append(
+                    {
+                        "name": r.name,
+                        "amount": float(r.amount or 0.0),
+                        "cadence": r.label or "monthly",
+                    }
                 )
-                return FinancialSnapshot(total_balance=total_balance)
+        return life_goals, commitments
 
-        except Exception as e:
-            logger.warning("Financial snapshot fallback for %s: %s", user_id, e)
-            return FinancialSnapshot()
+    # ------------------------------------------------------------------
+    # Private: Row → context section builders (no I/O)
+    # ------------------------------------------------------------------
 
-    def _load_health_baseline(
-        self, user, user_id: str, HealthDailySummary
-    ) -> HealthBaseline:
-        """Build compressed health context from latest daily summary."""
-        try:
-            prefs = user.viv_preferences or {}
-            if not prefs.get("share_health_data", True):
-                return HealthBaseline()
-
-            today = date.today()
-            summary = (
-                self.db.query(HealthDailySummary)
-                .filter(
-                    HealthDailySummary.user_id == user_id,
-                    HealthDailySummary.date == today,
-                )
-                .first()
+    @staticmethod
+    def _helm_scores_from(latest) -> HelmScores:
+        """HELM scores from the latest VivIndex row."""
+        if latest:
+            return HelmScores(
+                wealth=latest.financial_score or 50.0,
+                health=latest.health_score or 50.0,
+                time=latest.time_score or 50.0,
             )
+        return HelmScores()
 
-            if summary:
-                return HealthBaseline(
-                    sleep_hours_avg=(summary.sleep_duration_minutes or 0) / 60.0,
-                    sleep_quality=summary.sleep_quality_score or 50.0,
-                    hrv_avg=summary.hrv_average,
-                    steps_avg=summary.steps_count or 5000,
-                )
-
+    @staticmethod
+    def _financial_snapshot_from(score, total_balance) -> FinancialSnapshot:
+        """Compressed financial context from the latest FinancialScore."""
+        total_balance = float(total_balance or 0.0)
+        if score:
+            return FinancialSnapshot(
+                total_balance=total_balance,
+                monthly_income=score.total_monthly_income or 0.0,
+                monthly_expenses=(score.total_monthly_expenses or 0.0)
+                + (score.total_monthly_bills or 0.0),
+                monthly_savings=score.total_monthly_savings or 0.0,
+            )
+        # Fallback: derive from accounts
+        return FinancialSnapshot(total_balance=total_balance)
+
+    @staticmethod
+    def _health_baseline_from(user, summary) -> HealthBaseline:
+        """Compressed health context from today's daily summary."""
+        prefs = user.viv_preferences or {}
+        if not prefs.get("share_health_data", True):
             return HealthBaseline()
 
-        except Exception as e:
-            logger.warning("Health baseline fallback for %s: %s", user_id, e)
-            return HealthBaseline()
+        if summary:
+            return HealthBaseline(
+                sleep_hours_avg=(summary.sleep_duration_minutes or 0) / 60.0,
+                sleep_quality=summary.sleep_quality_score or 50.0,
+                hrv_avg=summary.hrv_average,
+                steps_avg=summary.steps_count or 5000,
+            )
+        return HealthBaseline()
 
-    def _load_time_baseline(self, user_id: str, DBUserScore) -> TimeBaseline:
-        """Build compressed time/productivity context."""
+    @staticmethod
+    def _time_baseline_from(user_id: str, score) -> TimeBaseline:
+        """Compressed time/productivity context from the user's score row."""
         try:
-            score = (
-                self.db.query(DBUserScore)
-                .filter(DBUserScore.user_id == user_id)
-                .first()
-            )
             if score:
                 return TimeBaseline(
                     focus_time_hours=score.focus_time_hours or 4.0,
@@ -298,22 +345,3 @@ class ContextAssembler:
         except Exception as e:
             logger.warning("Time baseline fallback for %s: %s", user_id, e)
             return TimeBaseline()
-
-    # ------------------------------------------------------------------
-    # Private: Caching
-    # ------------------------------------------------------------------
-
-    def _get_cached(self, user_id: str) -> Optional[ContextFrame]:
-        """Retrieve from in-memory cache if valid."""
-        entry = _context_cache.get(user_id)
-        if entry is None:
-            return None
-        context, expiry = entry
-        if time.time() > expiry:
-            del _context_cache[user_id]
-            return None
-        return context
-
-    def _set_cached(self, user_id: str, context: ContextFrame) -> None:
-        """Store in in-memory cache with TTL."""
-        _context_cache[user_id] = (context, time.time() + CACHE_TTL_SECONDS)
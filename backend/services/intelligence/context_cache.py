@@ -0,0 +1,220 @@
+"""
+Context Cache — Process-Wide LRU + TTL Cache for ContextFrames.
+
+One bounded cache shared by every pipeline instance in the process (the
+pipeline is built per request, so per-instance caches never warmed up):
+
+    - LRU eviction, bounded by entry count AND approximate bytes
+    - TTL expiry (5 minutes by default, same as DEFAULT_TTLS["ctx"])
+    - Versioned entries: a read only hits when the stored version matches
+      the caller's current user version
+    - Single-flight loading: concurrent misses for the same user collapse
+      into one load; the other callers await its result
+
+Sits in front of Redis when PipelineCache has a Redis backend (L1), and is
+the only context store when it does not.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from pydantic import BaseModel
+
+logger = logging.getLogger("intelligence.context_cache")
+
+DEFAULT_TTL_S = 300
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # 64 MiB
+
+
+class ContextCache:
+    """
+    Bounded LRU + TTL cache keyed by user_id, with single-flight loads.
+
+    Entries are (version, value, size_bytes, expiry_ts). Values are stored as
+    model objects and handed out as-is, so callers must treat them as
+    read-only.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl: int = DEFAULT_TTL_S,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        self._entries: "OrderedDict[str, Tuple[int, BaseModel, int, float]]" = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[Tuple[str, int], asyncio.Future] = {}
+
+        # Counters
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0  # dropped to respect max_entries / max_bytes
+        self._expirations = 0
+        self._loads = 0
+        self._coalesced = 0  # misses served by another caller's load
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, user_id: str, version: int = 0) -> Optional[BaseModel]:
+        """Return the cached value for this user and version, or None."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                self._misses += 1
+                return None
+            stored_version, value, size, expiry = entry
+            expired = time.time() > expiry
+            if stored_version != version or expired:
+                if expired:
+                    self._expirations += 1
+                if expired or stored_version < version:
+                    self._remove(user_id)  # never drop a newer version
+                self._misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self._hits += 1
+            return value
+
+    def set(
+        self,
+        user_id: str,
+        value: BaseModel,
+        version: int = 0,
+        ttl: Optional[int] = None,
+    ) -> None:
+        """Store a value, evicting least-recently-used entries to fit."""
+        size = len(value.model_dump_json())
+        if size > self.max_bytes:
+            logger.warning(
+                "Context for %s (%d bytes) exceeds cache size limit — not cached",
+                user_id,
+                size,
+            )
+            return
+        expiry = time.time() + (ttl or self.ttl)
+        with self._lock:
+            self._remove(user_id)
+            self._entries[user_id] = (version, value, size, expiry)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._evictions += 1
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a user's entry (any version)."""
+        with self._lock:
+            self._remove(user_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    async def get_or_load(
+        self,
+        user_id: str,
+        version: int,
+        loader: Callable[[], Awaitable[BaseModel]],
+    ) -> BaseModel:
+        """
+        Return the cached value, or load it exactly once per (user, version).
+
+        Concurrent callers that miss while a load is in flight await that
+        load instead of starting their own. A failed load propagates to every
+        waiter and nothing is cached.
+        """
+        cached = self.get(user_id, version)
+        if cached is not None:
+            return cached
+
+        flight_key = (user_id, version)
+        pending = self._inflight.get(flight_key)
+        if pending is not None:
+            self._coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # this caller was cancelled
+                # The loading caller was cancelled — load on our own
+                return await self.get_or_load(user_id, version, loader)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[flight_key] = future
+        try:
+            self._loads += 1
+            value = await loader()
+            self.set(user_id, value, version)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody may be waiting; don't log "exception never retrieved"
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(flight_key, None)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _remove(self, user_id: str) -> None:
+        """Drop an entry and its byte accounting (caller holds the lock)."""
+        entry = self._entries.pop(user_id, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    # ------------------------------------------------------------------
+    # Observability
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and hit/miss/eviction counters."""
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "loads": self._loads,
+            "coalesced": self._coalesced,
+            "inflight": len(self._inflight),
+        }
+
+
+# Process-wide cache shared by every PipelineCache instance
+_context_cache: Optional[ContextCache] = None
+
+
+def get_context_cache() -> ContextCache:
+    """Return the process-wide ContextCache."""
+    global _context_cache
+    if _context_cache is None:
+        _context_cache = ContextCache()
+    return _context_cache
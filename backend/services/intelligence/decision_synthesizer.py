@@ -16,6 +16,7 @@ import json
 import logging
 from typing import Any, Dict, List, Optional
 
+from .llm_gateway import LLMClient, get_llm_gateway
 from .schemas import (
     ActionPlan,
     ActionStep,
@@ -289,14 +290,24 @@ class DecisionSynthesizer:
     Escalates to heavy LLM for genuinely novel scenarios.
     """
 
-    def __init__(self, heavy_llm_model=None, llm_api_key: Optional[str] = None):
+    def __init__(
+        self,
+        heavy_llm_model=None,
+        llm_api_key: Optional[str] = None,
+        llm_client: Optional[LLMClient] = None,
+    ):
         """
         Args:
             heavy_llm_model: Configured heavy model for Tier 3 escalation.
             llm_api_key: API key (to check mock mode).
+            llm_client: Gateway client for the heavy model (built from
+                        heavy_llm_model on the process-wide gateway if None).
         """
         self.heavy_llm_model = heavy_llm_model
         self.llm_api_key = llm_api_key
+        if llm_client is None and heavy_llm_model is not None:
+            llm_client = get_llm_gateway().client(heavy_llm_model, tier=3)
+        self.llm_client = llm_client
 
     async def synthesize(
         self,
@@ -313,13 +324,20 @@ class DecisionSynthesizer:
         # Check if escalation is needed
         needs_escalation = self._should_escalate(intent, scores)
 
-        if needs_escalation and self.heavy_llm_model and self.llm_api_key != "mock":
+        if needs_escalation and self.llm_client and self.llm_api_key != "mock":
             logger.info("Escalating to heavy LLM for intent '%s'", intent.intent)
             return await self._synthesize_with_llm(intent, scores, context)
 
         # Template-based synthesis
         return self._synthesize_from_template(intent, scores)
 
+    def template_id_for(self, intent: IntentResult) -> Optional[str]:
+        """Response template the template path would pick for this intent."""
+        template = ACTION_TEMPLATES.get(
+            intent.intent, ACTION_TEMPLATES["general_conversation"]
+        )
+        return template.get("response_template_id")
+
     # ------------------------------------------------------------------
     # Template-based synthesis
     # ------------------------------------------------------------------
@@ -371,12 +389,9 @@ class DecisionSynthesizer:
     ) -> ActionPlan:
         """Escalate to heavy LLM for novel scenario reasoning."""
         try:
-            import asyncio
-
             prompt = self._build_synthesis_prompt(intent, scores, context)
 
-            response = await asyncio.to_thread(
-                self.heavy_llm_model.generate_content,
+            response = await self.llm_client.generate(
                 prompt,
                 generation_config={"response_mime_type": "application/json"},
             )
@@ -22,6 +22,7 @@ from .intent_taxonomy import (
     get_intent_entry,
     match_deterministic,
 )
+from .llm_gateway import LLMClient, get_llm_gateway
 from .schemas import ContextFrame, InputEnvelope, IntentResult, RequestTier
 
 logger = logging.getLogger("intelligence.intent_classifier")
@@ -55,27 +56,40 @@ class IntentClassifier:
         2. LLM fallback: structured JSON classification (lightweight model)
     """
 
-    def __init__(self, llm_model=None, llm_api_key: Optional[str] = None):
+    def __init__(
+        self,
+        llm_model=None,
+        llm_api_key: Optional[str] = None,
+        llm_client: Optional[LLMClient] = None,
+    ):
         """
         Args:
             llm_model: Configured generative model for fallback classification.
                        If None, deterministic-only mode.
             llm_api_key: API key (used to check if mock mode).
+            llm_client: Gateway client to call the model through (built
+                        from llm_model on the process-wide gateway if None).
         """
         self.llm_model = llm_model
         self.llm_api_key = llm_api_key
+        if llm_client is None and llm_model is not None:
+            llm_client = get_llm_gateway().client(llm_model, tier=1)
+        self.llm_client = llm_client
 
     async def classify(
         self,
         envelope: InputEnvelope,
-        context: ContextFrame,
+        context: Optional[ContextFrame] = None,
     ) -> IntentResult:
         """
         Classify user intent. Deterministic first, LLM fallback.
 
+        Neither pass reads the ContextFrame, so the pipeline runs this
+        concurrently with Stage 2 and passes no context.
+
         Args:
             envelope: Normalized input from Stage 1.
-            context: Assembled context from Stage 2.
+            context: Assembled context from Stage 2 (optional).
 
         Returns:
             IntentResult with intent name, confidence, tier, and entities.
@@ -121,7 +135,7 @@ class IntentClassifier:
         # ------------------------------------------------------------------
         # Pass 2: LLM Fallback
         # ------------------------------------------------------------------
-        if self.llm_model is None or self.llm_api_key == "mock":
+        if self.llm_client is None or self.llm_api_key == "mock":
             logger.info("No LLM available — defaulting to general_conversation")
             return IntentResult(
                 intent="general_conversation",
@@ -146,12 +160,10 @@ class IntentClassifier:
     async def _classify_with_llm(
         self,
         envelope: InputEnvelope,
-        context: ContextFrame,
+        context: Optional[ContextFrame] = None,
     ) -> IntentResult:
         """Call lightweight LLM for intent classification. Token budget: <500."""
         try:
-            import asyncio
-
             all_intents = get_all_intent_names()
 
             # Build compact prompt. Pass the resolved conversation context so the
@@ -163,8 +175,7 @@ class IntentClassifier:
                 all_intents,
             )
 
-            response = await asyncio.to_thread(
-                self.llm_model.generate_content,
+            response = await self.llm_client.generate(
                 prompt,
                 generation_config={"response_mime_type": "application/json"},
             )
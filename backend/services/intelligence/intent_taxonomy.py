@@ -806,14 +806,98 @@ ALL_INTENTS: List[IntentEntry] = (
 # Lookup by name → IntentEntry
 INTENT_REGISTRY: Dict[str, IntentEntry] = {entry.name: entry for entry in ALL_INTENTS}
 
-# Compiled regex patterns for deterministic matching (built once at import)
-_COMPILED_PATTERNS: List[tuple] = []  # (compiled_pattern, intent_name)
+# ============================================================================
+# Compiled Matcher (built once at import)
+# ============================================================================
+#
+# All regex patterns and all keywords are folded into ONE pattern, wrapped in
+# a lookahead so a single finditer() visits each start position once and
+# overlapping candidates never consume each other:
+#
+#     (?=(?P<r0>pattern)|(?P<r1>pattern)|…|\b(?P<kw>keyword-trie)\b)
+#
+# Keywords are merged into a prefix trie so the engine walks shared prefixes
+# once instead of trying ~250 alternatives at every position.
+#
+# Priority is preserved via a rank per outcome: regex patterns first (in
+# taxonomy order), then keywords by the taxonomy order of their intent. The
+# trie reports the longest keyword ending on a word boundary at a position;
+# shorter keywords that are prefixes of it are folded into its rank up front.
+
+# Rank → (intent_name, confidence, match_type); lower rank wins
+_MATCH_RESULTS: List[tuple] = []
+# Regex group name → rank
+_REGEX_RANK: Dict[str, int] = {}
+# Lowercased keyword → best rank among it and its keyword prefixes
+_KEYWORD_RANK: Dict[str, int] = {}
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """Build a prefix-factored regex matching any of ``words``, longest first."""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        alts = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        # Greedy optional: try the longer continuation before stopping here
+        if "" in node:
+            return "(?:" + body + ")?" if len(alts) == 1 else body + "?"
+        return body
+
+    return emit(trie)
+
+
+def _build_matcher() -> Optional[Pattern]:
+    alternatives: List[str] = []
+
+    for entry in ALL_INTENTS:
+        for pattern_str in entry.regex_patterns:
+            group = f"r{len(_REGEX_RANK)}"
+            _REGEX_RANK[group] = len(_MATCH_RESULTS)
+            _MATCH_RESULTS.append((entry.name, 0.85, "regex"))
+            alternatives.append(f"(?P<{group}>{pattern_str})")
+
+    for entry in ALL_INTENTS:
+        if not entry.keywords:
+            continue
+        rank = len(_MATCH_RESULTS)
+        _MATCH_RESULTS.append((entry.name, 0.95, "keyword"))
+        for keyword in entry.keywords:
+            _KEYWORD_RANK.setdefault(keyword.lower(), rank)
+
+    # A keyword also matches wherever a longer keyword it prefixes matches,
+    # provided its end falls on a word boundary inside the longer one.
+    for keyword in list(_KEYWORD_RANK):
+        for end in range(1, len(keyword)):
+            prefix = keyword[:end]
+            if prefix in _KEYWORD_RANK and _is_word_char(
+                keyword[end - 1]
+            ) != _is_word_char(keyword[end]):
+                _KEYWORD_RANK[keyword] = min(
+                    _KEYWORD_RANK[keyword], _KEYWORD_RANK[prefix]
+                )
+
+    if _KEYWORD_RANK:
+        # Word boundaries prevent substring matches (e.g., "this" -> "hi")
+        alternatives.append(rf"\b(?P<kw>{_trie_pattern(list(_KEYWORD_RANK))})\b")
 
-for _entry in ALL_INTENTS:
-    for _pattern_str in _entry.regex_patterns:
-        _COMPILED_PATTERNS.append(
-            (re.compile(_pattern_str, re.IGNORECASE), _entry.name)
-        )
+    if not alternatives:
+        return None
+    return re.compile("(?=" + "|".join(alternatives) + ")", re.IGNORECASE)
+
+
+_MATCHER: Optional[Pattern] = _build_matcher()
 
 
 def get_intent_entry(intent_name: str) -> Optional[IntentEntry]:
@@ -836,23 +920,28 @@ def match_deterministic(text: str) -> Optional[tuple]:
     Attempt deterministic intent classification via regex and keywords.
     Regex prioritized for complex actions. Word boundaries enforced on keywords.
 
+    Single pass over the text with the precompiled taxonomy matcher.
+
     Returns:
         (intent_name, confidence, match_type) or None if no match.
     """
-    text_lower = text.lower().strip()
+    if _MATCHER is None:
+        return None
 
-    # Pass 1: Regex pattern matching (prioritized for complex actions)
-    for compiled_pattern, intent_name in _COMPILED_PATTERNS:
-        if compiled_pattern.search(text_lower):
-            return (intent_name, 0.85, "regex")
-
-    # Pass 2: Keyword matching with word boundaries
-    # Process longer keywords first to prevent partial shadowing
-    for entry in ALL_INTENTS:
-        for keyword in sorted(entry.keywords, key=len, reverse=True):
-            # Enforce word boundaries to prevent substring matches (e.g., "this" -> "hi")
-            pattern = re.compile(rf"\b{re.escape(keyword)}\b", re.IGNORECASE)
-            if pattern.search(text_lower):
-                return (entry.name, 0.95, "keyword")
+    text_lower = text.lower().strip()
 
-    return None
+    best_rank = len(_MATCH_RESULTS)
+    for m in _MATCHER.finditer(text_lower):
+        group = m.lastgroup
+        if group == "kw":
+            rank = _KEYWORD_RANK[m.group("kw")]
+        else:
+            rank = _REGEX_RANK[group]
+        if rank < best_rank:
+            best_rank = rank
+            if rank == 0:
+                break
+
+    if best_rank == len(_MATCH_RESULTS):
+        return None
+    return _MATCH_RESULTS[best_rank]
@@ -0,0 +1,415 @@
+"""
+LLM Gateway — One Async Entry Point for Every Model Call.
+
+Every stage used to call `asyncio.to_thread(model.generate_content, ...)`:
+one default-executor thread per call, no concurrency cap, no way to cancel
+a call that outlived its timeout, and no streaming. The gateway replaces
+that with:
+
+    LLMGateway ── client(model, tier) ──► LLMClient ──► LLMBackend
+      │                                      │
+      ├─ global semaphore (all calls)        ├─ generate() → LLMResponse
+      ├─ per-tier semaphores                 └─ stream()   → text chunks
+      └─ retries with jittered backoff on 429
+
+Backends:
+    - GeminiBackend: google.generativeai models via generate_content_async
+      (natively async, so cancelling the task cancels the RPC). Models
+      without an async API fall back to a worker thread.
+    - FakeBackend: deterministic, offline, with configurable latency and
+      injected 429s — for unit and load tests.
+
+TierRouter hands out clients from the process-wide gateway.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("intelligence.llm_gateway")
+
+DEFAULT_MAX_CONCURRENCY = 32
+DEFAULT_TIER_LIMITS: Dict[int, int] = {1: 16, 2: 16, 3: 4}
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE_S = 0.5
+DEFAULT_BACKOFF_MAX_S = 8.0
+DEFAULT_TIMEOUT_S = 30.0
+
+
+class RateLimitError(Exception):
+    """Backend-neutral 429 / quota exhaustion."""
+
+
+def is_rate_limit(error: BaseException) -> bool:
+    """True for 429s from any backend (google.api_core, HTTP clients, fakes)."""
+    if isinstance(error, RateLimitError):
+        return True
+    if type(error).__name__ in ("ResourceExhausted", "TooManyRequests"):
+        return True
+    return (
+        getattr(error, "code", None) == 429
+        or getattr(error, "status_code", None) == 429
+    )
+
+
+@dataclass
+class LLMResponse:
+    """
+    Result of a generate() call, shaped like Gemini's response: `.text`, and
+    `.usage_metadata` (prompt_token_count / candidates_token_count) when the
+    backend reports token usage, else None.
+    """
+
+    text: str
+    latency_ms: float = 0.0
+    attempts: int = 1
+    usage_metadata: Any = None
+
+
+# ============================================================================
+# Backends
+# ============================================================================
+
+
+class LLMBackend:
+    """Backend interface: one full completion, or a stream of text chunks."""
+
+    async def generate(self, prompt: Any, **kwargs) -> str:
+        raise NotImplementedError
+
+    async def complete(self, prompt: Any, **kwargs) -> Tuple[str, Any]:
+        """(text, usage_metadata); backends that report usage override this."""
+        return await self.generate(prompt, **kwargs), None
+
+    def stream(self, prompt: Any, **kwargs) -> AsyncIterator[str]:
+        raise NotImplementedError
+
+
+class GeminiBackend(LLMBackend):
+    """google.generativeai GenerativeModel (or anything with generate_content)."""
+
+    def __init__(self, model: Any):
+        self.model = model
+
+    async def generate(self, prompt: Any, **kwargs) -> str:
+        return (await self.complete(prompt, **kwargs))[0]
+
+    async def complete(self, prompt: Any, **kwargs) -> Tuple[str, Any]:
+        if hasattr(self.model, "generate_content_async"):
+            response = await self.model.generate_content_async(prompt, **kwargs)
+        else:
+            response = await asyncio.to_thread(
+                self.model.generate_content, prompt, **kwargs
+            )
+        return response.text, getattr(response, "usage_metadata", None)
+
+    async def stream(self, prompt: Any, **kwargs) -> AsyncIterator[str]:
+        if not hasattr(self.model, "generate_content_async"):
+            # No async streaming API — degrade to a single chunk
+            yield await self.generate(prompt, **kwargs)
+            return
+        response = await self.model.generate_content_async(
+            prompt, stream=True, **kwargs
+        )
+        async for chunk in response:
+            text = getattr(chunk, "text", "")
+            if text:
+                yield text
+
+
+class FakeBackend(LLMBackend):
+    """
+    Deterministic offline backend.
+
+    The same prompt always yields the same text. `responder` overrides the
+    text; `latency_s` simulates model time; the first `rate_limit_first`
+    calls raise RateLimitError.
+    """
+
+    def __init__(
+        self,
+        responder: Optional[Callable[[str], str]] = None,
+        latency_s: float = 0.0,
+        rate_limit_first: int = 0,
+        chunk_words: int = 1,
+    ):
+        self.responder = responder
+        self.latency_s = latency_s
+        self.rate_limit_first = rate_limit_first
+        self.chunk_words = chunk_words
+        self.calls = 0
+
+    def _text_for(self, prompt: Any, **kwargs) -> str:
+        if self.responder is not None:
+            return self.responder(str(prompt))
+        config = kwargs.get("generation_config") or {}
+        if config.get("response_mime_type") == "application/json":
+            return '{"intent": "general_conversation", "confidence": 0.5}'
+        digest = hashlib.sha256(str(prompt).encode()).hexdigest()[:8]
+        return f"Fake response {digest}."
+
+    async def _call(self) -> None:
+        self.calls += 1
+        if self.calls <= self.rate_limit_first:
+            raise RateLimitError("429 (fake)")
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+
+    async def generate(self, prompt: Any, **kwargs) -> str:
+        await self._call()
+        return self._text_for(prompt, **kwargs)
+
+    async def stream(self, prompt: Any, **kwargs) -> AsyncIterator[str]:
+        await self._call()
+        words = self._text_for(prompt, **kwargs).split(" ")
+        for i in range(0, len(words), self.chunk_words):
+            chunk = " ".join(words[i : i + self.chunk_words])
+            yield chunk if i + self.chunk_words >= len(words) else chunk + " "
+            await asyncio.sleep(0)
+
+
+# ============================================================================
+# Client + Gateway
+# ============================================================================
+
+
+class LLMClient:
+    """A backend bound to a tier's concurrency pool. Cheap; create freely."""
+
+    def __init__(self, gateway: "LLMGateway", backend: LLMBackend, tier: int):
+        self.gateway = gateway
+        self.backend = backend
+        self.tier = tier
+
+    async def generate(
+        self, prompt: Any, timeout: Optional[float] = None, **kwargs
+    ) -> LLMResponse:
+        """Generate a full response. Cancelling the caller cancels the call."""
+        return await self.gateway._generate(self, prompt, timeout, kwargs)
+
+    def stream(
+        self, prompt: Any, timeout: Optional[float] = None, **kwargs
+    ) -> AsyncIterator[str]:
+        """Yield text chunks as the model produces them."""
+        return self.gateway._stream(self, prompt, timeout, kwargs)
+
+
+class LLMGateway:
+    """
+    Process-wide limiter and retry policy for LLM calls.
+
+    A call holds one global slot and one slot of its tier for as long as it
+    talks to the backend; backoff sleeps between retries hold neither.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        tier_limits: Optional[Dict[int, int]] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base_s: float = DEFAULT_BACKOFF_BASE_S,
+        backoff_max_s: float = DEFAULT_BACKOFF_MAX_S,
+        timeout_s: float = DEFAULT_TIMEOUT_S,
+    ):
+        self.max_concurrency = max_concurrency
+        self.tier_limits = dict(tier_limits or DEFAULT_TIER_LIMITS)
+        self.max_retries = max_retries
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.timeout_s = timeout_s
+
+        # Semaphores belong to an event loop; rebuilt if the loop changes
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._global_sem: Optional[asyncio.Semaphore] = None
+        self._tier_sems: Dict[int, asyncio.Semaphore] = {}
+
+        # Counters
+        self._calls = 0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._retries = 0
+        self._rate_limited = 0
+        self._timeouts = 0
+        self._cancelled = 0
+        self._errors = 0
+        self._latencies_ms: List[float] = []
+
+    def client(self, model_or_backend: Any, tier: int = 1) -> LLMClient:
+        """Client for a raw model (wrapped in GeminiBackend) or a backend."""
+        backend = model_or_backend
+        if not isinstance(backend, LLMBackend):
+            backend = GeminiBackend(model_or_backend)
+        return LLMClient(self, backend, tier)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _semaphores(self, tier: int) -> tuple:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._global_sem = asyncio.Semaphore(self.max_concurrency)
+            self._tier_sems = {}
+        if tier not in self._tier_sems:
+            limit = self.tier_limits.get(tier, self.max_concurrency)
+            self._tier_sems[tier] = asyncio.Semaphore(limit)
+        return self._global_sem, self._tier_sems[tier]
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        cap = min(self.backoff_max_s, self.backoff_base_s * (2**attempt))
+        return random.uniform(0, cap)
+
+    def _enter(self) -> None:
+        self._calls += 1
+        self._in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+
+    def _record_latency(self, start: float) -> float:
+        latency_ms = (time.monotonic() - start) * 1000
+        self._latencies_ms.append(latency_ms)
+        if len(self._latencies_ms) > 1000:
+            del self._latencies_ms[:500]
+        return latency_ms
+
+    async def _generate(
+        self, client: LLMClient, prompt: Any, timeout: Optional[float], kwargs: dict
+    ) -> LLMResponse:
+        timeout = timeout or self.timeout_s
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            global_sem, tier_sem = self._semaphores(client.tier)
+            try:
+                async with global_sem, tier_sem:
+                    self._enter()
+                    try:
+                        text, usage = await asyncio.wait_for(
+                            client.backend.complete(prompt, **kwargs), timeout
+                        )
+                    finally:
+                        self._in_flight -= 1
+                return LLMResponse(
+                    text=text,
+                    latency_ms=self._record_latency(start),
+                    attempts=attempt + 1,
+                    usage_metadata=usage,
+                )
+            except asyncio.TimeoutError:
+                self._timeouts += 1
+                raise
+            except asyncio.CancelledError:
+                self._cancelled += 1
+                raise
+            except Exception as e:
+                if not is_rate_limit(e) or attempt >= self.max_retries:
+                    self._errors += 1
+                    raise
+                self._rate_limited += 1
+                self._retries += 1
+                delay = self._backoff(attempt)
+                attempt += 1
+                logger.warning(
+                    "LLM rate limited (tier %d) — retry %d in %.2fs",
+                    client.tier,
+                    attempt,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+
+    async def _stream(
+        self, client: LLMClient, prompt: Any, timeout: Optional[float], kwargs: dict
+    ) -> AsyncIterator[str]:
+        """
+        Stream chunks. `timeout` bounds the wait for each chunk, not the
+        whole stream. 429s are retried only before the first chunk; after
+        that the caller has already shown partial text.
+        """
+        timeout = timeout or self.timeout_s
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            global_sem, tier_sem = self._semaphores(client.tier)
+            started = False
+            try:
+                async with global_sem, tier_sem:
+                    self._enter()
+                    chunks = client.backend.stream(prompt, **kwargs).__aiter__()
+                    try:
+                        while True:
+                            try:
+                                chunk = await asyncio.wait_for(
+                                    chunks.__anext__(), timeout
+                                )
+                            except StopAsyncIteration:
+                                break
+                            started = True
+                            yield chunk
+                    finally:
+                        self._in_flight -= 1
+                        aclose = getattr(chunks, "aclose", None)
+                        if aclose is not None:
+                            await aclose()
+                self._record_latency(start)
+                return
+            except asyncio.TimeoutError:
+                self._timeouts += 1
+                raise
+            except (asyncio.CancelledError, GeneratorExit):
+                self._cancelled += 1
+                raise
+            except Exception as e:
+                if started or not is_rate_limit(e) or attempt >= self.max_retries:
+                    self._errors += 1
+                    raise
+                self._rate_limited += 1
+                self._retries += 1
+                delay = self._backoff(attempt)
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    # ------------------------------------------------------------------
+    # Observability
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies_ms)
+
+        def pct(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 1)
+
+        return {
+            "max_concurrency": self.max_concurrency,
+            "tier_limits": self.tier_limits,
+            "calls": self._calls,
+            "in_flight": self._in_flight,
+            "peak_in_flight": self._peak_in_flight,
+            "retries": self._retries,
+            "rate_limited": self._rate_limited,
+            "timeouts": self._timeouts,
+            "cancelled": self._cancelled,
+            "errors": self._errors,
+            "latency_p50_ms": pct(0.50),
+            "latency_p95_ms": pct(0.95),
+        }
+
+
+# Process-wide gateway shared by every stage and service
+_gateway: Optional[LLMGateway] = None
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Return the process-wide LLMGateway."""
+    global _gateway
+    if _gateway is None:
+        _gateway = LLMGateway()
+    return _gateway
@@ -8,28 +8,37 @@ Runs the 7-stage pipeline with:
     - Cost tracking per request with budget enforcement
     - DecisionRecord audit trail
     - Per-stage latency measurement
+    - Concurrent execution of independent stages (StageScheduler):
+      Stage 2 ∥ Stage 3, and Stage 5 ∥ speculative Stage 6 template warm-up
+    - Stage 7 audit rows written off the request path by the batched TraceSink
+    - Streaming (process_stream): stage progress, early text and LLM tokens
+      are emitted as they happen; time-to-first-byte is recorded in StageTimings
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional
 
 from sqlalchemy.orm import Session
 
-from .cache import PipelineCache
+from .cache import PipelineCache, get_pipeline_cache
 from .context_assembler import ContextAssembler
 from .cost_tracker import CostTracker
 from .decision_synthesizer import DecisionSynthesizer
 from .execution_logger import ExecutionLogger
 from .input_processor import InputProcessor
 from .intent_classifier import IntentClassifier
+from .response_cache import ResponseCache
 from .response_generator import ResponseGenerator
 from .schemas import (
     ActionPlan,
     ActionStep,
     ActionType,
+    ContextFrame,
+    PipelineEvent,
     PipelineResult,
     PipelineTrace,
     RequestTier,
@@ -37,12 +46,63 @@ from .schemas import (
     StageTimings,
 )
 from .score_engine import ScoreEvaluationEngine
+from .stage_scheduler import StageScheduler
 from .tier_router import TierRouter
+from .trace_sink import TraceSink, get_trace_sink
 from .tradeoff_validator import TradeoffResolution, TradeoffValidator
 
 logger = logging.getLogger("intelligence.pipeline")
 
 
+class _EventEmitter:
+    """
+    Event hook threaded through one pipeline run.
+
+    process_stream() gives it a queue that the caller drains; process()
+    gives it none, so events are dropped and nothing streams.
+    """
+
+    def __init__(
+        self,
+        timings: StageTimings,
+        origin: float,
+        queue: Optional[asyncio.Queue] = None,
+    ):
+        self.timings = timings
+        self.origin = origin
+        self.queue = queue
+
+    @property
+    def streaming(self) -> bool:
+        return self.queue is not None
+
+    def stage(self, name: str, ms: float) -> None:
+        self._emit("stage", stage=name, ms=round(ms, 2))
+
+    def text(self, text: str, generated_by: str) -> None:
+        self._first_byte()
+        self._emit("text", text=text, generated_by=generated_by)
+
+    def token(self, chunk: str) -> None:
+        self._first_byte()
+        self._emit("token", text=chunk)
+
+    def _elapsed_ms(self) -> float:
+        return (time.monotonic() - self.origin) * 1000
+
+    def _first_byte(self) -> None:
+        if self.streaming and not self.timings.time_to_first_byte_ms:
+            self.timings.time_to_first_byte_ms = self._elapsed_ms()
+
+    def _emit(self, event: str, **data: Any) -> None:
+        if self.queue is not None:
+            self.queue.put_nowait(
+                PipelineEvent(
+                    event=event, data=data, elapsed_ms=round(self._elapsed_ms(), 2)
+                )
+            )
+
+
 class IntelligencePipeline:
     """
     Master orchestrator for the HELM 7-stage intelligence pipeline (Phase 2).
@@ -59,6 +119,10 @@ class IntelligencePipeline:
 
     Tier 0 short-circuit: If Stage 3 resolves deterministically with a template,
     skip Stage 5 LLM and Stage 6 LLM. Only template interpolation runs.
+
+    Stages 2 and 3 are independent (classification never reads the
+    ContextFrame), so they run concurrently; p50 for Tier 0/1 approaches the
+    slower of the two rather than their sum.
     """
 
     def __init__(
@@ -69,6 +133,7 @@ class IntelligencePipeline:
         llm_api_key: Optional[str] = None,
         cache: Optional[PipelineCache] = None,
         tier_router: Optional[TierRouter] = None,
+        trace_sink: Optional[TraceSink] = None,
     ):
         """
         Initialize all pipeline stages.
@@ -78,8 +143,11 @@ class IntelligencePipeline:
             llm_model: Lightweight LLM model (Gemini Flash) for Tier 1-2.
             heavy_llm_model: Heavy LLM model (Gemini Pro) for Tier 3.
             llm_api_key: API key (used to detect mock mode).
-            cache: PipelineCache instance (Redis + in-memory).
+            cache: PipelineCache instance (defaults to the process-wide cache).
             tier_router: TierRouter instance for model selection.
+            trace_sink: Background writer for audit rows (process-wide
+                        sink by default; rows are written inline when it
+                        is not running).
         """
         if heavy_llm_model is None:
             heavy_llm_model = llm_model
@@ -93,21 +161,29 @@ class IntelligencePipeline:
             )
 
         self.tier_router = tier_router
-        self.cache = cache or PipelineCache()  # In-memory fallback
+        self.cache = cache or get_pipeline_cache()
+        self.response_cache = ResponseCache(self.cache)
+        self.trace_sink = trace_sink or get_trace_sink()
 
         # Initialize all stages
         self.input_processor = InputProcessor()
         self.context_assembler = ContextAssembler(db=db)
         self.intent_classifier = IntentClassifier(
-            llm_model=llm_model, llm_api_key=llm_api_key
+            llm_model=llm_model,
+            llm_api_key=llm_api_key,
+            llm_client=tier_router.get_client(1),
         )
         self.score_engine = ScoreEvaluationEngine()
         self.tradeoff_validator = TradeoffValidator()
         self.decision_synthesizer = DecisionSynthesizer(
-            heavy_llm_model=heavy_llm_model, llm_api_key=llm_api_key
+            heavy_llm_model=heavy_llm_model,
+            llm_api_key=llm_api_key,
+            llm_client=tier_router.get_client(3),
         )
         self.response_generator = ResponseGenerator(
-            llm_model=llm_model, llm_api_key=llm_api_key
+            llm_model=llm_model,
+            llm_api_key=llm_api_key,
+            llm_client=tier_router.get_client(2),
         )
         self.execution_logger = ExecutionLogger(db=db)
         self.db = db
@@ -124,8 +200,56 @@ class IntelligencePipeline:
         Returns:
             PipelineResult with response, trace, tier, and tradeoff resolution.
         """
+        return await self._process(raw_input, user_id, session_metadata)
+
+    async def process_stream(
+        self,
+        raw_input: str,
+        user_id: str,
+        session_metadata: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[PipelineEvent]:
+        """
+        Process a request, yielding PipelineEvents as the pipeline runs.
+
+        Order: "stage" events as stages finish, then either early "text"
+        (template, clarification, cached response) or "token" events from
+        the Stage 6 LLM, and a "final" event carrying the PipelineResult.
+        Closing the iterator early cancels the run.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def run() -> PipelineResult:
+            try:
+                return await self._process(raw_input, user_id, session_metadata, queue)
+            finally:
+                queue.put_nowait(None)
+
+        task = asyncio.create_task(run())
+        try:
+            while (event := await queue.get()) is not None:
+                yield event
+            result = await task
+            yield PipelineEvent(
+                event="final",
+                data=result.model_dump(mode="json"),
+                elapsed_ms=round(result.trace.timings.total_ms, 2),
+            )
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.wait({task})
+
+    async def _process(
+        self,
+        raw_input: str,
+        user_id: str,
+        session_metadata: Optional[Dict[str, Any]] = None,
+        events: Optional[asyncio.Queue] = None,
+    ) -> PipelineResult:
+        """Run the pipeline; stream events into `events` when given."""
         timings = StageTimings()
         pipeline_start = time.monotonic()
+        emitter = _EventEmitter(timings, pipeline_start, events)
 
         try:
             # ============================================================
@@ -138,28 +262,21 @@ class IntelligencePipeline:
                 session_metadata=session_metadata,
             )
             timings.input_processing_ms = (time.monotonic() - t0) * 1000
+            emitter.stage("input_processing", timings.input_processing_ms)
 
             # ============================================================
-            # Stage 2: Context Assembly (Cached + Deterministic)
-            # ============================================================
-            t0 = time.monotonic()
-            # Try cache first
-            from .schemas import ContextFrame
-
-            cached_ctx = self.cache.get("ctx", user_id, ContextFrame)
-            if cached_ctx:
-                context = cached_ctx
-            else:
-                context = await self.context_assembler.assemble(envelope)
-                self.cache.set("ctx", user_id, context)
-            timings.context_assembly_ms = (time.monotonic() - t0) * 1000
-
-            # ============================================================
-            # Stage 3: Intent Classification (Tiered)
+            # Stage 2 ∥ Stage 3: Context Assembly + Intent Classification
             # ============================================================
-            t0 = time.monotonic()
-            intent = await self.intent_classifier.classify(envelope, context)
-            timings.intent_classification_ms = (time.monotonic() - t0) * 1000
+            scheduler = StageScheduler(origin=pipeline_start)
+            scheduler.add("context", lambda: self._load_context(envelope))
+            scheduler.add("intent", lambda: self.intent_classifier.classify(envelope))
+            results = await scheduler.run()
+            context, intent = results["context"], results["intent"]
+            timings.context_assembly_ms = scheduler.duration_ms("context")
+            timings.intent_classification_ms = scheduler.duration_ms("intent")
+            self._record_schedule(timings, scheduler)
+            emitter.stage("context_assembly", timings.context_assembly_ms)
+            emitter.stage("intent_classification", timings.intent_classification_ms)
 
             # Determine tier for cost tracking
             tier = intent.tier if isinstance(intent.tier, int) else intent.tier.value
@@ -179,6 +296,7 @@ class IntelligencePipeline:
             t0 = time.monotonic()
             scores = self.score_engine.evaluate(intent, context)
             timings.score_evaluation_ms = (time.monotonic() - t0) * 1000
+            emitter.stage("score_evaluation", timings.score_evaluation_ms)
 
             # ============================================================
             # Stage 4.5: Tradeoff Validation (Deterministic)
@@ -186,6 +304,7 @@ class IntelligencePipeline:
             t0 = time.monotonic()
             tradeoff = self.tradeoff_validator.validate(scores, intent, context)
             timings.tradeoff_validation_ms = (time.monotonic() - t0) * 1000
+            emitter.stage("tradeoff_validation", timings.tradeoff_validation_ms)
 
             logger.info(
                 "Tradeoff validation: resolution=%s, reason=%s",
@@ -205,6 +324,7 @@ class IntelligencePipeline:
                     steps=[ActionStep(action_type=ActionType.RESPOND_ONLY)],
                     synthesized_by="tradeoff_validator",
                 )
+                emitter.text(response.text, response.generated_by)
                 return self._finalize(
                     envelope,
                     context,
@@ -231,6 +351,7 @@ class IntelligencePipeline:
                     steps=[ActionStep(action_type=ActionType.RESPOND_ONLY)],
                     synthesized_by="tradeoff_validator",
                 )
+                emitter.text(response.text, response.generated_by)
                 return self._finalize(
                     envelope,
                     context,
@@ -250,14 +371,55 @@ class IntelligencePipeline:
                 tier = 3
                 cost_tracker = CostTracker(tier=3, tier_router=self.tier_router)
 
+            # ============================================================
+            # Response cache (Tier 0–2): reuse Stage 5 + 6 output
+            # ============================================================
+            template_id = self.decision_synthesizer.template_id_for(intent)
+            resp_key = None
+            if self.response_cache.eligible(tier):
+                resp_key = self.response_cache.key_for(user_id, intent, template_id)
+                cached = self.response_cache.get(resp_key)
+                if cached is not None:
+                    logger.info("Response cache HIT: intent=%s", intent.intent)
+                    emitter.text(cached.response.text, "response_cache")
+                    return self._finalize(
+                        envelope,
+                        context,
+                        intent,
+                        scores,
+                        cached.action_plan,
+                        cached.response,
+                        user_id,
+                        timings,
+                        cost_tracker,
+                        tradeoff.resolution.value,
+                        pipeline_start,
+                        response_cache_hit=True,
+                    )
+
             # ============================================================
             # Stage 5: Decision Synthesis (Templates + optional LLM)
             # ============================================================
-            t0 = time.monotonic()
-            action_plan = await self.decision_synthesizer.synthesize(
-                intent, scores, context
+            # Stage 6's template path is warmed speculatively while Stage 5
+            # runs (it only needs the predicted template id).
+            scheduler = StageScheduler(origin=pipeline_start)
+            scheduler.add(
+                "synthesis",
+                lambda: self.decision_synthesizer.synthesize(intent, scores, context),
+            )
+            scheduler.add(
+                "template_warmup",
+                lambda: self.response_generator.warm_template(
+                    template_id,
+                    scores,
+                    context,
+                    intent,
+                ),
             )
-            timings.decision_synthesis_ms = (time.monotonic() - t0) * 1000
+            action_plan = (await scheduler.run())["synthesis"]
+            timings.decision_synthesis_ms = scheduler.duration_ms("synthesis")
+            self._record_schedule(timings, scheduler)
+            emitter.stage("decision_synthesis", timings.decision_synthesis_ms)
 
             if action_plan.llm_tokens_used > 0:
                 cost_tracker.record_usage(
@@ -269,11 +431,20 @@ class IntelligencePipeline:
             # ============================================================
             # Stage 6: Response Generation (Templates + optional LLM)
             # ============================================================
+            # LLM responses stream token by token; anything else is sent as
+            # soon as Stage 6 returns, ahead of Stage 7.
             t0 = time.monotonic()
             response = await self.response_generator.generate(
-                action_plan, scores, context, intent
+                action_plan,
+                scores,
+                context,
+                intent,
+                on_token=emitter.token if emitter.streaming else None,
             )
             timings.response_generation_ms = (time.monotonic() - t0) * 1000
+            emitter.stage("response_generation", timings.response_generation_ms)
+            if not timings.time_to_first_byte_ms:
+                emitter.text(response.text, response.generated_by)
 
             if response.llm_tokens_used > 0:
                 cost_tracker.record_usage(
@@ -282,6 +453,11 @@ class IntelligencePipeline:
                     output_tokens=int(response.llm_tokens_used * 0.4),
                 )
 
+            response_cache_hit = None
+            if resp_key is not None:
+                self.response_cache.put(resp_key, user_id, action_plan, response)
+                response_cache_hit = False
+
             # ============================================================
             # Finalize: Stage 7 + DecisionRecord + cost summary
             # ============================================================
@@ -297,6 +473,7 @@ class IntelligencePipeline:
                 cost_tracker,
                 tradeoff.resolution.value,
                 pipeline_start,
+                response_cache_hit=response_cache_hit,
             )
 
         except Exception as e:
@@ -320,6 +497,24 @@ class IntelligencePipeline:
                 tier=0,
             )
 
+    # ------------------------------------------------------------------
+    # Stage helpers
+    # ------------------------------------------------------------------
+
+    async def _load_context(self, envelope) -> ContextFrame:
+        """Stage 2: cached ContextFrame, assembled from the DB on a miss."""
+        return await self.cache.get_or_load_context(
+            envelope.user_id,
+            ContextFrame,
+            lambda: self.context_assembler.assemble(envelope),
+        )
+
+    @staticmethod
+    def _record_schedule(timings: StageTimings, scheduler: StageScheduler) -> None:
+        """Fold a scheduler run's overlap and spans into StageTimings."""
+        timings.parallel_overlap_ms += scheduler.overlap_ms()
+        timings.stage_spans.update(scheduler.span_dict())
+
     # ------------------------------------------------------------------
     # Finalize helper — Runs Stage 7 and produces PipelineResult
     # ------------------------------------------------------------------
@@ -337,15 +532,17 @@ class IntelligencePipeline:
         cost_tracker,
         tradeoff_resolution,
         pipeline_start,
+        response_cache_hit: Optional[bool] = None,
     ) -> PipelineResult:
         """Run Stage 7 (sync), write DecisionRecord, and return PipelineResult."""
-        import asyncio
-
         tier = intent.tier if isinstance(intent.tier, int) else intent.tier.value
 
         # Stage 7: Execution & Logging
         t0 = time.monotonic()
         timings.total_ms = (time.monotonic() - pipeline_start) * 1000
+        if not timings.time_to_first_byte_ms:
+            # Nothing streamed: the caller gets the whole response at once
+            timings.time_to_first_byte_ms = timings.total_ms
 
         # Run async logger synchronously if not in event loop,
         # otherwise create task
@@ -402,6 +599,10 @@ class IntelligencePipeline:
                 tradeoff_resolution,
             )
 
+        if response_cache_hit is not None:
+            trace.response_cache_hit = response_cache_hit
+            trace.response_cache_hit_rate = self.response_cache.hit_rate()
+
         # Persist trace and DecisionRecord
         self._persist_trace(
             trace, intent, scores, action_plan, cost_summary, tradeoff_resolution
@@ -477,73 +678,78 @@ class IntelligencePipeline:
     def _persist_trace(
         self, trace, intent, scores, action_plan, cost_summary, tradeoff_resolution
     ):
-        """Write PipelineTrace to intelligence_traces table."""
+        """Queue PipelineTrace for the intelligence_traces table."""
         try:
             from models.intelligence_models import PipelineTraceRecord
-
-            record = PipelineTraceRecord(
-                execution_id=trace.execution_id,
-                request_id=trace.request_id,
-                user_id=trace.user_id,
-                timestamp=trace.timestamp,
-                tier=trace.tier,
-                intent_type=intent.intent,
-                confidence=intent.confidence,
-                score_deltas_json=trace.score_deltas,
-                action_plan_json=trace.action_plan,
-                response_text=(trace.response_envelope or {}).get("text", "")[:2000],
-                input_tokens=cost_summary.total_input_tokens,
-                output_tokens=cost_summary.total_output_tokens,
-                latency_ms=trace.timings.total_ms,
-                stage_timings_json=trace.timings.model_dump(),
-                execution_success=True,
-                estimated_cost_usd=cost_summary.estimated_cost_usd,
-                tradeoff_resolution=tradeoff_resolution,
-            )
-            self.db.add(record)
-            self.db.commit()
         except ImportError:
             logger.warning("PipelineTraceRecord not available — trace not persisted")
-        except Exception as e:
-            logger.error("Failed to persist trace: %s", e)
-            self.db.rollback()
+            return
+
+        row = dict(
+            execution_id=trace.execution_id,
+            request_id=trace.request_id,
+            user_id=trace.user_id,
+            timestamp=trace.timestamp,
+            tier=trace.tier,
+            intent_type=intent.intent,
+            confidence=intent.confidence,
+            score_deltas_json=trace.score_deltas,
+            action_plan_json=trace.action_plan,
+            response_text=(trace.response_envelope or {}).get("text", "")[:2000],
+            input_tokens=cost_summary.total_input_tokens,
+            output_tokens=cost_summary.total_output_tokens,
+            latency_ms=trace.timings.total_ms,
+            stage_timings_json=trace.timings.model_dump(),
+            execution_success=True,
+            estimated_cost_usd=cost_summary.estimated_cost_usd,
+            tradeoff_resolution=tradeoff_resolution,
+        )
+        self._persist_row(PipelineTraceRecord, row)
 
     def _persist_decision_record(
         self, trace, intent, scores, action_plan, cost_summary, tradeoff_resolution
     ):
-        """Write DecisionRecord (small, immutable, audit-ready)."""
+        """Queue DecisionRecord (small, immutable, audit-ready)."""
         try:
             from models.intelligence_models import DecisionRecord
-
-            # Determine primary action type
-            action_type = "respond_only"
-            if action_plan.steps:
-                action_type = action_plan.steps[0].action_type
-                if hasattr(action_type, "value"):
-                    action_type = action_type.value
-
-            record = DecisionRecord(
-                execution_id=trace.execution_id,
-                user_id=trace.user_id,
-                timestamp=trace.timestamp,
-                intent_type=intent.intent,
-                tier=trace.tier,
-                confidence=intent.confidence,
-                action_type=action_type,
-                wealth_delta=scores.wealth.delta,
-                health_delta=scores.health.delta,
-                time_delta=scores.time.delta,
-                net_impact=scores.net_impact,
-                tradeoff_resolution=tradeoff_resolution,
-                has_tradeoff=scores.has_tradeoff,
-                total_tokens=cost_summary.total_tokens,
-                estimated_cost_usd=cost_summary.estimated_cost_usd,
-                execution_success=True,
-            )
-            self.db.add(record)
-            self.db.commit()
         except ImportError:
             logger.warning("DecisionRecord not available — not persisted")
+            return
+
+        # Determine primary action type
+        action_type = "respond_only"
+        if action_plan.steps:
+            action_type = action_plan.steps[0].action_type
+            if hasattr(action_type, "value"):
+                action_type = action_type.value
+
+        row = dict(
+            execution_id=trace.execution_id,
+            user_id=trace.user_id,
+            timestamp=trace.timestamp,
+            intent_type=intent.intent,
+            tier=trace.tier,
+            confidence=intent.confidence,
+            action_type=action_type,
+            wealth_delta=scores.wealth.delta,
+            health_delta=scores.health.delta,
+            time_delta=scores.time.delta,
+            net_impact=scores.net_impact,
+            tradeoff_resolution=tradeoff_resolution,
+            has_tradeoff=scores.has_tradeoff,
+            total_tokens=cost_summary.total_tokens,
+            estimated_cost_usd=cost_summary.estimated_cost_usd,
+            execution_success=True,
+        )
+        self._persist_row(DecisionRecord, row)
+
+    def _persist_row(self, model, row: Dict[str, Any]) -> None:
+        """Hand a row to the trace sink; write inline if it can't take it."""
+        if self.trace_sink.offer(model, row):
+            return
+        try:
+            self.db.add(model(**row))
+            self.db.commit()
         except Exception as e:
-            logger.error("Failed to persist DecisionRecord: %s", e)
+            logger.error("Failed to persist %s: %s", model.__name__, e)
             self.db.rollback()
@@ -0,0 +1,144 @@
+"""
+Response Cache — Reuse Stage 5/6 Output for Repeated Tier 0–2 Questions.
+
+"What is my balance?" asked twice in five minutes produces the same
+ActionPlan and ResponseEnvelope as long as the user's context has not
+changed. This cache stores that pair in PipelineCache's `resp` namespace and
+is consulted after tradeoff validation, before Stage 5.
+
+Key: hash(user_id, intent, normalized entities, normalized message text,
+          conversation context, context version, template id)
+
+    - message text / conversation context: LLM-generated answers (general
+      conversation, decision-engine intents, local search) are built from
+      them, so two questions with the same intent and entities are only
+      the same question when their text matches (case, punctuation and
+      whitespace ignored)
+    - context version: any ctx-affecting InvalidationEvent bumps it, so
+      those events orphan every cached response for the user at once
+    - entries are also tagged with the user_id, so the events that map to
+      "resp" in _EVENT_INVALIDATION_MAP delete them explicitly
+
+Only side-effect-free plans (every step RESPOND_ONLY) are stored. Plans that
+dispatch to financial/calendar/mobility services are always recomputed.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import uuid
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+from .cache import PipelineCache
+from .schemas import ActionPlan, ActionType, IntentResult, ResponseEnvelope
+
+logger = logging.getLogger("intelligence.response_cache")
+
+NAMESPACE = "resp"
+MAX_CACHEABLE_TIER = 2
+
+_NON_WORD = re.compile(r"[^\w\s]")
+
+
+class CachedResponse(BaseModel):
+    """Stage 5 + Stage 6 output stored together."""
+
+    action_plan: ActionPlan
+    response: ResponseEnvelope
+
+
+class ResponseCache:
+    """Semantic response cache over PipelineCache's `resp` namespace."""
+
+    def __init__(self, cache: PipelineCache):
+        self.cache = cache
+
+    @staticmethod
+    def eligible(tier: int) -> bool:
+        """Tier 0–2 only; Tier 3 (heavy reasoning) is never reused."""
+        return tier <= MAX_CACHEABLE_TIER
+
+    def key_for(
+        self, user_id: str, intent: IntentResult, template_id: Optional[str]
+    ) -> str:
+        version = self.cache.get_user_version(user_id)
+        return PipelineCache.hash_key(
+            user_id,
+            intent.intent,
+            self._normalize_entities(intent.entities),
+            self._normalize_text(intent.original_text),
+            self._normalize_text(intent.conversation_context),
+            f"v{version}",
+            template_id or "",
+        )
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Cached pair with a fresh plan_id, or None."""
+        cached = self.cache.get(NAMESPACE, key, CachedResponse)
+        if cached is None:
+            return None
+        # Every execution gets its own plan id in the audit trail
+        cached.action_plan = cached.action_plan.model_copy(
+            update={"plan_id": str(uuid.uuid4())}
+        )
+        return cached
+
+    def put(
+        self,
+        key: str,
+        user_id: str,
+        action_plan: ActionPlan,
+        response: ResponseEnvelope,
+    ) -> bool:
+        """Store the pair if the plan has no side effects. Returns True if stored."""
+        if not self._side_effect_free(action_plan):
+            return False
+        try:
+            self.cache.set(
+                NAMESPACE,
+                key,
+                CachedResponse(action_plan=action_plan, response=response),
+                user_id=user_id,
+            )
+        except Exception as e:  # e.g. non-serializable response data
+            logger.debug("Response not cached: %s", e)
+            return False
+        return True
+
+    def hit_rate(self) -> float:
+        return self.cache.namespace_stats(NAMESPACE)["hit_rate"]
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _normalize_entities(entities: Dict[str, Any]) -> str:
+        """Order- and case-insensitive canonical form of extracted entities."""
+
+        def norm(value: Any) -> Any:
+            if isinstance(value, str):
+                return " ".join(value.lower().split())
+            if isinstance(value, dict):
+                return {k: norm(v) for k, v in value.items()}
+            if isinstance(value, (list, tuple)):
+                return [norm(v) for v in value]
+            return value
+
+        return json.dumps(norm(entities or {}), sort_keys=True, default=str)
+
+    @staticmethod
+    def _normalize_text(text: Optional[str]) -> str:
+        """Lowercased words of the text, punctuation and spacing dropped."""
+        return " ".join(_NON_WORD.sub(" ", (text or "").lower()).split())
+
+    @staticmethod
+    def _side_effect_free(action_plan: ActionPlan) -> bool:
+        return all(
+            step.action_type in (ActionType.RESPOND_ONLY, ActionType.RESPOND_ONLY.value)
+            for step in action_plan.steps
+        )
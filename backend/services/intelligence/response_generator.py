@@ -13,8 +13,9 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
+from .llm_gateway import LLMClient, get_llm_gateway
 from .schemas import (
     ActionPlan,
     ContextFrame,
@@ -170,14 +171,47 @@ class ResponseGenerator:
     or lightweight LLM (Tier 1–2) with HELM's persona.
     """
 
-    def __init__(self, llm_model=None, llm_api_key: Optional[str] = None):
+    def __init__(
+        self,
+        llm_model=None,
+        llm_api_key: Optional[str] = None,
+        llm_client: Optional[LLMClient] = None,
+    ):
         """
         Args:
             llm_model: Lightweight LLM model for personalized responses.
             llm_api_key: API key (to check mock mode).
+            llm_client: Gateway client to call the model through (built
+                        from llm_model on the process-wide gateway if None).
         """
         self.llm_model = llm_model
         self.llm_api_key = llm_api_key
+        if llm_client is None and llm_model is not None:
+            llm_client = get_llm_gateway().client(llm_model, tier=2)
+        self.llm_client = llm_client
+        # Speculatively rendered template response: (template_id, envelope)
+        self._warmed: Optional[tuple] = None
+
+    async def warm_template(
+        self,
+        template_id: Optional[str],
+        scores: ScoreDeltas,
+        context: ContextFrame,
+        intent: IntentResult,
+    ) -> None:
+        """
+        Pre-render the template response for a predicted template_id.
+
+        The pipeline calls this while Stage 5 runs; if synthesis picks the same
+        template, generate() reuses the result instead of rendering again.
+        """
+        self._warmed = None
+        if not template_id or template_id not in RESPONSE_TEMPLATES:
+            return
+        self._warmed = (
+            template_id,
+            self._render_template(template_id, scores, context, intent),
+        )
 
     async def generate(
         self,
@@ -185,6 +219,7 @@ class ResponseGenerator:
         scores: ScoreDeltas,
         context: ContextFrame,
         intent: IntentResult,
+        on_token: Optional[Callable[[str], None]] = None,
     ) -> ResponseEnvelope:
         """
         Generate user-facing response.
@@ -192,6 +227,9 @@ class ResponseGenerator:
         Tier 0: Template interpolation.
         Tier 1-2: LLM with HELM persona.
         Tier 3: LLM already handled in synthesis — just format.
+
+        If on_token is given, the LLM path streams and calls it with each
+        text chunk as it arrives; the returned envelope holds the full text.
         """
         template_id = action_plan.response_template_id
 
@@ -226,31 +264,16 @@ class ResponseGenerator:
 
         # --- Template path (Tier 0) ---
         if template_id and template_id in RESPONSE_TEMPLATES:
-            # Check for crisis-mode override
-            if context.crisis_mode and template_id in CRISIS_TEMPLATE_OVERRIDES:
-                text = self._interpolate_template(
-                    template_id,
-                    context,
-                    intent,
-                    scores,
-                    template_override=CRISIS_TEMPLATE_OVERRIDES[template_id],
-                )
-                logger.info("Using crisis-mode template override for '%s'", template_id)
-            else:
-                text = self._interpolate_template(template_id, context, intent, scores)
-            text = self._append_score_context(text, scores, context)
-
-            return ResponseEnvelope(
-                text=text,
-                response_type=self._infer_response_type(intent.intent),
-                data=self._build_response_data(intent, context),
-                generated_by="template",
-                template_id=template_id,
-            )
+            warmed, self._warmed = self._warmed, None
+            if warmed is not None and warmed[0] == template_id:
+                return warmed[1]
+            return self._render_template(template_id, scores, context, intent)
 
         # --- LLM path (Tier 1-3) ---
-        if self.llm_model and self.llm_api_key != "mock":
-            return await self._generate_with_llm(action_plan, scores, context, intent)
+        if self.llm_client and self.llm_api_key != "mock":
+            return await self._generate_with_llm(
+                action_plan, scores, context, intent, on_token
+            )
 
         # --- Fallback ---
         return ResponseEnvelope(
@@ -263,6 +286,36 @@ class ResponseGenerator:
     # Template Interpolation
     # ------------------------------------------------------------------
 
+    def _render_template(
+        self,
+        template_id: str,
+        scores: ScoreDeltas,
+        context: ContextFrame,
+        intent: IntentResult,
+    ) -> ResponseEnvelope:
+        """Build the full template-path ResponseEnvelope."""
+        # Check for crisis-mode override
+        if context.crisis_mode and template_id in CRISIS_TEMPLATE_OVERRIDES:
+            text = self._interpolate_template(
+                template_id,
+                context,
+                intent,
+                scores,
+                template_override=CRISIS_TEMPLATE_OVERRIDES[template_id],
+            )
+            logger.info("Using crisis-mode template override for '%s'", template_id)
+        else:
+            text = self._interpolate_template(template_id, context, intent, scores)
+        text = self._append_score_context(text, scores, context)
+
+        return ResponseEnvelope(
+            text=text,
+            response_type=self._infer_response_type(intent.intent),
+            data=self._build_response_data(intent, context),
+            generated_by="template",
+            template_id=template_id,
+        )
+
     def _interpolate_template(
         self,
         template_id: str,
@@ -390,19 +443,22 @@ class ResponseGenerator:
         scores: ScoreDeltas,
         context: ContextFrame,
         intent: IntentResult,
+        on_token: Optional[Callable[[str], None]] = None,
     ) -> ResponseEnvelope:
         """Generate personalized response via lightweight LLM."""
         try:
-            import asyncio
-
             prompt = self._build_response_prompt(action_plan, scores, context, intent)
 
-            response = await asyncio.to_thread(
-                self.llm_model.generate_content,
-                prompt,
-            )
+            if on_token is None:
+                text = (await self.llm_client.generate(prompt)).text
+            else:
+                chunks = []
+                async for chunk in self.llm_client.stream(prompt):
+                    chunks.append(chunk)
+                    on_token(chunk)
+                text = "".join(chunks)
 
-            text = response.text.strip()
+            text = text.strip()
             tokens_est = (len(prompt) + len(text)) // 4
 
             logger.info("LLM response generated (tokens~%d)", tokens_est)
@@ -600,10 +656,8 @@ Do NOT mention scores, deltas, or policies. Speak like a trusted advisor."""
             return resolved.strip()[:60]
 
         # Prefer an LLM extraction (best at resolving "some" → the real topic).
-        if self.llm_model and self.llm_api_key != "mock":
+        if self.llm_client and self.llm_api_key != "mock":
             try:
-                import asyncio
-
                 prompt = (
                     "From this conversation, output a short (2-4 word) Google Maps "
                     "search term for the kind of place the user wants near them. "
@@ -611,7 +665,7 @@ Do NOT mention scores, deltas, or policies. Speak like a trusted advisor."""
                     f"Context:\n{intent.conversation_context or '(none)'}\n"
                     f"User: {intent.original_text}\nSearch term:"
                 )
-                resp = await asyncio.to_thread(self.llm_model.generate_content, prompt)
+                resp = await self.llm_client.generate(prompt)
                 term = (getattr(resp, "text", "") or "").strip()
                 term = term.splitlines()[0].strip("\"'.` ")[:60] if term else ""
                 if term:
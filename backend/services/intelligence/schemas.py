@@ -370,11 +370,23 @@ class StageTimings(BaseModel):
     execution_logging_ms: float = 0.0
     total_ms: float = 0.0
 
+    # Concurrent stage execution (StageScheduler): wall-clock time saved by
+    # overlapping independent stages, and each stage's [start_ms, end_ms]
+    # relative to pipeline start.
+    parallel_overlap_ms: float = 0.0
+    stage_spans: Dict[str, List[float]] = Field(default_factory=dict)
+
+    # Time until the first response text was available to the caller: the
+    # first streamed token or early template/clarification text for
+    # process_stream(), the complete response for process().
+    time_to_first_byte_ms: float = 0.0
+
 
 class PipelineTrace(BaseModel):
     """
     Complete audit record for a single pipeline execution.
-    Written synchronously before response is returned.
+    Built before the response is returned; persisted by the background
+    TraceSink (or inline when the sink is not running).
     Append-only, immutable, queryable.
 
     This is the source of truth for compliance, debugging, and the learning loop.
@@ -412,6 +424,10 @@ class PipelineTrace(BaseModel):
     cost_summary: Optional[Dict[str, Any]] = None
     tradeoff_resolution: Optional[str] = None  # proceed/clarify/escalate/safe_minimal
 
+    # Response cache (None = request was not eligible for the cache)
+    response_cache_hit: Optional[bool] = None
+    response_cache_hit_rate: Optional[float] = None  # process-wide, resp namespace
+
     class Config:
         use_enum_values = True
 
@@ -421,6 +437,20 @@ class PipelineTrace(BaseModel):
 # ============================================================================
 
 
+class PipelineEvent(BaseModel):
+    """
+    One event from IntelligencePipeline.process_stream().
+
+    event: "stage" (a stage finished), "text" (early template or
+    clarification text), "token" (LLM text chunk) or "final" (data holds
+    the PipelineResult; always the last event).
+    """
+
+    event: str
+    data: Dict[str, Any] = Field(default_factory=dict)
+    elapsed_ms: float = 0.0
+
+
 class PipelineResult(BaseModel):
     """Top-level result from IntelligencePipeline.process()."""
 
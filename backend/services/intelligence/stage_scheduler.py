@@ -0,0 +1,138 @@
+"""
+Stage Scheduler — Dependency-Aware Concurrent Stage Execution.
+
+Stages declare which earlier stages they depend on. Every stage whose
+dependencies have completed is started immediately, so independent stages
+(e.g. Stage 2 context assembly and Stage 3 intent classification) overlap
+instead of running back to back.
+
+Each stage's start/end offset is recorded so the pipeline can report how much
+wall-clock time the overlap saved (StageTimings.parallel_overlap_ms).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+StageFn = Callable[..., Awaitable[Any]]
+
+
+@dataclass
+class StageSpan:
+    """When a stage ran, in ms relative to the scheduler's origin."""
+
+    start_ms: float
+    end_ms: float
+
+    @property
+    def duration_ms(self) -> float:
+        return self.end_ms - self.start_ms
+
+
+class StageScheduler:
+    """
+    Runs a small DAG of async pipeline stages.
+
+    Usage:
+        scheduler = StageScheduler(origin=pipeline_start)
+        scheduler.add("context", load_context)
+        scheduler.add("intent", classify)
+        scheduler.add("scores", evaluate, depends_on=("context", "intent"))
+        results = await scheduler.run()
+
+    A stage function receives its dependencies' results as keyword arguments
+    named after the dependency. Dependencies must be registered before the
+    stages that use them, which also rules out cycles.
+
+    If any stage raises, the remaining stages are cancelled and the first
+    exception propagates to the caller.
+    """
+
+    def __init__(self, origin: Optional[float] = None):
+        """
+        Args:
+            origin: time.monotonic() reference for recorded spans
+                    (defaults to the moment run() is called).
+        """
+        self._origin = origin
+        self._stages: Dict[str, Tuple[StageFn, Tuple[str, ...]]] = {}
+        self.spans: Dict[str, StageSpan] = {}
+
+    def add(self, name: str, fn: StageFn, depends_on: Iterable[str] = ()) -> None:
+        """Register a stage."""
+        deps = tuple(depends_on)
+        if name in self._stages:
+            raise ValueError(f"Stage '{name}' already registered")
+        for dep in deps:
+            if dep not in self._stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+        self._stages[name] = (fn, deps)
+
+    async def run(self) -> Dict[str, Any]:
+        """Run all stages, maximally concurrent. Returns {stage_name: result}."""
+        if self._origin is None:
+            self._origin = time.monotonic()
+
+        tasks: Dict[str, asyncio.Task] = {}
+        for name, (fn, deps) in self._stages.items():
+            tasks[name] = asyncio.ensure_future(
+                self._run_stage(name, fn, deps, [tasks[d] for d in deps])
+            )
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+
+        return {name: task.result() for name, task in tasks.items()}
+
+    async def _run_stage(
+        self,
+        name: str,
+        fn: StageFn,
+        dep_names: Tuple[str, ...],
+        dep_tasks: List[asyncio.Task],
+    ) -> Any:
+        dep_results = await asyncio.gather(*dep_tasks) if dep_tasks else []
+        start = self._elapsed_ms()
+        try:
+            return await fn(**dict(zip(dep_names, dep_results)))
+        finally:
+            self.spans[name] = StageSpan(start, self._elapsed_ms())
+
+    def _elapsed_ms(self) -> float:
+        return (time.monotonic() - self._origin) * 1000
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def duration_ms(self, name: str) -> float:
+        span = self.spans.get(name)
+        return span.duration_ms if span else 0.0
+
+    def overlap_ms(self) -> float:
+        """
+        Wall-clock time saved by concurrency: the sum of stage durations
+        minus the wall time those stages actually spanned.
+        """
+        if not self.spans:
+            return 0.0
+        busy = sum(s.duration_ms for s in self.spans.values())
+        wall = max(s.end_ms for s in self.spans.values()) - min(
+            s.start_ms for s in self.spans.values()
+        )
+        return max(0.0, busy - wall)
+
+    def span_dict(self) -> Dict[str, List[float]]:
+        """Spans as {name: [start_ms, end_ms]} for StageTimings.stage_spans."""
+        return {
+            name: [round(s.start_ms, 3), round(s.end_ms, 3)]
+            for name, s in self.spans.items()
+        }
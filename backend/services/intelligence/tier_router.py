@@ -7,6 +7,8 @@ Provides tier-aware model selection for the HELM pipeline:
     - Tier 3: Heavy reasoning model (Gemini Pro)
 
 Token budgets are hard limits — LLM call is skipped if budget exceeded.
+Clients are handed out through the process-wide LLMGateway, which enforces
+global and per-tier concurrency limits.
 """
 
 from __future__ import annotations
@@ -15,6 +17,7 @@ import logging
 from dataclasses import dataclass, field
 from typing import Any, Dict, Optional
 
+from .llm_gateway import LLMClient, LLMGateway, get_llm_gateway
 from .schemas import RequestTier
 
 logger = logging.getLogger("intelligence.tier_router")
@@ -88,6 +91,7 @@ class TierRouter:
         heavy_model=None,
         api_key: Optional[str] = None,
         tier_configs: Optional[Dict[int, TierConfig]] = None,
+        gateway: Optional[LLMGateway] = None,
     ):
         """
         Args:
@@ -95,11 +99,13 @@ class TierRouter:
             heavy_model: Pre-configured heavy LLM (Gemini Pro).
             api_key: API key (for mock detection).
             tier_configs: Override default tier configurations.
+            gateway: LLMGateway for clients (process-wide by default).
         """
         self.light_model = light_model
         self.heavy_model = heavy_model or light_model
         self.api_key = api_key
         self.tier_configs = tier_configs or DEFAULT_TIER_CONFIGS
+        self.gateway = gateway or get_llm_gateway()
 
     def get_model_for_tier(self, tier: int):
         """
@@ -119,6 +125,17 @@ class TierRouter:
             return self.heavy_model
         return self.light_model
 
+    def get_client(self, tier: int) -> Optional[LLMClient]:
+        """
+        Get a gateway client for a given tier.
+
+        Returns None whenever get_model_for_tier does.
+        """
+        model = self.get_model_for_tier(tier)
+        if model is None:
+            return None
+        return self.gateway.client(model, tier=tier)
+
     def get_config(self, tier: int) -> TierConfig:
         """Get tier configuration."""
         return self.tier_configs.get(tier, self.tier_configs[1])
@@ -0,0 +1,238 @@
+"""
+Trace Sink — Background, Batched Persistence for Stage 7 Audit Rows.
+
+The pipeline used to db.add + db.commit a PipelineTraceRecord and a
+DecisionRecord before returning every response. The sink takes those rows
+off the request path:
+
+    pipeline ──offer()──► bounded asyncio.Queue ──► worker ──► bulk INSERT
+                                                    (flush on batch size
+                                                     or flush interval)
+
+Backpressure: offer() never blocks. When the sink is not running (scripts,
+tests) or the queue is full, it returns False and the caller writes the row
+inline as before — audit rows are never silently dropped.
+
+Lifecycle: start() on application startup, stop() on shutdown. stop()
+drains everything already queued before returning.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("intelligence.trace_sink")
+
+# Defaults: a chat turn produces two rows, so 200 rows ≈ 100 turns per commit.
+DEFAULT_MAX_QUEUE = 10_000
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_FLUSH_INTERVAL_S = 0.5
+
+_STOP = object()
+
+
+class TraceSink:
+    """
+    Bounded queue + single worker that bulk-inserts audit rows in batches.
+
+    Rows are (model_class, column_dict) pairs; each batch is grouped by model
+    and written with one executemany INSERT per model and one commit.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Any]] = None,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_S,
+    ):
+        self._session_factory = session_factory
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        # Counters
+        self._enqueued = 0
+        self._rejected = 0  # queue full → caller wrote inline
+        self._written = 0
+        self._failed = 0
+        self._batches = 0
+        self._high_watermark = 0
+        self._last_flush_ms = 0.0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self) -> None:
+        """Start the background worker on the running event loop."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._worker = asyncio.create_task(self._run(), name="trace-sink")
+        logger.info(
+            "Trace sink started (batch=%d, interval=%.2fs, max_queue=%d)",
+            self.batch_size,
+            self.flush_interval,
+            self.max_queue,
+        )
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Flush every queued row, then stop the worker."""
+        if not self.running:
+            return
+        await self._queue.put(_STOP)
+        try:
+            await asyncio.wait_for(self._worker, timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.error(
+                "Trace sink drain timed out with %d rows queued", self._queue.qsize()
+            )
+            self._worker.cancel()
+        self._worker = None
+        logger.info("Trace sink stopped: %s", self.stats())
+
+    # ------------------------------------------------------------------
+    # Producer API
+    # ------------------------------------------------------------------
+
+    def offer(self, model: type, row: Dict[str, Any]) -> bool:
+        """
+        Queue a row for background insert. Never blocks.
+
+        Returns False when the sink is not running or the queue is full;
+        the caller should then persist the row itself.
+        """
+        if not self.running:
+            return False
+        try:
+            self._queue.put_nowait((model, row))
+        except asyncio.QueueFull:
+            self._rejected += 1
+            return False
+        self._enqueued += 1
+        self._high_watermark = max(self._high_watermark, self._queue.qsize())
+        return True
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            except Exception as e:  # never let the worker die
+                self._failed += len(batch)
+                logger.error("Trace sink batch failed: %s", e)
+
+    def _write_batch(self, batch: List[Tuple[type, Dict[str, Any]]]) -> None:
+        """Bulk-insert one batch (runs in a worker thread)."""
+        from sqlalchemy import insert
+
+        start = time.monotonic()
+        grouped: Dict[type, List[Dict[str, Any]]] = defaultdict(list)
+        for model, row in batch:
+            grouped[model].append(row)
+
+        db = self._new_session()
+        try:
+            try:
+                for model, rows in grouped.items():
+                    db.execute(insert(model), rows)
+                db.commit()
+                self._written += len(batch)
+            except Exception as e:
+                # One bad row must not cost the whole batch: retry row by row.
+                db.rollback()
+                logger.warning("Bulk trace insert failed (%s) — retrying per row", e)
+                for model, rows in grouped.items():
+                    for row in rows:
+                        try:
+                            db.execute(insert(model), [row])
+                            db.commit()
+                            self._written += 1
+                        except Exception as row_e:
+                            db.rollback()
+                            self._failed += 1
+                            logger.error(
+                                "Failed to persist %s: %s", model.__name__, row_e
+                            )
+        finally:
+            db.close()
+
+        self._batches += 1
+        self._last_flush_ms = (time.monotonic() - start) * 1000
+
+    def _new_session(self):
+        if self._session_factory is None:
+            from models.database import SessionLocal
+
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    # ------------------------------------------------------------------
+    # Observability
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, throughput and backpressure counters."""
+        return {
+            "running": self.running,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_queue": self.max_queue,
+            "high_watermark": self._high_watermark,
+            "enqueued": self._enqueued,
+            "rejected_full": self._rejected,
+            "written": self._written,
+            "failed": self._failed,
+            "batches": self._batches,
+            "avg_batch_size": (
+                round(self._written / self._batches, 1) if self._batches else 0.0
+            ),
+            "last_flush_ms": round(self._last_flush_ms, 2),
+        }
+
+
+# Process-wide sink shared by every pipeline instance
+_trace_sink: Optional[TraceSink] = None
+
+
+def get_trace_sink() -> TraceSink:
+    """Return the process-wide TraceSink (not started until start() is called)."""
+    global _trace_sink
+    if _trace_sink is None:
+        _trace_sink = TraceSink()
+    return _trace_sink
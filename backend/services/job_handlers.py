@@ -0,0 +1,97 @@
+"""
+Job Handlers — the long operations that run on services.job_runner.
+
+Importing this module registers them; app startup does so before starting
+the runner. Each handler receives a JobContext and returns the job's
+result_json.
+
+    statement_parse    payload {"filename", "content" (base64)}
+    score_recalc       the job's user
+    demo_refresh       no payload
+    health_sync        no payload; result is the run's metrics
+    governance_verify  payload {"full", "workers"}; result is the report
+"""
+
+import asyncio
+import base64
+import binascii
+from typing import Any, Dict
+
+from services.job_runner import JobContext, JobError, PermanentJobError, job_handler
+
+
+@job_handler("statement_parse", timeout_s=15 * 60)
+async def parse_statement(ctx: JobContext) -> Dict[str, Any]:
+    from services.statement_processing_service import PDFProcessor, StatementService
+
+    try:
+        file_bytes = base64.b64decode(ctx.payload["content"])
+    except (KeyError, binascii.Error) as e:
+        raise PermanentJobError(f"Invalid statement payload: {e}")
+    try:
+        await asyncio.to_thread(PDFProcessor.page_count, file_bytes)
+    except Exception as e:
+        raise PermanentJobError(f"Not a readable PDF: {e}")
+
+    with ctx.session() as db:
+        result = await StatementService(db).process_statement(
+            user_id=ctx.user_id,
+            file_content=file_bytes,
+            filename=ctx.payload.get("filename"),
+            progress_callback=ctx.progress,
+        )
+    if result.get("status") != "success":
+        error = result.get("error") or "Statement processing failed"
+        if not result.get("retryable", True):
+            raise PermanentJobError(error)
+        raise JobError(error)
+
+    data = result["data"]
+    return {
+        "filename": ctx.payload.get("filename"),
+        "statement_id": result["statement_id"],
+        "transactions": len(data["transactions"]),
+        "reconciliation": data.get("reconciliation"),
+        "cached": result["cached"],
+    }
+
+
+@job_handler("score_recalc", timeout_s=10 * 60)
+def recalc_scores(ctx: JobContext) -> Dict[str, Any]:
+    from models.models import User
+    from services.score_recalculation import recalculate_scores
+
+    with ctx.session() as db:
+        user = db.query(User).filter(User.id == ctx.user_id).first()
+        if user is None:
+            raise PermanentJobError(f"User {ctx.user_id} not found")
+        return recalculate_scores(db, user, progress=ctx.progress)
+
+
+@job_handler("demo_refresh", timeout_s=10 * 60)
+def refresh_demo(ctx: JobContext) -> Dict[str, Any]:
+    from services.demo_seed import refresh_demo_accounts
+
+    with ctx.session() as db:
+        return {"refreshed": refresh_demo_accounts(db)}
+
+
+@job_handler("health_sync", timeout_s=5 * 60 * 60)
+async def sync_health(ctx: JobContext) -> Dict[str, Any]:
+    from services.integrations.health_sync import HealthSyncOrchestrator
+
+    return await HealthSyncOrchestrator().run(progress=ctx.progress)
+
+
+@job_handler("governance_verify", timeout_s=6 * 60 * 60)
+def verify_governance_logs(ctx: JobContext) -> Dict[str, Any]:
+    from services.governance_bridge import verify_logs
+
+    try:
+        return verify_logs(
+            full=bool(ctx.payload.get("full")),
+            workers=int(ctx.payload.get("workers") or 1),
+            progress=ctx.progress,
+        )
+    except RuntimeError as e:
+        raise PermanentJobError(str(e))
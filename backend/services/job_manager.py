@@ -1,7 +1,7 @@
 import uuid
 from typing import Dict, Any, Optional
 from enum import Enum
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
 from loguru import logger
 from models.job import BackgroundJob
@@ -13,6 +13,11 @@ class JobStatus(str, Enum):
     PROCESSING = "processing"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+# Terminal states: no further transitions
+FINISHED_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
 
 
 class JobManager:
@@ -48,6 +53,77 @@ class JobManager:
             logger.error(f"Failed to create job: {e}")
             raise e
 
+    def enqueue(
+        self,
+        job_type: str,
+        payload: Optional[Dict[str, Any]] = None,
+        user_id: Optional[str] = None,
+        source: str = "system",
+        max_attempts: int = 3,
+        dedupe_key: Optional[str] = None,
+        delay_s: float = 0.0,
+    ) -> str:
+        """
+        Queue a job for services.job_runner and return its id immediately.
+
+        With a dedupe_key, an existing pending/processing job with the same
+        key is returned instead of queuing a second one.
+        """
+        try:
+            if dedupe_key:
+                existing = (
+                    self.db.query(BackgroundJob.id)
+                    .filter(
+                        BackgroundJob.dedupe_key == dedupe_key,
+                        BackgroundJob.status.in_(
+                            [JobStatus.PENDING, JobStatus.PROCESSING]
+                        ),
+                    )
+                    .first()
+                )
+                if existing:
+                    return existing.id
+
+            now = datetime.now(timezone.utc)
+            job = BackgroundJob(
+                id=str(uuid.uuid4()),
+                job_type=job_type,
+                user_id=user_id,
+                source=source,
+                status=JobStatus.PENDING,
+                progress=0,
+                dedupe_key=dedupe_key,
+                payload_json=payload or {},
+                run_after=now + timedelta(seconds=delay_s),
+                max_attempts=max_attempts,
+                expires_at=now + timedelta(days=7),  # 7-day retention
+            )
+            self.db.add(job)
+            self.db.commit()
+            logger.info(f"Job queued: {job.id} ({job_type})")
+            return job.id
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Failed to queue job: {e}")
+            raise e
+
+    def request_cancel(self, job_id: str) -> Optional[str]:
+        """
+        Cancel a job. Pending jobs are cancelled at once; a running job is
+        flagged and its runner cancels it on the next heartbeat. Returns the
+        job's status afterwards, or None if it does not exist.
+        """
+        job = self.db.query(BackgroundJob).filter(BackgroundJob.id == job_id).first()
+        if not job:
+            return None
+        if job.status == JobStatus.PENDING:
+            job.status = JobStatus.CANCELLED
+            job.payload_json = None
+        elif job.status == JobStatus.PROCESSING:
+            job.cancel_requested = True
+        self.db.commit()
+        return JobStatus(job.status).value
+
     def update_job(
         self,
         job_id: str,
@@ -66,10 +142,7 @@ class JobManager:
                 return
 
             # State Transition Validation (Basic)
-            if (
-                job.status in [JobStatus.COMPLETED, JobStatus.FAILED]
-                and status == JobStatus.PROCESSING
-            ):
+            if job.status in FINISHED_STATUSES and status == JobStatus.PROCESSING:
                 logger.warning(
                     f"Invalid transition from {job.status} to {status} for job {job_id}"
                 )
@@ -104,8 +177,10 @@ class JobManager:
 
         return {
             "id": job.id,
+            "job_type": job.job_type,
             "status": job.status,
             "progress": job.progress,
+            "attempts": job.attempts,
             "result": job.result_json,
             "error": job.error_message,
             "created_at": job.created_at,
@@ -0,0 +1,572 @@
+"""
+Job Runner — executes queued BackgroundJob rows.
+
+JobManager.enqueue() writes a pending row with a payload and returns its id;
+routes hand that id back to the client instead of holding the connection
+open while a statement parses or scores recalculate. Every app process runs
+one JobRunner:
+
+    enqueue() ──► background_jobs (PENDING, run_after) ──claim()──► handler
+                        ▲                                            │
+                        └─── retry: PENDING, run_after = now+backoff ◄┘
+
+Claiming: due rows are selected with FOR UPDATE SKIP LOCKED on Postgres, so
+concurrent runners never wait on each other's rows. Each row is then taken
+with a compare-and-swap UPDATE guarded on status = PENDING; on SQLite, which
+has no row locks, that guard alone keeps two runners off the same job.
+
+Leases: the runner heartbeats each running job (heartbeat_at, progress).
+A job whose heartbeat is older than stale_after — its process died — is put
+back to PENDING by whichever runner sweeps first.
+
+Outcomes: success → COMPLETED; JobError or a timeout → PENDING again with
+exponential backoff until max_attempts, then FAILED; PermanentJobError →
+FAILED at once; a cancel request (JobManager.request_cancel) → CANCELLED.
+
+Handlers are registered with @job_handler (see services/job_handlers.py).
+Async handlers run on the event loop; sync handlers run in a thread, and
+CPU-bound work can go to the shared process pool via ctx.run_in_process().
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import os
+import random
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import select, update
+
+from models.job import BackgroundJob, JobStatus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_POLL_INTERVAL_S = 1.0
+DEFAULT_HEARTBEAT_INTERVAL_S = 10.0
+DEFAULT_STALE_AFTER_S = 60.0
+
+# Retry delay: BACKOFF_BASE_S * 2^(attempt-1), capped, with jitter
+BACKOFF_BASE_S = 5.0
+BACKOFF_MAX_S = 600.0
+
+# Progress is flushed at most this often (piggybacks on the heartbeat write)
+PROGRESS_FLUSH_S = 1.0
+
+# Dialects with row locks that support SKIP LOCKED
+_SKIP_LOCKED_DIALECTS = ("postgresql", "mysql")
+
+
+class JobError(Exception):
+    """Handler failure worth retrying (transient: network, rate limit)."""
+
+
+class PermanentJobError(JobError):
+    """Handler failure that retrying cannot fix (bad payload, missing user)."""
+
+
+@dataclass
+class JobSpec:
+    """A registered handler: fn(ctx) -> result dict (sync or async)."""
+
+    job_type: str
+    fn: Callable[["JobContext"], Any]
+    timeout_s: Optional[float] = None
+
+
+_HANDLERS: Dict[str, JobSpec] = {}
+
+
+def job_handler(job_type: str, timeout_s: Optional[float] = None):
+    """Register fn as the handler for job_type."""
+
+    def decorator(fn):
+        _HANDLERS[job_type] = JobSpec(job_type=job_type, fn=fn, timeout_s=timeout_s)
+        return fn
+
+    return decorator
+
+
+def backoff_delay(attempt: int) -> float:
+    """Seconds before retry number `attempt` (1-based), with 50-100% jitter."""
+    delay = min(BACKOFF_MAX_S, BACKOFF_BASE_S * 2 ** (attempt - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+class JobContext:
+    """What a handler sees of its job."""
+
+    def __init__(
+        self,
+        job_id: str,
+        job_type: str,
+        user_id: Optional[str],
+        payload: Dict[str, Any],
+        attempt: int,
+        session_factory: Callable[[], Any],
+    ):
+        self.job_id = job_id
+        self.job_type = job_type
+        self.user_id = user_id
+        self.payload = payload
+        self.attempt = attempt
+        self._session_factory = session_factory
+        self._progress = 0
+        # Set when the job is cancelled; handlers running in a thread (where
+        # task cancellation cannot reach them) should check it between steps
+        self.cancelled = asyncio.Event()
+
+    def progress(self, pct: int) -> None:
+        """Record progress (0-100). Thread-safe; written on the next heartbeat."""
+        self._progress = max(0, min(100, int(pct)))
+
+    def session(self):
+        """A new DB session; use as a context manager so it is closed."""
+        return self._session_factory()
+
+    async def run_in_process(self, fn: Callable, *args) -> Any:
+        """Run a picklable CPU-bound fn(*args) in the shared process pool."""
+        from services.ocr_engine import get_pool, host_workers
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_pool(host_workers()), functools.partial(fn, *args)
+        )
+
+
+class JobRunner:
+    """Claims due jobs and runs up to `concurrency` of them at a time."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Any]] = None,
+        handlers: Optional[Dict[str, JobSpec]] = None,
+        worker_id: Optional[str] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        poll_interval: float = DEFAULT_POLL_INTERVAL_S,
+        heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL_S,
+        stale_after: float = DEFAULT_STALE_AFTER_S,
+    ):
+        self._session_factory = session_factory
+        self.handlers = _HANDLERS if handlers is None else handlers
+        self.worker_id = worker_id or (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        )
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+
+        self._worker: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._active: Dict[str, asyncio.Task] = {}
+        # job_id -> why its task was cancelled ("cancelled", "lost", "shutdown")
+        self._interrupts: Dict[str, str] = {}
+
+        # Counters
+        self._claimed = 0
+        self._completed = 0
+        self._retried = 0
+        self._failed = 0
+        self._cancelled = 0
+        self._requeued_stale = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self) -> None:
+        """Start polling for jobs on the running event loop."""
+        if self.running:
+            return
+        self._stopping = asyncio.Event()
+        self._wake = asyncio.Event()
+        self._worker = asyncio.create_task(self._run(), name="job-runner")
+        logger.info(
+            "Job runner %s started (concurrency=%d, handlers=%s)",
+            self.worker_id,
+            self.concurrency,
+            sorted(self.handlers),
+        )
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Stop claiming, give running jobs `timeout` seconds to finish, then
+        cancel the rest and put them back to PENDING for another runner.
+        """
+        if not self.running:
+            return
+        self._stopping.set()
+        self._wake.set()
+        await self._worker
+        self._worker = None
+
+        if self._active:
+            _, pending = await asyncio.wait(
+                list(self._active.values()), timeout=timeout
+            )
+            for job_id, task in list(self._active.items()):
+                if task in pending:
+                    self._interrupts[job_id] = "shutdown"
+                    task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+        logger.info("Job runner stopped: %s", self.stats())
+
+    # ------------------------------------------------------------------
+    # Polling
+    # ------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        last_sweep = 0.0
+        while not self._stopping.is_set():
+            try:
+                if time.monotonic() - last_sweep >= self.stale_after / 2:
+                    await asyncio.to_thread(self.requeue_stale)
+                    last_sweep = time.monotonic()
+                free = self.concurrency - len(self._active)
+                if free > 0:
+                    for job in await asyncio.to_thread(self.claim, free):
+                        self._spawn(job)
+            except Exception as e:  # never let the poller die
+                logger.error("Job runner poll failed: %s", e)
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def _spawn(self, job: Dict[str, Any]) -> asyncio.Task:
+        task = asyncio.create_task(self._execute(job), name=f"job-{job['id']}")
+        self._active[job["id"]] = task
+
+        def done(_):
+            self._active.pop(job["id"], None)
+            if self._wake is not None:
+                self._wake.set()  # a slot freed up: claim again now
+
+        task.add_done_callback(done)
+        return task
+
+    async def run_pending(self) -> int:
+        """Claim and run every due job once, without the poller (scripts, tests)."""
+        jobs = await asyncio.to_thread(self.claim, self.concurrency)
+        if jobs:
+            await asyncio.gather(*(self._spawn(job) for job in jobs))
+        return len(jobs)
+
+    def claim(self, limit: int) -> List[Dict[str, Any]]:
+        """Lease up to `limit` due jobs to this runner; returns their rows."""
+        if limit <= 0 or not self.handlers:
+            return []
+        db = self._new_session()
+        try:
+            now = datetime.now(timezone.utc)
+            query = (
+                select(BackgroundJob.id)
+                .where(
+                    BackgroundJob.status == JobStatus.PENDING,
+                    BackgroundJob.run_after.isnot(None),
+                    BackgroundJob.run_after <= now,
+                    BackgroundJob.job_type.in_(list(self.handlers)),
+                )
+                .order_by(BackgroundJob.run_after)
+                .limit(limit)
+            )
+            if db.get_bind().dialect.name in _SKIP_LOCKED_DIALECTS:
+                query = query.with_for_update(skip_locked=True)
+
+            claimed = []
+            for job_id in db.execute(query).scalars().all():
+                result = db.execute(
+                    update(BackgroundJob)
+                    .where(
+                        BackgroundJob.id == job_id,
+                        BackgroundJob.status == JobStatus.PENDING,
+                    )
+                    .values(
+                        status=JobStatus.PROCESSING,
+                        attempts=BackgroundJob.attempts + 1,
+                        locked_by=self.worker_id,
+                        heartbeat_at=now,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount == 1:
+                    claimed.append(job_id)
+            db.commit()
+            if not claimed:
+                return []
+
+            rows = db.execute(
+                select(
+                    BackgroundJob.id,
+                    BackgroundJob.job_type,
+                    BackgroundJob.user_id,
+                    BackgroundJob.payload_json,
+                    BackgroundJob.attempts,
+                    BackgroundJob.max_attempts,
+                ).where(BackgroundJob.id.in_(claimed))
+            )
+            self._claimed += len(claimed)
+            return [dict(row._mapping) for row in rows]
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def requeue_stale(self) -> int:
+        """Return jobs whose runner stopped heartbeating to the queue."""
+        db = self._new_session()
+        try:
+            now = datetime.now(timezone.utc)
+            stale = (
+                BackgroundJob.status == JobStatus.PROCESSING,
+                BackgroundJob.run_after.isnot(None),
+                BackgroundJob.heartbeat_at < now - timedelta(seconds=self.stale_after),
+            )
+            failed = db.execute(
+                update(BackgroundJob)
+                .where(*stale, BackgroundJob.attempts >= BackgroundJob.max_attempts)
+                .values(
+                    status=JobStatus.FAILED,
+                    error_message="Worker lost (no heartbeat)",
+                    locked_by=None,
+                    payload_json=None,
+                )
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            requeued = db.execute(
+                update(BackgroundJob)
+                .where(*stale)
+                .values(status=JobStatus.PENDING, locked_by=None, run_after=now)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+        finally:
+            db.close()
+        if failed or requeued:
+            logger.warning(
+                "Stale jobs: %d requeued, %d failed (attempts exhausted)",
+                requeued,
+                failed,
+            )
+        self._requeued_stale += requeued
+        return requeued
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    async def _execute(self, job: Dict[str, Any]) -> None:
+        job_id = job["id"]
+        spec = self.handlers[job["job_type"]]
+        ctx = JobContext(
+            job_id=job_id,
+            job_type=job["job_type"],
+            user_id=job["user_id"],
+            payload=job["payload_json"] or {},
+            attempt=job["attempts"],
+            session_factory=self._new_session,
+        )
+        task = asyncio.current_task()
+        heartbeat = asyncio.create_task(self._heartbeat(ctx, task))
+        try:
+            if asyncio.iscoroutinefunction(spec.fn):
+                call = spec.fn(ctx)
+            else:
+                call = asyncio.to_thread(spec.fn, ctx)
+            result = await asyncio.wait_for(call, spec.timeout_s)
+        except asyncio.CancelledError:
+            reason = self._interrupts.pop(job_id, "shutdown")
+            if reason == "cancelled":
+                self._cancelled += 1
+                await self._finish(job_id, status=JobStatus.CANCELLED)
+            elif reason == "shutdown":
+                # Not the job's fault: hand the attempt back
+                await self._finish(
+                    job_id,
+                    status=JobStatus.PENDING,
+                    attempts=job["attempts"] - 1,
+                    run_after=datetime.now(timezone.utc),
+                )
+            # "lost": another runner requeued it; the row is no longer ours
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                e = JobError(f"Timed out after {spec.timeout_s}s")
+            retry = (
+                not isinstance(e, PermanentJobError)
+                and job["attempts"] < job["max_attempts"]
+            )
+            if retry:
+                self._retried += 1
+                delay = backoff_delay(job["attempts"])
+                logger.warning(
+                    "Job %s (%s) attempt %d failed, retry in %.0fs: %s",
+                    job_id,
+                    job["job_type"],
+                    job["attempts"],
+                    delay,
+                    e,
+                )
+                await self._finish(
+                    job_id,
+                    status=JobStatus.PENDING,
+                    error_message=str(e),
+                    run_after=datetime.now(timezone.utc) + timedelta(seconds=delay),
+                )
+            else:
+                self._failed += 1
+                logger.error("Job %s (%s) failed: %s", job_id, job["job_type"], e)
+                await self._finish(
+                    job_id, status=JobStatus.FAILED, error_message=str(e)
+                )
+        else:
+            self._completed += 1
+            await self._finish(
+                job_id,
+                status=JobStatus.COMPLETED,
+                progress=100,
+                result_json=result or {},
+                error_message=None,
+            )
+        finally:
+            heartbeat.cancel()
+
+    async def _finish(self, job_id: str, **values) -> None:
+        """Write the outcome, as long as this runner still holds the lease."""
+        if values["status"] != JobStatus.PENDING:
+            values["payload_json"] = None  # terminal: drop the (large) input
+        values["locked_by"] = None
+        values["cancel_requested"] = False
+
+        def write():
+            db = self._new_session()
+            try:
+                written = db.execute(
+                    update(BackgroundJob)
+                    .where(
+                        BackgroundJob.id == job_id,
+                        BackgroundJob.locked_by == self.worker_id,
+                    )
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                db.commit()
+                return written
+            finally:
+                db.close()
+
+        try:
+            if not await asyncio.to_thread(write):
+                logger.warning("Job %s: lease lost, outcome not saved", job_id)
+        except Exception as e:
+            logger.error("Job %s: failed to save outcome: %s", job_id, e)
+
+    async def _heartbeat(self, ctx: JobContext, task: asyncio.Task) -> None:
+        """
+        Refresh the lease and flush progress. A failed guarded write means the
+        job was cancelled or requeued by another runner: stop the handler.
+        """
+        written_progress = -1
+        last_beat = time.monotonic()
+        while True:
+            await asyncio.sleep(min(PROGRESS_FLUSH_S, self.heartbeat_interval))
+            due = time.monotonic() - last_beat >= self.heartbeat_interval
+            if not due and ctx._progress == written_progress:
+                continue
+            progress = ctx._progress
+            try:
+                alive = await asyncio.to_thread(self._beat, ctx.job_id, progress)
+            except Exception as e:
+                logger.warning("Job %s heartbeat failed: %s", ctx.job_id, e)
+                continue
+            if alive is True:
+                written_progress, last_beat = progress, time.monotonic()
+                continue
+            self._interrupts[ctx.job_id] = alive
+            ctx.cancelled.set()
+            task.cancel()
+            return
+
+    def _beat(self, job_id: str, progress: int):
+        """True if the lease was refreshed, else "cancelled" or "lost"."""
+        db = self._new_session()
+        try:
+            written = db.execute(
+                update(BackgroundJob)
+                .where(
+                    BackgroundJob.id == job_id,
+                    BackgroundJob.locked_by == self.worker_id,
+                    BackgroundJob.status == JobStatus.PROCESSING,
+                    BackgroundJob.cancel_requested.is_(False),
+                )
+                .values(heartbeat_at=datetime.now(timezone.utc), progress=progress)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+            if written:
+                return True
+            cancel_requested = db.execute(
+                select(BackgroundJob.cancel_requested).where(
+                    BackgroundJob.id == job_id,
+                    BackgroundJob.locked_by == self.worker_id,
+                )
+            ).scalar()
+            return "cancelled" if cancel_requested else "lost"
+        finally:
+            db.close()
+
+    def _new_session(self):
+        if self._session_factory is None:
+            from models.database import SessionLocal
+
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    # ------------------------------------------------------------------
+    # Observability
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "worker_id": self.worker_id,
+            "active": len(self._active),
+            "concurrency": self.concurrency,
+            "claimed": self._claimed,
+            "completed": self._completed,
+            "retried": self._retried,
+            "failed": self._failed,
+            "cancelled": self._cancelled,
+            "requeued_stale": self._requeued_stale,
+        }
+
+
+# Process-wide runner started with the app
+_job_runner: Optional[JobRunner] = None
+
+
+def get_job_runner() -> JobRunner:
+    """Return the process-wide JobRunner (not started until start() is called)."""
+    global _job_runner
+    if _job_runner is None:
+        import core.config
+
+        _job_runner = JobRunner(
+            concurrency=core.config.get_settings().JOB_RUNNER_CONCURRENCY
+        )
+    return _job_runner
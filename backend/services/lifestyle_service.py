@@ -1,3 +1,5 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime
 from typing import List, Optional, Dict, Any, Union
@@ -9,7 +11,7 @@ import uuid
 
 
 class LifestyleService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Union[Session, AsyncSession]):
         self.db = db
 
     def get_upcoming_events(self, user_id: str) -> List[LifestyleEvent]:
@@ -107,23 +109,30 @@ class LifestyleService:
     def get_goals(self, user_id: str) -> List[dict]:
         """Get life goals."""
         goals = self.db.query(LifeGoal).filter(LifeGoal.user_id == user_id).all()
-        return [
-            {
-                "id": g.id,
-                "title": g.title,
-                "target_amount": g.target_amount,
-                "saved_amount": g.saved_amount,
-                "progress": (
-                    int((g.saved_amount / g.target_amount) * 100)
-                    if g.target_amount > 0
-                    else 0
-                ),
-                "target_date": g.target_date.isoformat() if g.target_date else None,
-                "pillar": g.pillar
-                or "finance",  # Use pillar instead of dead 'category'
-            }
-            for g in goals
-        ]
+        return [self._goal_to_dict(g) for g in goals]
+
+    async def get_goals_async(self, user_id: str) -> List[dict]:
+        """Get life goals (AsyncSession variant)."""
+        result = await self.db.execute(
+            select(LifeGoal).where(LifeGoal.user_id == user_id)
+        )
+        return [self._goal_to_dict(g) for g in result.scalars().all()]
+
+    @staticmethod
+    def _goal_to_dict(g: LifeGoal) -> dict:
+        return {
+            "id": g.id,
+            "title": g.title,
+            "target_amount": g.target_amount,
+            "saved_amount": g.saved_amount,
+            "progress": (
+                int((g.saved_amount / g.target_amount) * 100)
+                if g.target_amount > 0
+                else 0
+            ),
+            "target_date": g.target_date.isoformat() if g.target_date else None,
+            "pillar": g.pillar or "finance",  # Use pillar instead of dead 'category'
+        }
 
     def create_goal(self, user_id: str, goal_data: dict) -> Dict[str, Any]:
         """Create a new life goal."""
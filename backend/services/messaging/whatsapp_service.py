@@ -14,6 +14,7 @@ from typing import Dict, Any, Optional, List
 from datetime import datetime, timezone
 
 import core.config
+from core.http_client import get_http_client
 from .base_messaging_service import BaseMessagingService, MessageResponse
 
 logger = logging.getLogger(__name__)
@@ -43,7 +44,6 @@ class WhatsAppService(BaseMessagingService):
 
         # Support shared client for connection pooling
         self._client = client
-        self._timeout = httpx.Timeout(15.0, connect=5.0)
 
     @property
     def provider_name(self) -> str:
@@ -72,19 +72,20 @@ class WhatsAppService(BaseMessagingService):
         url = f"{self.base_url}/{path}"
         headers = self._get_headers()
 
-        # Use shared client or one-off
-        async with self._client or httpx.AsyncClient(timeout=self._timeout) as client:
-            try:
-                response = await client.request(method, url, headers=headers, **kwargs)
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                error_data = e.response.json().get("error", {})
-                logger.error(f"WhatsApp API Error: {error_data.get('message', str(e))}")
-                raise
-            except Exception as e:
-                logger.error(f"WhatsApp Connection Error: {e}")
-                raise
+        # Injected client (tests) or the shared pooled "whatsapp" client.
+        # Never `async with` a shared client: exiting would close it.
+        client = self._client or get_http_client("whatsapp")
+        try:
+            response = await client.request(method, url, headers=headers, **kwargs)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            error_data = e.response.json().get("error", {})
+            logger.error(f"WhatsApp API Error: {error_data.get('message', str(e))}")
+            raise
+        except Exception as e:
+            logger.error(f"WhatsApp Connection Error: {e}")
+            raise
 
     async def send_text_message(
         self, to: str, message: str, user_id: Optional[str] = None, **kwargs
@@ -4,10 +4,10 @@ Careem API Service
 Provides integration with Careem's API for ride price estimates and booking.
 """
 
-import httpx
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 import core.config
+from core.http_client import http_client
 from sqlalchemy.orm import Session
 from .base_mobility_service import BaseMobilityService
 from services.connection_service import ConnectionService
@@ -68,7 +68,7 @@ class CareemService(BaseMobilityService):
                 params["dropoff_lat"] = end_lat
                 params["dropoff_lng"] = end_lng
 
-            async with httpx.AsyncClient() as client:
+            async with http_client("careem") as client:
                 # This is a placeholder URL and logic
                 # In a real implementation, we would call the actual API
                 # For now, we'll simulate a failure to trigger mock data
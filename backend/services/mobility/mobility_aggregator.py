@@ -3,12 +3,22 @@ Mobility Aggregator - Unified interface for all mobility providers.
 
 Provides concurrent price comparison, idempotent booking, and
 lifecycle management for Uber and RTA.
+
+Price comparison is deadline-aware: quotes come from a short-TTL cache
+keyed by (provider, origin cell, destination cell, currency) where
+possible; the rest are fetched concurrently and the comparison returns
+whatever has arrived after MOBILITY_QUOTE_BUDGET_MS. Stragglers keep
+running (up to PROVIDER_TIMEOUT_S) and fill the cache for the next
+request. A provider slower than its own p95 gets one hedged request, and
+providers whose circuit is open are skipped (services/mobility/
+provider_guard.py).
 """
 
 import asyncio
+import time
 import uuid
 import logging
-from typing import Dict, Any, List, Optional, Sequence
+from typing import Dict, Any, List, Optional, Sequence, Set
 from datetime import datetime, timezone
 
 from .base_mobility_service import BaseMobilityService
@@ -16,11 +26,52 @@ from .uber_service import UberService
 from .rta_service import RTAService
 
 from sqlalchemy.orm import Session
-from models.models import Order, FinancialTransaction
+from models.models import Order, FinancialTransaction, MobilityTrip
 from services.audit_service import AuditService
+from services.financial_aggregates import record_transactions
+from services.mobility.provider_guard import ProviderGuard, get_provider_guard
+from services.mobility.route_stats import DEFAULT_CURRENCY, fare_prior, record_trips
+from services.productivity.geo_cache import GeoCache, geohash
+import core.config
 
 logger = logging.getLogger(__name__)
 
+# Hard limit for one provider quote (stragglers included)
+PROVIDER_TIMEOUT_S = 15.0
+
+# Quote cache cells: precision 7 is roughly 150 m, well inside one pickup spot
+QUOTE_CELL_PRECISION = 7
+QUOTE_CACHE_MAX_ENTRIES = 5000
+
+# Observed calls before a provider's p95 is trusted as a hedge delay
+HEDGE_MIN_SAMPLES = 20
+
+# Quotes still running after their comparison returned
+_late_quotes: Set[asyncio.Task] = set()
+
+_quote_cache: Optional[GeoCache] = None
+
+
+def get_quote_cache() -> GeoCache:
+    """Process-wide in-memory quote cache (quotes are too short-lived for L2)."""
+    global _quote_cache
+    if _quote_cache is None:
+        _quote_cache = GeoCache(store=None, max_entries=QUOTE_CACHE_MAX_ENTRIES)
+    return _quote_cache
+
+
+def quote_key(
+    provider: str,
+    start_lat: float,
+    start_lng: float,
+    end_lat: float,
+    end_lng: float,
+    currency: str,
+) -> str:
+    origin = geohash(start_lat, start_lng, QUOTE_CELL_PRECISION)
+    destination = geohash(end_lat, end_lng, QUOTE_CELL_PRECISION)
+    return f"quote:{provider}:{origin}:{destination}:{currency}"
+
 
 class MobilityAggregator:
     """
@@ -28,12 +79,24 @@ class MobilityAggregator:
     Handles concurrency, deduplication, and financial reconciliation.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        guard: Optional[ProviderGuard] = None,
+        quote_cache: Optional[GeoCache] = None,
+        budget_ms: Optional[int] = None,
+    ):
         """Initialize and register mobility providers."""
         self.providers: Dict[str, BaseMobilityService] = {
             "uber": UberService(),
             "rta": RTAService(),
         }
+        settings = core.config.get_settings()
+        self.guard = guard or get_provider_guard()
+        self.quote_cache = quote_cache or get_quote_cache()
+        self.budget_ms = (
+            budget_ms if budget_ms is not None else settings.MOBILITY_QUOTE_BUDGET_MS
+        )
+        self.quote_ttl_s = settings.MOBILITY_QUOTE_TTL_S
 
     def _validate_location(self, lat: float, lng: float, label: str):
         if not (-90 <= lat <= 90) or not (-180 <= lng <= 180):
@@ -47,10 +110,14 @@ class MobilityAggregator:
         end_lat: float,
         end_lng: float,
         provider_keys: Optional[List[str]] = None,
-        currency: str = "AED",
+        currency: str = DEFAULT_CURRENCY,
+        db: Optional[Session] = None,
     ) -> Dict[str, Any]:
         """
         Query multiple providers concurrently and aggregate results.
+
+        With a db session the result also carries "price_prior": what the
+        user has paid on this route before (route stats, no provider call).
         """
         # 1. Validation
         self._validate_location(start_lat, start_lng, "start")
@@ -66,42 +133,149 @@ class MobilityAggregator:
 
         to_query = {k: self.providers[k] for k in requested_keys if k in self.providers}
 
-        # 3. Concurrent Execution
-        tasks = []
+        # 3. Cached quotes, then a deadline-bounded fan-out for the rest
+        keys = {
+            name: quote_key(name, start_lat, start_lng, end_lat, end_lng, currency)
+            for name in to_query
+        }
+        cached = await self.quote_cache.get_many(keys.values())
+
+        results: Dict[str, Any] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+        cached_providers = []
+        args = (start_lat, start_lng, end_lat, end_lng, user_id, currency)
         for name, svc in to_query.items():
-            tasks.append(
-                self._safe_query(
-                    name, svc, start_lat, start_lng, end_lat, end_lng, user_id, currency
+            if keys[name] in cached:
+                results[name] = cached[keys[name]]
+                cached_providers.append(name)
+                self.guard.count(name, "cache_hits")
+            else:
+                tasks[name] = asyncio.ensure_future(
+                    self.quote_cache.get_or_load(
+                        keys[name], lambda n=name, s=svc: self._load_quote(n, s, *args)
+                    )
                 )
-            )
 
-        raw_results = await asyncio.gather(*tasks)
-        results = {name: res for name, res in raw_results}
+        pending_providers = []
+        if tasks:
+            await asyncio.wait(tasks.values(), timeout=self.budget_ms / 1000)
+            for name, task in tasks.items():
+                if task.done():
+                    results[name] = task.result()
+                    continue
+                # Straggler: keep it running so it fills the cache
+                pending_providers.append(name)
+                results[name] = {
+                    "success": False,
+                    "pending": True,
+                    "error": f"Provider {name} did not answer within the budget",
+                    "prices": [],
+                }
+                _late_quotes.add(task)
+                task.add_done_callback(_late_quotes.discard)
+                task.add_done_callback(lambda _, n=name: self.guard.count(n, "late"))
 
         # 4. Format & Sort
-        return self._format_comparison(results, currency)
+        comparison = self._format_comparison(results, currency)
+        comparison["partial"] = bool(pending_providers)
+        comparison["pending_providers"] = pending_providers
+        comparison["cached_providers"] = cached_providers
+        comparison["open_circuits"] = [
+            name for name, res in results.items() if res.get("circuit_open")
+        ]
+        if db is not None:
+            comparison["price_prior"] = fare_prior(
+                db, user_id, start_lat, start_lng, end_lat, end_lng, currency
+            )
+        return comparison
 
-    async def _safe_query(
+    async def _load_quote(
         self, name: str, service: BaseMobilityService, *args
     ) -> tuple:
-        """Execute provider query with timeout and error capture."""
-        try:
-            # We assume the service's get_price_estimates handles its own internal timeouts,
-            # but we guard the aggregator loop too.
-            res = await asyncio.wait_for(
-                service.get_price_estimates(*args), timeout=15.0
+        """Quote loader for the cache: (result, ttl_s); only successes are cached."""
+        # Checked here, not per caller: a coalesced caller never makes the call,
+        # so it must not claim the half-open trial slot
+        if not self.guard.allow(name):
+            return {
+                "success": False,
+                "error": f"Provider {name} temporarily unavailable",
+                "circuit_open": True,
+                "prices": [],
+            }, None
+        res = await self._safe_query(name, service, *args)
+        return res, (self.quote_ttl_s if res.get("success") else None)
+
+    async def _safe_query(
+        self,
+        name: str,
+        service: BaseMobilityService,
+        start_lat: float,
+        start_lng: float,
+        end_lat: float,
+        end_lng: float,
+        user_id: str,
+        currency: str,
+    ) -> Dict[str, Any]:
+        """
+        One provider quote with timeout, hedging and error capture.
+
+        Once the provider has been slower than its observed p95, a second
+        identical request races the first; whichever succeeds first wins
+        and the other is cancelled. Latency and outcome feed the guard.
+        """
+
+        def attempt() -> asyncio.Task:
+            return asyncio.ensure_future(
+                service.get_price_estimates(
+                    start_lat, start_lng, end_lat, end_lng, user_id, currency=currency
+                )
             )
-            return (name, res)
+
+        started = time.monotonic()
+        deadline = started + PROVIDER_TIMEOUT_S
+        hedge_ms = self.guard.latency_quantile(name, 0.95, HEDGE_MIN_SAMPLES)
+        hedge_at = started + hedge_ms / 1000 if hedge_ms is not None else None
+        attempts = {attempt()}
+        error: Optional[BaseException] = None
+        res: Optional[Dict[str, Any]] = None
+        try:
+            while attempts and res is None:
+                now = time.monotonic()
+                if now >= deadline:
+                    raise asyncio.TimeoutError()
+                wait_until = min(deadline, hedge_at) if hedge_at else deadline
+                done, attempts = await asyncio.wait(
+                    attempts,
+                    timeout=max(wait_until - now, 0),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done and hedge_at and time.monotonic() < deadline:
+                    hedge_at = None
+                    self.guard.count(name, "hedges")
+                    attempts.add(attempt())
+                for task in done:
+                    if task.exception() is None:
+                        res = task.result()
+                        break
+                    error = task.exception()
+            if res is None:
+                raise error or asyncio.TimeoutError()
         except Exception as e:
-            logger.error(f"Aggregator failure for {name}: {e}", exc_info=True)
-            return (
-                name,
-                {
-                    "success": False,
-                    "error": f"Provider {name} unreachable",
-                    "prices": [],
-                },
-            )
+            logger.error(f"Aggregator failure for {name}: {e!r}")
+            self.guard.record(name, (time.monotonic() - started) * 1000, ok=False)
+            return {
+                "success": False,
+                "error": f"Provider {name} unreachable",
+                "prices": [],
+            }
+        finally:
+            for task in attempts:
+                task.cancel()
+
+        # Unconfigured (mock) providers carry no "success" key: not an outage
+        ok = res.get("success") is not False
+        self.guard.record(name, (time.monotonic() - started) * 1000, ok=ok)
+        return res
 
     async def book_ride(
         self,
@@ -208,6 +382,7 @@ class MobilityAggregator:
                         transaction_date=datetime.now(timezone.utc),
                     )
                     db.add(tx)
+                    record_transactions(db, [tx])
                     db.flush()
                     order.transaction_id = tx.id
 
@@ -224,6 +399,14 @@ class MobilityAggregator:
                 )
                 db.commit()  # Persist Audit
 
+                self._record_trip(
+                    db,
+                    order,
+                    ride_type,
+                    start_location,
+                    end_location,
+                    response.get("currency", "AED"),
+                )
                 return response
             else:
                 # 6. Reconcile Failure
@@ -240,6 +423,39 @@ class MobilityAggregator:
             db.commit()
             return {"success": False, "error": str(e)}
 
+    def _record_trip(
+        self,
+        db: Session,
+        order: Order,
+        ride_type: str,
+        start_location: Dict[str, Any],
+        end_location: Dict[str, Any],
+        currency: str = DEFAULT_CURRENCY,
+    ) -> None:
+        """
+        Write the confirmed ride to mobility_trips (route cells + fare stats).
+        Best-effort: runs after the booking commit so it can never undo it.
+        """
+        try:
+            trip = MobilityTrip(
+                user_id=order.user_id,
+                provider=order.provider,
+                pickup_time=datetime.utcnow(),
+                cost_amount=order.amount_estimated or None,
+                currency=currency,
+                trip_type=ride_type,
+                origin_lat=start_location.get("lat"),
+                origin_lon=start_location.get("lng"),
+                destination_lat=end_location.get("lat"),
+                destination_lon=end_location.get("lng"),
+            )
+            db.add(trip)
+            record_trips(db, [trip])
+            db.commit()
+        except Exception as e:
+            logger.warning(f"Trip history write failed for order {order.id}: {e}")
+            db.rollback()
+
     def _sanitize_location(self, loc: Dict[str, Any]) -> Dict[str, Any]:
         """Redact detailed address for log storage if needed, keep coords."""
         return {
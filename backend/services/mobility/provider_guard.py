@@ -0,0 +1,183 @@
+"""
+Provider Guard — per-provider latency histograms and circuit breakers.
+
+MobilityAggregator records every quote call here. The histogram feeds the
+hedge delay (a second request goes out once a provider is slower than its
+usual p95); the breaker stops a failing provider from costing a timeout on
+every comparison:
+
+    closed ──(FAILURE_THRESHOLD consecutive failures)──► open
+    open ──(OPEN_S elapsed)──► half_open: one trial call
+    half_open ──success──► closed     half_open ──failure──► open
+
+Failures are exceptions, timeouts and responses with "success": False
+(providers catch their own transport errors and report them that way).
+State is process-wide (get_provider_guard()).
+"""
+
+import bisect
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Histogram bucket upper bounds in milliseconds (last bucket is overflow)
+BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 15000)
+
+FAILURE_THRESHOLD = 5
+OPEN_S = 30.0
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with bucket-resolution quantiles."""
+
+    def __init__(self, buckets_ms=BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts: List[int] = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+
+    def observe(self, latency_ms: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets_ms, latency_ms)] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None if empty)."""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return float(self.buckets_ms[min(i, len(self.buckets_ms) - 1)])
+        return float(self.buckets_ms[-1])
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"le_{b}" for b in self.buckets_ms] + ["overflow"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else None,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class CircuitBreaker:
+    def __init__(
+        self, failure_threshold: int = FAILURE_THRESHOLD, open_s: float = OPEN_S
+    ):
+        self.failure_threshold = failure_threshold
+        self.open_s = open_s
+        self.state = CLOSED
+        self.failures = 0  # consecutive
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.short_circuited = 0
+
+    def allow(self) -> bool:
+        """Whether a call may go out now (claims the half-open trial slot)."""
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.open_s:
+                self.short_circuited += 1
+                return False
+            self.state = HALF_OPEN
+            self.trial_in_flight = False
+        if self.state == HALF_OPEN:
+            if self.trial_in_flight:
+                self.short_circuited += 1
+                return False
+            self.trial_in_flight = True
+        return True
+
+    def record(self, ok: bool) -> None:
+        if ok:
+            self.state, self.failures, self.trial_in_flight = CLOSED, 0, False
+            return
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+
+class ProviderGuard:
+    """Histogram + breaker + call counters for each provider."""
+
+    def __init__(
+        self, failure_threshold: int = FAILURE_THRESHOLD, open_s: float = OPEN_S
+    ):
+        self.failure_threshold = failure_threshold
+        self.open_s = open_s
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def _provider(self, name: str):
+        if name not in self._breakers:
+            self._histograms[name] = LatencyHistogram()
+            self._breakers[name] = CircuitBreaker(self.failure_threshold, self.open_s)
+            self._counters[name] = {
+                "calls": 0,
+                "failures": 0,
+                "hedges": 0,
+                "late": 0,
+                "cache_hits": 0,
+            }
+        return self._histograms[name], self._breakers[name], self._counters[name]
+
+    def allow(self, name: str) -> bool:
+        with self._lock:
+            return self._provider(name)[1].allow()
+
+    def record(self, name: str, latency_ms: float, ok: bool) -> None:
+        with self._lock:
+            histogram, breaker, counters = self._provider(name)
+            histogram.observe(latency_ms)
+            breaker.record(ok)
+            counters["calls"] += 1
+            if not ok:
+                counters["failures"] += 1
+
+    def count(self, name: str, counter: str) -> None:
+        with self._lock:
+            self._provider(name)[2][counter] += 1
+
+    def latency_quantile(self, name: str, q: float, min_samples: int = 0):
+        """Observed q-quantile latency (ms), or None below min_samples."""
+        with self._lock:
+            histogram = self._provider(name)[0]
+            if histogram.count < max(min_samples, 1):
+                return None
+            return histogram.quantile(q)
+
+    def state(self, name: str) -> str:
+        with self._lock:
+            return self._provider(name)[1].state
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                name: {
+                    "state": self._breakers[name].state,
+                    "consecutive_failures": self._breakers[name].failures,
+                    "short_circuited": self._breakers[name].short_circuited,
+                    **self._counters[name],
+                    "latency": self._histograms[name].snapshot(),
+                }
+                for name in self._breakers
+            }
+
+
+_guard: Optional[ProviderGuard] = None
+
+
+def get_provider_guard() -> ProviderGuard:
+    global _guard
+    if _guard is None:
+        _guard = ProviderGuard()
+    return _guard
@@ -0,0 +1,215 @@
+"""
+Route Stats — geohash route buckets and rolling fare statistics per user.
+
+Trips used to be grouped by exact float coordinates, which almost never
+match twice. record_trips() snaps both ends of each trip to geohash cells
+(ROUTE_CELL_PRECISION 6: roughly 1.2 x 0.6 km) in the same unit of work
+that writes it, and folds the fare into the user's RoutePriceStats row for
+that (origin cell, destination cell, currency):
+
+    trip_count, price_total   every fare on the route (avg = total / count)
+    p50, p90                  over the last PRICE_WINDOW fares
+
+Popular routes and fare priors read those rows directly (one indexed row
+per route) instead of aggregating mobility_trips.
+
+Cells are fixed buckets: two points a few metres apart on either side of a
+cell edge land in different routes. At this precision that is rare enough
+for history and priors.
+
+rebuild_user() recomputes a user's cells and stats from scratch; it backs
+the backfill script for trips written before cells existed.
+"""
+
+import math
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from models.models import MobilityTrip, RoutePriceStats
+from services.productivity.geo_cache import geohash, geohash_center
+
+ROUTE_CELL_PRECISION = 6
+
+# Fares kept per route for the rolling percentiles
+PRICE_WINDOW = 50
+
+# Currency for trips recorded without one, and for fare priors/comparisons
+# that do not name one; both sides must agree or the prior never matches
+DEFAULT_CURRENCY = "AED"
+
+RouteKey = Tuple[str, str, str, str]  # (user_id, origin, destination, currency)
+
+
+def route_cells(
+    start_lat: float, start_lng: float, end_lat: float, end_lng: float
+) -> Tuple[str, str]:
+    """(origin cell, destination cell) for a trip's endpoints."""
+    return (
+        geohash(start_lat, start_lng, ROUTE_CELL_PRECISION),
+        geohash(end_lat, end_lng, ROUTE_CELL_PRECISION),
+    )
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct * len(ordered)) - 1)]
+
+
+def _assign_cells(trip: MobilityTrip) -> bool:
+    coords = (
+        trip.origin_lat,
+        trip.origin_lon,
+        trip.destination_lat,
+        trip.destination_lon,
+    )
+    if any(c is None for c in coords):
+        return False
+    trip.origin_cell, trip.destination_cell = route_cells(*coords)
+    return True
+
+
+def _fold(row: RoutePriceStats, trips: List[MobilityTrip]) -> None:
+    recent = list(row.recent_prices_json or [])
+    for trip in trips:
+        row.trip_count = (row.trip_count or 0) + 1
+        row.price_total = (row.price_total or 0.0) + trip.cost_amount
+        recent.append(round(trip.cost_amount, 2))
+        when = trip.pickup_time or trip.created_at or datetime.utcnow()
+        if row.last_trip_at is None or when > row.last_trip_at:
+            row.last_trip_at = when
+    recent = recent[-PRICE_WINDOW:]
+    # Reassign so the JSON column is flagged dirty
+    row.recent_prices_json = recent
+    row.p50 = _percentile(recent, 0.5)
+    row.p90 = _percentile(recent, 0.9)
+
+
+def _bucket(trips: Iterable[MobilityTrip]) -> Dict[RouteKey, List[MobilityTrip]]:
+    buckets: Dict[RouteKey, List[MobilityTrip]] = defaultdict(list)
+    for trip in trips:
+        if not _assign_cells(trip):
+            continue
+        if trip.user_id is None or trip.cost_amount is None:
+            continue
+        # Stored too, so the trip row agrees with its route bucket
+        trip.currency = trip.currency or DEFAULT_CURRENCY
+        key = (trip.user_id, trip.origin_cell, trip.destination_cell, trip.currency)
+        buckets[key].append(trip)
+    return buckets
+
+
+def record_trips(db: Session, trips: Iterable[MobilityTrip]) -> None:
+    """
+    Set route cells on newly added trips and fold their fares into the
+    route stats.
+
+    Call before the commit that persists the trips. Existing stats rows are
+    locked (SELECT ... FOR UPDATE); two first-writers racing to create the
+    same route row hit the unique constraint and the losing unit of work
+    rolls back as a whole, so the stats never drift from the trips.
+    """
+    buckets = _bucket(trips)
+    for (user_id, origin, destination, currency), route_trips in buckets.items():
+        row = (
+            db.query(RoutePriceStats)
+            .filter(
+                RoutePriceStats.user_id == user_id,
+                RoutePriceStats.origin_cell == origin,
+                RoutePriceStats.destination_cell == destination,
+                RoutePriceStats.currency == currency,
+            )
+            .with_for_update()
+            .first()
+        )
+        if row is None:
+            row = RoutePriceStats(
+                user_id=user_id,
+                origin_cell=origin,
+                destination_cell=destination,
+                currency=currency,
+            )
+            db.add(row)
+        _fold(row, route_trips)
+
+
+def rebuild_user(db: Session, user_id: str) -> int:
+    """
+    Recompute a user's trip cells and route stats from mobility_trips.
+
+    Does not commit. Returns the number of route rows written.
+    """
+    db.query(RoutePriceStats).filter(RoutePriceStats.user_id == user_id).delete(
+        synchronize_session=False
+    )
+    trips = (
+        db.query(MobilityTrip)
+        .filter(MobilityTrip.user_id == user_id)
+        .order_by(MobilityTrip.pickup_time.asc(), MobilityTrip.created_at.asc())
+    )
+    buckets = _bucket(trips)
+    for (_, origin, destination, currency), route_trips in buckets.items():
+        row = RoutePriceStats(
+            user_id=user_id,
+            origin_cell=origin,
+            destination_cell=destination,
+            currency=currency,
+        )
+        db.add(row)
+        _fold(row, route_trips)
+    return len(buckets)
+
+
+def _stats_dict(row: RoutePriceStats) -> Dict[str, Any]:
+    start_lat, start_lng = geohash_center(row.origin_cell)
+    end_lat, end_lng = geohash_center(row.destination_cell)
+    return {
+        "origin_cell": row.origin_cell,
+        "destination_cell": row.destination_cell,
+        "start": {"lat": round(start_lat, 5), "lon": round(start_lng, 5)},
+        "end": {"lat": round(end_lat, 5), "lon": round(end_lng, 5)},
+        "currency": row.currency,
+        "count": row.trip_count,
+        "avg": round(row.price_total / row.trip_count, 2) if row.trip_count else 0,
+        "p50": row.p50,
+        "p90": row.p90,
+        "last_trip_at": row.last_trip_at.isoformat() if row.last_trip_at else None,
+    }
+
+
+def fare_prior(
+    db: Session,
+    user_id: str,
+    start_lat: float,
+    start_lng: float,
+    end_lat: float,
+    end_lng: float,
+    currency: str = DEFAULT_CURRENCY,
+) -> Optional[Dict[str, Any]]:
+    """What this user has paid on this route before, or None (no provider call)."""
+    origin, destination = route_cells(start_lat, start_lng, end_lat, end_lng)
+    row = (
+        db.query(RoutePriceStats)
+        .filter(
+            RoutePriceStats.user_id == user_id,
+            RoutePriceStats.origin_cell == origin,
+            RoutePriceStats.destination_cell == destination,
+            RoutePriceStats.currency == currency,
+        )
+        .first()
+    )
+    return _stats_dict(row) if row else None
+
+
+def popular_routes(db: Session, user_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """The user's most travelled routes with their fare stats."""
+    rows = (
+        db.query(RoutePriceStats)
+        .filter(RoutePriceStats.user_id == user_id)
+        .order_by(RoutePriceStats.trip_count.desc())
+        .limit(limit)
+    )
+    return [_stats_dict(row) for row in rows]
@@ -13,6 +13,7 @@ import logging
 from typing import Optional, Dict, Any, List, Union
 from datetime import datetime, timedelta, timezone
 import core.config
+from core.http_client import http_client
 from sqlalchemy.orm import Session
 from .base_mobility_service import BaseMobilityService
 
@@ -37,8 +38,7 @@ class RTAService(BaseMobilityService):
         if db:
             self.connection_service = ConnectionService(db)
         self.api_key = self.settings.RTA_API_KEY
-        # Timeout policy: 10s total, 2s connect
-        self.timeout = httpx.Timeout(10.0, connect=2.0)
+        # Timeout policy (10s total, 2s connect): "rta" in core/http_client.py
 
     @property
     def provider_name(self) -> str:
@@ -109,7 +109,7 @@ class RTAService(BaseMobilityService):
         # 2. Live API Request (with Retry/Timeout)
         if self.api_key:
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
+                async with http_client("rta") as client:
                     response = await client.get(
                         f"{self.BASE_URL}/trips/cost",
                         headers=self._get_headers(),
@@ -6,10 +6,10 @@ Uses the Uber Server Token for authentication.
 Supports both Sandbox (dev) and Production modes.
 """
 
-import httpx
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 import core.config
+from core.http_client import http_client
 from services.connection_service import ConnectionService
 from .base_mobility_service import BaseMobilityService
 from sqlalchemy.orm import Session
@@ -55,6 +55,7 @@ class UberService(BaseMobilityService):
         end_lat: Optional[float] = None,
         end_lng: Optional[float] = None,
         user_id: Optional[str] = None,
+        **kwargs,
     ) -> Dict[str, Any]:
         """
         Get price estimates for rides from start to end location.
@@ -102,7 +103,7 @@ class UberService(BaseMobilityService):
                 params["end_latitude"] = end_lat
                 params["end_longitude"] = end_lng
 
-            async with httpx.AsyncClient() as client:
+            async with http_client("uber") as client:
                 response = await client.get(
                     f"{self.base_url}/estimates/price",
                     params=params,
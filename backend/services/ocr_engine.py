@@ -0,0 +1,172 @@
+"""
+OCR Engine — parallel OCR fallback for PDF pages without a text layer.
+
+Pages that already carry a text layer are read directly with PyMuPDF; only
+pages with (almost) no extractable text are sent to OCR. Each OCR task
+rasterizes its own page lazily with a PyMuPDF pixmap at OCR_DPI and runs
+pytesseract in a ProcessPoolExecutor sized to the host (OCR_WORKERS, or
+the CPUs this process may run on), so OCR neither blocks the event loop
+nor stays on one core.
+
+Results stream page by page in page order (stream_pages / astream_pages):
+a page is yielded as soon as it and every page before it are done. The PDF
+is spooled to a temporary file once per document so tasks carry a path,
+not the file bytes.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+from loguru import logger
+from PIL import Image
+
+import core.config
+
+# Pages with fewer extractable characters than this are treated as scans
+MIN_TEXT_LAYER_CHARS = 20
+
+OCRFunction = Callable[[Image.Image], str]
+
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def host_workers() -> int:
+    """CPUs this process may run on (respects affinity / cpusets)."""
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except AttributeError:
+        return max(1, os.cpu_count() or 1)
+
+
+def get_pool(workers: int) -> ProcessPoolExecutor:
+    """Shared, lazily started process pool with `workers` processes."""
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            # spawn: forking a process that runs the event loop and DB
+            # pools can copy held locks into the children
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _pools[workers] = pool
+            logger.info(f"Started OCR process pool with {workers} workers")
+        return pool
+
+
+def shutdown_pools() -> None:
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        _pools.clear()
+
+
+def tesseract_ocr(image: Image.Image) -> str:
+    import pytesseract
+
+    return pytesseract.image_to_string(image)
+
+
+def rasterize_page(doc: "fitz.Document", index: int, dpi: int) -> Image.Image:
+    """Grayscale PIL image of one page at the given DPI."""
+    pix = doc[index].get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False)
+    return Image.frombytes("L", (pix.width, pix.height), pix.samples)
+
+
+def ocr_page(path: str, index: int, dpi: int, ocr: OCRFunction) -> str:
+    """Worker task: rasterize one page of the PDF at `path` and OCR it."""
+    with fitz.open(path) as doc:
+        image = rasterize_page(doc, index, dpi)
+    return ocr(image)
+
+
+def text_layer(pdf_bytes: bytes) -> Tuple[List[str], List[int]]:
+    """Per-page text layer, and the indices of pages that need OCR."""
+    texts, scanned = [], []
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        for page in doc:
+            text = page.get_text()
+            # A short text layer over an image is a scan (maybe with a
+            # printed header); a short page without images is just short
+            if len(text.strip()) < MIN_TEXT_LAYER_CHARS and page.get_images():
+                scanned.append(page.number)
+            texts.append(text)
+    return texts, scanned
+
+
+@contextmanager
+def _spooled(pdf_bytes: bytes) -> Iterator[str]:
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(pdf_bytes)
+        yield path
+    finally:
+        os.unlink(path)
+
+
+class OCREngine:
+    """Text per page, with OCR only for pages lacking a text layer."""
+
+    def __init__(
+        self,
+        dpi: Optional[int] = None,
+        workers: Optional[int] = None,
+        ocr: OCRFunction = tesseract_ocr,
+    ):
+        settings = core.config.get_settings()
+        self.dpi = dpi or settings.OCR_DPI
+        self.workers = workers or settings.OCR_WORKERS or host_workers()
+        # Must be a module-level function: it is pickled to the workers
+        self.ocr = ocr
+
+    def _submit(self, path: str, pages: List[int]) -> Dict[int, Future]:
+        pool = get_pool(self.workers)
+        logger.info(
+            f"OCR: {len(pages)} pages at {self.dpi} DPI, {self.workers} workers"
+        )
+        return {i: pool.submit(ocr_page, path, i, self.dpi, self.ocr) for i in pages}
+
+    def stream_pages(self, pdf_bytes: bytes) -> Iterator[Tuple[int, str]]:
+        """Yield (page index, text) in page order as pages complete."""
+        texts, scanned = text_layer(pdf_bytes)
+        if not scanned:
+            yield from enumerate(texts)
+            return
+        with _spooled(pdf_bytes) as path:
+            futures = self._submit(path, scanned)
+            try:
+                for i, text in enumerate(texts):
+                    yield i, futures[i].result() if i in futures else text
+            finally:
+                for future in futures.values():
+                    future.cancel()
+
+    async def astream_pages(self, pdf_bytes: bytes) -> AsyncIterator[Tuple[int, str]]:
+        """Async stream_pages: the event loop only awaits the pool."""
+        texts, scanned = await asyncio.to_thread(text_layer, pdf_bytes)
+        if not scanned:
+            for item in enumerate(texts):
+                yield item
+            return
+        with _spooled(pdf_bytes) as path:
+            futures = self._submit(path, scanned)
+            try:
+                for i, text in enumerate(texts):
+                    if i in futures:
+                        text = await asyncio.wrap_future(futures[i])
+                    yield i, text
+            finally:
+                for future in futures.values():
+                    future.cancel()
+
+    def page_texts(self, pdf_bytes: bytes) -> List[str]:
+        return [text for _, text in self.stream_pages(pdf_bytes)]
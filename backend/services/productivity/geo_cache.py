@@ -0,0 +1,406 @@
+"""
+Geo Cache — geocode and route results shared across requests.
+
+Users ask for the same handful of places ("Dubai Mall", "DXB airport",
+home/office), yet every trip quote used to pay two or three Maps round
+trips. GoogleMapsService reads through this cache:
+
+    L1  process-wide LRU + TTL (GEO_CACHE_MAX_ENTRIES entries)
+    L2  Redis when REDIS_URL is set, else the geo_cache table
+
+L2 hits are promoted into L1. Keys:
+
+    geo:addr:{region}:{normalized address}     forward geocode
+    geo:rev:{geohash 8}                        reverse geocode (~20 m cell)
+    geo:route:{mode}:{endpoint}>{endpoint}     one distance-matrix element
+
+A route endpoint given as "lat,lng" is quantized to a geohash of
+ROUTE_PRECISION (~150 m cell), so nearby starting points share entries;
+an address endpoint uses its normalized form.
+
+TTLs depend on the result type (TTL_S, route_ttl). "Not found" answers
+(ZERO_RESULTS, NOT_FOUND elements) are cached for NEGATIVE_TTL_S so a
+misspelt place is not re-sent on every message; quota and permission
+errors are never cached.
+
+Concurrent misses for the same key share one upstream call (single-flight).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+import core.config
+
+logger = logging.getLogger(__name__)
+
+DAY_S = 86_400
+
+TTL_S = {
+    "addr": 30 * DAY_S,  # Maps Platform terms allow caching coordinates 30 days
+    "rev": 7 * DAY_S,
+}
+# Without departure_time the matrix ignores live traffic, so routes only
+# change with the road network (driving) or timetables (transit)
+ROUTE_TTL_S = {"walking": 7 * DAY_S, "bicycling": 7 * DAY_S}
+DEFAULT_ROUTE_TTL_S = DAY_S
+NEGATIVE_TTL_S = 6 * 3600
+
+REVERSE_PRECISION = 8
+ROUTE_PRECISION = 7
+
+# Sentinel for "not in cache" (None is a cached negative answer)
+MISS = object()
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_LATLNG = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+
+
+def geohash(lat: float, lng: float, precision: int = ROUTE_PRECISION) -> str:
+    """Standard base-32 geohash of a point."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, value, bits, even = [], 0, 0, True
+    while len(chars) < precision:
+        coord, bounds = (lng, lng_range) if even else (lat, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        if coord >= mid:
+            value = value * 2 + 1
+            bounds[0] = mid
+        else:
+            value *= 2
+            bounds[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            value, bits = 0, 0
+    return "".join(chars)
+
+
+def geohash_center(cell: str) -> Tuple[float, float]:
+    """(lat, lng) at the centre of a geohash cell."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in cell:
+        value = _BASE32.index(char)
+        for shift in range(4, -1, -1):
+            bounds = lng_range if even else lat_range
+            mid = (bounds[0] + bounds[1]) / 2
+            if value >> shift & 1:
+                bounds[0] = mid
+            else:
+                bounds[1] = mid
+            even = not even
+    return (lat_range[0] + lat_range[1]) / 2, (lng_range[0] + lng_range[1]) / 2
+
+
+def parse_latlng(text: str) -> Optional[Tuple[float, float]]:
+    """(lat, lng) for a "lat,lng" string, else None."""
+    match = _LATLNG.match(text or "")
+    if not match:
+        return None
+    lat, lng = float(match.group(1)), float(match.group(2))
+    if -90 <= lat <= 90 and -180 <= lng <= 180:
+        return lat, lng
+    return None
+
+
+def normalize_address(address: str) -> str:
+    """Case, punctuation and whitespace-insensitive form of an address."""
+    return " ".join(re.sub(r"[^\w\s]", " ", address.lower()).split())
+
+
+def address_key(address: str, region: str = "") -> str:
+    return f"geo:addr:{region}:{normalize_address(address)}"
+
+
+def reverse_key(lat: float, lng: float) -> str:
+    return f"geo:rev:{geohash(lat, lng, REVERSE_PRECISION)}"
+
+
+def _endpoint(place: str) -> str:
+    point = parse_latlng(place)
+    if point:
+        return geohash(*point, ROUTE_PRECISION)
+    return normalize_address(place)
+
+
+def route_key(mode: str, origin: str, destination: str) -> str:
+    return f"geo:route:{mode}:{_endpoint(origin)}>{_endpoint(destination)}"
+
+
+def route_ttl(mode: str) -> int:
+    return ROUTE_TTL_S.get(mode, DEFAULT_ROUTE_TTL_S)
+
+
+# ============================================================================
+# L2 backends (blocking; called from a worker thread)
+# ============================================================================
+
+
+class RedisGeoStore:
+    """L2 on Redis: one key per entry, native TTL."""
+
+    name = "redis"
+
+    def __init__(self, client: Any):
+        self._redis = client
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        keys = list(keys)
+        found = {}
+        for key, raw in zip(keys, self._redis.mget(keys)):
+            if raw is not None:
+                found[key] = json.loads(raw)
+        return found
+
+    def set_many(self, entries: Dict[str, Tuple[Any, int]]) -> None:
+        pipe = self._redis.pipeline(transaction=False)
+        for key, (value, ttl_s) in entries.items():
+            pipe.setex(key, ttl_s, json.dumps(value))
+        pipe.execute()
+
+
+class DBGeoStore:
+    """L2 on the geo_cache table; expired rows are purged every PURGE_EVERY writes."""
+
+    name = "db"
+    PURGE_EVERY = 500
+
+    def __init__(self, session_factory: Optional[Callable[[], Any]] = None):
+        self._session_factory = session_factory
+        self._writes = 0
+
+    def _session(self):
+        if self._session_factory is None:
+            from models.database import SessionLocal
+
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        from models.models import GeoCacheEntry
+
+        with self._session() as db:
+            rows = db.query(GeoCacheEntry.key, GeoCacheEntry.value_json).filter(
+                GeoCacheEntry.key.in_(list(keys)),
+                GeoCacheEntry.expires_at > datetime.utcnow(),
+            )
+            return {key: json.loads(value) for key, value in rows}
+
+    def set_many(self, entries: Dict[str, Tuple[Any, int]]) -> None:
+        from models.models import GeoCacheEntry
+
+        now = datetime.utcnow()
+        with self._session() as db:
+            for key, (value, ttl_s) in entries.items():
+                db.merge(
+                    GeoCacheEntry(
+                        key=key,
+                        value_json=json.dumps(value),
+                        expires_at=now + timedelta(seconds=ttl_s),
+                        created_at=now,
+                    )
+                )
+            self._writes += len(entries)
+            if self._writes >= self.PURGE_EVERY:
+                self._writes = 0
+                db.query(GeoCacheEntry).filter(GeoCacheEntry.expires_at <= now).delete(
+                    synchronize_session=False
+                )
+            db.commit()
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+
+class GeoCache:
+    """
+    Two-tier read-through cache. Values must be JSON-serializable; None is
+    a valid (negative) value, so lookups return MISS when absent.
+    """
+
+    def __init__(self, store: Any = None, max_entries: Optional[int] = None):
+        if max_entries is None:
+            max_entries = core.config.get_settings().GEO_CACHE_MAX_ENTRIES
+        self.max_entries = max_entries
+        self.store = store
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._counters = {
+            "l1_hits": 0,
+            "l2_hits": 0,
+            "misses": 0,
+            "negative_hits": 0,
+            "coalesced": 0,
+            "stores": 0,
+            "l2_errors": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # L1
+    # ------------------------------------------------------------------
+
+    def _l1_get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISS
+            value, expires = entry
+            if time.time() >= expires:
+                del self._entries[key]
+                return MISS
+            self._entries.move_to_end(key)
+            return value
+
+    def _l1_set(self, key: str, value: Any, ttl_s: int) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl_s)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += n
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Cached values for the keys that are present (L1, then L2)."""
+        found, missing = {}, []
+        for key in dict.fromkeys(keys):
+            value = self._l1_get(key)
+            if value is MISS:
+                missing.append(key)
+            else:
+                found[key] = value
+        self._count("l1_hits", len(found))
+
+        promoted: Dict[str, Any] = {}
+        if missing and self.store is not None:
+            try:
+                promoted = await asyncio.to_thread(self.store.get_many, missing)
+            except Exception as e:
+                self._count("l2_errors")
+                logger.warning(f"Geo cache L2 read failed: {e}")
+            for key, value in promoted.items():
+                # Remaining lifetime is unknown here: keep it in L1 briefly
+                self._l1_set(key, value, NEGATIVE_TTL_S)
+            found.update(promoted)
+            self._count("l2_hits", len(promoted))
+
+        self._count("misses", len(missing) - len(promoted))
+        return found
+
+    async def get(self, key: str) -> Any:
+        """The cached value, or MISS."""
+        return (await self.get_many([key])).get(key, MISS)
+
+    async def set_many(self, entries: Dict[str, Tuple[Any, int]]) -> None:
+        """Store {key: (value, ttl_s)} in both tiers."""
+        if not entries:
+            return
+        for key, (value, ttl_s) in entries.items():
+            self._l1_set(key, value, ttl_s)
+        self._count("stores", len(entries))
+        if self.store is not None:
+            try:
+                await asyncio.to_thread(self.store.set_many, entries)
+            except Exception as e:
+                self._count("l2_errors")
+                logger.warning(f"Geo cache L2 write failed: {e}")
+
+    async def set(self, key: str, value: Any, ttl_s: int) -> None:
+        await self.set_many({key: (value, ttl_s)})
+
+    async def get_or_load(
+        self, key: str, loader: Callable[[], Awaitable[Tuple[Any, Optional[int]]]]
+    ) -> Any:
+        """
+        Cached value, or the loader's. loader returns (value, ttl_s); a
+        ttl_s of None means "do not cache" (transient errors).
+        """
+        value = await self.get(key)
+        if value is not MISS:
+            if value is None:
+                self._count("negative_hits")
+            return value
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self._count("coalesced")
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value, ttl_s = await loader()
+            if ttl_s:
+                await self.set(key, value, ttl_s)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # retrieved: waiters re-raise it themselves
+            raise
+        finally:
+            self._inflight.pop(key, None)
+            if not future.done():
+                future.cancel()
+
+    def clear(self) -> None:
+        """Drop L1 (L2 entries expire on their own)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            entries = len(self._entries)
+        lookups = counters["l1_hits"] + counters["l2_hits"] + counters["misses"]
+        hits = counters["l1_hits"] + counters["l2_hits"]
+        return {
+            **counters,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "l1_entries": entries,
+            "max_entries": self.max_entries,
+            "l2": self.store.name if self.store is not None else None,
+        }
+
+
+def _default_store() -> Any:
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        try:
+            import redis
+
+            client = redis.Redis.from_url(redis_url, socket_timeout=2)
+            client.ping()
+            return RedisGeoStore(client)
+        except Exception as e:
+            logger.warning(f"Geo cache: Redis unavailable ({e}), using the database")
+    return DBGeoStore()
+
+
+_geo_cache: Optional[GeoCache] = None
+
+
+def get_geo_cache() -> GeoCache:
+    """Process-wide GeoCache (Redis L2 when REDIS_URL is set, else the DB)."""
+    global _geo_cache
+    if _geo_cache is None:
+        _geo_cache = GeoCache(store=_default_store())
+    return _geo_cache
@@ -19,6 +19,7 @@ from urllib.parse import urlencode
 from sqlalchemy.orm import Session
 from models.models import Connection, CalendarEvent
 import core.config
+from core.http_client import http_client
 from services.connection_service import ConnectionService
 from services.audit_service import AuditService
 from .base_calendar_service import (
@@ -66,8 +67,6 @@ class GoogleCalendarService(BaseCalendarService):
         self.client_secret = self.settings.GOOGLE_CLIENT_SECRET
         self.redirect_uri = self.settings.APP_BASE_URL + "/productivity/google/callback"
 
-        self.timeout = httpx.Timeout(20.0, connect=10.0)
-
     @property
     def provider_name(self) -> str:
         return self.PROVIDER
@@ -140,7 +139,7 @@ class GoogleCalendarService(BaseCalendarService):
         }
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with http_client("google") as client:
                 response = await client.post(self.TOKEN_URL, data=payload)
                 if response.status_code == 400:  # invalid_grant
                     connection.status = "disconnected"
@@ -206,7 +205,7 @@ class GoogleCalendarService(BaseCalendarService):
         page_token = None
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with http_client("google") as client:
                 while True:
                     if page_token:
                         params["pageToken"] = page_token
@@ -277,7 +276,7 @@ class GoogleCalendarService(BaseCalendarService):
         }
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with http_client("google") as client:
                 headers = {
                     "Authorization": f"Bearer {token}",
                     "Content-Type": "application/json",
@@ -393,7 +392,7 @@ class GoogleCalendarService(BaseCalendarService):
         self, user_id: str, account_id: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         token = await self._ensure_authorized(user_id)
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with http_client("google") as client:
             headers = {"Authorization": f"Bearer {token}"}
             response = await client.get(
                 f"{self.API_BASE}/users/me/calendarList", headers=headers
@@ -409,7 +408,7 @@ class GoogleCalendarService(BaseCalendarService):
         calendar_id: str = "primary",
     ) -> bool:
         token = await self._ensure_authorized(user_id)
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with http_client("google") as client:
             headers = {"Authorization": f"Bearer {token}"}
             resp = await client.delete(
                 f"{self.API_BASE}/calendars/{calendar_id}/events/{event_id}",
@@ -3,46 +3,66 @@ Google Maps Service
 
 Handles location-related operations using the Google Maps Platform API.
 Includes geocoding, reverse geocoding, and distance matrix calculations.
+
+Geocodes and distance-matrix elements are read through the shared geo cache
+(services/productivity/geo_cache.py); mock mode bypasses it.
 """
 
 import httpx
 import logging
-import asyncio
 import core.config
+from core.http_client import get_http_client
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
 import urllib.parse
 
+from services.productivity.geo_cache import (
+    NEGATIVE_TTL_S,
+    TTL_S,
+    GeoCache,
+    address_key,
+    get_geo_cache,
+    reverse_key,
+    route_key,
+    route_ttl,
+)
+
 logger = logging.getLogger(__name__)
 
+# Distance-matrix element statuses worth caching (NOT_FOUND / ZERO_RESULTS
+# as negative entries); anything else is retried on the next request
+_CACHEABLE_ELEMENTS = {"OK", "NOT_FOUND", "ZERO_RESULTS"}
+
 
 class GoogleMapsService:
     """
     Service for interacting with Google Maps Platform APIs.
-    Uses a persistent client for connection pooling and implements retries.
+    Uses the shared "google_maps" client (core/http_client.py) for connection
+    pooling and retries.
     """
 
     BASE_URL = "https://maps.googleapis.com/maps/api"
-    _client: Optional[httpx.AsyncClient] = None
 
-    def __init__(self):
+    def __init__(self, cache: Optional[GeoCache] = None):
         self.settings = core.config.get_settings()
         self.api_key = self.settings.GOOGLE_MAPS_API_KEY
         self.client = None
+        self._cache = cache
         if self.settings.GOOGLE_MAPS_API_KEY:
             # Default region/language for better relevance
             self.region = "ae"
             self.language = "en"
 
+    @property
+    def cache(self) -> GeoCache:
+        if self._cache is None:
+            self._cache = get_geo_cache()
+        return self._cache
+
     @classmethod
     async def get_client(cls) -> httpx.AsyncClient:
-        """Get or create the persistent AsyncClient for connection pooling."""
-        if cls._client is None or cls._client.is_closed:
-            cls._client = httpx.AsyncClient(
-                timeout=httpx.Timeout(10.0, connect=5.0),
-                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
-            )
-        return cls._client
+        """The shared pooled AsyncClient for Google Maps."""
+        return get_http_client("google_maps")
 
     async def geocode(self, address: str) -> Optional[Tuple[float, float]]:
         """
@@ -61,6 +81,15 @@ class GoogleMapsService:
             logger.info("Using mock geocoding for address.")
             return self._get_mock_coordinates(address)
 
+        coords = await self.cache.get_or_load(
+            address_key(address, self.region), lambda: self._fetch_geocode(address)
+        )
+        return tuple(coords) if coords else None
+
+    async def _fetch_geocode(
+        self, address: str
+    ) -> Tuple[Optional[list], Optional[int]]:
+        """(coordinates, cache TTL) from the Geocoding API; TTL None = don't cache."""
         params = {
             "address": address,
             "key": self.api_key,
@@ -69,43 +98,31 @@ class GoogleMapsService:
         }
 
         try:
+            # Transient network errors are retried by the shared client
             client = await self.get_client()
-            # Implement 1 retry for transient network issues
-            for attempt in range(2):
-                try:
-                    response = await client.get(
-                        f"{self.BASE_URL}/geocode/json", params=params
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-
-                    status = data.get("status")
-                    if status == "OK" and data.get("results"):
-                        location = data["results"][0]["geometry"]["location"]
-                        return location["lat"], location["lng"]
-                    elif status == "ZERO_RESULTS":
-                        logger.info(
-                            f"Geocoding found no results for: [REDACTED ADDRESS]"
-                        )
-                        return None
-                    elif status in ["OVER_QUERY_LIMIT", "REQUEST_DENIED"]:
-                        logger.error(
-                            f"Google Maps API error: {status}. Message: {data.get('error_message')}"
-                        )
-                        break  # Unrecoverable here
-                    else:
-                        logger.warning(f"Geocoding failed for [REDACTED]: {status}")
-                        break
-                except (httpx.RequestError, httpx.TimeoutException) as e:
-                    if attempt == 0:
-                        await asyncio.sleep(1)
-                        continue
-                    logger.error(f"Geocoding network error: {e}")
+            response = await client.get(f"{self.BASE_URL}/geocode/json", params=params)
+            response.raise_for_status()
+            data = response.json()
 
+            status = data.get("status")
+            if status == "OK" and data.get("results"):
+                location = data["results"][0]["geometry"]["location"]
+                return [location["lat"], location["lng"]], TTL_S["addr"]
+            elif status == "ZERO_RESULTS":
+                logger.info(f"Geocoding found no results for: [REDACTED ADDRESS]")
+                return None, NEGATIVE_TTL_S
+            elif status in ["OVER_QUERY_LIMIT", "REQUEST_DENIED"]:
+                logger.error(
+                    f"Google Maps API error: {status}. Message: {data.get('error_message')}"
+                )
+            else:
+                logger.warning(f"Geocoding failed for [REDACTED]: {status}")
+        except (httpx.RequestError, httpx.TimeoutException) as e:
+            logger.error(f"Geocoding network error: {e}")
         except Exception as e:
             logger.error(f"Geocoding exception: {type(e).__name__}")
 
-        return None
+        return None, None
 
     async def reverse_geocode(self, lat: float, lng: float) -> Optional[str]:
         """
@@ -117,6 +134,13 @@ class GoogleMapsService:
                 return "Mock Address, Downtown Dubai, UAE"
             return "Mock Address, Unknown Location"
 
+        return await self.cache.get_or_load(
+            reverse_key(lat, lng), lambda: self._fetch_reverse_geocode(lat, lng)
+        )
+
+    async def _fetch_reverse_geocode(
+        self, lat: float, lng: float
+    ) -> Tuple[Optional[str], Optional[int]]:
         params = {
             "latlng": f"{lat},{lng}",
             "key": self.api_key,
@@ -129,18 +153,24 @@ class GoogleMapsService:
             response.raise_for_status()
             data = response.json()
 
-            if data.get("status") == "OK" and data.get("results"):
-                return data["results"][0]["formatted_address"]
+            status = data.get("status")
+            if status == "OK" and data.get("results"):
+                return data["results"][0]["formatted_address"], TTL_S["rev"]
+            if status == "ZERO_RESULTS":
+                return None, NEGATIVE_TTL_S
         except Exception as e:
             logger.error(f"Reverse geocoding exception: {type(e).__name__}")
 
-        return None
+        return None, None
 
     async def get_distance_matrix(
         self, origins: List[str], destinations: List[str], mode: str = "driving"
     ) -> Optional[Dict[str, Any]]:
         """
         Get travel distance and time between origins and destinations.
+
+        Elements are cached per (origin, destination, mode); only the rows and
+        columns with a missing element are requested from the API.
         """
         if not origins or not destinations:
             return None
@@ -157,6 +187,43 @@ class GoogleMapsService:
         if not self.api_key or self.api_key == "mock":
             return self._get_mock_distance_matrix(len(origins), len(destinations))
 
+        keys = {(o, d): route_key(mode, o, d) for o in origins for d in destinations}
+        cached = await self.cache.get_many(keys.values())
+        missing = [pair for pair, key in keys.items() if key not in cached]
+
+        if missing:
+            fetch_origins = list(dict.fromkeys(o for o, _ in missing))
+            fetch_destinations = list(dict.fromkeys(d for _, d in missing))
+            data = await self._fetch_distance_matrix(
+                fetch_origins, fetch_destinations, mode
+            )
+            if data is None:
+                return None
+
+            fresh = {}
+            for i, row in enumerate(data.get("rows") or []):
+                for j, element in enumerate(row.get("elements") or []):
+                    if element.get("status") not in _CACHEABLE_ELEMENTS:
+                        continue
+                    origin, destination = fetch_origins[i], fetch_destinations[j]
+                    entry = {
+                        "element": element,
+                        "origin": self._address_at(data, "origin", i, origin),
+                        "destination": self._address_at(
+                            data, "destination", j, destination
+                        ),
+                    }
+                    ok = element["status"] == "OK"
+                    key = keys[(origin, destination)]
+                    cached[key] = entry
+                    fresh[key] = (entry, route_ttl(mode) if ok else NEGATIVE_TTL_S)
+            await self.cache.set_many(fresh)
+
+        return self._assemble_matrix(origins, destinations, keys, cached)
+
+    async def _fetch_distance_matrix(
+        self, origins: List[str], destinations: List[str], mode: str
+    ) -> Optional[Dict[str, Any]]:
         params = {
             "origins": "|".join(origins),
             "destinations": "|".join(destinations),
@@ -182,6 +249,58 @@ class GoogleMapsService:
 
         return None
 
+    @staticmethod
+    def _address_at(data: Dict[str, Any], side: str, index: int, default: str) -> str:
+        addresses = data.get(f"{side}_addresses") or []
+        return addresses[index] if index < len(addresses) else default
+
+    @staticmethod
+    def _assemble_matrix(
+        origins: List[str],
+        destinations: List[str],
+        keys: Dict[Tuple[str, str], str],
+        entries: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """The API's response shape, rebuilt from cached elements."""
+        unknown = {"element": {"status": "UNKNOWN_ERROR"}}
+        rows, origin_addresses, destination_addresses = [], [], {}
+        for origin in origins:
+            row = [entries.get(keys[(origin, d)], unknown) for d in destinations]
+            rows.append({"elements": [entry["element"] for entry in row]})
+            origin_addresses.append(
+                next((e["origin"] for e in row if "origin" in e), origin)
+            )
+            for destination, entry in zip(destinations, row):
+                if "destination" in entry:
+                    destination_addresses.setdefault(destination, entry["destination"])
+        return {
+            "status": "OK",
+            "rows": rows,
+            "origin_addresses": origin_addresses,
+            "destination_addresses": [
+                destination_addresses.get(d, d) for d in destinations
+            ],
+        }
+
+    async def get_distance(
+        self, origin: str, destination: str, mode: str = "driving"
+    ) -> Optional[float]:
+        """
+        Road distance in kilometers, or None when unknown. Returns None in
+        mock mode so callers fall back to their own estimate.
+        """
+        if not origin or not destination:
+            return None
+        if not self.api_key or self.api_key == "mock":
+            return None
+        matrix = await self.get_distance_matrix([origin], [destination], mode=mode)
+        if not matrix:
+            return None
+        element = matrix["rows"][0]["elements"][0]
+        if element.get("status") != "OK":
+            return None
+        return element["distance"]["value"] / 1000.0
+
     async def places_search(
         self,
         query: str,
@@ -10,8 +10,8 @@ from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
 import logging
 import uuid
-import httpx
 import core.config
+from core.http_client import http_client
 from .base_calendar_service import (
     BaseCalendarService,
     NormalizedEvent,
@@ -38,7 +38,6 @@ class OutlookCalendarService(BaseCalendarService):
         self.db = db
         self.access_token = access_token
         self.settings = core.config.get_settings()
-        self.timeout = httpx.Timeout(30.0, connect=10.0)
         self.client_id = None
 
     @property
@@ -53,7 +52,7 @@ class OutlookCalendarService(BaseCalendarService):
             return [{"id": "primary", "name": "Calendar", "isDefaultCalendar": True}]
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with http_client("microsoft") as client:
                 headers = {"Authorization": f"Bearer {self.access_token}"}
                 response = await client.get(
                     f"{self.BASE_URL}/me/calendars", headers=headers
@@ -88,7 +87,7 @@ class OutlookCalendarService(BaseCalendarService):
                 # Using calendarView to get instances of recurring events
                 url = f"{self.BASE_URL}/me/calendars/{calendar_id}/calendarView?startDateTime={start_iso}&endDateTime={end_iso}&$top={limit}"
 
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
+                async with http_client("microsoft") as client:
                     response = await client.get(url, headers=headers)
                     if response.status_code == 401:
                         raise CalendarAuthError("Outlook token expired")
@@ -131,7 +130,7 @@ class OutlookCalendarService(BaseCalendarService):
         if self.access_token:
             try:
                 headers = {"Authorization": f"Bearer {self.access_token}"}
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
+                async with http_client("microsoft") as client:
                     response = await client.post(
                         f"{self.BASE_URL}/me/calendars/{calendar_id}/events",
                         json=payload,
@@ -164,7 +163,7 @@ class OutlookCalendarService(BaseCalendarService):
             return True
         try:
             headers = {"Authorization": f"Bearer {self.access_token}"}
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with http_client("microsoft") as client:
                 response = await client.delete(
                     f"{self.BASE_URL}/me/events/{event_id}", headers=headers
                 )
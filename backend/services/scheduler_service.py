@@ -2,8 +2,6 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from sqlalchemy.orm import Session
 from models.database import SessionLocal
-from models.models import Connection
-from services.integrations.google_fit_service import GoogleFitService
 
 # from services.integrations.apple_health_service import AppleHealthService
 import logging
@@ -37,10 +35,30 @@ class SchedulerService:
     async def refresh_demo_data(self):
         """Job to roll the demo accounts' synthetic data forward to today."""
         import asyncio
+        import core.config
+
+        if core.config.get_settings().JOB_RUNNER_ENABLED:
+            # Queue it for the job runner; the dedupe key keeps app instances
+            # from piling up refreshes while one is still pending
+            await asyncio.to_thread(self._enqueue_demo_refresh)
+            return
 
         loop = asyncio.get_event_loop()
         await loop.run_in_executor(None, self._refresh_demo_data_impl)
 
+    def _enqueue_demo_refresh(self):
+        db = SessionLocal()
+        try:
+            from services.job_manager import JobManager
+
+            JobManager(db).enqueue(
+                "demo_refresh", source="scheduler", dedupe_key="demo_refresh"
+            )
+        except Exception as e:
+            logger.error(f"Failed to queue demo refresh: {e}")
+        finally:
+            db.close()
+
     def _refresh_demo_data_impl(self):
         db = SessionLocal()
         try:
@@ -66,46 +84,42 @@ class SchedulerService:
     async def sync_health_data(self):
         """Job to sync health data for all connected users."""
         import asyncio
+        import core.config
 
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, self._sync_health_data_impl)
+        if core.config.get_settings().JOB_RUNNER_ENABLED:
+            await asyncio.to_thread(self._enqueue_health_sync)
+            return
+
+        # No runner in this process: sync inline, still recording the run's
+        # metrics on a tracked job
+        from services.integrations.health_sync import HealthSyncOrchestrator
+        from services.job_manager import JobManager, JobStatus
 
-    def _sync_health_data_impl(self):
-        """Synchronous implementation of health data sync."""
-        logger.info("Starting scheduled health data sync...")
         db = SessionLocal()
         try:
-            # 1. Google Fit
-            google_connections = (
-                db.query(Connection)
-                .filter(
-                    Connection.provider == "google_fit",
-                    Connection.status == "connected",
-                )
-                .all()
-            )
+            jobs = JobManager(db)
+            job_id = jobs.create_job("health_sync", source="scheduler")
+            try:
+                stats = await HealthSyncOrchestrator().run()
+                jobs.update_job(job_id, JobStatus.COMPLETED, result=stats, progress=100)
+            except Exception as e:
+                logger.error(f"Error in health sync job: {e}")
+                jobs.update_job(job_id, JobStatus.FAILED, error=str(e))
+        finally:
+            db.close()
 
-            for conn in google_connections:
-                try:
-                    logger.info(f"Syncing Google Fit for user {conn.user_id}")
-                    service = GoogleFitService(db)
-                    # Fetch last 1 day of data for incremental updates
-                    service.fetch_data(conn.user_id, days=1)
-                except Exception as e:
-                    logger.error(
-                        f"Failed to sync Google Fit for user {conn.user_id}: {e}"
-                    )
-
-            # 2. Apple Health (Placeholder for now as it requires push or middleware)
-            # apple_connections = db.query(Connection).filter(
-            #     Connection.provider == "apple_health",
-            #     Connection.status == "connected"
-            # ).all()
-            # for conn in apple_connections:
-            #     ...
+    def _enqueue_health_sync(self):
+        db = SessionLocal()
+        try:
+            from services.job_manager import JobManager
 
+            JobManager(db).enqueue(
+                "health_sync",
+                source="scheduler",
+                max_attempts=1,  # the next scheduled run catches up
+                dedupe_key="health_sync",
+            )
         except Exception as e:
-            logger.error(f"Error in health sync job: {e}")
+            logger.error(f"Failed to queue health sync: {e}")
         finally:
             db.close()
-            logger.info("Health data sync job completed.")
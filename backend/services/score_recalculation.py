@@ -0,0 +1,150 @@
+"""
+Score Recalculation — full recompute of a user's Finance, Health and Time
+scores plus a fresh VivIndex snapshot.
+
+Shared by POST /scores/debug/trigger_calc (inline) and the "score_recalc"
+background job (services/job_handlers.py).
+"""
+
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from models.models import FinancialScore, User, VivIndex
+from services.financial_scoring import calculate_financial_health_score
+from services.health_scoring import calculate_health_score
+from services.time_service import calculate_time_score
+
+logger = logging.getLogger(__name__)
+
+
+def recalculate_scores(
+    db: Session, user: User, progress: Optional[Callable[[int], None]] = None
+) -> Dict[str, Any]:
+    """
+    Populate FinancialScore, TimeScore and VivIndex from raw data.
+
+    Each pillar is computed in isolation: a failing calculator falls back to
+    a neutral 50 instead of failing the whole recalculation. progress, when
+    given, receives a percentage after each step.
+    """
+    user_id = user.id
+    # Clear any stale transaction (Cloud SQL pooled connections)
+    try:
+        db.rollback()
+    except Exception:
+        pass
+
+    onboarding = user.profile_json if user.profile_json else {}
+    fin_val = 50.0
+    health_val = 50.0
+    time_val = 50.0
+    ts = None
+
+    # 1. Time/Productivity Score — isolated
+    try:
+        from models.models import TimeScore
+
+        ts = calculate_time_score(db, user_id, window_days=30)
+        if ts:
+            time_val = ts.overall_score
+    except Exception as e:
+        logger.warning(f"Time score calculation failed (continuing): {e}")
+        try:
+            db.rollback()
+        except Exception:
+            pass
+
+    if progress:
+        progress(25)
+
+    # 2. Financial Score — isolated
+    try:
+        fin_data = calculate_financial_health_score(user_id, onboarding, db)
+        if fin_data:
+            fin_val = fin_data.get("overall_score", 50.0)
+    except Exception as e:
+        logger.warning(f"Financial score calculation failed (continuing): {e}")
+        try:
+            db.rollback()
+        except Exception:
+            pass
+
+    if progress:
+        progress(50)
+
+    # 3. Health Score — isolated
+    try:
+        hs_data = calculate_health_score(user_id, onboarding, db)
+        if hs_data:
+            health_val = hs_data.get("score", 50.0)
+    except Exception as e:
+        logger.warning(f"Health score calculation failed (continuing): {e}")
+        try:
+            db.rollback()
+        except Exception:
+            pass
+
+    if progress:
+        progress(75)
+
+    # 4. Try to fetch persisted scores (may be better than computed)
+    try:
+        latest_fs = (
+            db.query(FinancialScore)
+            .filter(FinancialScore.user_id == user_id)
+            .order_by(FinancialScore.timestamp.desc())
+            .first()
+        )
+        if latest_fs:
+            fin_val = latest_fs.overall_score
+    except Exception:
+        try:
+            db.rollback()
+        except Exception:
+            pass
+
+    try:
+        from models.models import TimeScore
+
+        latest_ts = (
+            db.query(TimeScore)
+            .filter(TimeScore.user_id == user_id)
+            .order_by(TimeScore.timestamp.desc())
+            .first()
+        )
+        if latest_ts:
+            time_val = latest_ts.overall_score
+    except Exception:
+        try:
+            db.rollback()
+        except Exception:
+            pass
+
+    # 5. Always create a VivIndex snapshot
+    try:
+        db.rollback()  # ensure clean transaction
+    except Exception:
+        pass
+
+    viv_index = VivIndex(
+        id=str(uuid.uuid4()),
+        user_id=user_id,
+        financial_score=fin_val,
+        health_score=health_val,
+        time_score=time_val,
+        snapshot_reason="Manual Recalculation",
+        timestamp=datetime.utcnow(),
+        confidence=1.0,
+    )
+    db.add(viv_index)
+    db.commit()
+
+    return {
+        "status": "success",
+        "message": "Scores recalculation complete",
+        "scores": {"financial": fin_val, "health": health_val, "time": time_val},
+    }
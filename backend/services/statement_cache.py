@@ -0,0 +1,190 @@
+"""
+Statement Cache — content-addressed cache of parsed statements.
+
+Users re-upload the same PDF (onboarding retries, double submits); every
+upload used to pay the full parse before the dedup keys discarded each row.
+StatementService hashes the raw file bytes and the normalized text layer
+and consults this cache before any parsing tier:
+
+    - content_hash: sha256 of the file bytes, the exact-file key
+    - text_hash: sha256 of the lowercased, whitespace-collapsed text layer,
+      which also matches a re-export of the same statement whose bytes
+      differ (new PDF metadata, different producer). Scanned PDFs without
+      a text layer only get the content key.
+
+Entries live in parsed_statement_cache with a total size cap
+(STATEMENT_CACHE_MAX_BYTES); writes evict least recently used entries
+above it. CACHE_VERSION is part of both keys, so a parser change that
+alters output orphans old entries by bumping it.
+
+Hit/miss counters are process-wide and exposed through stats() to the
+admin analytics endpoint.
+"""
+
+import hashlib
+import json
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import core.config
+from models.models import ParsedStatementCache
+from services.ocr_engine import text_layer
+
+CACHE_VERSION = "1"
+
+# Text layers shorter than this (normalized) are not distinctive enough
+MIN_TEXT_KEY_CHARS = 200
+
+_counters = {
+    "content_hits": 0,
+    "text_hits": 0,
+    "misses": 0,
+    "stores": 0,
+    "evictions": 0,
+}
+_counters_lock = threading.Lock()
+
+
+def _count(name: str, n: int = 1) -> None:
+    with _counters_lock:
+        _counters[name] += n
+
+
+def _sha256(*parts: bytes) -> str:
+    digest = hashlib.sha256(CACHE_VERSION.encode())
+    for part in parts:
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def cache_keys(pdf_bytes: bytes) -> Tuple[str, Optional[str]]:
+    """(content_hash, text_hash); text_hash is None without a text layer."""
+    content_hash = _sha256(pdf_bytes)
+    try:
+        texts, _ = text_layer(pdf_bytes)
+    except Exception:
+        return content_hash, None
+    normalized = " ".join("\n".join(texts).lower().split())
+    if len(normalized) < MIN_TEXT_KEY_CHARS:
+        return content_hash, None
+    return content_hash, _sha256(b"text:", normalized.encode())
+
+
+class StatementCache:
+    """Parsed-statement cache over the parsed_statement_cache table."""
+
+    def __init__(self, db: Session, max_bytes: Optional[int] = None):
+        self.db = db
+        if max_bytes is None:
+            max_bytes = core.config.get_settings().STATEMENT_CACHE_MAX_BYTES
+        self.max_bytes = max_bytes
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(
+        self, content_hash: str, text_hash: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Cached ParsedStatement data (JSON mode), or None."""
+        if not self.enabled:
+            return None
+        entry = self.db.get(ParsedStatementCache, content_hash)
+        counter = "content_hits"
+        if entry is None and text_hash:
+            entry = (
+                self.db.query(ParsedStatementCache)
+                .filter(ParsedStatementCache.text_hash == text_hash)
+                .first()
+            )
+            counter = "text_hits"
+        if entry is None:
+            _count("misses")
+            return None
+
+        _count(counter)
+        entry.hits = (entry.hits or 0) + 1
+        entry.last_used_at = datetime.utcnow()
+        parsed = entry.parsed_json
+        self.db.commit()
+        return parsed
+
+    def put(
+        self, content_hash: str, text_hash: Optional[str], parsed: Dict[str, Any]
+    ) -> None:
+        """Store a parse (JSON mode), then evict LRU entries above the cap."""
+        if not self.enabled:
+            return
+        size = len(json.dumps(parsed))
+        if size > self.max_bytes:
+            return
+        self.db.add(
+            ParsedStatementCache(
+                content_hash=content_hash,
+                text_hash=text_hash,
+                parsed_json=parsed,
+                size_bytes=size,
+            )
+        )
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # A concurrent upload of the same file stored it first
+            self.db.rollback()
+            return
+        _count("stores")
+        self._evict()
+
+    def _evict(self) -> None:
+        total = self.db.query(
+            func.coalesce(func.sum(ParsedStatementCache.size_bytes), 0)
+        ).scalar()
+        if total <= self.max_bytes:
+            return
+        victims = []
+        oldest_first = self.db.query(
+            ParsedStatementCache.content_hash, ParsedStatementCache.size_bytes
+        ).order_by(ParsedStatementCache.last_used_at.asc())
+        for content_hash, size in oldest_first:
+            if total <= self.max_bytes:
+                break
+            victims.append(content_hash)
+            total -= size
+        self.db.query(ParsedStatementCache).filter(
+            ParsedStatementCache.content_hash.in_(victims)
+        ).delete(synchronize_session=False)
+        self.db.commit()
+        _count("evictions", len(victims))
+        logger.info(f"Statement cache: evicted {len(victims)} LRU entries")
+
+    def stats(self) -> Dict[str, Any]:
+        with _counters_lock:
+            counters = dict(_counters)
+        hits = counters["content_hits"] + counters["text_hits"]
+        lookups = hits + counters["misses"]
+        entries, size, lifetime_hits = self.db.query(
+            func.count(ParsedStatementCache.content_hash),
+            func.coalesce(func.sum(ParsedStatementCache.size_bytes), 0),
+            func.coalesce(func.sum(ParsedStatementCache.hits), 0),
+        ).one()
+        return {
+            **counters,
+            "hits": hits,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+            "lifetime_hits": lifetime_hits,
+        }
+
+
+def reset_counters() -> None:
+    with _counters_lock:
+        for name in _counters:
+            _counters[name] = 0
@@ -0,0 +1,400 @@
+"""
+Statement Layout — deterministic table extraction for bank statement PDFs.
+
+Rebuilds table rows from the PyMuPDF word layer (page.get_text("words")):
+words are grouped into lines by vertical position, a header line fixes the
+column x-ranges, and every following line is split into date / description
+/ debit / credit / amount / balance cells by the x-centre of each word.
+
+Per-bank differences (header labels, fixed column positions, date and
+amount formats, summary-line patterns) live in BankTemplate entries of a
+registry. GENERIC_TEMPLATE covers the common Date / Description / Debit /
+Credit / Balance layout. More templates are registered in code with
+register_template() or loaded from the JSON file named by
+STATEMENT_TEMPLATES_PATH: a list of objects with BankTemplate's fields, e.g.
+
+    [{"name": "acme", "match": ["ACME BANK"], "bank_name": "Acme Bank",
+      "date_formats": ["%d %b"], "thousands_sep": ".", "decimal_sep": ",",
+      "columns": {"date": [30, 80], "description": [90, 300],
+                  "amount": [320, 400], "balance": [420, 500]}}]
+
+This module only extracts. StatementService's LayoutParser decides whether
+the result reconciles well enough to skip the LLM tier.
+"""
+
+import json
+import logging
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+import core.config
+
+logger = logging.getLogger(__name__)
+
+AMOUNT_COLUMNS = ("debit", "credit", "amount", "balance")
+
+# Words whose vertical centres are this close (points) share a line
+LINE_TOLERANCE = 2.5
+
+# A description-only line continues the row above it when the vertical gap
+# is at most this many line heights
+CONTINUATION_GAP = 1.5
+
+DEFAULT_HEADERS: Dict[str, List[str]] = {
+    "date": ["transaction date", "posting date", "value date", "date"],
+    "description": ["description", "details", "narrative", "particulars"],
+    "debit": ["money out", "paid out", "withdrawals", "withdrawal", "debit"],
+    "credit": ["money in", "paid in", "deposits", "deposit", "credit"],
+    "balance": ["running balance", "balance"],
+    "amount": ["amount"],
+}
+
+DEFAULT_DATE_FORMATS = [
+    "%Y-%m-%d",
+    "%d/%m/%Y",
+    "%d-%m-%Y",
+    "%d %b %Y",
+    "%d-%b-%Y",
+    "%b %d, %Y",
+    "%d %b",
+]
+
+DEFAULT_SKIP = [
+    r"\b(?:opening|closing|previous|ending)\s+balance\b",
+    r"\bbalance\s+(?:brought|carried)\s+forward\b",
+    r"^\s*total\b",
+]
+
+_FIGURE = r"\s*:?\s*(?:[A-Z]{3}\s*)?(\(?[-+]?[$£€]?[\d.,]+\)?(?:\s?(?:CR|DR))?)"
+
+DEFAULT_SUMMARY_PATTERNS: Dict[str, str] = {
+    "total_credits": r"total\s+(?:credits?|deposits?|money\s+in|paid\s+in)" + _FIGURE,
+    "total_debits": r"total\s+(?:debits?|withdrawals?|money\s+out|paid\s+out)"
+    + _FIGURE,
+    "opening_balance": r"(?:opening|previous)\s+balance" + _FIGURE,
+    "closing_balance": r"(?:closing|ending|new)\s+balance" + _FIGURE,
+}
+
+
+@dataclass
+class BankTemplate:
+    """How one bank lays out its statement table."""
+
+    name: str
+    # Case-insensitive substrings of the first page that identify the bank
+    match: List[str] = field(default_factory=list)
+    bank_name: Optional[str] = None
+    # Column -> header labels; the header line fixes the column x-ranges
+    headers: Dict[str, List[str]] = field(default_factory=lambda: dict(DEFAULT_HEADERS))
+    # Column -> (x0, x1) in points; replaces header detection when set
+    columns: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    # Tried in order; formats without a year take it from the statement
+    date_formats: List[str] = field(default_factory=lambda: list(DEFAULT_DATE_FORMATS))
+    decimal_sep: str = "."
+    thousands_sep: str = ","
+    # Rows that print the date only on the first transaction of each day
+    carry_date: bool = False
+    # Lines matching any of these (case-insensitive) are never rows
+    skip: List[str] = field(default_factory=lambda: list(DEFAULT_SKIP))
+    # Summary figures printed on the statement, one capture group each
+    summary_patterns: Dict[str, str] = field(
+        default_factory=lambda: dict(DEFAULT_SUMMARY_PATTERNS)
+    )
+
+
+@dataclass
+class LayoutExtraction:
+    """Rows and printed summary figures read from the word layer."""
+
+    template: str
+    bank_name: Optional[str]
+    transactions: List[Dict[str, Any]]
+    # Figures printed on the statement (None when not found)
+    summary: Dict[str, Optional[float]]
+    # Dated lines whose amount cells could not be read
+    malformed: int = 0
+
+
+GENERIC_TEMPLATE = BankTemplate(name="generic")
+
+_REGISTRY: Dict[str, BankTemplate] = {}
+_config_loaded = False
+
+
+# ============================================================================
+# Template Registry
+# ============================================================================
+
+
+def register_template(template: BankTemplate) -> None:
+    _REGISTRY[template.name] = template
+
+
+def load_templates(path: str) -> int:
+    """Register templates from a JSON file; returns how many were loaded."""
+    with open(path, "r", encoding="utf-8") as fh:
+        entries = json.load(fh)
+    for entry in entries:
+        entry = dict(entry)
+        entry["columns"] = {
+            column: tuple(span) for column, span in entry.get("columns", {}).items()
+        }
+        register_template(BankTemplate(**entry))
+    logger.info(f"Loaded {len(entries)} statement templates from {path}")
+    return len(entries)
+
+
+def get_templates() -> List[BankTemplate]:
+    """Registered bank templates, loading STATEMENT_TEMPLATES_PATH once."""
+    global _config_loaded
+    if not _config_loaded:
+        _config_loaded = True
+        path = core.config.get_settings().STATEMENT_TEMPLATES_PATH
+        if path:
+            try:
+                load_templates(path)
+            except (OSError, ValueError, TypeError) as e:
+                logger.error(f"Could not load statement templates from {path}: {e}")
+    return list(_REGISTRY.values())
+
+
+def match_template(first_page_text: str) -> BankTemplate:
+    haystack = first_page_text.lower()
+    for template in get_templates():
+        if any(needle.lower() in haystack for needle in template.match):
+            return template
+    return GENERIC_TEMPLATE
+
+
+# ============================================================================
+# Cell Parsing
+# ============================================================================
+
+_NUMBER_RE = re.compile(r"\d+\.\d{2}")
+_YEAR_RE = re.compile(r"\b(19|20)\d{2}\b")
+
+
+def parse_amount(
+    text: str, template: BankTemplate = GENERIC_TEMPLATE
+) -> Optional[float]:
+    """
+    Read a printed amount: thousands/decimal separators per template, sign
+    from a leading/trailing minus, parentheses or a CR/DR suffix. Amounts
+    must carry two decimals, so reference numbers are not mistaken for money.
+    """
+    s = "".join(text.split())
+    if not s:
+        return None
+    sign = 1.0
+    suffix = s[-2:].upper()
+    if suffix in ("CR", "DR"):
+        s = s[:-2]
+        sign = -1.0 if suffix == "DR" else 1.0
+    s = re.sub(r"^[A-Z]{3}|[$£€]", "", s)
+    if s.startswith("(") and s.endswith(")"):
+        s, sign = s[1:-1], -sign
+    if s.endswith("-"):
+        s, sign = s[:-1], -sign
+    if s.startswith("-"):
+        s, sign = s[1:], -sign
+    elif s.startswith("+"):
+        s = s[1:]
+    if template.thousands_sep:
+        s = s.replace(template.thousands_sep, "")
+    if template.decimal_sep != ".":
+        s = s.replace(template.decimal_sep, ".")
+    if not _NUMBER_RE.fullmatch(s):
+        return None
+    return sign * float(s)
+
+
+def parse_date(
+    text: str, template: BankTemplate = GENERIC_TEMPLATE, year: Optional[int] = None
+) -> Optional[date]:
+    text = " ".join(text.split())
+    if not text:
+        return None
+    for fmt in template.date_formats:
+        try:
+            if "%Y" in fmt or "%y" in fmt:
+                return datetime.strptime(text, fmt).date()
+            # Parse with the year attached so 29 Feb survives strptime
+            year_ = year or datetime.utcnow().year
+            return datetime.strptime(f"{text} {year_}", f"{fmt} %Y").date()
+        except ValueError:
+            continue
+    return None
+
+
+# ============================================================================
+# Layout Extraction
+# ============================================================================
+
+Word = Tuple[float, float, float, float, str]
+
+
+def _lines(page: "fitz.Page") -> List[List[Word]]:
+    """Words grouped into lines by vertical centre, each sorted left to right."""
+    words = sorted(
+        (w[:5] for w in page.get_text("words")),
+        key=lambda w: ((w[1] + w[3]) / 2, w[0]),
+    )
+    lines: List[Tuple[float, List[Word]]] = []
+    for w in words:
+        centre = (w[1] + w[3]) / 2
+        if lines and abs(centre - lines[-1][0]) <= LINE_TOLERANCE:
+            lines[-1][1].append(w)
+        else:
+            lines.append((centre, [w]))
+    return [sorted(ws, key=lambda w: w[0]) for _, ws in lines]
+
+
+def _find_header(
+    line: List[Word], template: BankTemplate
+) -> Optional[Dict[str, Tuple[float, float]]]:
+    """Column x-spans if this line is the table header."""
+    texts = [w[4].lower().strip(":") for w in line]
+    used: set = set()
+    spans: Dict[str, Tuple[float, float]] = {}
+    labels = [
+        (column, label.lower().split())
+        for column, names in template.headers.items()
+        for label in names
+    ]
+    # Multi-word labels first, so "Debit Amount" is not read as "Amount"
+    for column, tokens in sorted(labels, key=lambda item: -len(item[1])):
+        if column in spans:
+            continue
+        for i in range(len(texts) - len(tokens) + 1):
+            idx = set(range(i, i + len(tokens)))
+            if texts[i : i + len(tokens)] == tokens and not idx & used:
+                used |= idx
+                spans[column] = (line[i][0], line[i + len(tokens) - 1][2])
+                break
+    has_amounts = "amount" in spans or {"debit", "credit"} <= spans.keys()
+    if {"date", "description"} <= spans.keys() and has_amounts:
+        return spans
+    return None
+
+
+def _zones(spans: Dict[str, Tuple[float, float]]) -> List[Tuple[float, str]]:
+    """(right boundary, column) pairs: midpoints between neighbouring spans."""
+    ordered = sorted(spans.items(), key=lambda item: item[1][0])
+    zones = []
+    for (column, (_, x1)), (_, (nx0, _)) in zip(ordered, ordered[1:]):
+        zones.append(((x1 + nx0) / 2, column))
+    zones.append((float("inf"), ordered[-1][0]))
+    return zones
+
+
+def _cells(line: List[Word], zones: List[Tuple[float, str]]) -> Dict[str, str]:
+    cells: Dict[str, List[str]] = defaultdict(list)
+    for w in line:
+        centre = (w[0] + w[2]) / 2
+        column = next(column for bound, column in zones if centre <= bound)
+        cells[column].append(w[4])
+    return {column: " ".join(words) for column, words in cells.items()}
+
+
+def _summary(text: str, template: BankTemplate) -> Dict[str, Optional[float]]:
+    figures: Dict[str, Optional[float]] = {}
+    for key, pattern in template.summary_patterns.items():
+        m = re.search(pattern, text, re.IGNORECASE)
+        figures[key] = parse_amount(m.group(1), template) if m else None
+    return figures
+
+
+def extract_statement(
+    pdf_bytes: bytes, template: Optional[BankTemplate] = None
+) -> Optional[LayoutExtraction]:
+    """
+    Extract transaction rows from a text-layer PDF.
+
+    Returns None when there is no text layer or no table was found.
+    """
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        page_texts = [page.get_text() for page in doc]
+        if not "".join(page_texts).strip():
+            return None
+        template = template or match_template(page_texts[0])
+        year_match = _YEAR_RE.search(page_texts[0])
+        year = int(year_match.group(0)) if year_match else None
+        skip = [re.compile(p, re.IGNORECASE) for p in template.skip]
+
+        zones = _zones(template.columns) if template.columns else None
+        rows: List[Dict[str, Any]] = []
+        malformed = 0
+        for page in doc:
+            current: Optional[Dict[str, Any]] = None
+            last_bottom = None
+            for line in _lines(page):
+                spans = None if template.columns else _find_header(line, template)
+                if spans:
+                    zones, current = _zones(spans), None
+                    continue
+                if zones is None:
+                    continue
+                text = " ".join(w[4] for w in line)
+                if any(p.search(text) for p in skip):
+                    current = None
+                    continue
+
+                cells = _cells(line, zones)
+                day = parse_date(cells.get("date", ""), template, year)
+                amounts = {
+                    c: parse_amount(cells[c], template)
+                    for c in AMOUNT_COLUMNS
+                    if c in cells
+                }
+                top = min(w[1] for w in line)
+                height = max(w[3] - w[1] for w in line)
+                if day is None and template.carry_date and rows and amounts:
+                    day = date.fromisoformat(rows[-1]["date"])
+
+                if day is not None:
+                    amount = _signed_amount(amounts)
+                    if amount is None or None in amounts.values():
+                        malformed += 1
+                        current = None
+                        continue
+                    current = {
+                        "date": day.isoformat(),
+                        "description": cells.get("description", ""),
+                        "amount": amount,
+                        "balance": amounts.get("balance"),
+                    }
+                    rows.append(current)
+                elif (
+                    current is not None
+                    and set(cells) == {"description"}
+                    and top - last_bottom <= CONTINUATION_GAP * height
+                ):
+                    current["description"] += " " + cells["description"]
+                else:
+                    current = None
+                last_bottom = max(w[3] for w in line)
+
+    if not rows and not malformed:
+        return None
+    return LayoutExtraction(
+        template=template.name,
+        bank_name=template.bank_name,
+        transactions=rows,
+        summary=_summary("\n".join(page_texts), template),
+        malformed=malformed,
+    )
+
+
+def _signed_amount(amounts: Dict[str, Optional[float]]) -> Optional[float]:
+    """Signed amount from a single amount column or debit/credit columns."""
+    if amounts.get("amount") is not None:
+        return amounts["amount"]
+    debit, credit = amounts.get("debit"), amounts.get("credit")
+    if debit is None and credit is None:
+        return None
+    return round((credit or 0.0) - abs(debit or 0.0), 2)
@@ -3,19 +3,31 @@ import json
 import asyncio
 import logging
 from services.gemini_service import GeminiService
-from datetime import date, datetime
-from typing import List, Optional, Dict, Any, Union
+import hashlib
+import math
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from io import BytesIO
 
 import fitz  # PyMuPDF
 from PIL import Image
-import pytesseract
-from pdf2image import convert_from_bytes
 from pydantic import BaseModel, Field, validator
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 import google.generativeai as genai
 
-from models.models import Statement, FinancialTransaction, User
+from models.models import (
+    FinancialDailyAggregate,
+    FinancialTransaction,
+    Statement,
+    User,
+)
+from services.financial_aggregates import record_transactions
+from services.ocr_engine import OCREngine
+from services.statement_cache import StatementCache, cache_keys
+from services.statement_layout import extract_statement
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -30,6 +42,7 @@ class TransactionModel(BaseModel):
     description: str
     amount: float
     category: Optional[str] = "Uncategorized"
+    balance: Optional[float] = None  # Running balance, when the statement prints one
 
     @validator("date", pre=True)
     def parse_date(cls, v):
@@ -59,6 +72,8 @@ class StatementMetadata(BaseModel):
 class ParsedStatement(BaseModel):
     metadata: StatementMetadata
     transactions: List[TransactionModel]
+    # Chunked and layout parses only: how the rows were checked
+    reconciliation: Optional[Dict[str, Any]] = None
 
 
 class PDFProcessor:
@@ -66,28 +81,31 @@ class PDFProcessor:
 
     @staticmethod
     def extract_text(pdf_bytes: bytes) -> str:
-        """Extract text from PDF bytes using PyMuPDF, falling back to OCR if scanned/image-only."""
-        text = ""
+        """Extract text from PDF bytes using PyMuPDF, with OCR for scanned pages."""
         try:
-            # 1. Try extracting text using PyMuPDF
-            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-            for page in doc:
-                text += page.get_text()
-
-            # 2. Fallback to OCR using pytesseract if text is empty or too short
-            if len(text.strip()) < 100:
-                logger.info("Extracted PDF text is too short. Running OCR fallback...")
-                images = convert_from_bytes(pdf_bytes)
-                ocr_text = []
-                for img in images:
-                    ocr_text.append(pytesseract.image_to_string(img))
-                text = "\n".join(ocr_text)
-
-            return text
+            return "\n".join(OCREngine().page_texts(pdf_bytes))
         except Exception as e:
             logger.error(f"Error extracting text from PDF: {e}")
             raise e
 
+    @staticmethod
+    def page_count(pdf_bytes: bytes) -> int:
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+            return doc.page_count
+
+    @staticmethod
+    def slice_pages(pdf_bytes: bytes, start: int, end: int) -> bytes:
+        """A standalone PDF of pages [start, end)."""
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+            with fitz.open() as part:
+                part.insert_pdf(doc, from_page=start, to_page=end - 1)
+                return part.tobytes()
+
+    @staticmethod
+    def extract_page_texts(pdf_bytes: bytes) -> List[str]:
+        """Per-page text; pages without a text layer are OCR'd in parallel."""
+        return OCREngine().page_texts(pdf_bytes)
+
 
 # ============================================================================
 # 3. Gemini LLM Parsing
@@ -96,23 +114,28 @@ class PDFProcessor:
 import core.config
 
 
-class GeminiParser:
-    def __init__(self):
-        settings = core.config.get_settings()
-        api_key = settings.GEMINI_API_KEY
-
-        if not api_key:
-            logger.warning("GEMINI_API_KEY not found in settings. Parsing will fail.")
-
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel("gemini-2.0-flash")
-
-    async def parse_pdf(self, pdf_bytes: bytes) -> ParsedStatement:
-        """
-        Sends PDF bytes directly to Gemini (Multimodal) to parse into structured JSON.
-        This replicates the behavior of the Gemini UI.
-        """
-        prompt = """
+# Page-chunked parsing: statements longer than this many pages are split
+# into overlapping page ranges and parsed concurrently
+STATEMENT_CHUNK_PAGES = 4
+STATEMENT_CHUNK_OVERLAP = 1  # Rows split across a page break land whole in one chunk
+STATEMENT_CHUNK_CONCURRENCY = 6
+STATEMENT_CHUNK_TIMEOUT_S = 90.0
+
+# Text fallback is chunked at page boundaries instead of truncated
+TEXT_CHUNK_CHARS = 40_000
+
+PDF_MODELS = [
+    "models/gemini-2.5-flash",
+    "models/gemini-2.0-flash",
+    "models/gemini-2.0-flash-lite",
+    "models/gemini-2.0-flash-exp",
+]
+TEXT_MODELS = [
+    "models/gemini-2.0-flash",
+    "models/gemini-2.0-flash-lite",
+]
+
+STATEMENT_PROMPT = """
         You are an expert financial analyst. Acknowledge that you are analyzing a bank statement PDF.
         
         TASK:
@@ -137,7 +160,8 @@ class GeminiParser:
               "date": "YYYY-MM-DD",
               "description": "string",
               "amount": number,
-              "category": "string"
+              "category": "string",
+              "balance": number
             }
           ]
         }
@@ -146,177 +170,297 @@ class GeminiParser:
         - Dates must be ISO format YYYY-MM-DD.
         - Amounts: positive for credits, negative for debits.
         - Do not include currency symbols.
+        - "balance" is the running balance printed on the row; null if none is printed.
+        - List transactions in the order they appear on the statement.
         - If a value does not exist, set it to null.
         - Output ONLY JSON. No commentary.
         """
 
-        # Try available models based on account access
-        # Prioritize 2.5-flash as it seems most reliable with current quotas
-        models_to_try = [
-            "models/gemini-2.5-flash",
-            "models/gemini-2.0-flash",
-            "models/gemini-2.0-flash-lite",
-            "models/gemini-2.0-flash-exp",
-        ]
-
-        errors = []
-        for model_name in models_to_try:
-            try:
-                logger.info(f"Attempting native PDF parse with model: {model_name}")
-                model = genai.GenerativeModel(model_name)
-
-                # Create the content part with PDF data
-                pdf_part = {"mime_type": "application/pdf", "data": pdf_bytes}
-
-                # Run in thread with INCREASED timeout
-                response = await asyncio.wait_for(
-                    asyncio.to_thread(
-                        model.generate_content,
-                        [prompt, pdf_part],  # Pass prompt AND pdf part
-                        generation_config={"response_mime_type": "application/json"},
-                    ),
-                    timeout=240.0,  # Increased to 4 minutes per user request
-                )
-
-                response_text = response.text
-
-                # --- DEBUG LOGGING ---
-                logger.debug(
-                    f"Gemini Response ({model_name}): {response_text[:500]}..."
-                )
-                # -----------------------------
-
-                # Clean up potential markdown code blocks
-                if response_text.startswith("```json"):
-                    response_text = response_text[7:]
-                if response_text.endswith("```"):
-                    response_text = response_text[:-3]
-
-                try:
-                    data = json.loads(response_text)
-
-                    # Handle case where LLM returns a list instead of a dict
-                    if isinstance(data, list):
-                        if len(data) == 1 and isinstance(data[0], dict):
-                            data = data[0]
-                        else:
-                            # Fallback: if it looks like a list of transactions, try to wrap it
-                            if all(isinstance(x, dict) and "amount" in x for x in data):
-                                logger.warning(
-                                    "Gemini returned list of transactions without metadata. wrapping."
-                                )
-                                data = {"metadata": {}, "transactions": data}
-                            else:
-                                raise ValueError(
-                                    f"Expected JSON object, got list: {data[:100]}"
-                                )
-
-                except json.JSONDecodeError as json_err:
-                    raise ValueError(
-                        f"Invalid JSON returned: {json_err}. Content snippet: {response_text[:100]}..."
-                    )
-
-                # Validate with Pydantic
-                return ParsedStatement(**data)
-
-                msg = f"Model {model_name} timed out."
-                logger.warning(msg)
-                errors.append(msg)
-                continue  # Try next model
-            except Exception as e:
-                msg = f"Model {model_name} failed: {e}"
-                logger.error(msg)
-                errors.append(msg)
-                continue  # Try next model
-
-        # If all multimodal attempts failed, try text-based fallback
-        logger.warning(
-            "All multimodal attempts failed. Falling back to text-based parsing."
-        )
-        return await self.parse_text_fallback(pdf_bytes, errors)
-
-    async def parse_text_fallback(
-        self, pdf_bytes: bytes, previous_errors: list
-    ) -> ParsedStatement:
-        """
-        Fallback: Extract text from PDF (using PyMuPDF/OCR) and send text to Gemini.
-        This is often lighter and avoids some quota/timeout issues with heavy PDF processing.
+CHUNK_PROMPT_SUFFIX = """
+        This PDF is pages {first}-{last} of a {total}-page statement.
+        Extract every transaction row on these pages, including rows on the
+        first and last page. Statement-level metadata may be missing on
+        these pages; set it to null rather than guessing.
         """
-        try:
-            # 1. Extract Text
-            # We can use the PDFProcessor class defined in this file.
-            # Since it's a static method service, we can call it directly.
-            text_content = PDFProcessor.extract_text(pdf_bytes)
 
-            if len(text_content) < 50:
-                raise ValueError("Extracted text is too short for parsing.")
-
-            prompt = (
-                """
+TEXT_PROMPT = """
             You are a financial statement parser.
             Analyze the following bank statement text transactions.
             Extract ALL transactions into a structured JSON format.
             
             TEXT CONTENT:
-            """
-                + text_content[:50000]
-                + """ <TRUNCATED IF TOO LONG>
+            {text}
             
             Output ONLY valid JSON matching exactly this schema:
-            {
-              "metadata": {
+            {{
+              "metadata": {{
                 "bank_name": "string",
                 "account_number": "string",
                 "period_start": "YYYY-MM-DD",
                 "period_end": "YYYY-MM-DD",
                 "total_credits": number,
                 "total_debits": number
-              },
+              }},
               "transactions": [
-                {
+                {{
                   "date": "YYYY-MM-DD",
                   "description": "string",
-                  "amount": number
-                }
+                  "amount": number,
+                  "balance": number
+                }}
               ]
-            }
+            }}
 
             Rules:
             - Dates must be ISO format YYYY-MM-DD.
             - Amounts: positive for credits, negative for debits.
             - Do not include currency symbols.
+            - "balance" is the running balance printed on the row; null if none is printed.
             - If a value does not exist, set it to null.
             - Output ONLY JSON.
             """
+
+# (chunks done, chunks total)
+ProgressCallback = Callable[[int, int], None]
+
+
+def load_statement_json(response_text: str) -> Dict[str, Any]:
+    """Decode a model response into a ParsedStatement-shaped dict."""
+    # Clean up potential markdown code blocks
+    if response_text.startswith("```json"):
+        response_text = response_text[7:]
+    if response_text.endswith("```"):
+        response_text = response_text[:-3]
+
+    try:
+        data = json.loads(response_text)
+    except json.JSONDecodeError as json_err:
+        raise ValueError(
+            f"Invalid JSON returned: {json_err}. Content snippet: {response_text[:100]}..."
+        )
+
+    # Handle case where LLM returns a list instead of a dict
+    if isinstance(data, list):
+        if len(data) == 1 and isinstance(data[0], dict):
+            data = data[0]
+        # Fallback: if it looks like a list of transactions, try to wrap it
+        elif all(isinstance(x, dict) and "amount" in x for x in data):
+            logger.warning(
+                "Gemini returned list of transactions without metadata. wrapping."
             )
+            data = {"metadata": {}, "transactions": data}
+        else:
+            raise ValueError(f"Expected JSON object, got list: {data[:100]}")
+    data.setdefault("metadata", {})
+    data.setdefault("transactions", [])
+    return data
 
-            # Try the most lightweight model first
-            fallback_models = [
-                "models/gemini-2.0-flash",
-                "models/gemini-2.0-flash-lite",
-            ]
 
-            for model_name in fallback_models:
-                try:
-                    model = genai.GenerativeModel(model_name)
-                    response = await asyncio.wait_for(
-                        asyncio.to_thread(
-                            model.generate_content,
-                            prompt,
-                            generation_config={
-                                "response_mime_type": "application/json"
-                            },
-                        ),
-                        timeout=60.0,
-                    )
+class GeminiParser:
+    def __init__(self, backend=None):
+        settings = core.config.get_settings()
+        api_key = settings.GEMINI_API_KEY
+
+        if not api_key:
+            logger.warning("GEMINI_API_KEY not found in settings. Parsing will fail.")
+
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel("gemini-2.0-flash")
+        # Optional LLMBackend used for every model name (offline tests)
+        self.backend = backend
+
+    def _client(self, model_name: str):
+        from services.intelligence.llm_gateway import get_llm_gateway
+
+        model = self.backend or genai.GenerativeModel(model_name)
+        return get_llm_gateway().client(model, tier=2)
+
+    async def _generate_json(
+        self, prompt: Any, models: List[str], timeout: float, errors: List[str]
+    ) -> Dict[str, Any]:
+        """Try each model in turn; the first parseable response wins."""
+        for model_name in models:
+            try:
+                logger.info(f"Attempting statement parse with model: {model_name}")
+                response = await self._client(model_name).generate(
+                    prompt,
+                    timeout=timeout,
+                    generation_config={"response_mime_type": "application/json"},
+                )
+                logger.debug(
+                    f"Gemini Response ({model_name}): {response.text[:500]}..."
+                )
+                data = load_statement_json(response.text)
+                ParsedStatement(**data)  # Validate; a bad shape tries the next model
+                return data
+            except asyncio.TimeoutError:
+                msg = f"Model {model_name} timed out."
+                logger.warning(msg)
+                errors.append(msg)
+            except Exception as e:
+                msg = f"Model {model_name} failed: {e}"
+                logger.error(msg)
+                errors.append(msg)
+        raise ValueError("; ".join(errors[-len(models) :]))
+
+    async def parse_pdf(
+        self, pdf_bytes: bytes, on_progress: Optional[ProgressCallback] = None
+    ) -> ParsedStatement:
+        """
+        Sends PDF bytes directly to Gemini (Multimodal) to parse into structured JSON.
+        This replicates the behavior of the Gemini UI.
+
+        Statements longer than STATEMENT_CHUNK_PAGES pages are parsed in
+        page chunks (parse_pdf_chunked).
+        """
+        try:
+            pages = PDFProcessor.page_count(pdf_bytes)
+        except Exception as e:
+            logger.warning(f"Could not count PDF pages, parsing whole file: {e}")
+            pages = 0
+        if pages > STATEMENT_CHUNK_PAGES + STATEMENT_CHUNK_OVERLAP:
+            return await self.parse_pdf_chunked(pdf_bytes, pages, on_progress)
+
+        # Create the content part with PDF data
+        pdf_part = {"mime_type": "application/pdf", "data": pdf_bytes}
+        errors: List[str] = []
+        try:
+            data = await self._generate_json(
+                [STATEMENT_PROMPT, pdf_part], PDF_MODELS, 240.0, errors
+            )
+        except ValueError:
+            # If all multimodal attempts failed, try text-based fallback
+            logger.warning(
+                "All multimodal attempts failed. Falling back to text-based parsing."
+            )
+            return await self.parse_text_fallback(pdf_bytes, errors, on_progress)
+
+        if on_progress:
+            on_progress(1, 1)
+        return ParsedStatement(**data)
+
+    async def parse_pdf_chunked(
+        self,
+        pdf_bytes: bytes,
+        pages: int,
+        on_progress: Optional[ProgressCallback] = None,
+        chunk_pages: int = STATEMENT_CHUNK_PAGES,
+        overlap: int = STATEMENT_CHUNK_OVERLAP,
+        max_concurrency: int = STATEMENT_CHUNK_CONCURRENCY,
+    ) -> ParsedStatement:
+        """
+        Parse overlapping page ranges concurrently, then merge.
+
+        Each chunk falls back to text extraction of its own pages if every
+        multimodal model fails, so one bad chunk does not send the whole
+        statement down the text path. Wall-clock time tracks the slowest
+        chunk (up to max_concurrency chunks in flight).
+        """
+        ranges = page_ranges(pages, chunk_pages, overlap)
+        logger.info(f"Parsing {pages}-page statement in {len(ranges)} chunks")
+
+        async def parse_range(start: int, end: int) -> Dict[str, Any]:
+            chunk = await asyncio.to_thread(
+                PDFProcessor.slice_pages, pdf_bytes, start, end
+            )
+            prompt = STATEMENT_PROMPT + CHUNK_PROMPT_SUFFIX.format(
+                first=start + 1, last=end, total=pages
+            )
+            errors: List[str] = []
+            try:
+                return await self._generate_json(
+                    [prompt, {"mime_type": "application/pdf", "data": chunk}],
+                    PDF_MODELS,
+                    STATEMENT_CHUNK_TIMEOUT_S,
+                    errors,
+                )
+            except ValueError:
+                logger.warning(f"Pages {start + 1}-{end}: falling back to text")
+                text = await asyncio.to_thread(PDFProcessor.extract_text, chunk)
+                return await self._generate_json(
+                    TEXT_PROMPT.format(text=text), TEXT_MODELS, 60.0, errors
+                )
+
+        results = await self._gather_chunks(
+            [parse_range(start, end) for start, end in ranges],
+            max_concurrency,
+            on_progress,
+        )
+        shares = [
+            (prev_end - start) / (prev_end - prev_start)
+            for (prev_start, prev_end), (start, _) in zip(ranges, ranges[1:])
+        ]
+        return merge_parsed_chunks(results, shares)
+
+    async def _gather_chunks(
+        self,
+        coros: List[Any],
+        max_concurrency: int,
+        on_progress: Optional[ProgressCallback],
+    ) -> List[Dict[str, Any]]:
+        """Run chunk coroutines under a semaphore; results keep chunk order."""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        done = 0
+
+        async def run(coro):
+            nonlocal done
+            async with semaphore:
+                result = await coro
+            done += 1
+            if on_progress:
+                on_progress(done, len(coros))
+            return result
+
+        tasks = [asyncio.ensure_future(run(coro)) for coro in coros]
+        try:
+            return await asyncio.gather(*tasks)
+        finally:
+            # A failed chunk fails the statement; don't leave siblings running
+            for task in tasks:
+                task.cancel()
+
+    async def parse_text_fallback(
+        self,
+        pdf_bytes: bytes,
+        previous_errors: list,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> ParsedStatement:
+        """
+        Fallback: Extract text from PDF (using PyMuPDF/OCR) and send text to Gemini.
+        This is often lighter and avoids some quota/timeout issues with heavy PDF processing.
+
+        Long statements are split at page boundaries into TEXT_CHUNK_CHARS
+        chunks and parsed concurrently, so no rows are dropped.
+        """
+        try:
+            # 1. Extract Text (scanned pages OCR'd off the event loop)
+            page_texts = [
+                text async for _, text in OCREngine().astream_pages(pdf_bytes)
+            ]
 
-                    data = json.loads(response.text)
-                    return ParsedStatement(**data)
-                except Exception as e:
-                    logger.warning(f"Text fallback model {model_name} failed: {e}")
-                    continue
+            if len("".join(page_texts)) < 50:
+                raise ValueError("Extracted text is too short for parsing.")
 
-            raise ValueError("All text fallback models failed.")
+            packed = _pack_text_chunks(page_texts, TEXT_CHUNK_CHARS)
+            chunks = ["\n".join(pieces) for pieces, _ in packed]
+            shares = [
+                len(pieces[0]) / max(1, len(prev)) if carried else 0.0
+                for prev, (pieces, carried) in zip(chunks, packed[1:])
+            ]
+            errors: List[str] = []
+            results = await self._gather_chunks(
+                [
+                    self._generate_json(
+                        TEXT_PROMPT.format(text=text), TEXT_MODELS, 60.0, errors
+                    )
+                    for text in chunks
+                ],
+                STATEMENT_CHUNK_CONCURRENCY,
+                on_progress,
+            )
+            if len(results) == 1:
+                return ParsedStatement(**results[0])
+            return merge_parsed_chunks(results, shares)
 
         except Exception as e:
             all_errors = "; ".join(previous_errors) + f"; Fallback error: {str(e)}"
@@ -324,15 +468,431 @@ class GeminiParser:
 
 
 # ============================================================================
-# 4. Statement Service (Orchestrator)
+# 4. Chunk Merge & Reconciliation
+# ============================================================================
+
+BALANCE_TOLERANCE = 0.01
+
+
+def page_ranges(pages: int, chunk_pages: int, overlap: int) -> List[Tuple[int, int]]:
+    """[start, end) page ranges; each chunk re-reads `overlap` pages of the last."""
+    if pages <= 0:
+        return []
+    step = max(1, chunk_pages)
+    ranges = []
+    for start in range(0, pages, step):
+        first = max(0, start - overlap) if start else 0
+        ranges.append((first, min(pages, start + step)))
+    return ranges
+
+
+def text_chunks(page_texts: List[str], max_chars: int) -> List[str]:
+    """
+    Pack page texts into chunks of at most max_chars, one page of overlap.
+
+    A page longer than max_chars on its own is split on line boundaries.
+    """
+    return ["\n".join(pieces) for pieces, _ in _pack_text_chunks(page_texts, max_chars)]
+
+
+def _pack_text_chunks(
+    page_texts: List[str], max_chars: int
+) -> List[Tuple[List[str], bool]]:
+    """text_chunks' pieces per chunk, and whether it re-reads the last one's tail."""
+    pieces: List[str] = []
+    for text in page_texts:
+        while len(text) > max_chars:
+            cut = text.rfind("\n", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            pieces.append(text[:cut])
+            text = text[cut:]
+        pieces.append(text)
+
+    chunks: List[Tuple[List[str], bool]] = [([], False)]
+    size = 0
+    for piece in pieces:
+        if chunks[-1][0] and size + len(piece) > max_chars:
+            carry = chunks[-1][0][-1]
+            carry = [carry] if len(carry) + len(piece) <= max_chars else []
+            chunks.append((carry, bool(carry)))
+            size = sum(len(p) for p in carry)
+        chunks[-1][0].append(piece)
+        size += len(piece)
+    return [chunk for chunk in chunks if chunk[0]]
+
+
+def _txn_key(t: TransactionModel) -> Tuple:
+    return (t.date, round(t.amount, 2), " ".join(t.description.lower().split()))
+
+
+def _balance_follows(prev: TransactionModel, nxt: TransactionModel) -> Optional[bool]:
+    """Whether nxt's running balance follows prev's; None if either is missing."""
+    if prev.balance is None or nxt.balance is None:
+        return None
+    return abs(prev.balance + nxt.amount - nxt.balance) <= BALANCE_TOLERANCE
+
+
+def _same_row(a: TransactionModel, b: TransactionModel) -> bool:
+    """Same statement row: equal keys, and equal balances when both print one."""
+    if _txn_key(a) != _txn_key(b):
+        return False
+    if a.balance is None or b.balance is None:
+        return True
+    return abs(a.balance - b.balance) <= BALANCE_TOLERANCE
+
+
+def _overlap_length(
+    prev: List[TransactionModel],
+    nxt: List[TransactionModel],
+    window: Optional[int] = None,
+) -> int:
+    """
+    How many leading rows of nxt repeat the tail of prev.
+
+    Prefers the longest exact suffix/prefix alignment whose running balance
+    still chains across the seam, so a genuine repeat (two identical
+    coffees) is kept. If the model rendered the overlap page differently in
+    the two chunks, falls back to dropping leading rows of nxt that appear
+    among prev's tail rows.
+
+    `window` caps both at the rows the next chunk can have re-read (the
+    overlap pages); rows further back are never treated as repeats.
+    """
+    limit = min(len(prev), len(nxt))
+    if window is not None:
+        limit = min(limit, window)
+    for k in range(limit, 0, -1):
+        if not all(_same_row(a, b) for a, b in zip(prev[-k:], nxt[:k])):
+            continue
+        if k < len(nxt) and _balance_follows(prev[-1], nxt[k]) is False:
+            continue
+        return k
+
+    tail = list(prev[-limit:]) if limit else []
+    k = 0
+    while k < limit:
+        match = next((i for i, t in enumerate(tail) if _same_row(t, nxt[k])), None)
+        if match is None:
+            break
+        del tail[match]
+        k += 1
+    return k
+
+
+def reconcile_balances(transactions: List[TransactionModel]) -> Dict[str, Any]:
+    """
+    Check running balances across consecutive rows.
+
+    Statements list rows oldest- or newest-first; the order that explains
+    more of the balances is used. Mismatch indices point at the row whose
+    balance does not follow from its neighbour.
+    """
+    forward, backward = [], []
+    checked = 0
+    for i in range(1, len(transactions)):
+        prev, cur = transactions[i - 1], transactions[i]
+        if prev.balance is None or cur.balance is None:
+            continue
+        checked += 1
+        if abs(prev.balance + cur.amount - cur.balance) > BALANCE_TOLERANCE:
+            forward.append(i)
+        if abs(cur.balance + prev.amount - prev.balance) > BALANCE_TOLERANCE:
+            backward.append(i)
+    mismatches = forward if len(forward) <= len(backward) else backward
+    return {"balance_checked": checked, "balance_mismatches": mismatches}
+
+
+def merge_parsed_chunks(
+    results: List[Dict[str, Any]], overlap_shares: Optional[List[float]] = None
+) -> ParsedStatement:
+    """
+    Merge per-chunk parses (in page order) into one statement.
+
+    overlap_shares[i] is the fraction of chunk i that chunk i + 1 re-reads;
+    the overlap search at that seam is limited to that many of chunk i's
+    rows (plus one split across the page break). Without it, any tail row
+    may be matched.
+    """
+    chunks = [ParsedStatement(**data) for data in results]
+
+    merged: List[TransactionModel] = []
+    overlap_dropped = 0
+    for i, chunk in enumerate(chunks):
+        k = 0
+        if merged:
+            window = None
+            if overlap_shares is not None:
+                share = overlap_shares[i - 1]
+                rows = len(chunks[i - 1].transactions)
+                window = math.ceil(rows * share) + 1 if share > 0 else 0
+            k = _overlap_length(merged, chunk.transactions, window)
+        merged.extend(chunk.transactions[k:])
+        overlap_dropped += k
+
+    # Metadata: first chunk that has each field; period spans all chunks
+    meta: Dict[str, Any] = {}
+    for field_name in ("bank_name", "account_number", "total_credits", "total_debits"):
+        meta[field_name] = next(
+            (
+                getattr(c.metadata, field_name)
+                for c in chunks
+                if getattr(c.metadata, field_name)
+            ),
+            None,
+        )
+    starts = [c.metadata.period_start for c in chunks if c.metadata.period_start]
+    ends = [c.metadata.period_end for c in chunks if c.metadata.period_end]
+    dates = [t.date for t in merged]
+    meta["period_start"] = min(starts or dates or [None])
+    meta["period_end"] = max(ends or dates or [None])
+    if not meta["total_credits"]:
+        meta["total_credits"] = round(sum(t.amount for t in merged if t.amount > 0), 2)
+    if not meta["total_debits"]:
+        meta["total_debits"] = round(sum(-t.amount for t in merged if t.amount < 0), 2)
+
+    reconciliation = reconcile_balances(merged)
+    reconciliation.update({"chunks": len(chunks), "overlap_dropped": overlap_dropped})
+    if reconciliation["balance_mismatches"]:
+        logger.warning(
+            f"Chunked parse: {len(reconciliation['balance_mismatches'])} running "
+            f"balance mismatches across {len(merged)} transactions"
+        )
+
+    return ParsedStatement(
+        metadata=StatementMetadata(**meta),
+        transactions=merged,
+        reconciliation=reconciliation,
+    )
+
+
+# ============================================================================
+# 5. Layout Parsing (deterministic tier)
+# ============================================================================
+
+# Printed summary figures that each give an independent check on the rows
+LAYOUT_TOTAL_CHECKS = ("total_credits", "total_debits")
+
+
+class LayoutParser:
+    """
+    Deterministic first tier: template-driven table extraction from the
+    PDF's text layer (services.statement_layout).
+
+    A parse is accepted only if it reconciles: printed total credits/debits
+    match the rows, opening + net equals the closing balance, and running
+    balances chain. At least one of those checks must be possible; anything
+    else returns None so the caller escalates to GeminiParser.
+    """
+
+    def parse_pdf(self, pdf_bytes: bytes) -> Optional[ParsedStatement]:
+        try:
+            extraction = extract_statement(pdf_bytes)
+        except Exception as e:
+            logger.info(f"Layout parse unavailable: {e}")
+            return None
+        if extraction is None:
+            return None
+
+        problems: List[str] = []
+        checks: List[str] = []
+        if extraction.malformed:
+            problems.append(f"{extraction.malformed} unreadable rows")
+        try:
+            transactions = [TransactionModel(**t) for t in extraction.transactions]
+        except ValueError as e:
+            logger.info(f"Layout parse ({extraction.template}) rejected: {e}")
+            return None
+        if not transactions:
+            problems.append("no transactions")
+
+        credits = round(sum(t.amount for t in transactions if t.amount > 0), 2)
+        debits = round(sum(-t.amount for t in transactions if t.amount < 0), 2)
+        summary = extraction.summary
+        for key, total in zip(LAYOUT_TOTAL_CHECKS, (credits, debits)):
+            printed = summary.get(key)
+            if printed is None:
+                continue
+            if abs(abs(printed) - total) > BALANCE_TOLERANCE:
+                problems.append(f"{key} {abs(printed)} != rows {total}")
+            else:
+                checks.append(key)
+
+        opening = summary.get("opening_balance")
+        closing = summary.get("closing_balance")
+        if opening is not None and closing is not None:
+            if abs(opening + credits - debits - closing) > BALANCE_TOLERANCE:
+                problems.append(f"opening {opening} + net != closing {closing}")
+            else:
+                checks.append("closing_balance")
+
+        balances = reconcile_balances(transactions)
+        if balances["balance_mismatches"]:
+            problems.append(
+                f"{len(balances['balance_mismatches'])} running balance mismatches"
+            )
+        elif 0 < balances["balance_checked"] == len(transactions) - 1:
+            # A single row has no previous balance to chain from, so 0 == 0
+            # proves nothing
+            checks.append("running_balance")
+
+        if not checks and not problems:
+            problems.append("nothing to reconcile against")
+        if problems:
+            logger.info(
+                f"Layout parse ({extraction.template}) escalated: {'; '.join(problems)}"
+            )
+            return None
+
+        dates = [t.date for t in transactions]
+        metadata = StatementMetadata(
+            bank_name=extraction.bank_name,
+            period_start=min(dates),
+            period_end=max(dates),
+            total_credits=credits,
+            total_debits=debits,
+        )
+        logger.info(
+            f"Layout parse ({extraction.template}): {len(transactions)} "
+            f"transactions, reconciled on {', '.join(checks)}"
+        )
+        balances.update(
+            {"tier": "layout", "template": extraction.template, "checks": checks}
+        )
+        return ParsedStatement(
+            metadata=metadata, transactions=transactions, reconciliation=balances
+        )
+
+
+# ============================================================================
+# 6. Transaction Import (bulk, deduplicated)
+# ============================================================================
+
+# Rows per IN-lookup / INSERT batch; keeps statements well under driver
+# bind-parameter limits on long statements
+IMPORT_CHUNK_SIZE = 500
+
+
+def transaction_dedup_key(tx: TransactionModel) -> str:
+    """Deterministic key: Date + Amount + Description (slugified)."""
+    raw_str = f"{tx.date.isoformat()}_{tx.amount}_{tx.description.strip().lower()}"
+    return hashlib.sha256(raw_str.encode()).hexdigest()
+
+
+@dataclass
+class ImportResult:
+    # Inserted rows as transient ORM objects (not attached to the session)
+    transactions: List[FinancialTransaction] = field(default_factory=list)
+    duplicates: int = 0
+
+
+def _chunks(items: List[Any], size: int):
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def import_transactions(
+    db: Session,
+    user_id: str,
+    statement_id: str,
+    parsed: List[TransactionModel],
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> ImportResult:
+    """
+    Insert parsed transactions, skipping ones this user already has.
+
+    All dedup keys are computed up front, resolved against the table with
+    one IN query per chunk, and the survivors are inserted with chunked
+    executemany. Keys are unique per user (ux_transactions_user_dedup_key),
+    so another user's identical row never counts. On PostgreSQL and SQLite
+    the insert is ON CONFLICT (user_id, deduplication_key) DO NOTHING
+    RETURNING, so a key that appears between the lookup and the insert
+    (a concurrent upload by the same user) is counted as a duplicate
+    instead of failing the import.
+
+    Keys repeated within the statement itself are imported once. Does not
+    commit.
+    """
+    rows: Dict[str, Dict[str, Any]] = {}
+    for tx in parsed:
+        key = transaction_dedup_key(tx)
+        if key in rows:
+            continue
+        rows[key] = {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "statement_id": statement_id,
+            "transaction_date": datetime.combine(tx.date, time.min),
+            "description": tx.description,
+            "amount": tx.amount,
+            "currency_code": "USD",
+            "category_primary": tx.category or "Uncategorized",
+            "deduplication_key": key,
+        }
+
+    existing = set()
+    for chunk in _chunks(list(rows), chunk_size):
+        existing.update(
+            key
+            for (key,) in db.query(FinancialTransaction.deduplication_key).filter(
+                FinancialTransaction.user_id == user_id,
+                FinancialTransaction.deduplication_key.in_(chunk),
+            )
+        )
+
+    survivors = [row for key, row in rows.items() if key not in existing]
+    inserted_keys = _insert_transactions(db, survivors, chunk_size)
+
+    inserted = [FinancialTransaction(**rows[key]) for key in inserted_keys]
+    return ImportResult(transactions=inserted, duplicates=len(parsed) - len(inserted))
+
+
+def _insert_transactions(
+    db: Session, rows: List[Dict[str, Any]], chunk_size: int
+) -> List[str]:
+    """Chunked executemany insert; returns the dedup keys actually written."""
+    if not rows:
+        return []
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        for chunk in _chunks(rows, chunk_size):
+            db.execute(insert(FinancialTransaction.__table__), chunk)
+        return [row["deduplication_key"] for row in rows]
+
+    stmt = (
+        dialect_insert(FinancialTransaction.__table__)
+        .on_conflict_do_nothing(index_elements=["user_id", "deduplication_key"])
+        .returning(FinancialTransaction.__table__.c.deduplication_key)
+    )
+    written = set()
+    for chunk in _chunks(rows, chunk_size):
+        written.update(db.execute(stmt, chunk).scalars())
+    # Preserve statement order for callers
+    return [
+        row["deduplication_key"] for row in rows if row["deduplication_key"] in written
+    ]
+
+
+# ============================================================================
+# 7. Statement Service (Orchestrator)
 # ============================================================================
 
 
+# Share of job progress covered by parsing; persistence takes the rest
+PARSE_PROGRESS_SHARE = 90
+
+
 class StatementService:
     def __init__(self, db: Session):
         self.db = db
         self.pdf_processor = PDFProcessor()
         self.gemini_service = GeminiService(db)
+        self.statement_cache = StatementCache(db)
+        self.layout_parser = LayoutParser()
         self.gemini_parser = GeminiParser()
         self.settings = core.config.get_settings()
 
@@ -342,27 +902,82 @@ class StatementService:
         file_content: bytes,
         filename: str,
         persist: bool = True,
+        progress_callback: Optional[Callable[[int], None]] = None,
     ) -> Dict[str, Any]:
         """
         Frontend and test entrypoint to process a statement.
         """
-        return await self.process_pdf(file_content, user_id, persist=persist)
+        return await self.process_pdf(
+            file_content,
+            user_id,
+            persist=persist,
+            progress_callback=progress_callback,
+        )
 
     async def process_pdf(
-        self, file_content: bytes, user_id: Optional[str], persist: bool = True
+        self,
+        file_content: bytes,
+        user_id: Optional[str],
+        persist: bool = True,
+        progress_callback: Optional[Callable[[int], None]] = None,
     ) -> Dict[str, Any]:
         """
-        Full pipeline: PDF -> Text -> Gemini -> JSON -> DB
+        Full pipeline: PDF -> Cache / Layout parse / Gemini -> JSON -> DB
+
+        A re-uploaded file is served from the parsed-statement cache without
+        parsing. Otherwise the deterministic layout tier runs first; Gemini
+        is only called when its rows do not reconcile with the statement's
+        own totals. progress_callback receives percentages: parsing (per
+        completed chunk) fills the first PARSE_PROGRESS_SHARE percent. The
+        statement_parse job passes one so the job's progress can be polled.
         """
         start_time = datetime.utcnow()
         logger.info(f"Processing statement for user {user_id}")
 
+        def on_progress(done: int, total: int) -> None:
+            if progress_callback:
+                progress_callback(PARSE_PROGRESS_SHARE * done // max(total, 1))
+
         try:
-            # 1. Parse PDF directly with Gemini (Native Multimodal)
-            # We skip local OCR extraction and send the PDF bytes directly.
-            parsed_data: ParsedStatement = await self.gemini_parser.parse_pdf(
-                file_content
+            on_progress(0, 1)
+            # 1. Same file (or same text layer) parsed before: skip all tiers
+            content_hash, text_hash = await asyncio.to_thread(cache_keys, file_content)
+            cached = await asyncio.to_thread(
+                self.statement_cache.get, content_hash, text_hash
             )
+            parsed_data: Optional[ParsedStatement] = None
+            if cached is not None:
+                parsed_data = ParsedStatement(**cached)
+            else:
+                # Deterministic layout parse of the text layer; escalate to
+                # Gemini (native multimodal) when it does not reconcile
+                parsed_data = await asyncio.to_thread(
+                    self.layout_parser.parse_pdf, file_content
+                )
+            if parsed_data is not None:
+                on_progress(1, 1)
+            else:
+                parsed_data = await self.gemini_parser.parse_pdf(
+                    file_content, on_progress=on_progress
+                )
+            # Only reconciled parses are cached: a re-upload after a bad parse
+            # must get a fresh one, not the same mismatches back
+            mismatches = (
+                parsed_data.reconciliation
+                or reconcile_balances(parsed_data.transactions)
+            )["balance_mismatches"]
+            if cached is None and mismatches:
+                logger.info(
+                    f"Not caching parse with {len(mismatches)} running balance "
+                    "mismatches"
+                )
+            elif cached is None:
+                await asyncio.to_thread(
+                    self.statement_cache.put,
+                    content_hash,
+                    text_hash,
+                    parsed_data.model_dump(mode="json"),
+                )
 
             statement_id = None
 
@@ -373,6 +988,9 @@ class StatementService:
                     self.db.query(FinancialTransaction).filter(
                         FinancialTransaction.user_id == user_id
                     ).delete()
+                    self.db.query(FinancialDailyAggregate).filter(
+                        FinancialDailyAggregate.user_id == user_id
+                    ).delete()
                     self.db.query(Statement).filter(
                         Statement.user_id == user_id
                     ).delete()
@@ -393,50 +1011,15 @@ class StatementService:
                 self.db.flush()  # Get ID
                 statement_id = statement.id
 
-                # Create Transactions
-                import hashlib
-
-                transactions = []
-                duplicates_count = 0
-
-                # Fetch existing keys for this user to minimize DB hits (or check one by one)
-                # For robustness, checking one by one or doing a bulk check is better.
-                # Let's do a bulk check if list is small, or just try/except integrity error if we trust DB constraints.
-                # But we want to "Prevent re-insertion" gracefully.
-
-                for tx in parsed_data.transactions:
-                    # Deterministic Key: Date + Amount + Description (slugified)
-                    raw_str = f"{tx.date.isoformat()}_{tx.amount}_{tx.description.strip().lower()}"
-                    dedup_key = hashlib.sha256(raw_str.encode()).hexdigest()
-
-                    # Check existence
-                    exists = (
-                        self.db.query(FinancialTransaction)
-                        .filter(
-                            FinancialTransaction.deduplication_key == dedup_key,
-                            FinancialTransaction.user_id == user_id,
-                        )
-                        .first()
-                    )
-
-                    if exists:
-                        duplicates_count += 1
-                        continue
-
-                    transaction = FinancialTransaction(
-                        user_id=user_id,
-                        statement_id=statement.id,
-                        transaction_date=tx.date,
-                        description=tx.description,
-                        amount=tx.amount,
-                        currency_code="USD",
-                        category_primary=tx.category or "Uncategorized",
-                        deduplication_key=dedup_key,
-                    )
-                    transactions.append(transaction)
+                # Create Transactions (bulk, deduplicated)
+                result = import_transactions(
+                    self.db, user_id, statement.id, parsed_data.transactions
+                )
+                transactions = result.transactions
+                duplicates_count = result.duplicates
 
                 if transactions:
-                    self.db.add_all(transactions)
+                    record_transactions(self.db, transactions)
                     self.db.commit()
                     logger.info(
                         f"Imported {len(transactions)} new transactions. Skipped {duplicates_count} duplicates."
@@ -455,6 +1038,7 @@ class StatementService:
                 "status": "success",
                 "statement_id": statement_id,
                 "data": parsed_data.dict(),
+                "cached": cached is not None,
                 "processing_time": processing_time,
             }
 
@@ -467,6 +1051,8 @@ class StatementService:
             user_friendly_error = (
                 "An unexpected error occurred while processing your statement."
             )
+            # False when the file itself is the problem: retrying cannot help
+            retryable = True
 
             if "429" in error_str or "quota" in error_str.lower():
                 user_friendly_error = (
@@ -476,15 +1062,19 @@ class StatementService:
                 user_friendly_error = "The file processing timed out. Please try a smaller file or try again."
             elif "image_to_string" in error_str or "ocr" in error_str.lower():
                 user_friendly_error = "Could not read text from this PDF. Please ensure it's a clear, readable bank statement."
+                retryable = False
             elif "pdf" in error_str.lower() and "cannot open" in error_str.lower():
                 user_friendly_error = (
                     "The PDF file appears to be corrupted or password protected."
                 )
+                retryable = False
             elif "expecting value" in error_str.lower() or "json" in error_str.lower():
                 user_friendly_error = "We couldn't understand the data format. Please try another statement or enter data manually."
+                retryable = False
 
             return {
                 "status": "error",
                 "error": user_friendly_error,
+                "retryable": retryable,
                 "technical_details": error_str,  # Keep raw error for debugging if needed
             }
@@ -14,6 +14,7 @@ import uuid
 import re
 
 import core.config
+from core.http_client import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -36,7 +37,6 @@ class SkyscannerService:
             api_key or self.settings.RAPIDAPI_KEY or self.settings.SKYSCANNER_API_KEY
         )
 
-        self.timeout = httpx.Timeout(45.0, connect=10.0)
         self.headers = {
             "X-RapidAPI-Key": self.api_key or "",
             "X-RapidAPI-Host": self.RAPIDAPI_HOST,
@@ -72,9 +72,7 @@ class SkyscannerService:
         # 3. Request Execution (Live API)
         # Typical Skyscanner RapidAPI flow: Create Session -> Poll Results
         try:
-            async with httpx.AsyncClient(
-                timeout=self.timeout, headers=self.headers
-            ) as client:
+            async with http_client("skyscanner") as client:
                 # Note: Exact endpoint path can vary by RapidAPI provider.
                 # This implementation follows the typical 'search' pattern.
                 search_params = {
@@ -92,7 +90,9 @@ class SkyscannerService:
 
                 # Check for one-shot search or session-based (Simplified for this integration)
                 response = await client.get(
-                    f"{self.BASE_URL}/search-one-way", params=search_params
+                    f"{self.BASE_URL}/search-one-way",
+                    params=search_params,
+                    headers=self.headers,
                 )
 
                 # Handle common status codes
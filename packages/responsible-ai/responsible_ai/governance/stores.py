@@ -11,7 +11,29 @@ Security properties:
   * **Tamper-evident.** Every row is hash-chained (``record_hash`` over the row's
     canonical content + the previous row's hash), so any silent edit/deletion
     breaks the chain — verifiable via ``verify_chain()``.
-  * **Parameterized.** All access is through SQLAlchemy Core; no string SQL.
+  * **Partitioned chains.** Each subject (consent: ``user_id``, decisions:
+    ``subject_id``) has its own chain (``chain_key`` + ``seq``), so writers for
+    different subjects never contend. ``rai_chain_heads`` holds every chain's
+    tip and is advanced compare-and-swap style, so concurrent writers (threads
+    or processes) retry instead of forking a chain; truncating a chain's tail
+    no longer matches its head. Every ``anchor_every`` records a global anchor
+    (itself hash-chained) snapshots the heads that moved, so deleting a whole
+    chain is detected too. Rows written before chains existed (``chain_key``
+    NULL) keep verifying as the original single global chain.
+  * **Group commit.** Concurrent appends are batched: one caller commits
+    everything queued in a single transaction with the linkage computed in
+    memory, while the others wait for it. ``append()`` still returns only once
+    its record is committed.
+  * **Streaming, checkpointed verification.** ``verify()`` streams rows in id
+    order (server-side cursors), optionally as parallel id ranges, and with a
+    ``checkpoint_key`` persists an HMAC-signed checkpoint (every chain's last
+    verified seq + hash, anchor tip) so later runs verify only the rows past
+    those tips. Progress is per chain, not by id: ids are handed out at
+    INSERT, so a row can commit after rows with higher ids. The verified
+    prefix is trusted apart from the rows the tail links to; ``full=True``
+    re-verifies from genesis.
+  * **Parameterized.** All access is through SQLAlchemy Core; the only string
+    SQL is the column-upgrade DDL in ``create_all`` (no user input).
   * **No PII by contract.** Stores hold pseudonymous ids, purposes, decisions,
     and reasons — never raw identifiers. Callers must keep PII out (see pii.py).
 """
@@ -19,21 +41,35 @@ Security properties:
 from __future__ import annotations
 
 import hashlib
+import hmac
 import json
-from typing import List, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 from sqlalchemy import (
     Boolean,
     Column,
+    Index,
     Integer,
     MetaData,
     String,
     Table,
     Text,
+    and_,
+    delete,
+    func,
+    inspect,
     insert,
     select,
+    text,
+    tuple_,
+    update,
 )
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
 
 from .consent import ConsentRecord
 
@@ -42,6 +78,16 @@ RAI_METADATA = MetaData()
 # Genesis hash for the first link in each chain.
 _GENESIS = "0" * 64
 
+# Appends committed per transaction (at most), and records between anchors.
+MAX_BATCH = 256
+ANCHOR_EVERY = 1000
+
+# Attempts when another writer advanced a chain head first.
+_MAX_RETRIES = 8
+
+# Rows fetched per round trip while verifying (server-side cursor batch).
+VERIFY_CHUNK = 1000
+
 
 def _canonical(payload: dict) -> str:
     """Deterministic serialization for hashing (stable key order)."""
@@ -63,8 +109,11 @@ consent_records = Table(
     Column("timestamp", String(40), nullable=False),  # ISO 8601, caller-supplied
     Column("source", String(64), nullable=False, default="app"),
     Column("metadata_json", Text, nullable=True),
+    Column("chain_key", String(255), nullable=True),  # NULL: legacy global chain
+    Column("seq", Integer, nullable=True),
     Column("prev_hash", String(64), nullable=False),
     Column("record_hash", String(64), nullable=False),
+    Index("ux_rai_consent_chain_seq", "chain_key", "seq", unique=True),
 )
 
 decision_log = Table(
@@ -79,8 +128,80 @@ decision_log = Table(
     Column("reason", Text, nullable=False),
     Column("correlation_id", String(64), nullable=True, index=True),
     Column("metadata_json", Text, nullable=True),
+    Column("chain_key", String(255), nullable=True),
+    Column("seq", Integer, nullable=True),
+    Column("prev_hash", String(64), nullable=False),
+    Column("record_hash", String(64), nullable=False),
+    Index("ux_rai_decision_chain_seq", "chain_key", "seq", unique=True),
+)
+
+# Tip of every chain; ``seq`` doubles as the compare-and-swap version.
+chain_heads = Table(
+    "rai_chain_heads",
+    RAI_METADATA,
+    Column("log", String(64), primary_key=True),
+    Column("chain_key", String(255), primary_key=True),
+    Column("seq", Integer, nullable=False),
+    Column("head_hash", String(64), nullable=False),
+)
+
+# Global anchors: {chain_key: [seq, hash]} for the heads that moved since the
+# previous anchor of the same log, chained like any other record.
+chain_anchors = Table(
+    "rai_chain_anchors",
+    RAI_METADATA,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("log", String(64), nullable=False),
+    Column("seq", Integer, nullable=False),
+    Column("timestamp", String(40), nullable=False),
+    Column("heads_json", Text, nullable=False),
     Column("prev_hash", String(64), nullable=False),
     Column("record_hash", String(64), nullable=False),
+    Index("ux_rai_anchor_log_seq", "log", "seq", unique=True),
+)
+
+# Signed verification checkpoints: every chain up to its tip in
+# ``rai_checkpoint_tips`` (signed through ``tips_digest``) and the anchors up to
+# ``anchor_seq`` verified; later runs only check what follows. ``prev_id`` is
+# the checkpoint the run started from, unique per log so two concurrent runs
+# cannot both extend it. ``through_id`` (highest id verified) is informational.
+chain_checkpoints = Table(
+    "rai_chain_checkpoints",
+    RAI_METADATA,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("log", String(64), nullable=False, index=True),
+    Column("prev_id", Integer, nullable=False),
+    Column("timestamp", String(40), nullable=False),
+    Column("through_id", Integer, nullable=False),
+    Column("chains", Integer, nullable=False),
+    Column("tips_digest", String(64), nullable=False),
+    Column("anchor_seq", Integer, nullable=False),
+    Column("anchor_hash", String(64), nullable=False),
+    Column("rows_verified", Integer, nullable=False),
+    Column("signature", String(64), nullable=False),  # HMAC-SHA256
+    Index("ux_rai_checkpoint_log_prev", "log", "prev_id", unique=True),
+)
+
+# Last verified (seq, hash) of every chain, as of the latest checkpoint.
+checkpoint_tips = Table(
+    "rai_checkpoint_tips",
+    RAI_METADATA,
+    Column("log", String(64), primary_key=True),
+    Column("chain_key", String(255), primary_key=True),
+    Column("seq", Integer, nullable=False),
+    Column("record_hash", String(64), nullable=False),
+)
+
+_CHECKPOINT_FIELDS = (
+    "log",
+    "prev_id",
+    "timestamp",
+    "through_id",
+    "chains",
+    "tips_digest",
+    "anchor_seq",
+    "anchor_hash",
+    "rows_verified",
 )
 
 idempotency_keys = Table(
@@ -92,8 +213,706 @@ idempotency_keys = Table(
 
 
 def create_all(engine: Engine) -> None:
-    """Create the governance tables if they do not already exist."""
+    """Create the governance tables if they do not already exist, and add the
+    chain columns to log tables created by earlier versions."""
     RAI_METADATA.create_all(engine)
+    inspector = inspect(engine)
+    for table in (consent_records, decision_log):
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        missing = [c for c in ("chain_key", "seq") if c not in existing]
+        if not missing:
+            continue
+        with engine.begin() as conn:
+            for name in missing:
+                # DDL only; identifiers come from our own metadata.
+                col_type = table.c[name].type.compile(engine.dialect)
+                conn.execute(
+                    text(f"ALTER TABLE {table.name} ADD COLUMN {name} {col_type}")
+                )
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+
+# ---------------------------------------------------------------------------
+# Chains
+# ---------------------------------------------------------------------------
+
+
+class _StaleHead(Exception):
+    """Another writer advanced a chain head since it was read."""
+
+
+class _Broken(Exception):
+    """Verification found a tampered, missing or out-of-place record."""
+
+
+class _Pending:
+    __slots__ = ("chain_key", "payload", "done", "error")
+
+    def __init__(self, chain_key: str, payload: dict):
+        self.chain_key = chain_key
+        self.payload = payload
+        self.done = False
+        self.error: Optional[BaseException] = None
+
+
+class _ChainedLog:
+    """
+    Per-subject hash chains over one log table, written by group commit.
+
+    Appenders queue their record; whoever finds no commit in progress becomes
+    the leader, commits up to ``max_batch`` queued records in one transaction
+    and wakes the rest. Chain heads are cached in memory and only re-read after
+    a compare-and-swap conflict, so the steady state is one INSERT batch plus
+    one head UPDATE per chain touched — no read of the log itself.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        table: Table,
+        log: str,
+        max_batch: int = MAX_BATCH,
+        anchor_every: int = ANCHOR_EVERY,
+        checkpoint_key: Union[str, bytes, None] = None,
+    ):
+        self.engine = engine
+        self.table = table
+        self.log = log
+        if isinstance(checkpoint_key, str):
+            checkpoint_key = checkpoint_key.encode("utf-8")
+        self.checkpoint_key = checkpoint_key or None
+        self.anchor_log = f"{log}.anchors"
+        self.max_batch = max_batch
+        self.anchor_every = anchor_every
+        self._cond = threading.Condition()
+        self._queue: List[_Pending] = []
+        self._leader = False
+        self._state_lock = threading.Lock()
+        self._heads: Dict[Tuple[str, str], Tuple[int, str]] = {}
+        self._unanchored: Dict[str, Tuple[int, str]] = {}
+        self._since_anchor = 0
+
+    # -- writing -------------------------------------------------------------
+
+    def append(self, chain_key: str, payload: dict) -> None:
+        item = _Pending(chain_key, payload)
+        with self._cond:
+            self._queue.append(item)
+        while True:
+            with self._cond:
+                while not item.done and self._leader:
+                    self._cond.wait()
+                if item.done:
+                    break
+                self._leader = True
+                batch = self._queue[: self.max_batch]
+                del self._queue[: self.max_batch]
+            try:
+                self._commit(batch)
+            finally:
+                with self._cond:
+                    self._leader = False
+                    self._cond.notify_all()
+        if item.error is not None:
+            raise item.error
+
+    def anchor(self) -> Optional[int]:
+        """Anchor the heads that moved since the last anchor now; returns the
+        anchor's seq (None if nothing moved)."""
+        with self._state_lock:
+            pending = dict(self._unanchored)
+        if not pending:
+            return None
+        for attempt in range(_MAX_RETRIES):
+            try:
+                with self.engine.begin() as conn:
+                    seq = self._write_anchor(conn, pending)
+                break
+            except (_StaleHead, IntegrityError):
+                self._forget([(self.anchor_log, "*")])
+                if attempt == _MAX_RETRIES - 1:
+                    raise
+        with self._state_lock:
+            for chain_key, head in pending.items():
+                if self._unanchored.get(chain_key) == head:
+                    del self._unanchored[chain_key]
+        return seq
+
+    def _commit(self, batch: List[_Pending]) -> None:
+        try:
+            for attempt in range(_MAX_RETRIES):
+                try:
+                    self._commit_once(batch)
+                    return
+                except (_StaleHead, IntegrityError):
+                    self._forget((self.log, i.chain_key) for i in batch)
+                    self._forget([(self.anchor_log, "*")])
+                    if attempt == _MAX_RETRIES - 1:
+                        raise
+        except Exception as e:
+            for item in batch:
+                item.error = e
+        finally:
+            for item in batch:
+                item.done = True
+
+    def _commit_once(self, batch: List[_Pending]) -> None:
+        rows: List[dict] = []
+        with self.engine.begin() as conn:
+            heads = self._load_heads(conn, self.log, {i.chain_key for i in batch})
+            advanced: Dict[str, Tuple[int, str]] = {}
+            for item in batch:
+                seq, prev_hash = advanced.get(item.chain_key) or heads.get(
+                    item.chain_key, (0, _GENESIS)
+                )
+                seq += 1
+                content = _chained(item.payload, item.chain_key, seq)
+                record_hash = _hash(content, prev_hash)
+                rows.append(
+                    {
+                        **item.payload,
+                        "chain_key": item.chain_key,
+                        "seq": seq,
+                        "prev_hash": prev_hash,
+                        "record_hash": record_hash,
+                    }
+                )
+                advanced[item.chain_key] = (seq, record_hash)
+            self._advance(conn, self.log, heads, advanced)
+            conn.execute(insert(self.table), rows)
+
+            with self._state_lock:
+                pending = {**self._unanchored, **advanced}
+                due = self._since_anchor + len(batch) >= self.anchor_every
+            if due:
+                self._write_anchor(conn, pending)
+
+        with self._state_lock:
+            for chain_key, head in advanced.items():
+                self._heads[(self.log, chain_key)] = head
+            if due:
+                self._unanchored.clear()
+                self._since_anchor = 0
+            else:
+                self._unanchored.update(advanced)
+                self._since_anchor += len(batch)
+
+    def _write_anchor(self, conn: Connection, pending: Dict[str, Tuple[int, str]]):
+        heads = self._load_heads(conn, self.anchor_log, {"*"})
+        seq, prev_hash = heads.get("*", (0, _GENESIS))
+        seq += 1
+        payload = {
+            "log": self.log,
+            "seq": seq,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "heads_json": _canonical({k: list(v) for k, v in pending.items()}),
+        }
+        record_hash = _hash(payload, prev_hash)
+        self._advance(conn, self.anchor_log, heads, {"*": (seq, record_hash)})
+        conn.execute(
+            insert(chain_anchors).values(
+                **payload, prev_hash=prev_hash, record_hash=record_hash
+            )
+        )
+        with self._state_lock:
+            self._heads[(self.anchor_log, "*")] = (seq, record_hash)
+        return seq
+
+    def _load_heads(
+        self, conn: Connection, log: str, chain_keys: Set[str]
+    ) -> Dict[str, Tuple[int, str]]:
+        """Current (seq, hash) per chain: cached, else read (absent = new)."""
+        heads: Dict[str, Tuple[int, str]] = {}
+        with self._state_lock:
+            for chain_key in chain_keys:
+                if (log, chain_key) in self._heads:
+                    heads[chain_key] = self._heads[(log, chain_key)]
+        missing = sorted(chain_keys - heads.keys())
+        for i in range(0, len(missing), 500):
+            for r in conn.execute(
+                select(chain_heads)
+                .where(chain_heads.c.log == log)
+                .where(chain_heads.c.chain_key.in_(missing[i : i + 500]))
+            ):
+                heads[r.chain_key] = (r.seq, r.head_hash)
+        return heads
+
+    def _advance(
+        self,
+        conn: Connection,
+        log: str,
+        old: Dict[str, Tuple[int, str]],
+        new: Dict[str, Tuple[int, str]],
+    ) -> None:
+        """Compare-and-swap each head from ``old`` to ``new``."""
+        # Sorted, so concurrent batches lock head rows in the same order.
+        for chain_key, (seq, head_hash) in sorted(new.items()):
+            if chain_key not in old:
+                # A concurrent first write hits the primary key instead.
+                conn.execute(
+                    insert(chain_heads).values(
+                        log=log, chain_key=chain_key, seq=seq, head_hash=head_hash
+                    )
+                )
+                continue
+            result = conn.execute(
+                update(chain_heads)
+                .where(chain_heads.c.log == log)
+                .where(chain_heads.c.chain_key == chain_key)
+                .where(chain_heads.c.seq == old[chain_key][0])
+                .values(seq=seq, head_hash=head_hash)
+            )
+            if result.rowcount != 1:
+                raise _StaleHead(chain_key)
+
+    def _forget(self, keys: Iterable[Tuple[str, str]]) -> None:
+        with self._state_lock:
+            for key in keys:
+                self._heads.pop(key, None)
+
+    # -- verification --------------------------------------------------------
+
+    def verify(
+        self,
+        payload_of: Callable,
+        *,
+        full: bool = False,
+        workers: int = 1,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Verify rows, heads and anchors; returns a report (``ok``, ``error``,
+        counts). Resumes after the latest signed checkpoint unless ``full``.
+        """
+        started = time.monotonic()
+        report: Dict[str, Any] = {
+            "log": self.log,
+            "ok": False,
+            "mode": "full",
+            "through_id": 0,
+            "rows_verified": 0,
+            "chains_advanced": 0,
+            "anchors_verified": 0,
+            "heads_checked": 0,
+            "checkpoint_id": None,
+            "error": None,
+        }
+        try:
+            self._verify(payload_of, report, full, max(1, workers), progress)
+            report["ok"] = True
+        except _Broken as e:
+            report["error"] = str(e)
+        report["elapsed_s"] = round(time.monotonic() - started, 3)
+        return report
+
+    def _verify(self, payload_of, report, full, workers, progress) -> None:
+        t, c = self.table, chain_checkpoints
+        with self.engine.connect() as conn:
+            checkpoint, prev_id = None, 0
+            if self.checkpoint_key is not None and not full:
+                checkpoint = self._latest_checkpoint(conn)
+            elif self.checkpoint_key is not None:
+                # Not trusted, only the slot the new checkpoint will claim.
+                latest = select(func.max(c.c.id)).where(c.c.log == self.log)
+                prev_id = conn.execute(latest).scalar() or 0
+            anchor_seq, anchor_hash, verified_before, through_id = 0, _GENESIS, 0, 0
+            if checkpoint is not None:
+                digest, chains = self._tips_digest(conn)
+                if (digest, chains) != (checkpoint.tips_digest, checkpoint.chains):
+                    raise _Broken(
+                        f"checkpoint {checkpoint.id}: verified chain tips changed"
+                    )
+                prev_id, through_id = checkpoint.id, checkpoint.through_id
+                anchor_seq, anchor_hash = checkpoint.anchor_seq, checkpoint.anchor_hash
+                verified_before = checkpoint.rows_verified
+                report["mode"] = "incremental"
+                rows, tips, last_id = self._verify_tail(payload_of, progress)
+            else:
+                hi = conn.execute(select(func.max(t.c.id))).scalar() or 0
+                rows, tips, last_id = self._verify_rows(
+                    payload_of, 0, hi, workers, progress
+                )
+            report["rows_verified"] = rows
+            report["chains_advanced"] = len(tips)
+            report["through_id"] = max(through_id, last_id)
+            anchor_seq, anchor_hash, anchors = self._verify_anchors(
+                conn, anchor_seq, anchor_hash
+            )
+            report["anchors_verified"] = anchors
+            report["heads_checked"] = self._verify_heads(conn, set(tips))
+
+        if self.checkpoint_key is not None and (rows or anchors or checkpoint is None):
+            report["checkpoint_id"] = self._write_checkpoint(
+                tips,
+                replace=checkpoint is None,
+                prev_id=prev_id,
+                through_id=report["through_id"],
+                anchor_seq=anchor_seq,
+                anchor_hash=anchor_hash,
+                rows_verified=verified_before + rows,
+            )
+        if progress is not None:
+            progress(100)
+
+    def _verify_rows(self, payload_of, lo, hi, workers, progress):
+        """Verify rows with lo < id <= hi in ``workers`` parallel id ranges."""
+        if hi <= lo:
+            return 0, {}, 0
+        step = -(-(hi - lo) // workers)
+        bounds = [(b, min(b + step, hi)) for b in range(lo, hi, step)]
+        done = {b: b for b, _ in bounds}
+        lock = threading.Lock()
+
+        def tick(segment_lo: int, row_id: int) -> None:
+            if progress is None:
+                return
+            with lock:
+                done[segment_lo] = row_id
+                covered = sum(done[b] - b for b in done)
+                progress(min(99, int(100 * covered / (hi - lo))))
+
+        if len(bounds) == 1:
+            results = [self._verify_segment(payload_of, lo, hi, tick)]
+        else:
+            with ThreadPoolExecutor(max_workers=len(bounds)) as pool:
+                futures = [
+                    pool.submit(self._verify_segment, payload_of, a, b, tick)
+                    for a, b in bounds
+                ]
+                results = [f.result() for f in futures]
+        tips: Dict[str, Tuple[int, str]] = {}
+        for _, segment_tips, _ in results:
+            for key, tip in segment_tips.items():
+                if key not in tips or tip[0] > tips[key][0]:
+                    tips[key] = tip
+        count = sum(r[0] for r in results)
+        return count, tips, max(r[2] for r in results)
+
+    def _verify_segment(self, payload_of, lo: int, hi: int, tick):
+        """
+        Stream one id range. A chain's first row in the range is linked to its
+        predecessor (looked up and re-hashed), so ranges verify independently.
+        """
+        t = self.table
+        with self.engine.connect() as conn, self.engine.connect() as lookup:
+            rows = conn.execute(
+                select(t)
+                .where(t.c.id > lo)
+                .where(t.c.id <= hi)
+                .order_by(t.c.id.asc())
+                .execution_options(stream_results=True, yield_per=VERIFY_CHUNK)
+            )
+            result = self._verify_stream(
+                payload_of,
+                rows,
+                lambda r: self._predecessor(lookup, payload_of, r),
+                lambda count, row_id: tick(lo, row_id),
+            )
+        tick(lo, hi)
+        return result
+
+    def _verify_tail(self, payload_of, progress):
+        """
+        Stream the rows past each chain's checkpointed tip, chain by chain,
+        starting from the heads that moved. A chain's first new row must link
+        to that tip, which is re-hashed.
+        """
+        t, h, p = self.table, chain_heads, checkpoint_tips
+        tip_seq = func.coalesce(p.c.seq, 0)
+        moved = h.outerjoin(
+            p, and_(p.c.log == h.c.log, p.c.chain_key == h.c.chain_key)
+        ).join(t, and_(t.c.chain_key == h.c.chain_key, t.c.seq > tip_seq))
+        tail = (
+            select(t, p.c.seq.label("tip_seq"), p.c.record_hash.label("tip_hash"))
+            .select_from(moved)
+            .where(h.c.log == self.log)
+            .where(h.c.seq > tip_seq)
+        )
+        with self.engine.connect() as conn, self.engine.connect() as lookup:
+            total = 0
+            if progress is not None:
+                total = conn.execute(
+                    select(func.count()).select_from(tail.subquery())
+                ).scalar()
+
+            def seed(r) -> Tuple[int, str]:
+                linked = self._predecessor(lookup, payload_of, r)
+                if r.tip_seq is not None and linked != (r.tip_seq, r.tip_hash):
+                    raise _Broken(
+                        f"chain {r.chain_key!r}: seq {r.tip_seq} changed since "
+                        "the checkpoint"
+                    )
+                return linked
+
+            def tick(count: int, row_id: int) -> None:
+                if progress is not None and total:
+                    progress(min(99, int(100 * count / total)))
+
+            rows = conn.execute(
+                tail.order_by(t.c.chain_key.asc(), t.c.seq.asc()).execution_options(
+                    stream_results=True, yield_per=VERIFY_CHUNK
+                )
+            )
+            return self._verify_stream(payload_of, rows, seed, tick)
+
+    def _verify_stream(self, payload_of, rows, seed, tick):
+        """
+        Check linkage and hashes of rows ordered by seq within each chain;
+        ``seed(r)`` gives the (seq, hash) a chain's first row must link to.
+        Returns the count, each chain's last (seq, hash) and the highest id.
+        """
+        tips: Dict[Optional[str], Tuple[int, str]] = {}
+        count = last_id = 0
+        for r in rows:
+            key = r.chain_key
+            if key not in tips:
+                tips[key] = seed(r)
+            seq, prev_hash = tips[key]
+            if key is None:
+                content = payload_of(r)
+            else:
+                if r.seq != seq + 1:
+                    raise _Broken(
+                        f"row {r.id}: chain {key!r} jumps from seq {seq} to {r.seq}"
+                    )
+                content = _chained(payload_of(r), key, r.seq)
+            record_hash = _hash(content, prev_hash)
+            if r.prev_hash != prev_hash or r.record_hash != record_hash:
+                raise _Broken(f"row {r.id}: hash chain broken")
+            tips[key] = (r.seq or 0, r.record_hash)
+            count += 1
+            last_id = max(last_id, r.id)
+            if count % VERIFY_CHUNK == 0:
+                tick(count, r.id)
+        tips.pop(None, None)  # the legacy chain is only re-checked by full runs
+        return count, tips, last_id
+
+    def _predecessor(self, conn: Connection, payload_of, r) -> Tuple[int, str]:
+        """(seq, hash) the row must link to; the predecessor is re-hashed."""
+        t = self.table
+        if r.chain_key is None:
+            p = conn.execute(
+                select(t)
+                .where(t.c.chain_key.is_(None))
+                .where(t.c.id < r.id)
+                .order_by(t.c.id.desc())
+                .limit(1)
+            ).first()
+            if p is None:
+                return 0, _GENESIS
+            content = payload_of(p)
+        else:
+            if r.seq is None or r.seq <= 1:
+                return 0, _GENESIS
+            p = conn.execute(
+                select(t)
+                .where(t.c.chain_key == r.chain_key)
+                .where(t.c.seq == r.seq - 1)
+            ).first()
+            if p is None or p.id >= r.id:
+                raise _Broken(
+                    f"row {r.id}: chain {r.chain_key!r} seq {r.seq - 1} is missing"
+                )
+            content = _chained(payload_of(p), p.chain_key, p.seq)
+        if p.record_hash != _hash(content, p.prev_hash):
+            raise _Broken(f"row {p.id}: content does not match its hash")
+        return p.seq or 0, p.record_hash
+
+    def _verify_heads(self, conn: Connection, seen: Set[str]) -> int:
+        """Every head must point at its chain's row; every chain seen needs one."""
+        h, t = chain_heads, self.table
+        joined = h.outerjoin(
+            t, and_(t.c.chain_key == h.c.chain_key, t.c.seq == h.c.seq)
+        )
+        rows = conn.execute(
+            select(h.c.chain_key, h.c.seq, h.c.head_hash, t.c.record_hash)
+            .select_from(joined)
+            .where(h.c.log == self.log)
+            .execution_options(stream_results=True, yield_per=VERIFY_CHUNK)
+        )
+        count = 0
+        for r in rows:
+            if r.record_hash != r.head_hash:
+                raise _Broken(f"chain {r.chain_key!r}: no row matches head seq {r.seq}")
+            count += 1
+        missing = sorted(seen)
+        for i in range(0, len(missing), 500):
+            batch = missing[i : i + 500]
+            found = set(
+                conn.execute(
+                    select(h.c.chain_key)
+                    .where(h.c.log == self.log)
+                    .where(h.c.chain_key.in_(batch))
+                ).scalars()
+            )
+            for chain_key in batch:
+                if chain_key not in found:
+                    raise _Broken(f"chain {chain_key!r}: head is missing")
+        return count
+
+    def _verify_anchors(self, conn: Connection, seq: int, prev_hash: str):
+        """Verify anchors after ``seq`` and the rows they vouch for; returns the
+        new (seq, hash) tip and the number of anchors checked."""
+        a = chain_anchors
+        head = conn.execute(
+            select(chain_heads.c.seq, chain_heads.c.head_hash)
+            .where(chain_heads.c.log == self.anchor_log)
+            .where(chain_heads.c.chain_key == "*")
+        ).first()
+        head_seq = head.seq if head is not None else 0
+        if head_seq < seq:
+            raise _Broken(f"anchors after seq {head_seq} are gone")
+        count, expected = 0, {}
+        anchors = conn.execute(
+            select(a)
+            .where(a.c.log == self.log)
+            .where(a.c.seq > seq)
+            .order_by(a.c.seq.asc())
+            .execution_options(stream_results=True, yield_per=100)
+        )
+        for r in anchors:
+            if r.seq > head_seq:
+                if head is None:
+                    raise _Broken("anchor head is missing")
+                break  # written after the head was read
+            payload = {
+                "log": r.log,
+                "seq": r.seq,
+                "timestamp": r.timestamp,
+                "heads_json": r.heads_json,
+            }
+            if r.seq != seq + 1 or r.prev_hash != prev_hash:
+                raise _Broken(f"anchor {r.seq}: anchor chain broken")
+            if r.record_hash != _hash(payload, prev_hash):
+                raise _Broken(f"anchor {r.seq}: content does not match its hash")
+            seq, prev_hash = r.seq, r.record_hash
+            count += 1
+            for chain_key, (chain_seq, chain_hash) in json.loads(r.heads_json).items():
+                expected[(chain_key, chain_seq)] = (r.seq, chain_hash)
+            if len(expected) >= 500:
+                self._check_anchored(conn, expected)
+        self._check_anchored(conn, expected)
+        if head is not None and (seq, prev_hash) != (head.seq, head.head_hash):
+            raise _Broken(f"anchor head seq {head.seq} does not match the anchors")
+        return seq, prev_hash, count
+
+    def _check_anchored(self, conn: Connection, expected: Dict) -> None:
+        t = self.table
+        if not expected:
+            return
+        rows = conn.execute(
+            select(t.c.chain_key, t.c.seq, t.c.record_hash).where(
+                tuple_(t.c.chain_key, t.c.seq).in_(list(expected))
+            )
+        )
+        found = {(r.chain_key, r.seq): r.record_hash for r in rows}
+        for (chain_key, chain_seq), (anchor_seq, chain_hash) in expected.items():
+            if found.get((chain_key, chain_seq)) != chain_hash:
+                raise _Broken(
+                    f"anchor {anchor_seq}: chain {chain_key!r} seq {chain_seq} "
+                    "is missing or changed"
+                )
+        expected.clear()
+
+    # -- checkpoints ---------------------------------------------------------
+
+    def _sign(self, payload: dict) -> str:
+        return hmac.new(
+            self.checkpoint_key, _canonical(payload).encode("utf-8"), hashlib.sha256
+        ).hexdigest()
+
+    def _latest_checkpoint(self, conn: Connection):
+        c = chain_checkpoints
+        row = conn.execute(
+            select(c).where(c.c.log == self.log).order_by(c.c.id.desc()).limit(1)
+        ).first()
+        if row is None:
+            return None
+        payload = {k: getattr(row, k) for k in _CHECKPOINT_FIELDS}
+        if not hmac.compare_digest(row.signature, self._sign(payload)):
+            raise _Broken(f"checkpoint {row.id}: signature does not match")
+        return row
+
+    def _tips_digest(self, conn: Connection) -> Tuple[str, int]:
+        """Digest and count of this log's checkpointed chain tips."""
+        p = checkpoint_tips
+        digest, count = hashlib.sha256(), 0
+        rows = conn.execute(
+            select(p.c.chain_key, p.c.seq, p.c.record_hash)
+            .where(p.c.log == self.log)
+            .order_by(p.c.chain_key.asc())
+            .execution_options(stream_results=True, yield_per=VERIFY_CHUNK)
+        )
+        for r in rows:
+            digest.update(_canonical([r.chain_key, r.seq, r.record_hash]).encode())
+            count += 1
+        return digest.hexdigest(), count
+
+    def _write_checkpoint(
+        self, tips: Dict[str, Tuple[int, str]], replace: bool, **values
+    ) -> Optional[int]:
+        """
+        Store the advanced tips (all of them when ``replace``) and a checkpoint
+        signing the result. None if a concurrent run already checkpointed from
+        the same ``prev_id``; that run's tips stand.
+        """
+        p = checkpoint_tips
+        try:
+            with self.engine.begin() as conn:
+                if replace:
+                    conn.execute(delete(p).where(p.c.log == self.log))
+                keys = sorted(tips)
+                for i in range(0, len(keys), 500):
+                    batch = keys[i : i + 500]
+                    if not replace:
+                        conn.execute(
+                            delete(p)
+                            .where(p.c.log == self.log)
+                            .where(p.c.chain_key.in_(batch))
+                        )
+                    conn.execute(
+                        insert(p),
+                        [
+                            {
+                                "log": self.log,
+                                "chain_key": key,
+                                "seq": tips[key][0],
+                                "record_hash": tips[key][1],
+                            }
+                            for key in batch
+                        ],
+                    )
+                digest, chains = self._tips_digest(conn)
+                payload = {
+                    "log": self.log,
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "chains": chains,
+                    "tips_digest": digest,
+                    **values,
+                }
+                result = conn.execute(
+                    insert(chain_checkpoints).values(
+                        **payload, signature=self._sign(payload)
+                    )
+                )
+                return result.inserted_primary_key[0]
+        except IntegrityError:
+            return None
+
+    def latest_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """The newest checkpoint row (unverified), for status displays."""
+        c = chain_checkpoints
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(c).where(c.c.log == self.log).order_by(c.c.id.desc()).limit(1)
+            ).first()
+        return dict(row._mapping) if row is not None else None
+
+
+def _chained(payload: dict, chain_key: str, seq: int) -> dict:
+    """Hashed content of a chained row: the row plus its place in its chain."""
+    return {**payload, "chain_key": chain_key, "seq": seq}
 
 
 # ---------------------------------------------------------------------------
@@ -102,10 +921,20 @@ def create_all(engine: Engine) -> None:
 
 
 class SqlConsentStore:
-    """Append-only, hash-chained ``ConsentStore`` backed by SQLAlchemy."""
+    """Append-only ``ConsentStore`` backed by SQLAlchemy, one hash chain per user."""
 
-    def __init__(self, engine: Engine):
+    def __init__(
+        self,
+        engine: Engine,
+        *,
+        max_batch: int = MAX_BATCH,
+        anchor_every: int = ANCHOR_EVERY,
+        checkpoint_key: Union[str, bytes, None] = None,
+    ):
         self.engine = engine
+        self._chains = _ChainedLog(
+            engine, consent_records, "consent", max_batch, anchor_every, checkpoint_key
+        )
 
     def append(self, record: ConsentRecord) -> None:
         payload = {
@@ -117,20 +946,7 @@ class SqlConsentStore:
             "source": record.source,
             "metadata_json": _canonical(record.metadata) if record.metadata else None,
         }
-        with self.engine.begin() as conn:
-            prev = conn.execute(
-                select(consent_records.c.record_hash)
-                .order_by(consent_records.c.id.desc())
-                .limit(1)
-            ).scalar()
-            prev_hash = prev or _GENESIS
-            conn.execute(
-                insert(consent_records).values(
-                    **payload,
-                    prev_hash=prev_hash,
-                    record_hash=_hash(payload, prev_hash),
-                )
-            )
+        self._chains.append(record.user_id, payload)
 
     def history(self, user_id: str, purpose: str) -> List[ConsentRecord]:
         with self.engine.connect() as conn:
@@ -155,27 +971,40 @@ class SqlConsentStore:
             )
         return out
 
-    def verify_chain(self) -> bool:
-        """Recompute the hash chain; False if any row was tampered/deleted."""
-        with self.engine.connect() as conn:
-            rows = conn.execute(
-                select(consent_records).order_by(consent_records.c.id.asc())
-            ).all()
-        prev_hash = _GENESIS
-        for r in rows:
-            payload = {
-                "user_id": r.user_id,
-                "purpose": r.purpose,
-                "granted": r.granted,
-                "policy_version": r.policy_version,
-                "timestamp": r.timestamp,
-                "source": r.source,
-                "metadata_json": r.metadata_json,
-            }
-            if r.prev_hash != prev_hash or r.record_hash != _hash(payload, prev_hash):
-                return False
-            prev_hash = r.record_hash
-        return True
+    def anchor(self) -> Optional[int]:
+        """Write a global anchor now (normally every ``anchor_every`` records)."""
+        return self._chains.anchor()
+
+    def verify(
+        self,
+        *,
+        full: bool = False,
+        workers: int = 1,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> Dict[str, Any]:
+        """Streaming verification report; see ``_ChainedLog.verify``."""
+        return self._chains.verify(
+            _consent_payload, full=full, workers=workers, progress=progress
+        )
+
+    def verify_chain(self, full: bool = False) -> bool:
+        """Recompute the hash chains; False if any row was tampered/deleted."""
+        return self.verify(full=full)["ok"]
+
+    def latest_checkpoint(self) -> Optional[Dict[str, Any]]:
+        return self._chains.latest_checkpoint()
+
+
+def _consent_payload(r) -> dict:
+    return {
+        "user_id": r.user_id,
+        "purpose": r.purpose,
+        "granted": r.granted,
+        "policy_version": r.policy_version,
+        "timestamp": r.timestamp,
+        "source": r.source,
+        "metadata_json": r.metadata_json,
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -184,10 +1013,21 @@ class SqlConsentStore:
 
 
 class SqlDecisionLog:
-    """Append-only, hash-chained audit log of policy/assessment decisions."""
+    """Append-only audit log of policy/assessment decisions, one hash chain
+    per subject."""
 
-    def __init__(self, engine: Engine):
+    def __init__(
+        self,
+        engine: Engine,
+        *,
+        max_batch: int = MAX_BATCH,
+        anchor_every: int = ANCHOR_EVERY,
+        checkpoint_key: Union[str, bytes, None] = None,
+    ):
         self.engine = engine
+        self._chains = _ChainedLog(
+            engine, decision_log, "decision", max_batch, anchor_every, checkpoint_key
+        )
 
     def append(
         self,
@@ -211,20 +1051,7 @@ class SqlDecisionLog:
             "correlation_id": correlation_id,
             "metadata_json": _canonical(metadata) if metadata else None,
         }
-        with self.engine.begin() as conn:
-            prev = conn.execute(
-                select(decision_log.c.record_hash)
-                .order_by(decision_log.c.id.desc())
-                .limit(1)
-            ).scalar()
-            prev_hash = prev or _GENESIS
-            conn.execute(
-                insert(decision_log).values(
-                    **payload,
-                    prev_hash=prev_hash,
-                    record_hash=_hash(payload, prev_hash),
-                )
-            )
+        self._chains.append(subject_id, payload)
 
     def recent(self, subject_id: Optional[str] = None, limit: int = 100) -> List[dict]:
         stmt = select(decision_log).order_by(decision_log.c.id.desc()).limit(limit)
@@ -234,27 +1061,41 @@ class SqlDecisionLog:
             rows = conn.execute(stmt).all()
         return [dict(r._mapping) for r in rows]
 
-    def verify_chain(self) -> bool:
-        with self.engine.connect() as conn:
-            rows = conn.execute(
-                select(decision_log).order_by(decision_log.c.id.asc())
-            ).all()
-        prev_hash = _GENESIS
-        for r in rows:
-            payload = {
-                "timestamp": r.timestamp,
-                "subject_id": r.subject_id,
-                "action": r.action,
-                "decision": r.decision,
-                "risk_class": r.risk_class,
-                "reason": r.reason,
-                "correlation_id": r.correlation_id,
-                "metadata_json": r.metadata_json,
-            }
-            if r.prev_hash != prev_hash or r.record_hash != _hash(payload, prev_hash):
-                return False
-            prev_hash = r.record_hash
-        return True
+    def anchor(self) -> Optional[int]:
+        """Write a global anchor now (normally every ``anchor_every`` records)."""
+        return self._chains.anchor()
+
+    def verify(
+        self,
+        *,
+        full: bool = False,
+        workers: int = 1,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> Dict[str, Any]:
+        """Streaming verification report; see ``_ChainedLog.verify``."""
+        return self._chains.verify(
+            _decision_payload, full=full, workers=workers, progress=progress
+        )
+
+    def verify_chain(self, full: bool = False) -> bool:
+        """Recompute the hash chains; False if any row was tampered/deleted."""
+        return self.verify(full=full)["ok"]
+
+    def latest_checkpoint(self) -> Optional[Dict[str, Any]]:
+        return self._chains.latest_checkpoint()
+
+
+def _decision_payload(r) -> dict:
+    return {
+        "timestamp": r.timestamp,
+        "subject_id": r.subject_id,
+        "action": r.action,
+        "decision": r.decision,
+        "risk_class": r.risk_class,
+        "reason": r.reason,
+        "correlation_id": r.correlation_id,
+        "metadata_json": r.metadata_json,
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -5,7 +5,19 @@ tamper-evidence, the policy gate, idempotency, and PII hardening.
     python -m pytest responsible_ai/tests/test_governance_db.py -q
 """
 
-from sqlalchemy import create_engine, text, update
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import (
+    Column,
+    MetaData,
+    Table,
+    create_engine,
+    delete,
+    insert,
+    select,
+    text,
+    update,
+)
 from sqlalchemy.pool import StaticPool
 
 from responsible_ai.governance import (
@@ -66,6 +78,243 @@ def test_consent_chain_detects_tampering():
     assert store.verify_chain() is False  # tamper detected
 
 
+# -- partitioned chains + group commit ---------------------------------------
+
+
+def _decide(log, subject_id, n=1):
+    for i in range(n):
+        log.append(
+            timestamp=f"2026-01-01T00:00:{i:02d}",
+            subject_id=subject_id,
+            action="ai_advisory",
+            decision=ALLOW,
+            reason="ok",
+        )
+
+
+def test_decision_chains_are_per_subject_and_detect_truncation():
+    engine = _engine()
+    log = st.SqlDecisionLog(engine)
+    _decide(log, "u1", 3)
+    _decide(log, "u2", 2)
+    assert log.verify_chain() is True
+    rows = log.recent(subject_id="u1")
+    assert [r["seq"] for r in rows] == [3, 2, 1]
+    assert {r["chain_key"] for r in rows} == {"u1"}
+    # Dropping the newest record leaves the chain intact but short of its head.
+    with engine.begin() as conn:
+        conn.execute(
+            delete(st.decision_log).where(st.decision_log.c.id == rows[0]["id"])
+        )
+    assert log.verify_chain() is False
+
+
+def test_anchor_detects_a_deleted_subject():
+    engine = _engine()
+    log = st.SqlDecisionLog(engine, anchor_every=3)
+    _decide(log, "u1", 2)
+    _decide(log, "u2", 1)  # third record → anchor over u1 and u2
+    assert log.verify_chain() is True
+    # Erase u2 entirely, head included: only the anchor still remembers it.
+    with engine.begin() as conn:
+        conn.execute(
+            delete(st.decision_log).where(st.decision_log.c.subject_id == "u2")
+        )
+        conn.execute(delete(st.chain_heads).where(st.chain_heads.c.chain_key == "u2"))
+    assert log.verify_chain() is False
+
+
+def test_concurrent_appends_keep_every_chain_valid(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'rai.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    st.create_all(engine)
+    # Two stores on one database: they race on the same chain heads.
+    logs = [st.SqlDecisionLog(engine, anchor_every=50) for _ in range(2)]
+
+    def worker(i):
+        for j in range(20):
+            _decide(logs[i % 2], f"u{(i + j) % 3}")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(worker, range(8)))
+
+    assert logs[0].verify_chain() is True
+    with engine.connect() as conn:
+        rows = conn.execute(select(st.decision_log)).all()
+    assert len(rows) == 160
+    for subject in ("u0", "u1", "u2"):
+        seqs = sorted(r.seq for r in rows if r.chain_key == subject)
+        assert seqs == list(range(1, len(seqs) + 1))
+
+
+def test_legacy_global_chain_survives_schema_upgrade():
+    # A decision log as created before per-subject chains existed.
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    legacy = Table(
+        "rai_decision_log",
+        MetaData(),
+        *[
+            Column(c.name, c.type, primary_key=c.primary_key)
+            for c in st.decision_log.columns
+            if c.name not in ("chain_key", "seq")
+        ],
+    )
+    legacy.create(engine)
+    prev = st._GENESIS
+    with engine.begin() as conn:
+        for i in range(3):
+            payload = {
+                "timestamp": f"2025-12-31T00:00:0{i}",
+                "subject_id": "u1",
+                "action": "ai_advisory",
+                "decision": ALLOW,
+                "risk_class": None,
+                "reason": "ok",
+                "correlation_id": None,
+                "metadata_json": None,
+            }
+            record_hash = st._hash(payload, prev)
+            conn.execute(
+                insert(legacy).values(
+                    **payload, prev_hash=prev, record_hash=record_hash
+                )
+            )
+            prev = record_hash
+
+    st.create_all(engine)  # adds chain_key/seq to the pre-existing table
+    log = st.SqlDecisionLog(engine)
+    _decide(log, "u1", 2)
+    assert log.verify_chain() is True
+    with engine.begin() as conn:
+        conn.execute(
+            update(st.decision_log)
+            .where(st.decision_log.c.id == 2)
+            .values(decision=DENY)
+        )
+    assert log.verify_chain() is False
+
+
+# -- streaming, checkpointed verification -----------------------------------
+
+
+def test_checkpoint_limits_later_runs_to_the_tail():
+    engine = _engine()
+    log = st.SqlDecisionLog(engine, checkpoint_key="k" * 32)
+    _decide(log, "u1", 3)
+    _decide(log, "u2", 2)
+    first = log.verify()
+    assert first["ok"] and first["mode"] == "full"
+    assert first["rows_verified"] == 5 and first["checkpoint_id"]
+
+    _decide(log, "u1", 2)
+    second = log.verify()
+    assert second["ok"] and second["mode"] == "incremental"
+    assert second["through_id"] == 7 and second["chains_advanced"] == 1
+    assert second["rows_verified"] == 2
+    assert log.latest_checkpoint()["rows_verified"] == 7
+
+    # The next u1 record links to seq 5, inside the checkpointed prefix:
+    # rewriting that row is still caught without a full run.
+    with engine.begin() as conn:
+        conn.execute(
+            update(st.decision_log)
+            .where(st.decision_log.c.chain_key == "u1")
+            .where(st.decision_log.c.seq == 5)
+            .values(reason="edited")
+        )
+    _decide(log, "u1")
+    report = log.verify()
+    assert report["ok"] is False and "content does not match" in report["error"]
+
+
+def test_row_committed_below_the_checkpoint_is_still_verified():
+    # Ids are handed out at INSERT, so a row can commit after higher ids were
+    # already checkpointed. The next run must pick it up, not skip past it.
+    engine = _engine()
+    log = st.SqlDecisionLog(engine, checkpoint_key="k" * 32)
+    _decide(log, "u1", 2)
+    _decide(log, "late")
+    _decide(log, "u1")
+    log_t, heads = st.decision_log, st.chain_heads
+    with engine.begin() as conn:  # hold id 3 back as if still in flight
+        row = conn.execute(select(log_t).where(log_t.c.id == 3)).one()
+        head = conn.execute(select(heads).where(heads.c.chain_key == "late")).one()
+        conn.execute(delete(log_t).where(log_t.c.id == 3))
+        conn.execute(delete(heads).where(heads.c.chain_key == "late"))
+    first = log.verify()
+    assert first["ok"] and first["through_id"] == 4
+
+    with engine.begin() as conn:
+        conn.execute(insert(log_t).values(**row._mapping))
+        conn.execute(insert(heads).values(**head._mapping))
+    second = log.verify()
+    assert second["ok"] and second["mode"] == "incremental"
+    assert second["rows_verified"] == 1 and second["chains_advanced"] == 1
+
+    # Verified tips are signed with the checkpoint.
+    with engine.begin() as conn:
+        conn.execute(update(st.checkpoint_tips).values(seq=1, record_hash="f" * 64))
+    report = log.verify()
+    assert report["ok"] is False and "tips changed" in report["error"]
+
+
+def test_full_run_rechecks_the_checkpointed_prefix():
+    engine = _engine()
+    log = st.SqlDecisionLog(engine, checkpoint_key="k" * 32)
+    _decide(log, "u1", 3)
+    assert log.verify()["ok"]
+    with engine.begin() as conn:
+        conn.execute(
+            update(st.decision_log)
+            .where(st.decision_log.c.seq == 2)
+            .values(decision=DENY)
+        )
+    assert log.verify()["ok"] is True  # prefix trusted, nothing new to check
+    assert log.verify(full=True)["ok"] is False
+
+
+def test_forged_checkpoint_is_rejected():
+    engine = _engine()
+    log = st.SqlDecisionLog(engine, checkpoint_key="k" * 32)
+    _decide(log, "u1", 2)
+    assert log.verify()["ok"]
+    with engine.begin() as conn:
+        conn.execute(update(st.chain_checkpoints).values(through_id=99))
+    report = log.verify()
+    assert report["ok"] is False and "signature" in report["error"]
+    # Verifying with a different key cannot trust it either.
+    other = st.SqlDecisionLog(engine, checkpoint_key="x" * 32)
+    assert other.verify()["ok"] is False
+
+
+def test_parallel_segments_verify_independently(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'rai.db'}", connect_args={"check_same_thread": False}
+    )
+    st.create_all(engine)
+    log = st.SqlDecisionLog(engine, anchor_every=40)
+    for i in range(120):
+        _decide(log, f"u{i % 7}")
+    seen = []
+    report = log.verify(workers=4, progress=seen.append)
+    assert report["ok"] and report["rows_verified"] == 120
+    assert report["anchors_verified"] == 3 and report["heads_checked"] == 7
+    assert seen[-1] == 100 and seen == sorted(seen)
+
+    with engine.begin() as conn:
+        conn.execute(
+            update(st.decision_log).where(st.decision_log.c.id == 61).values(reason="x")
+        )
+    report = log.verify(workers=4)
+    assert report["ok"] is False and "row 61" in report["error"]
+
+
 # -- policy gate ------------------------------------------------------------
 
 
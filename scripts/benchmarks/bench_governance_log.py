@@ -0,0 +1,123 @@
+"""
+Benchmark: responsible_ai SqlDecisionLog appends/sec under concurrent writers.
+
+Compares the previous append (read the global latest record_hash, then
+insert, one transaction per record) against per-subject chains with group
+commit, then runs verify_chain() over what each wrote. The legacy path is
+reproduced here for comparison only; its rows land in the legacy global
+chain (chain_key NULL).
+
+Usage:
+    python scripts/benchmarks/bench_governance_log.py [threads] [per_thread] [db_url]
+
+db_url defaults to a fresh SQLite file in a temp dir; pass a Postgres URL
+to measure against the real backend.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+sys.path.insert(0, os.path.join(_ROOT, "packages", "responsible-ai"))
+
+from sqlalchemy import create_engine, func, insert, select  # noqa: E402
+
+from responsible_ai.governance import stores as st  # noqa: E402
+
+SUBJECTS = 50
+
+
+def _payload(i, j):
+    return {
+        "timestamp": f"2026-01-01T00:{i % 60:02d}:{j % 60:02d}",
+        "subject_id": f"user-{(i * 7919 + j) % SUBJECTS}",
+        "action": "ai_advisory",
+        "decision": "ALLOW",
+        "risk_class": "LOW",
+        "reason": "Allowed: low risk.",
+        "correlation_id": f"req-{i}-{j}",
+        "metadata_json": '{"safe_mode":false}',
+    }
+
+
+def legacy_append(engine, payload):
+    """The pre-partitioning append: one global chain, read-then-insert."""
+    with engine.begin() as conn:
+        prev = conn.execute(
+            select(st.decision_log.c.record_hash)
+            .order_by(st.decision_log.c.id.desc())
+            .limit(1)
+        ).scalar()
+        prev_hash = prev or st._GENESIS
+        conn.execute(
+            insert(st.decision_log).values(
+                **payload,
+                prev_hash=prev_hash,
+                record_hash=st._hash(payload, prev_hash),
+            )
+        )
+
+
+def chained_append(log, payload):
+    fields = {k: v for k, v in payload.items() if k != "metadata_json"}
+    log.append(**fields, metadata={"safe_mode": False})
+
+
+def run(label, engine, append, threads, per_thread):
+    errors = []
+
+    def worker(i):
+        for j in range(per_thread):
+            try:
+                append(_payload(i, j))
+            except Exception as e:  # legacy writers collide under concurrency
+                errors.append(e)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(worker, range(threads)))
+    elapsed = time.perf_counter() - started
+
+    with engine.connect() as conn:
+        count = select(func.count()).select_from(st.decision_log)
+        written = conn.execute(count).scalar()
+    valid = st.SqlDecisionLog(engine).verify_chain()
+    print(
+        f"{label:<10} {written / elapsed:10.0f} appends/s  "
+        f"written={written:<6} failed={len(errors):<5} verify_chain={valid}"
+    )
+
+
+def _engine(url, name, tmpdir):
+    url = url or f"sqlite:///{os.path.join(tmpdir, name)}"
+    args = {}
+    if url.startswith("sqlite"):
+        args = {"check_same_thread": False, "timeout": 30}
+    engine = create_engine(url, connect_args=args, pool_size=32, max_overflow=0)
+    st.RAI_METADATA.drop_all(engine)
+    st.create_all(engine)
+    return engine
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    per_thread = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    url = sys.argv[3] if len(sys.argv) > 3 else None
+    print(f"threads:   {threads}  appends/thread: {per_thread}  subjects: {SUBJECTS}")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = _engine(url, "legacy.db", tmpdir)
+        run("legacy", engine, lambda p: legacy_append(engine, p), threads, per_thread)
+        engine.dispose()
+
+        engine = _engine(url, "chained.db", tmpdir)
+        log = st.SqlDecisionLog(engine)
+        run("chained", engine, lambda p: chained_append(log, p), threads, per_thread)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Micro-benchmark: intent_taxonomy.match_deterministic.
+
+Compares the compiled single-pass matcher against the previous
+implementation (per-call keyword sort + re.compile per keyword) and checks
+both return identical results on the sample corpus.
+
+Usage:
+    python scripts/benchmarks/bench_intent_matcher.py [iterations]
+"""
+
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "backend")
+)
+
+from services.intelligence.intent_taxonomy import (  # noqa: E402
+    ALL_INTENTS,
+    match_deterministic,
+)
+
+SAMPLES = [
+    "hello",
+    "What is my balance?",
+    "How much did I spend on groceries last month?",
+    "Can I afford a new laptop for $1500?",
+    "I want to save for a vacation of 3000 dollars",
+    "Book me a ride to the airport",
+    "How much is a careem to downtown?",
+    "Should I take the job offer or stay at my current company?",
+    "Find a gym near me",
+    "How did I sleep last night?",
+    "Schedule a workout tomorrow for 2 hours",
+    "this is broken, the chart never loads",
+    "Tell me a story about dragons and castles in the mountains",
+    "I've been feeling stressed about money and can't focus at work lately",
+]
+
+_LEGACY_PATTERNS = [
+    (re.compile(p, re.IGNORECASE), e.name) for e in ALL_INTENTS for p in e.regex_patterns
+]
+
+
+def legacy_match_deterministic(text):
+    """The pre-compiled-matcher implementation, kept here for comparison."""
+    text_lower = text.lower().strip()
+    for compiled_pattern, intent_name in _LEGACY_PATTERNS:
+        if compiled_pattern.search(text_lower):
+            return (intent_name, 0.85, "regex")
+    for entry in ALL_INTENTS:
+        for keyword in sorted(entry.keywords, key=len, reverse=True):
+            pattern = re.compile(rf"\b{re.escape(keyword)}\b", re.IGNORECASE)
+            if pattern.search(text_lower):
+                return (entry.name, 0.95, "keyword")
+    return None
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    for text in SAMPLES:
+        old, new = legacy_match_deterministic(text), match_deterministic(text)
+        assert old == new, f"Mismatch for {text!r}: {old} != {new}"
+
+    def run(fn):
+        for text in SAMPLES:
+            fn(text)
+
+    n_msgs = iterations * len(SAMPLES)
+    legacy_s = timeit.timeit(lambda: run(legacy_match_deterministic), number=iterations)
+    compiled_s = timeit.timeit(lambda: run(match_deterministic), number=iterations)
+
+    legacy_us = legacy_s / n_msgs * 1e6
+    compiled_us = compiled_s / n_msgs * 1e6
+    print(f"messages:  {n_msgs}")
+    print(f"legacy:    {legacy_us:8.1f} us/message")
+    print(f"compiled:  {compiled_us:8.1f} us/message")
+    print(f"speedup:   {legacy_us / compiled_us:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark: OCR fallback throughput (services.ocr_engine.OCREngine).
+
+Builds a scanned fixture (statement pages rendered to images, no text
+layer) and reports pages/sec for the process-pool OCR engine at 1, 2 and
+N workers, N being the CPUs available to this process. Each pool is warmed
+up before timing so worker start-up is not counted.
+
+Runs real tesseract by default. With --simulate, a CPU-bound stand-in
+replaces tesseract (same rasterization, same pool), for hosts without the
+tesseract binary.
+
+Usage:
+    python scripts/benchmarks/bench_ocr.py [--pages 24] [--dpi 300] [--simulate]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "backend")
+)
+
+import fitz  # noqa: E402
+
+from services.ocr_engine import (  # noqa: E402
+    OCREngine,
+    get_pool,
+    host_workers,
+    shutdown_pools,
+    tesseract_ocr,
+)
+
+
+def simulated_ocr(image):
+    """CPU-bound stand-in for tesseract: a pure-Python pass over the pixels."""
+    total = 0
+    for value in image.tobytes()[::2]:
+        total += value
+    return f"{image.width}x{image.height}:{total}"
+
+
+def scanned_fixture(pages):
+    """A statement whose pages are images only, like a scanner's output."""
+    doc = fitz.open()
+    for p in range(pages):
+        source = fitz.open()
+        page = source.new_page()
+        lines = [f"Statement page {p + 1}"] + [
+            f"2026-01-{(r % 28) + 1:02d}  POS PURCHASE MERCHANT {p:03d}-{r:02d}"
+            f"  -{(r * 7.31) % 400:8.2f}"
+            for r in range(40)
+        ]
+        page.insert_text((36, 48), "\n".join(lines), fontsize=9)
+        pix = page.get_pixmap(dpi=150)
+        target = doc.new_page()
+        target.insert_image(target.rect, pixmap=pix)
+        source.close()
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=24)
+    parser.add_argument("--dpi", type=int, default=300)
+    parser.add_argument("--simulate", action="store_true")
+    args = parser.parse_args()
+
+    ocr = simulated_ocr if args.simulate else tesseract_ocr
+    pdf = scanned_fixture(args.pages)
+    counts = sorted({1, 2, host_workers()})
+    print(
+        f"{args.pages} scanned pages at {args.dpi} DPI, "
+        f"{'simulated' if args.simulate else 'tesseract'} OCR, "
+        f"{host_workers()} CPUs available"
+    )
+
+    print(f"{'workers':>8} {'seconds':>9} {'pages/s':>9} {'speedup':>8}")
+    baseline = None
+    for workers in counts:
+        # Warm the pool: spawn every worker before timing
+        pool = get_pool(workers)
+        list(pool.map(abs, range(workers * 4)))
+
+        engine = OCREngine(dpi=args.dpi, workers=workers, ocr=ocr)
+        t0 = time.perf_counter()
+        pages = engine.page_texts(pdf)
+        elapsed = time.perf_counter() - t0
+        assert len(pages) == args.pages
+
+        rate = args.pages / elapsed
+        baseline = baseline or rate
+        print(f"{workers:>8} {elapsed:>8.2f}s {rate:>9.2f} {rate / baseline:>7.2f}x")
+    shutdown_pools()
+
+
+if __name__ == "__main__":
+    main()
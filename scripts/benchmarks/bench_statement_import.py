@@ -0,0 +1,144 @@
+"""
+Benchmark: statement transaction import (StatementService.process_pdf).
+
+Compares the bulk path (import_transactions: keys up front, chunked IN
+lookup, chunked INSERT ... ON CONFLICT DO NOTHING) against the previous
+per-row SELECT-then-add loop on synthetic statements. Each size is imported
+into a fresh file-backed SQLite database, then re-imported with half the
+rows already present; both paths must report identical imported/duplicate
+counts.
+
+SQLite round trips are in-process, so the gap against a networked Postgres
+is larger than shown here; the statement counts are the portable figure.
+
+Usage:
+    python scripts/benchmarks/bench_statement_import.py [sizes...]
+"""
+
+import hashlib
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "backend")
+)
+
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from models.database import Base  # noqa: E402
+from models.models import (  # noqa: E402
+    FinancialAccount,
+    FinancialTransaction,
+    Statement,
+    User,
+)
+from services.statement_processing_service import (  # noqa: E402
+    TransactionModel,
+    import_transactions,
+)
+
+TABLES = [m.__table__ for m in (User, FinancialAccount, Statement, FinancialTransaction)]
+
+
+def synthetic_statement(n, offset=0):
+    start = date(2026, 1, 1)
+    return [
+        TransactionModel(
+            date=start + timedelta(days=(i + offset) % 365),
+            description=f"POS PURCHASE MERCHANT {i + offset:06d}",
+            amount=-round(3.5 + ((i + offset) * 7.31) % 400, 2),
+            category="Shopping",
+        )
+        for i in range(n)
+    ]
+
+
+def legacy_import(db, user_id, statement_id, parsed):
+    """The pre-bulk loop: one SELECT per parsed row, then add_all."""
+    transactions = []
+    duplicates_count = 0
+    for tx in parsed:
+        raw_str = f"{tx.date.isoformat()}_{tx.amount}_{tx.description.strip().lower()}"
+        dedup_key = hashlib.sha256(raw_str.encode()).hexdigest()
+        exists = (
+            db.query(FinancialTransaction)
+            .filter(
+                FinancialTransaction.deduplication_key == dedup_key,
+                FinancialTransaction.user_id == user_id,
+            )
+            .first()
+        )
+        if exists:
+            duplicates_count += 1
+            continue
+        transactions.append(
+            FinancialTransaction(
+                user_id=user_id,
+                statement_id=statement_id,
+                transaction_date=tx.date,
+                description=tx.description,
+                amount=tx.amount,
+                currency_code="USD",
+                category_primary=tx.category or "Uncategorized",
+                deduplication_key=dedup_key,
+            )
+        )
+    db.add_all(transactions)
+    return len(transactions), duplicates_count
+
+
+def bulk_import(db, user_id, statement_id, parsed):
+    result = import_transactions(db, user_id, statement_id, parsed)
+    return len(result.transactions), result.duplicates
+
+
+def run(import_fn, n):
+    """Fresh import of n rows, then a re-import with n/2 duplicates."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine, tables=TABLES)
+        db = sessionmaker(bind=engine)()
+        db.add(User(id="bench", email="bench@test.com", hashed_password="pw"))
+        db.commit()
+
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *a: statements.append(1))
+
+        timings, counts = [], []
+        for parsed in (synthetic_statement(n), synthetic_statement(n, offset=n // 2)):
+            t0 = time.perf_counter()
+            counts.append(import_fn(db, "bench", None, parsed))
+            db.commit()
+            timings.append(time.perf_counter() - t0)
+
+        db.close()
+        engine.dispose()
+        return timings, counts, len(statements)
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [1_000, 10_000]
+
+    print(f"{'rows':>7}  {'path':<7} {'fresh':>9} {'re-import':>10} {'stmts':>7}")
+    for n in sizes:
+        legacy_t, legacy_counts, legacy_stmts = run(legacy_import, n)
+        bulk_t, bulk_counts, bulk_stmts = run(bulk_import, n)
+        assert legacy_counts == bulk_counts, (legacy_counts, bulk_counts)
+
+        for name, (fresh, again), stmts in (
+            ("legacy", legacy_t, legacy_stmts),
+            ("bulk", bulk_t, bulk_stmts),
+        ):
+            print(f"{n:>7}  {name:<7} {fresh:>8.3f}s {again:>9.3f}s {stmts:>7}")
+        print(
+            f"{'':>7}  speedup {legacy_t[0] / bulk_t[0]:>8.1f}x "
+            f"{legacy_t[1] / bulk_t[1]:>9.1f}x   counts {bulk_counts}"
+        )
+
+
+if __name__ == "__main__":
+    main()
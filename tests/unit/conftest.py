@@ -0,0 +1,42 @@
+"""
+Shared fixtures for unit tests.
+
+sqlite_engine / sqlite_sessionmaker give each test a private in-memory
+SQLite database. StaticPool keeps a single connection, so sessions handed
+to worker threads (asyncio.to_thread, job runners) see the same tables.
+"""
+
+import pytest
+
+
+@pytest.fixture
+def sqlite_engine():
+    """Fresh in-memory SQLite engine, disposed after the test."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import StaticPool
+
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def sqlite_sessionmaker(sqlite_engine):
+    """
+    Factory: sqlite_sessionmaker(*models) creates the tables for models
+    (every registered table when none are given) on sqlite_engine and
+    returns a sessionmaker bound to it.
+    """
+    from sqlalchemy.orm import sessionmaker
+    from models.database import Base
+
+    def make(*models):
+        tables = [m.__table__ for m in models] or None
+        Base.metadata.create_all(sqlite_engine, tables=tables)
+        return sessionmaker(bind=sqlite_engine)
+
+    return make
@@ -0,0 +1,96 @@
+"""
+Unit Tests for the async database path (models.database.get_async_db).
+
+Runs against aiosqlite in-memory databases — no Postgres needed.
+"""
+
+import sys
+import os
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+
+
+class TestAsyncUrlMapping:
+    """Sync → async driver URL translation."""
+
+    def test_sqlite_maps_to_aiosqlite(self):
+        from models.database import to_async_url
+
+        url, connect_args = to_async_url("sqlite:///./lfsd_v2.db")
+        assert url.drivername == "sqlite+aiosqlite"
+        assert url.database == "./lfsd_v2.db"
+        assert connect_args == {}
+
+    def test_postgres_maps_to_asyncpg(self):
+        from models.database import to_async_url
+
+        url, connect_args = to_async_url(
+            "postgresql://u:p@db.example.com:5432/helm?sslmode=require"
+        )
+        assert url.drivername == "postgresql+asyncpg"
+        assert "sslmode" not in url.query
+        assert connect_args == {"ssl": "require"}
+
+    def test_postgres_sslmode_disable(self):
+        from models.database import to_async_url
+
+        _, connect_args = to_async_url("postgresql+psycopg2://u:p@h/db?sslmode=disable")
+        assert connect_args == {}
+
+    def test_unknown_backend_raises(self):
+        from models.database import to_async_url
+
+        with pytest.raises(ValueError):
+            to_async_url("mysql://u:p@h/db")
+
+
+class TestAsyncSession:
+    """get_async_db yields a working AsyncSession."""
+
+    async def test_get_async_db_executes(self):
+        from sqlalchemy import text
+        from models.database import get_async_db
+
+        gen = get_async_db()
+        db = await gen.__anext__()
+        try:
+            result = await db.execute(text("SELECT 1"))
+            assert result.scalar() == 1
+        finally:
+            await gen.aclose()
+
+    async def test_lifestyle_goals_async(self):
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        from models.database import Base
+        from models.models import LifeGoal, User
+        from services.lifestyle_service import LifestyleService
+
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                Base.metadata.create_all,
+                tables=[User.__table__, LifeGoal.__table__],
+            )
+
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        async with Session() as db:
+            db.add(User(id="u1", email="u1@test.com", hashed_password="pw"))
+            db.add(
+                LifeGoal(
+                    id="g1",
+                    user_id="u1",
+                    title="Emergency fund",
+                    target_amount=1000,
+                    saved_amount=250,
+                    pillar="finance",
+                )
+            )
+            await db.commit()
+
+            goals = await LifestyleService(db).get_goals_async("u1")
+
+        await engine.dispose()
+        assert len(goals) == 1
+        assert goals[0]["title"] == "Emergency fund"
+        assert goals[0]["progress"] == 25
@@ -0,0 +1,216 @@
+"""
+Unit Tests for incremental financial daily aggregates.
+
+Tests: write-path maintenance, rolling windows vs. a raw rescan,
+rebuild/backfill parity, consumer read paths.
+"""
+
+import sys
+import os
+import statistics
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+
+
+@pytest.fixture
+def db(sqlite_sessionmaker):
+    from models.models import (
+        FinancialAccount,
+        FinancialDailyAggregate,
+        FinancialTransaction,
+        User,
+    )
+    from models.investment_portfolios import InvestmentPortfolio
+
+    db = sqlite_sessionmaker(
+        User,
+        FinancialAccount,
+        FinancialTransaction,
+        FinancialDailyAggregate,
+        InvestmentPortfolio,
+    )()
+    db.add(User(id="u1", email="alice@test.com", hashed_password="pw"))
+    db.add(User(id="u2", email="bob@test.com", hashed_password="pw"))
+    db.commit()
+    return db
+
+
+# ============================================================================
+# Financial Aggregates Tests
+# ============================================================================
+
+
+class TestFinancialAggregates:
+    """Tests for services.financial_aggregates against in-memory SQLite."""
+
+    def _txns(self, days=60, user_id="u1"):
+        from datetime import datetime, timedelta
+        from models.models import FinancialTransaction
+
+        now = datetime.utcnow()
+        txns = []
+        for d in range(days):
+            when = now - timedelta(days=d, hours=1)
+            if d % 14 == 0:
+                txns.append(
+                    FinancialTransaction(
+                        user_id=user_id,
+                        amount=4000.0 + d * 10,
+                        category_primary="Income",
+                        transaction_date=when,
+                    )
+                )
+            if d % 30 == 2:
+                txns.append(
+                    FinancialTransaction(
+                        user_id=user_id,
+                        amount=-1500.0,
+                        category_primary="Rent",
+                        transaction_date=when,
+                    )
+                )
+            txns.append(
+                FinancialTransaction(
+                    user_id=user_id,
+                    amount=-(20.0 + d % 5),
+                    category_primary="Groceries",
+                    transaction_date=when,
+                )
+            )
+            if d % 10 == 0:
+                txns.append(
+                    FinancialTransaction(
+                        user_id=user_id,
+                        amount=-9.99,
+                        category_primary="Entertainment",
+                        category_detailed="Subscription",
+                        transaction_date=when,
+                    )
+                )
+        return txns
+
+    def test_window_matches_raw_rescan(self, db):
+        from datetime import datetime, timedelta
+        from services.financial_aggregates import (
+            get_window,
+            is_bill,
+            record_transactions,
+        )
+
+        txns = self._txns()
+        db.add_all(txns)
+        record_transactions(db, txns)
+        db.commit()
+
+        since = (datetime.utcnow() - timedelta(days=30)).date()
+        in_window = [t for t in txns if t.transaction_date.date() >= since]
+        incomes = [t.amount for t in in_window if t.amount > 0]
+        outflows = [-t.amount for t in in_window if t.amount < 0]
+
+        window = get_window(db, "u1", days=30)
+        assert window.txn_count == len(in_window)
+        assert window.income_total == pytest.approx(sum(incomes))
+        assert window.income_count == len(incomes)
+        assert window.income_stdev == pytest.approx(statistics.stdev(incomes))
+        assert window.expense_total == pytest.approx(sum(outflows))
+        assert window.bill_total == pytest.approx(
+            sum(-t.amount for t in in_window if t.amount < 0 and is_bill(t))
+        )
+        assert window.category_spend["Rent"] == 1500.0
+        assert sum(window.category_spend.values()) == pytest.approx(sum(outflows))
+        assert get_window(db, "u2", days=30).txn_count == 0
+
+    def test_incremental_writes_match_rebuild(self, db):
+        from services.financial_aggregates import (
+            get_window,
+            rebuild_user,
+            record_transactions,
+        )
+
+        txns = self._txns()
+        # Arrive in several batches, some touching days already aggregated
+        for batch in (txns[::3], txns[1::3], txns[2::3]):
+            db.add_all(batch)
+            record_transactions(db, batch)
+            db.commit()
+        incremental = get_window(db, "u1", days=90)
+
+        rebuild_user(db, "u1")
+        db.commit()
+        rebuilt = get_window(db, "u1", days=90)
+
+        assert rebuilt.txn_count == incremental.txn_count == len(txns)
+        assert rebuilt.income_total == pytest.approx(incremental.income_total)
+        assert rebuilt.income_sq_total == pytest.approx(incremental.income_sq_total)
+        assert rebuilt.expense_total == pytest.approx(incremental.expense_total)
+        assert rebuilt.bill_total == pytest.approx(incremental.bill_total)
+        assert rebuilt.category_spend == pytest.approx(incremental.category_spend)
+
+    def test_rollback_discards_aggregate_with_rows(self, db):
+        from services.financial_aggregates import get_window, record_transactions
+
+        txns = self._txns(days=5)
+        db.add_all(txns)
+        record_transactions(db, txns)
+        db.rollback()
+
+        assert get_window(db, "u1", days=30).txn_count == 0
+
+    def test_window_read_cost_is_independent_of_volume(self, sqlite_engine, db):
+        from sqlalchemy import event
+        from services.financial_aggregates import get_window, record_transactions
+
+        for _ in range(5):
+            txns = self._txns(days=90)
+            db.add_all(txns)
+            record_transactions(db, txns)
+        db.commit()
+
+        statements = []
+        event.listen(
+            sqlite_engine, "before_cursor_execute", lambda *a: statements.append(a[2])
+        )
+        window = get_window(db, "u1", days=90)
+        assert window.txn_count > 500
+        assert len(statements) == 1
+        assert "financial_daily_aggregates" in statements[0]
+        assert "transactions_v2" not in statements[0]
+
+    def test_add_transaction_and_monthly_summary(self, db):
+        from services.finance_service import FinanceService
+
+        service = FinanceService(db)
+        service.add_transaction("u1", {"amount": 5000, "direction": "CREDIT"})
+        service.add_transaction("u1", {"amount": 1200, "category": "Rent"})
+        service.add_transaction("u1", {"amount": 80.5, "category": "Groceries"})
+
+        summary = service.get_monthly_summary("u1")
+        assert summary["total_income"] == 5000.0
+        assert summary["total_expenses"] == 1280.5
+        assert summary["recurring_bills"] == 1200.0
+        assert summary["monthly_savings"] == 3719.5
+
+    def test_wellbeing_index_reads_aggregates(self, db):
+        from models.models import FinancialAccount
+        from services.financial_aggregates import record_transactions
+        from services.index_calculator_service import (
+            calculate_financial_wellbeing_index,
+        )
+
+        db.add(
+            FinancialAccount(
+                user_id="u1",
+                institution_name="Ally",
+                account_type="savings",
+                current_balance=12000.0,
+            )
+        )
+        txns = self._txns(days=30)
+        db.add_all(txns)
+        record_transactions(db, txns)
+        db.commit()
+
+        result = calculate_financial_wellbeing_index("u1", db)
+        assert result["confidence"] == 0.85
+        assert 0 < result["value"] <= 100
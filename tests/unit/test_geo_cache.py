@@ -0,0 +1,217 @@
+"""
+Unit Tests for the geocode / distance-matrix cache.
+
+Tests: geohash and key normalization, read-through geocoding with negative
+caching and single-flight, per-element distance-matrix caching, the DB tier
+surviving an empty L1, concurrent lookups in MobilityExecutor.
+"""
+
+import sys
+import os
+import asyncio
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+
+
+def _maps(monkeypatch, handler, cache=None):
+    """GoogleMapsService with a live key, talking to a MockTransport."""
+    import core.config
+    import core.http_client
+    from core.http_client import HTTPClientRegistry
+    from services.productivity.geo_cache import GeoCache
+    from services.productivity.google_maps_service import GoogleMapsService
+
+    monkeypatch.setattr(core.config.Settings, "GOOGLE_MAPS_API_KEY", "test-key")
+    monkeypatch.setattr(
+        core.http_client,
+        "_registry",
+        HTTPClientRegistry(transport=httpx.MockTransport(handler)),
+    )
+    return GoogleMapsService(cache=cache or GeoCache(max_entries=100))
+
+
+def _maps_api(calls, statuses=None, delay=0.0):
+    """Geocode and distance-matrix endpoints; records every upstream call."""
+
+    async def handler(request):
+        query = parse_qs(urlparse(str(request.url)).query)
+        params = {name: values[0] for name, values in query.items()}
+        calls.append(params)
+        await asyncio.sleep(delay)
+        if request.url.path.endswith("/geocode/json"):
+            status = (statuses or {}).get(params.get("address"), "OK")
+            location = {"lat": 25.19, "lng": 55.27}
+            results = [{"geometry": {"location": location}}] if status == "OK" else []
+            return httpx.Response(200, json={"status": status, "results": results})
+        origins = params["origins"].split("|")
+        destinations = params["destinations"].split("|")
+        rows = [
+            {
+                "elements": [
+                    {"status": "NOT_FOUND"}
+                    if d == "Atlantis"
+                    else {
+                        "status": "OK",
+                        "distance": {"text": f"{len(d)} km", "value": len(d) * 1000},
+                        "duration": {"text": "5 mins", "value": 300},
+                    }
+                    for d in destinations
+                ]
+            }
+            for _ in origins
+        ]
+        return httpx.Response(
+            200,
+            json={
+                "status": "OK",
+                "rows": rows,
+                "origin_addresses": [f"addr({o})" for o in origins],
+                "destination_addresses": [f"addr({d})" for d in destinations],
+            },
+        )
+
+    return handler
+
+
+# ============================================================================
+# Geo Cache Tests
+# ============================================================================
+
+
+class TestGeoCache:
+    def test_geohash_and_keys(self):
+        from services.productivity.geo_cache import (
+            address_key,
+            geohash,
+            parse_latlng,
+            route_key,
+        )
+
+        assert geohash(57.64911, 10.40744, 11) == "u4pruydqqvj"
+        assert address_key("  Dubai Mall, ", "ae") == address_key("dubai   MALL", "ae")
+        assert parse_latlng("25.2048, 55.2708") == (25.2048, 55.2708)
+        assert parse_latlng("Dubai Mall") is None
+        # Points ~20 m apart share a route entry; addresses are normalized
+        assert route_key("walking", "25.19720,55.27440", "Zabeel Park") == route_key(
+            "walking", "25.19735,55.27452", "zabeel park"
+        )
+        assert route_key("walking", "25.1972,55.2744", "x") != route_key(
+            "driving", "25.1972,55.2744", "x"
+        )
+
+    async def test_geocode_read_through_negative_and_single_flight(self, monkeypatch):
+        calls = []
+        maps = _maps(
+            monkeypatch,
+            _maps_api(
+                calls,
+                statuses={"Nowhere St": "ZERO_RESULTS", "Busy": "OVER_QUERY_LIMIT"},
+                delay=0.05,
+            ),
+        )
+
+        first, second = await asyncio.gather(
+            maps.geocode("Dubai Mall"), maps.geocode("dubai mall")
+        )
+        assert first == second == (25.19, 55.27)
+        assert await maps.geocode("DUBAI MALL!") == (25.19, 55.27)
+        assert len(calls) == 1  # concurrent miss coalesced, then cached
+
+        assert await maps.geocode("Nowhere St") is None
+        assert await maps.geocode("Nowhere St") is None
+        assert len(calls) == 2  # ZERO_RESULTS cached
+
+        assert await maps.geocode("Busy") is None
+        assert await maps.geocode("Busy") is None
+        assert len(calls) == 4  # quota errors are not cached
+
+        stats = maps.cache.stats()
+        assert stats["coalesced"] == 1 and stats["negative_hits"] == 1
+
+    async def test_distance_matrix_fetches_only_missing_elements(self, monkeypatch):
+        calls = []
+        maps = _maps(monkeypatch, _maps_api(calls))
+        origin = "25.2000,55.2700"
+
+        first = await maps.get_distance_matrix(
+            [origin], ["Zabeel Park", "Atlantis"], mode="walking"
+        )
+        elements = first["rows"][0]["elements"]
+        assert elements[0]["distance"]["value"] == 11_000
+        assert elements[1]["status"] == "NOT_FOUND"
+
+        # Nearby origin: both known elements come from cache, one new one fetched
+        second = await maps.get_distance_matrix(
+            ["25.2001,55.2701"], ["Atlantis", "Mall", "Zabeel Park"], mode="walking"
+        )
+        assert calls[-1]["destinations"] == "Mall"
+        assert [e["status"] for e in second["rows"][0]["elements"]] == [
+            "NOT_FOUND",
+            "OK",
+            "OK",
+        ]
+        assert second["destination_addresses"] == [
+            "addr(Atlantis)",
+            "addr(Mall)",
+            "addr(Zabeel Park)",
+        ]
+        assert len(calls) == 2
+
+        assert await maps.get_distance(origin, "Mall", mode="walking") == 4.0
+        assert len(calls) == 2
+
+    async def test_db_tier_serves_a_cold_process(self, monkeypatch, tmp_path):
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from models.database import Base
+        from models.models import GeoCacheEntry
+        from services.productivity.geo_cache import MISS, DBGeoStore, GeoCache
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'geo.db'}")
+        Base.metadata.create_all(engine, tables=[GeoCacheEntry.__table__])
+        store = DBGeoStore(sessionmaker(bind=engine))
+
+        calls = []
+        warm = _maps(monkeypatch, _maps_api(calls), GeoCache(store, max_entries=10))
+        await warm.geocode("DXB Airport")
+        await GeoCache(store, max_entries=10).set("geo:expired", 1, ttl_s=-1)
+
+        cold_cache = GeoCache(store, max_entries=10)
+        cold = _maps(monkeypatch, _maps_api(calls), cold_cache)
+        assert await cold.geocode("dxb airport") == (25.19, 55.27)
+        assert len(calls) == 1
+        assert cold_cache.stats()["l2_hits"] == 1
+        assert await GeoCache(store, max_entries=10).get("geo:expired") is MISS
+
+
+class TestMobilityExecutorLookups:
+    async def test_geocodes_and_distance_run_concurrently(self):
+        from mobility.executor import MobilityExecutor
+
+        inflight = {"now": 0, "peak": 0}
+
+        class _StubMaps:
+            async def _call(self, result):
+                inflight["now"] += 1
+                inflight["peak"] = max(inflight["peak"], inflight["now"])
+                await asyncio.sleep(0.05)
+                inflight["now"] -= 1
+                return result
+
+            async def geocode(self, place):
+                return await self._call((25.2, 55.3))
+
+            async def get_distance(self, origin, destination):
+                return await self._call(18.4)
+
+        executor = MobilityExecutor()
+        executor.maps_service = _StubMaps()
+        result = await executor.execute_safe(
+            {"origin": "Dubai Mall", "destination": "DXB"}, "u1", {}
+        )
+
+        assert inflight["peak"] == 3
+        assert result["distance_km"] == 18.4
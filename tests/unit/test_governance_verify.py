@@ -0,0 +1,133 @@
+"""
+Unit Tests for governance log verification as a background job.
+
+Tests: the governance_verify handler reporting progress and a full then
+incremental (checkpointed) run, and a tampered decision log surfacing in
+the job's report.
+"""
+
+import sys
+import os
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+
+
+def _governance(monkeypatch, engine, checkpoint_key="k" * 48):
+    """Point governance_bridge at the test's database, with a checkpoint key."""
+    import core.config
+    import models.database
+    from services import governance_bridge
+
+    monkeypatch.setattr(models.database, "engine", engine)
+    monkeypatch.setattr(core.config.Settings, "RAI_GOVERNANCE_ENABLED", True)
+    monkeypatch.setattr(core.config.Settings, "RAI_CHECKPOINT_KEY", checkpoint_key)
+    governance_bridge._components.cache_clear()
+
+
+def _run_verify(factory, full=False):
+    from services.job_manager import JobManager
+    from services.job_runner import JobRunner, _HANDLERS
+    import services.job_handlers  # noqa: F401  (registers governance_verify)
+
+    with factory() as db:
+        job_id = JobManager(db).enqueue("governance_verify", payload={"full": full})
+    return (
+        JobRunner(
+            session_factory=factory,
+            handlers={"governance_verify": _HANDLERS["governance_verify"]},
+        ),
+        job_id,
+    )
+
+
+@pytest.fixture
+def factory(sqlite_sessionmaker):
+    from models.job import BackgroundJob
+
+    return sqlite_sessionmaker(BackgroundJob)
+
+
+# ============================================================================
+# Governance Verification Job Tests
+# ============================================================================
+
+
+class TestGovernanceVerifyJob:
+    async def test_full_then_incremental_runs(
+        self, sqlite_engine, factory, monkeypatch
+    ):
+        from models.job import BackgroundJob, JobStatus
+        from services import governance_bridge
+
+        _governance(monkeypatch, sqlite_engine)
+        try:
+            governance_bridge.record_consent("u1", True)
+            for i in range(3):
+                governance_bridge.log_decision("u1", "ai_advisory", "ALLOW", "ok")
+
+            runner, job_id = _run_verify(factory)
+            assert await runner.run_pending() == 1
+            with factory() as db:
+                job = db.get(BackgroundJob, job_id)
+                assert job.status == JobStatus.COMPLETED and job.progress == 100
+                report = job.result_json
+            assert report["ok"]
+            decisions = report["logs"]["decisions"]
+            assert decisions["mode"] == "full" and decisions["rows_verified"] == 3
+
+            governance_bridge.log_decision("u2", "ai_advisory", "DENY", "no consent")
+            status = governance_bridge.verification_status()
+            assert status["decisions"]["through_id"] == 3
+
+            again = governance_bridge.verify_logs()
+            assert again["ok"]
+            assert again["logs"]["decisions"]["mode"] == "incremental"
+            assert again["logs"]["decisions"]["rows_verified"] == 1
+            assert again["logs"]["consent"]["rows_verified"] == 0
+        finally:
+            governance_bridge._components.cache_clear()
+
+    async def test_tampered_log_is_reported(self, sqlite_engine, factory, monkeypatch):
+        from sqlalchemy import update
+        from models.job import BackgroundJob, JobStatus
+        from responsible_ai.governance import stores as st
+        from services import governance_bridge
+
+        _governance(monkeypatch, sqlite_engine)
+        try:
+            for i in range(3):
+                governance_bridge.log_decision("u1", "ai_advisory", "ALLOW", "ok")
+            with sqlite_engine.begin() as conn:
+                conn.execute(
+                    update(st.decision_log)
+                    .where(st.decision_log.c.seq == 2)
+                    .values(decision="DENY")
+                )
+
+            runner, job_id = _run_verify(factory, full=True)
+            assert await runner.run_pending() == 1
+            with factory() as db:
+                job = db.get(BackgroundJob, job_id)
+                assert job.status == JobStatus.COMPLETED
+                report = job.result_json
+            assert report["ok"] is False
+            assert "hash chain broken" in report["logs"]["decisions"]["error"]
+            assert report["logs"]["consent"]["ok"]
+        finally:
+            governance_bridge._components.cache_clear()
+
+    def test_no_checkpoint_key_means_full_runs(self, sqlite_engine, monkeypatch):
+        from services import governance_bridge
+
+        # SECRET_KEY is set for the test app; it must not stand in as the key.
+        _governance(monkeypatch, sqlite_engine, checkpoint_key=None)
+        try:
+            governance_bridge.log_decision("u1", "ai_advisory", "ALLOW", "ok")
+            for _ in range(2):
+                report = governance_bridge.verify_logs()["logs"]["decisions"]
+                assert report["ok"] and report["mode"] == "full"
+                assert report["checkpoint_id"] is None
+            assert governance_bridge.verification_status()["decisions"] is None
+        finally:
+            governance_bridge._components.cache_clear()
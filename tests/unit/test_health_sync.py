@@ -0,0 +1,159 @@
+"""
+Unit Tests for the scheduled health sync fan-out.
+
+Tests: first-sync backfill and incremental fetch from the high-water mark,
+bulk upsert without duplicate days, bounded concurrency over one shared
+client, failed connections keeping their mark, run metrics.
+"""
+
+import sys
+import os
+import json
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+
+DAY_MS = 86_400_000
+
+
+def _setup(monkeypatch, tmp_path, users):
+    """
+    SQLite file DB with a connected, non-expired google_fit row per user.
+    A file, not sqlite://, so concurrent workers get their own connections.
+    """
+    from cryptography.fernet import Fernet
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    import core.config
+    from models.database import Base
+    from models.models import Connection, HealthDataSample
+    from services.connection_service import ConnectionService
+
+    monkeypatch.setattr(
+        core.config.Settings,
+        "CREDENTIALS_ENCRYPTION_KEY",
+        Fernet.generate_key().decode(),
+    )
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'health.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(
+        engine, tables=[Connection.__table__, HealthDataSample.__table__]
+    )
+    factory = sessionmaker(bind=engine)
+    expires = datetime.now(timezone.utc) + timedelta(hours=1)
+    with factory() as db:
+        for user_id in users:
+            ConnectionService(db).create_or_update_connection(
+                user_id=user_id,
+                provider="google_fit",
+                credentials={"access_token": f"token-{user_id}"},
+                metadata={"expires_at": expires.isoformat()},
+            )
+    return factory
+
+
+def _fit_api(requests, fail_tokens=(), delay=0.0, inflight=None):
+    """Aggregate endpoint: one daily bucket per day in the requested window."""
+    import httpx
+
+    async def handler(request):
+        body = json.loads(request.content)
+        token = request.headers["Authorization"].split()[-1]
+        requests.append((token, body["startTimeMillis"]))
+        if inflight is not None:
+            inflight["now"] += 1
+            inflight["peak"] = max(inflight["peak"], inflight["now"])
+        await asyncio.sleep(delay)
+        if inflight is not None:
+            inflight["now"] -= 1
+        if token in fail_tokens:
+            return httpx.Response(500)
+        start = body["startTimeMillis"]
+        buckets = [
+            {
+                "startTimeMillis": str(ms),
+                "dataset": [
+                    {
+                        "dataSourceId": "derived:com.google.step_count.delta",
+                        "point": [{"value": [{"intVal": 1000}]}],
+                    }
+                ],
+            }
+            for ms in range(start, body["endTimeMillis"], DAY_MS)
+        ]
+        return httpx.Response(200, json={"bucket": buckets})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _cursor(factory, user_id):
+    from models.models import Connection
+
+    with factory() as db:
+        connection = db.query(Connection).filter(Connection.user_id == user_id).one()
+        return json.loads(connection.metadata_json).get("sync_high_water")
+
+
+# ============================================================================
+# Health Sync Tests
+# ============================================================================
+
+
+class TestHealthSync:
+    async def test_backfill_then_incremental_upsert(self, monkeypatch, tmp_path):
+        from models.models import HealthDataSample
+        from services.integrations.health_sync import HealthSyncOrchestrator
+
+        factory = _setup(monkeypatch, tmp_path, ["u1"])
+        requests = []
+        orchestrator = HealthSyncOrchestrator(
+            session_factory=factory,
+            backfill_days=7,
+            client=_fit_api(requests),
+        )
+
+        first = await orchestrator.run()
+        today = datetime.now(timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        assert requests[0][1] == int((today - timedelta(days=7)).timestamp() * 1000)
+        assert first["synced"] == 1 and first["backfilled"] == 1
+        assert first["samples_upserted"] == 8
+        assert _cursor(factory, "u1") is not None
+
+        second = await orchestrator.run()
+        # Only from the high-water mark's day: today's partial bucket again
+        assert requests[1][1] == int(today.timestamp() * 1000)
+        assert second["backfilled"] == 0 and second["samples_upserted"] == 1
+        assert second["lag_s"]["max"] >= 0
+
+        with factory() as db:
+            assert db.query(HealthDataSample).count() == 8  # no duplicate days
+            assert {s.steps for s in db.query(HealthDataSample)} == {1000}
+
+    async def test_bounded_fan_out_and_failures(self, monkeypatch, tmp_path):
+        from services.integrations.health_sync import HealthSyncOrchestrator
+
+        users = [f"user{i}" for i in range(10)]
+        factory = _setup(monkeypatch, tmp_path, users)
+        requests, inflight = [], {"now": 0, "peak": 0}
+        client = _fit_api(
+            requests, fail_tokens={"token-user3"}, delay=0.2, inflight=inflight
+        )
+        progress = []
+
+        stats = await HealthSyncOrchestrator(
+            session_factory=factory, concurrency=3, backfill_days=2, client=client
+        ).run(progress=progress.append)
+
+        assert 1 < inflight["peak"] <= 3
+        assert len(requests) == 10
+        assert (stats["connections"], stats["synced"], stats["failed"]) == (10, 9, 1)
+        assert stats["connections_per_s"] > 0
+        assert progress[-1] == 100
+        # A failed connection keeps its mark and is retried next run
+        assert _cursor(factory, "user3") is None
+        assert _cursor(factory, "user4") is not None
@@ -0,0 +1,174 @@
+"""
+Unit Tests for the unified history timeline (HistoryService).
+
+Tests: keyset pagination across sources, SQL-side filters, cursor handling.
+"""
+
+import sys
+import os
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+
+
+@pytest.fixture
+def db(sqlite_sessionmaker):
+    from models.models import (
+        FinancialAccount,
+        FinancialTransaction,
+        HealthDailySummary,
+        User,
+        VivLog,
+    )
+
+    return sqlite_sessionmaker(
+        User,
+        FinancialAccount,
+        FinancialTransaction,
+        VivLog,
+        HealthDailySummary,
+    )()
+
+
+# ============================================================================
+# History Timeline Tests
+# ============================================================================
+
+
+class TestHistoryService:
+    """Tests for HistoryService.get_timeline against in-memory SQLite."""
+
+    def _seed(self, db, days=10):
+        from datetime import date, datetime, timedelta
+        from models.models import (
+            FinancialTransaction,
+            HealthDailySummary,
+            User,
+            VivLog,
+        )
+
+        db.add(User(id="u1", email="alice@test.com", hashed_password="pw"))
+        db.add(User(id="u2", email="bob@test.com", hashed_password="pw"))
+        base = datetime(2026, 3, 1)
+        for d in range(days):
+            noon = base + timedelta(days=d, hours=12)
+            # Two transactions and a Viv log share the health summary's noon slot
+            for n in range(2):
+                db.add(
+                    FinancialTransaction(
+                        id=f"t{d:02d}{n}",
+                        user_id="u1",
+                        amount=-10.0 * (n + 1),
+                        transaction_date=noon,
+                        merchant_name="Blue Bottle Coffee" if n == 0 else "Metro",
+                        category_primary="Food & Drink" if n == 0 else "Transport",
+                    )
+                )
+            db.add(
+                VivLog(
+                    id=f"v{d:02d}",
+                    user_id="u1",
+                    timestamp=noon,
+                    user_intent="order_sushi",
+                    decision_logic="Approved because budget allows",
+                )
+            )
+            db.add(
+                HealthDailySummary(
+                    id=f"h{d:02d}",
+                    user_id="u1",
+                    date=date(2026, 3, 1) + timedelta(days=d),
+                    sleep_quality_score=80,
+                    steps_count=8000 + d,
+                )
+            )
+        db.add(
+            FinancialTransaction(
+                id="other", user_id="u2", amount=-5.0, transaction_date=base
+            )
+        )
+        db.commit()
+
+    def _walk(self, service, limit, **filters):
+        pages, cursor = [], None
+        while True:
+            page = service.get_timeline("u1", limit=limit, cursor=cursor, **filters)
+            pages.append(page)
+            if not page.has_more:
+                return pages
+            cursor = page.next_cursor
+
+    def test_pages_cover_timeline_in_order(self, db):
+        from services.history_service import HistoryService
+
+        self._seed(db)
+        pages = self._walk(HistoryService(db), limit=7)
+
+        keys = [e.key for p in pages for e in p.entries]
+        assert len(keys) == 40
+        assert len(set(keys)) == 40
+        assert keys == sorted(keys, reverse=True)
+        assert all(len(p.entries) == 7 for p in pages[:-1])
+        assert pages[-1].next_cursor is None
+        assert "other" not in {e.id for p in pages for e in p.entries}
+
+    def test_deep_page_query_count_is_constant(self, sqlite_engine, db):
+        from sqlalchemy import event
+        from services.history_service import HistoryService
+
+        self._seed(db, days=30)
+        service = HistoryService(db)
+        pages = self._walk(service, limit=5)
+
+        statements = []
+        event.listen(
+            sqlite_engine, "before_cursor_execute", lambda *a: statements.append(a[2])
+        )
+        deep = service.get_timeline("u1", limit=5, cursor=pages[-3].next_cursor)
+        assert len(deep.entries) == 5
+        assert len(statements) == 3  # one ordered, limited query per source
+        assert all("LIMIT" in s for s in statements)
+
+    def test_type_and_date_filters(self, db):
+        from datetime import datetime
+        from services.history_service import HistoryService
+
+        self._seed(db)
+        service = HistoryService(db)
+
+        page = service.get_timeline("u1", types=["health"], limit=100)
+        assert {e.type for e in page.entries} == {"health"}
+        assert len(page.entries) == 10
+
+        page = service.get_timeline(
+            "u1",
+            start=datetime(2026, 3, 3),
+            end=datetime(2026, 3, 4, 23, 59),
+            limit=100,
+        )
+        assert len(page.entries) == 8
+        assert {e.timestamp.day for e in page.entries} == {3, 4}
+
+    def test_search_pushed_into_sql(self, db):
+        from services.history_service import HistoryService
+
+        self._seed(db)
+        service = HistoryService(db)
+
+        coffee = self._walk(service, limit=3, search="coffee")
+        entries = [e for p in coffee for e in p.entries]
+        assert len(entries) == 10
+        assert {e.row.merchant_name for e in entries} == {"Blue Bottle Coffee"}
+
+        assert len(service.get_timeline("u1", search="SUSHI", limit=50).entries) == 10
+        assert len(service.get_timeline("u1", search="health", limit=50).entries) == 10
+        steps = service.get_timeline("u1", search="steps: 8003", limit=50).entries
+        assert [e.id for e in steps] == ["h03"]
+        # LIKE wildcards in the query are matched literally
+        assert service.get_timeline("u1", search="step_", limit=50).entries == []
+
+    def test_invalid_cursor_rejected(self, db):
+        from services.history_service import HistoryService, InvalidCursorError
+
+        with pytest.raises(InvalidCursorError):
+            HistoryService(db).get_timeline("u1", cursor="not-a-cursor")
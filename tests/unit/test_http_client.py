@@ -0,0 +1,132 @@
+"""
+Unit Tests for the shared HTTP client registry.
+
+Tests: one client per provider and event loop, retry/backoff on transient
+statuses for idempotent methods only, Retry-After, connection errors,
+closing on shutdown.
+"""
+
+import sys
+import os
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+
+
+def _registry(handler, **policy):
+    from core.http_client import HTTPClientRegistry, ProviderPolicy
+
+    policy.setdefault("backoff_base_s", 0.001)
+    return HTTPClientRegistry(
+        policies={"test": ProviderPolicy(**policy)},
+        transport=httpx.MockTransport(handler),
+    )
+
+
+def _flaky(statuses, calls, headers=None):
+    """Answers with each status in turn, then 200."""
+
+    def handler(request):
+        calls.append(request.method)
+        if len(calls) <= len(statuses):
+            return httpx.Response(statuses[len(calls) - 1], headers=headers or {})
+        return httpx.Response(200, json={"ok": True})
+
+    return handler
+
+
+# ============================================================================
+# HTTP Client Registry Tests
+# ============================================================================
+
+
+class TestHTTPClientRegistry:
+    async def test_one_shared_client_per_provider(self):
+        registry = _registry(lambda request: httpx.Response(200))
+
+        client = registry.get("test")
+        assert registry.get("test") is client
+        assert registry.get("other") is not client
+
+        await registry.aclose()
+        assert client.is_closed
+        assert registry.get("test") is not client  # recreated after shutdown
+
+    async def test_idempotent_request_retries_transient_status(self):
+        calls = []
+        registry = _registry(_flaky([503, 502], calls), retries=2)
+
+        response = await registry.get("test").get("https://provider.test/quote")
+
+        assert response.status_code == 200
+        assert calls == ["GET", "GET", "GET"]
+        stats = registry.stats()["providers"]["test"]
+        assert (stats["requests"], stats["retries"]) == (3, 2)
+
+    async def test_post_is_not_replayed_after_server_error(self):
+        calls = []
+        registry = _registry(_flaky([503], calls), retries=2)
+
+        response = await registry.get("test").post("https://provider.test/book")
+
+        assert response.status_code == 503
+        assert calls == ["POST"]
+
+    async def test_retries_exhausted_and_retry_after(self, monkeypatch):
+        import core.http_client as http_client
+
+        sleeps = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+
+        monkeypatch.setattr(http_client.asyncio, "sleep", fake_sleep)
+        calls = []
+        registry = _registry(
+            _flaky([429, 429, 429], calls, headers={"Retry-After": "30"}),
+            retries=1,
+            backoff_max_s=2.0,
+        )
+
+        response = await registry.get("test").get("https://provider.test/quote")
+
+        assert response.status_code == 429
+        assert len(calls) == 2
+        assert sleeps == [2.0]  # Retry-After honoured up to the cap
+
+    async def test_connection_errors_retry_any_method(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request.method)
+            if len(calls) == 1:
+                raise httpx.ConnectError("connection refused", request=request)
+            return httpx.Response(201)
+
+        registry = _registry(handler, retries=1)
+        response = await registry.get("test").post("https://provider.test/book")
+
+        assert response.status_code == 201
+        assert calls == ["POST", "POST"]
+
+    async def test_stale_connection_errors_retry_idempotent_only(self):
+        for error in (httpx.ReadError, httpx.RemoteProtocolError):
+            calls = []
+
+            def handler(request):
+                calls.append(request.method)
+                if len(calls) == 1:
+                    raise error("connection reset by peer", request=request)
+                return httpx.Response(200)
+
+            registry = _registry(handler, retries=1)
+            response = await registry.get("test").get("https://provider.test/quote")
+            assert response.status_code == 200
+            assert calls == ["GET", "GET"]
+
+            calls.clear()
+            with pytest.raises(error):
+                await registry.get("test").post("https://provider.test/book")
+            assert calls == ["POST"]
@@ -124,6 +124,151 @@ class TestInputProcessor:
         assert proc.process("hi", user_id="u1").location is None
 
 
+# ============================================================================
+# Stage 2: Context Assembly Tests (batched DB load)
+# ============================================================================
+
+
+class TestContextAssembler:
+    """Tests for ContextAssembler._assemble_from_db against in-memory SQLite."""
+
+    @pytest.fixture
+    def db(self, sqlite_sessionmaker):
+        from models.models import (
+            FinancialAccount,
+            FinancialScore,
+            HealthDailySummary,
+            LifeGoal,
+            RecurringBill,
+            User,
+            VivIndex,
+        )
+        from models.models_scores import DBUserScore
+
+        return sqlite_sessionmaker(
+            User,
+            VivIndex,
+            FinancialScore,
+            FinancialAccount,
+            HealthDailySummary,
+            LifeGoal,
+            RecurringBill,
+            DBUserScore,
+        )()
+
+    def _seed(self, db):
+        from datetime import date, datetime, timedelta
+        from models.models import (
+            FinancialAccount,
+            FinancialScore,
+            HealthDailySummary,
+            LifeGoal,
+            RecurringBill,
+            User,
+            VivIndex,
+        )
+
+        now = datetime.utcnow()
+        db.add(User(id="u1", email="alice@test.com", hashed_password="pw"))
+        db.add(
+            VivIndex(user_id="u1", timestamp=now - timedelta(days=1), financial_score=10)
+        )
+        db.add(
+            VivIndex(
+                user_id="u1",
+                timestamp=now,
+                financial_score=70,
+                health_score=60,
+                time_score=55,
+            )
+        )
+        db.add(
+            FinancialScore(
+                user_id="u1",
+                timestamp=now,
+                total_monthly_income=5000,
+                total_monthly_expenses=1500,
+                total_monthly_bills=500,
+            )
+        )
+        for name, balance in (("A", 1200), ("B", 800)):
+            db.add(
+                FinancialAccount(
+                    user_id="u1",
+                    institution_name=name,
+                    account_type="checking",
+                    current_balance=balance,
+                )
+            )
+        db.add(
+            HealthDailySummary(
+                user_id="u1",
+                date=date.today(),
+                sleep_duration_minutes=420,
+                hrv_average=55.0,
+                steps_count=9000,
+            )
+        )
+        db.add(
+            LifeGoal(
+                user_id="u1",
+                title="House",
+                target_amount=50000,
+                saved_amount=5000,
+                target_date=datetime(2030, 1, 1),
+                priority="high",
+                pillar="finance",
+            )
+        )
+        db.add(LifeGoal(user_id="u1", title="Run", target_amount=1, pillar="health"))
+        db.add(
+            RecurringBill(user_id="u1", name="Netflix", amount=15.99, cadence="monthly")
+        )
+        db.commit()
+
+    def test_assembles_full_context(self, db):
+        from services.intelligence.context_assembler import ContextAssembler
+
+        self._seed(db)
+        ctx = ContextAssembler(db)._assemble_from_db("u1")
+
+        assert ctx.user_name == "alice"
+        assert ctx.helm_scores.wealth == 70  # latest VivIndex wins
+        assert ctx.financial.total_balance == 2000
+        assert ctx.financial.monthly_expenses == 2000
+        assert ctx.health.hrv_avg == 55.0
+        assert ctx.health.sleep_hours_avg == 7.0
+        assert {g["title"] for g in ctx.life_goals} == {"House", "Run"}
+        house = next(g for g in ctx.life_goals if g["title"] == "House")
+        assert house["deadline"].startswith("2030-01-01")
+        assert ctx.commitments == [
+            {"name": "Netflix", "amount": 15.99, "cadence": "monthly"}
+        ]
+
+    def test_two_round_trips_per_assembly(self, sqlite_engine, db):
+        from sqlalchemy import event
+        from services.intelligence.context_assembler import ContextAssembler
+
+        self._seed(db)
+        db.expire_all()
+
+        statements = []
+        event.listen(
+            sqlite_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, stmt, *args: statements.append(stmt),
+        )
+        ContextAssembler(db)._assemble_from_db("u1")
+        assert len(statements) == 2
+
+    def test_missing_user_returns_default(self, db):
+        from services.intelligence.context_assembler import ContextAssembler
+
+        ctx = ContextAssembler(db)._assemble_from_db("ghost")
+        assert ctx.user_id == "ghost"
+        assert ctx.life_goals == []
+
+
 # ============================================================================
 # Stage 3: Intent Classification Tests (Deterministic Pass Only)
 # ============================================================================
@@ -267,6 +412,22 @@ class TestIntentTaxonomy:
         assert result[1] == 0.85
         assert result[2] == "regex"
 
+    # --- Priority (single-pass matcher) ---
+    def test_regex_beats_earlier_keyword(self):
+        """A regex anywhere in the text outranks a keyword that appears first."""
+        result = self._match("hello, should i buy a new car or lease one")
+        assert result[2] == "regex"
+        assert result[0] != "greeting"
+
+    def test_taxonomy_order_beats_text_position(self):
+        """Keywords resolve by taxonomy order, not by where they occur."""
+        result = self._match("hey there, what is my balance")
+        assert result[0] == "balance_check"
+
+    def test_keyword_word_boundaries(self):
+        """'this' must not trigger the 'hi' greeting keyword."""
+        assert self._match("this thing") is None
+
 
 class TestIntentClassifier:
     """Tests for the IntentClassifier (deterministic-only mode)."""
@@ -874,6 +1035,389 @@ class TestResponseGenerator:
         assert len(resp.data["places"]) == 1
 
 
+# ============================================================================
+# Stage Scheduler Tests (concurrent stage execution)
+# ============================================================================
+
+
+class TestStageScheduler:
+    """Tests for dependency-aware concurrent stage execution."""
+
+    async def test_independent_stages_overlap(self):
+        import asyncio
+        from services.intelligence.stage_scheduler import StageScheduler
+
+        async def slow(value):
+            await asyncio.sleep(0.05)
+            return value
+
+        scheduler = StageScheduler()
+        scheduler.add("a", lambda: slow("A"))
+        scheduler.add("b", lambda: slow("B"))
+        results = await scheduler.run()
+
+        assert results == {"a": "A", "b": "B"}
+        wall = max(s.end_ms for s in scheduler.spans.values())
+        assert wall < 90  # ran together, not back to back (~100ms)
+        assert scheduler.overlap_ms() > 30
+
+    async def test_dependencies_receive_results(self):
+        from services.intelligence.stage_scheduler import StageScheduler
+
+        async def one():
+            return 1
+
+        async def add(a, b):
+            return a + b
+
+        scheduler = StageScheduler()
+        scheduler.add("a", one)
+        scheduler.add("b", one)
+        scheduler.add("sum", add, depends_on=("a", "b"))
+        results = await scheduler.run()
+
+        assert results["sum"] == 2
+        assert scheduler.spans["sum"].start_ms >= scheduler.spans["a"].end_ms
+
+    def test_unknown_dependency_rejected(self):
+        from services.intelligence.stage_scheduler import StageScheduler
+
+        async def noop():
+            return None
+
+        scheduler = StageScheduler()
+        with pytest.raises(ValueError):
+            scheduler.add("b", noop, depends_on=("a",))
+
+    async def test_failure_cancels_siblings(self):
+        import asyncio
+        from services.intelligence.stage_scheduler import StageScheduler
+
+        finished = []
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        async def slow():
+            await asyncio.sleep(0.5)
+            finished.append(True)
+
+        scheduler = StageScheduler()
+        scheduler.add("fail", fail)
+        scheduler.add("slow", slow)
+        with pytest.raises(RuntimeError):
+            await scheduler.run()
+        assert finished == []
+
+    async def test_pipeline_records_spans(self):
+        """Context assembly and intent classification run concurrently."""
+        from unittest.mock import MagicMock
+        from services.intelligence.cache import PipelineCache
+        from services.intelligence.context_cache import ContextCache
+        from services.intelligence.pipeline import IntelligencePipeline
+
+        pipeline = IntelligencePipeline(
+            db=MagicMock(),
+            llm_api_key="mock",
+            cache=PipelineCache(context_cache=ContextCache()),
+        )
+        result = await pipeline.process("what is my balance", user_id="u1")
+
+        timings = result.trace.timings
+        assert result.trace.execution_success is True
+        assert result.response.template_id == "balance_report"
+        assert {"context", "intent", "synthesis", "template_warmup"} <= set(
+            timings.stage_spans
+        )
+        ctx_start = timings.stage_spans["context"][0]
+        intent_start = timings.stage_spans["intent"][0]
+        ctx_end = timings.stage_spans["context"][1]
+        assert intent_start <= ctx_end and ctx_start <= timings.stage_spans["intent"][1]
+
+    async def test_warmed_template_reused(self):
+        """generate() returns the speculatively rendered template response."""
+        from services.intelligence.response_generator import ResponseGenerator
+        from services.intelligence.schemas import (
+            ActionPlan,
+            ContextFrame,
+            IntentResult,
+            ScoreDeltas,
+        )
+
+        gen = ResponseGenerator(llm_api_key="mock")
+        ctx = ContextFrame(user_id="u1", user_name="Sam")
+        intent = IntentResult(intent="greeting", original_text="hi")
+        scores = ScoreDeltas()
+
+        await gen.warm_template("greeting", scores, ctx, intent)
+        warmed = gen._warmed[1]
+        resp = await gen.generate(
+            ActionPlan(response_template_id="greeting"), scores, ctx, intent
+        )
+        assert resp is warmed
+        assert gen._warmed is None
+
+
+# ============================================================================
+# Trace Sink Tests (Stage 7 background persistence)
+# ============================================================================
+
+
+class TestTraceSink:
+    """Tests for the batched background writer of audit rows."""
+
+    @pytest.fixture
+    def factory(self, sqlite_sessionmaker):
+        from models.intelligence_models import DecisionRecord, PipelineTraceRecord
+
+        return sqlite_sessionmaker(PipelineTraceRecord, DecisionRecord)
+
+    def _row(self, i):
+        return dict(execution_id=f"e{i}", user_id="u1", intent_type="greeting")
+
+    def test_offer_rejected_when_not_running(self, factory):
+        from services.intelligence.trace_sink import TraceSink
+        from models.intelligence_models import DecisionRecord
+
+        sink = TraceSink(session_factory=factory)
+        assert sink.offer(DecisionRecord, self._row(0)) is False
+
+    async def test_batches_and_drains_on_stop(self, factory):
+        from services.intelligence.trace_sink import TraceSink
+        from models.intelligence_models import DecisionRecord
+
+        sink = TraceSink(session_factory=factory, batch_size=200, flush_interval=5)
+        await sink.start()
+        for i in range(450):
+            assert sink.offer(DecisionRecord, self._row(i))
+        await sink.stop()
+
+        stats = sink.stats()
+        assert stats["written"] == 450
+        assert stats["failed"] == 0
+        assert stats["batches"] == 3
+        with factory() as db:
+            assert db.query(DecisionRecord).count() == 450
+
+    async def test_queue_full_applies_backpressure(self, factory):
+        from services.intelligence.trace_sink import TraceSink
+        from models.intelligence_models import DecisionRecord
+
+        sink = TraceSink(session_factory=factory, max_queue=2)
+        await sink.start()
+        accepted = [sink.offer(DecisionRecord, self._row(i)) for i in range(5)]
+        await sink.stop()
+
+        assert accepted.count(False) >= 2
+        assert sink.stats()["rejected_full"] == accepted.count(False)
+
+    async def test_bad_row_does_not_drop_batch(self, factory):
+        from services.intelligence.trace_sink import TraceSink
+        from models.intelligence_models import DecisionRecord
+
+        sink = TraceSink(session_factory=factory)
+        await sink.start()
+        sink.offer(DecisionRecord, self._row(1))
+        sink.offer(DecisionRecord, dict(execution_id="bad", user_id=None))
+        sink.offer(DecisionRecord, self._row(2))
+        await sink.stop()
+
+        assert sink.stats()["written"] == 2
+        assert sink.stats()["failed"] == 1
+
+    async def test_pipeline_persists_off_request_path(self, factory):
+        from unittest.mock import MagicMock
+        from services.intelligence.pipeline import IntelligencePipeline
+        from services.intelligence.trace_sink import TraceSink
+        from models.intelligence_models import DecisionRecord, PipelineTraceRecord
+
+        sink = TraceSink(session_factory=factory)
+        await sink.start()
+        db = MagicMock()
+        pipeline = IntelligencePipeline(db=db, llm_api_key="mock", trace_sink=sink)
+        result = await pipeline.process("hello", user_id="u1")
+        db.commit.assert_not_called()
+        await sink.stop()
+
+        with factory() as session:
+            trace = session.get(PipelineTraceRecord, result.trace.execution_id)
+            assert trace is not None
+            assert session.query(DecisionRecord).count() == 1
+
+
+# ============================================================================
+# Response Cache Tests (Tier 0–2 Stage 5/6 reuse)
+# ============================================================================
+
+
+class TestResponseCache:
+    """Tests for the semantic response cache."""
+
+    def _make_pipeline(self):
+        from unittest.mock import MagicMock
+        from services.intelligence.cache import PipelineCache
+        from services.intelligence.context_cache import ContextCache
+        from services.intelligence.pipeline import IntelligencePipeline
+
+        cache = PipelineCache(context_cache=ContextCache())
+        return IntelligencePipeline(db=MagicMock(), llm_api_key="mock", cache=cache)
+
+    def _intent(self, **entities):
+        from services.intelligence.schemas import IntentResult
+
+        return IntentResult(intent="balance_check", confidence=0.95, entities=entities)
+
+    async def test_repeat_question_skips_stage_5_and_6(self):
+        pipeline = self._make_pipeline()
+
+        first = await pipeline.process("what is my balance", user_id="u1")
+        second = await pipeline.process("What is my balance?", user_id="u1")
+
+        assert first.trace.response_cache_hit is False
+        assert second.trace.response_cache_hit is True
+        assert second.trace.response_cache_hit_rate == 0.5
+        assert second.response.text == first.response.text
+        assert "synthesis" not in second.trace.timings.stage_spans
+        assert second.trace.action_plan["plan_id"] != first.trace.action_plan["plan_id"]
+
+    async def test_invalidation_event_forces_recompute(self):
+        from services.intelligence.cache import InvalidationEvent
+
+        pipeline = self._make_pipeline()
+        await pipeline.process("what is my balance", user_id="u1")
+        pipeline.cache.invalidate_on_event("u1", InvalidationEvent.TRANSACTION_LOGGED)
+
+        result = await pipeline.process("what is my balance", user_id="u1")
+        assert result.trace.response_cache_hit is False
+
+    async def test_different_question_same_intent_misses(self):
+        pipeline = self._make_pipeline()
+
+        first = await pipeline.process("zzqx blorp", user_id="u1")
+        second = await pipeline.process(
+            "tell me about quantum physics please", user_id="u1"
+        )
+
+        intents = [r.trace.intent_result["intent"] for r in (first, second)]
+        assert intents == ["general_conversation"] * 2
+        assert second.trace.response_cache_hit is False
+
+    def test_message_text_normalized_in_key(self):
+        from services.intelligence.cache import PipelineCache
+        from services.intelligence.context_cache import ContextCache
+        from services.intelligence.response_cache import ResponseCache
+
+        rc = ResponseCache(PipelineCache(context_cache=ContextCache()))
+        k1, k2, k3 = (
+            rc.key_for("u1", self._intent().model_copy(update={"original_text": t}), None)
+            for t in ("Hi,  there!", "hi there", "hi where")
+        )
+        assert k1 == k2
+        assert k1 != k3
+
+    def test_entities_normalized_in_key(self):
+        from services.intelligence.cache import PipelineCache
+        from services.intelligence.context_cache import ContextCache
+        from services.intelligence.response_cache import ResponseCache
+
+        rc = ResponseCache(PipelineCache(context_cache=ContextCache()))
+        k1 = rc.key_for("u1", self._intent(category="Dining  Out", period="month"), "t")
+        k2 = rc.key_for("u1", self._intent(period="month", category="dining out"), "t")
+        k3 = rc.key_for("u2", self._intent(category="dining out", period="month"), "t")
+        assert k1 == k2
+        assert k1 != k3
+
+    def test_side_effect_plans_not_cached(self):
+        from services.intelligence.cache import PipelineCache
+        from services.intelligence.context_cache import ContextCache
+        from services.intelligence.response_cache import ResponseCache
+        from services.intelligence.schemas import (
+            ActionPlan,
+            ActionStep,
+            ActionType,
+            ResponseEnvelope,
+        )
+
+        rc = ResponseCache(PipelineCache(context_cache=ContextCache()))
+        plan = ActionPlan(steps=[ActionStep(action_type=ActionType.EXECUTE_FINANCIAL)])
+        assert rc.put("k", "u1", plan, ResponseEnvelope(text="paid")) is False
+        assert rc.get("k") is None
+
+    def test_tier_3_not_eligible(self):
+        from services.intelligence.response_cache import ResponseCache
+
+        assert ResponseCache.eligible(2) is True
+        assert ResponseCache.eligible(3) is False
+
+
+# ============================================================================
+# Streaming Tests
+# ============================================================================
+
+
+class TestPipelineStreaming:
+    """Tests for IntelligencePipeline.process_stream() and token streaming."""
+
+    def _make_pipeline(self, responder=None):
+        from unittest.mock import MagicMock
+        from services.intelligence.cache import PipelineCache
+        from services.intelligence.context_cache import ContextCache
+        from services.intelligence.llm_gateway import FakeBackend, LLMGateway
+        from services.intelligence.pipeline import IntelligencePipeline
+
+        pipeline = IntelligencePipeline(
+            db=MagicMock(),
+            llm_api_key="test-key",
+            cache=PipelineCache(context_cache=ContextCache()),
+        )
+        backend = FakeBackend(responder=responder or (lambda p: "alpha beta gamma"))
+        pipeline.response_generator.llm_client = LLMGateway().client(backend, tier=2)
+        return pipeline
+
+    async def test_template_response_streams_early_text(self):
+        pipeline = self._make_pipeline()
+        events = [e async for e in pipeline.process_stream("what is my balance", "u1")]
+        names = [e.event for e in events]
+
+        assert names[-1] == "final"
+        assert names.count("final") == 1
+        assert names[0] == "stage" and events[0].data["stage"] == "input_processing"
+        text = next(e for e in events if e.event == "text")
+        final = events[-1].data
+        assert text.data["text"] == final["response"]["text"]
+        timings = final["trace"]["timings"]
+        assert 0 < timings["time_to_first_byte_ms"] <= timings["total_ms"]
+
+    async def test_llm_tokens_stream_before_final(self):
+        pipeline = self._make_pipeline()
+        events = [e async for e in pipeline.process_stream("zzqx blorp", "u1")]
+        tokens = [e.data["text"] for e in events if e.event == "token"]
+
+        assert tokens == ["alpha ", "beta ", "gamma"]
+        assert events[-1].data["response"]["text"] == "alpha beta gamma"
+        assert "text" not in [e.event for e in events]
+        first_token = next(e for e in events if e.event == "token")
+        ttfb = events[-1].data["trace"]["timings"]["time_to_first_byte_ms"]
+        assert ttfb <= first_token.elapsed_ms + 0.01  # elapsed_ms is rounded
+
+    async def test_process_records_ttfb_as_total(self):
+        pipeline = self._make_pipeline()
+        result = await pipeline.process("zzqx blorp", user_id="u1")
+        timings = result.trace.timings
+        assert result.response.text == "alpha beta gamma"
+        assert 0 < timings.time_to_first_byte_ms <= timings.total_ms
+
+    async def test_closing_stream_cancels_run(self):
+        import asyncio
+
+        pipeline = self._make_pipeline()
+        stream = pipeline.process_stream("zzqx blorp", "u1")
+        first = await stream.__anext__()
+        assert first.event == "stage"
+        await stream.aclose()
+        assert not [t for t in asyncio.all_tasks() if t.get_coro().__name__ == "run"]
+
+
 # ============================================================================
 # Schema Tests
 # ============================================================================
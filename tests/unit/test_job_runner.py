@@ -0,0 +1,226 @@
+"""
+Unit Tests for the background job runner.
+
+Tests: enqueue → claim → complete, retries with backoff, permanent failure
+and exhausted attempts, unreadable statements, cancellation (queued and
+running), non-overlapping claims between runners, stale lease recovery,
+tracked-only jobs.
+"""
+
+import sys
+import os
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+
+
+@pytest.fixture
+def factory(sqlite_sessionmaker):
+    from models.job import BackgroundJob
+
+    return sqlite_sessionmaker(BackgroundJob)
+
+
+def _runner(factory, handlers, **kwargs):
+    from services.job_runner import JobRunner, JobSpec
+
+    specs = {name: JobSpec(job_type=name, fn=fn) for name, fn in handlers.items()}
+    return JobRunner(session_factory=factory, handlers=specs, **kwargs)
+
+
+def _job(factory, job_id):
+    from models.job import BackgroundJob
+
+    with factory() as db:
+        return db.get(BackgroundJob, job_id)
+
+
+def _make_due(factory, job_id):
+    from models.job import BackgroundJob
+
+    with factory() as db:
+        db.get(BackgroundJob, job_id).run_after = datetime.now(timezone.utc)
+        db.commit()
+
+
+# ============================================================================
+# Job Runner Tests
+# ============================================================================
+
+
+class TestJobRunner:
+    async def test_enqueued_job_completes(self, factory):
+        from models.job import JobStatus
+        from services.job_manager import JobManager
+
+        async def double(ctx):
+            ctx.progress(50)
+            return {"value": ctx.payload["n"] * 2, "user": ctx.user_id}
+
+        with factory() as db:
+            job_id = JobManager(db).enqueue("double", payload={"n": 21})
+
+        assert await _runner(factory, {"double": double}).run_pending() == 1
+        job = _job(factory, job_id)
+        assert job.status == JobStatus.COMPLETED
+        assert job.progress == 100
+        assert job.result_json == {"value": 42, "user": None}
+        assert job.payload_json is None  # input dropped once finished
+        assert job.attempts == 1 and job.locked_by is None
+
+    async def test_retry_with_backoff_then_success(self, factory):
+        from models.job import JobStatus
+        from services.job_manager import JobManager
+        from services.job_runner import BACKOFF_BASE_S, JobError
+
+        calls = []
+
+        def flaky(ctx):  # sync handlers run in a thread
+            calls.append(ctx.attempt)
+            if ctx.attempt == 1:
+                raise JobError("upstream 503")
+            return {"ok": True}
+
+        with factory() as db:
+            job_id = JobManager(db).enqueue("flaky", max_attempts=3)
+        runner = _runner(factory, {"flaky": flaky})
+
+        await runner.run_pending()
+        job = _job(factory, job_id)
+        assert job.status == JobStatus.PENDING
+        assert job.error_message == "upstream 503"
+        # SQLite hands timestamps back without their UTC offset
+        run_after = job.run_after.replace(tzinfo=timezone.utc)
+        delay = (run_after - datetime.now(timezone.utc)).total_seconds()
+        assert BACKOFF_BASE_S * 0.5 - 1 <= delay <= BACKOFF_BASE_S
+        assert await runner.run_pending() == 0  # not due yet
+
+        _make_due(factory, job_id)
+        await runner.run_pending()
+        assert calls == [1, 2]
+        assert _job(factory, job_id).status == JobStatus.COMPLETED
+
+    async def test_permanent_error_and_exhausted_attempts_fail(self, factory):
+        from models.job import JobStatus
+        from services.job_manager import JobManager
+        from services.job_runner import PermanentJobError
+
+        def bad_payload(ctx):
+            raise PermanentJobError("no such user")
+
+        def always_down(ctx):
+            raise RuntimeError("connection refused")
+
+        with factory() as db:
+            permanent = JobManager(db).enqueue("bad", max_attempts=5)
+            exhausted = JobManager(db).enqueue("down", max_attempts=2)
+        runner = _runner(factory, {"bad": bad_payload, "down": always_down})
+
+        await runner.run_pending()
+        _make_due(factory, exhausted)
+        await runner.run_pending()
+
+        assert _job(factory, permanent).status == JobStatus.FAILED
+        assert _job(factory, permanent).attempts == 1
+        job = _job(factory, exhausted)
+        assert (job.status, job.attempts) == (JobStatus.FAILED, 2)
+        assert job.error_message == "connection refused"
+        assert runner.stats()["failed"] == 2
+
+    async def test_unreadable_statement_fails_without_retry(self, factory):
+        import base64
+        from models.job import JobStatus
+        from services.job_handlers import parse_statement
+        from services.job_manager import JobManager
+
+        content = base64.b64encode(b"not a pdf").decode()
+        with factory() as db:
+            job_id = JobManager(db).enqueue(
+                "statement_parse",
+                payload={"filename": "broken.pdf", "content": content},
+                max_attempts=3,
+            )
+        runner = _runner(factory, {"statement_parse": parse_statement})
+
+        await runner.run_pending()
+        job = _job(factory, job_id)
+        assert (job.status, job.attempts) == (JobStatus.FAILED, 1)
+        assert job.error_message.startswith("Not a readable PDF")
+
+    async def test_cancel_queued_and_running_jobs(self, factory):
+        from models.job import JobStatus
+        from services.job_manager import JobManager
+
+        started = asyncio.Event()
+
+        async def slow(ctx):
+            started.set()
+            await asyncio.sleep(30)
+
+        with factory() as db:
+            queued = JobManager(db).enqueue("slow")
+            running = JobManager(db).enqueue("slow")
+            assert JobManager(db).request_cancel(queued) == "cancelled"
+
+        runner = _runner(factory, {"slow": slow}, heartbeat_interval=0.05)
+        execution = asyncio.create_task(runner.run_pending())
+        await asyncio.wait_for(started.wait(), 5)
+        with factory() as db:
+            assert JobManager(db).request_cancel(running) == "processing"
+        assert await asyncio.wait_for(execution, 5) == 1
+
+        assert _job(factory, queued).status == JobStatus.CANCELLED
+        assert _job(factory, running).status == JobStatus.CANCELLED
+        assert runner.stats()["cancelled"] == 1
+
+    def test_runners_never_claim_the_same_job(self, factory):
+        from services.job_manager import JobManager
+
+        with factory() as db:
+            ids = {JobManager(db).enqueue("noop") for _ in range(5)}
+
+        handlers = {"noop": lambda ctx: None}
+        first = _runner(factory, handlers, worker_id="a").claim(3)
+        second = _runner(factory, handlers, worker_id="b").claim(10)
+
+        claimed = [job["id"] for job in first + second]
+        assert len(first) == 3 and len(second) == 2
+        assert sorted(claimed) == sorted(ids)
+        assert _job(factory, first[0]["id"]).locked_by == "a"
+
+    def test_stale_lease_is_requeued(self, factory):
+        from models.job import JobStatus
+        from services.job_manager import JobManager
+
+        with factory() as db:
+            job_id = JobManager(db).enqueue("noop", max_attempts=2)
+        handlers = {"noop": lambda ctx: None}
+        crashed = _runner(factory, handlers, worker_id="crashed", stale_after=60)
+        assert len(crashed.claim(1)) == 1
+
+        sweeper = _runner(factory, handlers, worker_id="sweeper", stale_after=60)
+        assert sweeper.requeue_stale() == 0  # heartbeat is fresh
+        with factory() as db:
+            from models.job import BackgroundJob
+
+            job = db.get(BackgroundJob, job_id)
+            job.heartbeat_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+            db.commit()
+
+        assert sweeper.requeue_stale() == 1
+        assert _job(factory, job_id).status == JobStatus.PENDING
+        assert sweeper.claim(1)[0]["attempts"] == 2
+
+    def test_tracked_jobs_and_duplicates_are_not_queued(self, factory):
+        from services.job_manager import JobManager
+
+        with factory() as db:
+            jobs = JobManager(db)
+            jobs.create_job("noop")  # tracked inline, never claimed
+            first = jobs.enqueue("noop", dedupe_key="nightly")
+            assert jobs.enqueue("noop", dedupe_key="nightly") == first
+
+        claimed = _runner(factory, {"noop": lambda ctx: None}).claim(10)
+        assert [job["id"] for job in claimed] == [first]
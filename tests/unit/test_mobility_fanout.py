@@ -0,0 +1,170 @@
+"""
+Unit Tests for deadline-aware price comparison in MobilityAggregator.
+
+Tests: partial results at the latency budget with stragglers filling the
+quote cache, quote cache keys snapping nearby points, hedged requests for
+slow providers, circuit breaker open / half-open / close, and histograms.
+"""
+
+import sys
+import os
+import asyncio
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+
+MALL = (25.19720, 55.27440)
+MALL_DOOR = (25.19725, 55.27445)  # a few metres away, same quote cell
+AIRPORT = (25.25320, 55.36570)
+
+
+class _Provider:
+    """Quotes one ride type; delays[i] / failures[i] shape the i-th call."""
+
+    def __init__(self, price, delays=(), fail=False):
+        self.price = price
+        self.delays = list(delays)
+        self.fail = fail
+        self.calls = 0
+
+    async def get_price_estimates(self, *args, **kwargs):
+        delay = self.delays[self.calls] if self.calls < len(self.delays) else 0
+        self.calls += 1
+        await asyncio.sleep(delay)
+        if self.fail:
+            raise ConnectionError("provider down")
+        return {
+            "success": True,
+            "prices": [
+                {
+                    "display_name": "X",
+                    "low_estimate": self.price,
+                    "high_estimate": self.price,
+                    "currency": kwargs.get("currency"),
+                }
+            ],
+        }
+
+
+def _aggregator(providers, budget_ms=200, guard=None, cache=None):
+    from services.mobility.mobility_aggregator import MobilityAggregator
+    from services.mobility.provider_guard import ProviderGuard
+    from services.productivity.geo_cache import GeoCache
+
+    aggregator = MobilityAggregator(
+        guard=guard or ProviderGuard(),
+        quote_cache=cache or GeoCache(store=None, max_entries=100),
+        budget_ms=budget_ms,
+    )
+    aggregator.providers = providers
+    return aggregator
+
+
+# ============================================================================
+# Fan-out Tests
+# ============================================================================
+
+
+class TestDeadlineFanOut:
+    async def test_partial_results_then_straggler_fills_cache(self):
+        from services.mobility import mobility_aggregator
+
+        fast, slow = _Provider(30.0), _Provider(20.0, delays=[0.5])
+        aggregator = _aggregator({"fast": fast, "slow": slow}, budget_ms=100)
+
+        first = await aggregator.compare_prices("u1", *MALL, *AIRPORT)
+        assert first["partial"] and first["pending_providers"] == ["slow"]
+        assert first["cheapest"]["provider"] == "fast"
+        assert first["provider_query_count"] == 2
+        assert first["successful_provider_count"] == 1
+
+        await asyncio.gather(*list(mobility_aggregator._late_quotes))
+        second = await aggregator.compare_prices("u1", *MALL_DOOR, *AIRPORT)
+        assert not second["partial"]
+        assert sorted(second["cached_providers"]) == ["fast", "slow"]
+        assert second["cheapest"]["provider"] == "slow"
+        assert (fast.calls, slow.calls) == (1, 1)
+        assert aggregator.guard.stats()["slow"]["late"] == 1
+
+    async def test_quote_cache_is_per_currency_and_direction(self):
+        provider = _Provider(30.0)
+        aggregator = _aggregator({"uber": provider})
+
+        await aggregator.compare_prices("u1", *MALL, *AIRPORT)
+        await aggregator.compare_prices("u2", *MALL, *AIRPORT)
+        await aggregator.compare_prices("u1", *MALL, *AIRPORT, currency="USD")
+        await aggregator.compare_prices("u1", *AIRPORT, *MALL)
+        assert provider.calls == 3
+
+    async def test_concurrent_comparisons_share_one_quote(self):
+        provider = _Provider(30.0, delays=[0.05])
+        aggregator = _aggregator({"uber": provider})
+
+        results = await asyncio.gather(
+            *[aggregator.compare_prices(f"u{i}", *MALL, *AIRPORT) for i in range(5)]
+        )
+        assert provider.calls == 1
+        assert all(r["cheapest"]["low_estimate"] == 30.0 for r in results)
+
+    async def test_slow_call_is_hedged(self):
+        from services.mobility.mobility_aggregator import HEDGE_MIN_SAMPLES
+        from services.mobility.provider_guard import ProviderGuard
+
+        guard = ProviderGuard()
+        for _ in range(HEDGE_MIN_SAMPLES):
+            guard.record("uber", 40.0, ok=True)  # p95 bucket: 50 ms
+        provider = _Provider(30.0, delays=[1.0, 0.0])
+        aggregator = _aggregator({"uber": provider}, budget_ms=500, guard=guard)
+
+        result = await aggregator.compare_prices("u1", *MALL, *AIRPORT)
+        assert not result["partial"]
+        assert result["cheapest"]["low_estimate"] == 30.0
+        assert provider.calls == 2
+        assert guard.stats()["uber"]["hedges"] == 1
+
+
+# ============================================================================
+# Circuit Breaker Tests
+# ============================================================================
+
+
+class TestCircuitBreaker:
+    async def test_failing_provider_is_skipped_until_trial_succeeds(self):
+        from services.mobility.provider_guard import HALF_OPEN, OPEN, ProviderGuard
+
+        guard = ProviderGuard(failure_threshold=2, open_s=60)
+        down, up = _Provider(99.0, fail=True), _Provider(30.0)
+        aggregator = _aggregator({"down": down, "up": up}, guard=guard)
+
+        for _ in range(2):
+            result = await aggregator.compare_prices("u1", *MALL, *AIRPORT)
+            assert result["open_circuits"] == []
+        assert guard.state("down") == OPEN
+
+        result = await aggregator.compare_prices("u1", *MALL, *AIRPORT)
+        assert result["open_circuits"] == ["down"]
+        assert result["cheapest"]["provider"] == "up"
+        assert down.calls == 2
+
+        # Cooldown over: one trial call, which fails and re-opens
+        guard._breakers["down"].opened_at -= 61
+        await aggregator.compare_prices("u1", *MALL, *AIRPORT)
+        assert down.calls == 3 and guard.state("down") == OPEN
+
+        guard._breakers["down"].opened_at -= 61
+        assert guard.allow("down") and guard.state("down") == HALF_OPEN
+        assert not guard.allow("down")  # trial already in flight
+        guard.record("down", 30.0, ok=True)
+        assert guard.state("down") == "closed"
+
+    def test_histogram_quantiles(self):
+        from services.mobility.provider_guard import LatencyHistogram
+
+        histogram = LatencyHistogram()
+        assert histogram.quantile(0.5) is None
+        for ms in [10] * 90 + [700] * 9 + [20000]:
+            histogram.observe(ms)
+        snapshot = histogram.snapshot()
+        assert (snapshot["p50_ms"], snapshot["p95_ms"]) == (50.0, 1000.0)
+        assert snapshot["p99_ms"] == 1000.0
+        assert snapshot["buckets"]["overflow"] == 1
+        assert snapshot["count"] == 100
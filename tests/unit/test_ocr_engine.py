@@ -0,0 +1,92 @@
+"""
+Unit Tests for the parallel OCR engine.
+
+Tests: only image pages without a text layer are OCR'd, rasterization
+DPI, in-order streaming (sync and async), process pool reuse.
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+
+TEXT_PAGE = "Statement of account\n" + "\n".join(
+    f"2026-01-{d:02d} Coffee -4.50" for d in range(1, 11)
+)
+
+
+def fake_ocr(image):
+    """Stands in for tesseract in the worker processes (must be picklable)."""
+    return f"OCR {image.width}x{image.height}"
+
+
+def _mixed_pdf():
+    """Pages: text layer, scanned image, scanned image, short text page."""
+    import fitz
+
+    doc = fitz.open()
+    doc.new_page().insert_text((36, 36), TEXT_PAGE)
+
+    scan_source = fitz.open()
+    scan_source.new_page().insert_text((36, 36), "Scanned line 1.00")
+    pix = scan_source[0].get_pixmap(dpi=50)
+    for _ in range(2):
+        doc.new_page().insert_image(doc[-1].rect, pixmap=pix)
+
+    doc.new_page().insert_text((36, 36), "End")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+# ============================================================================
+# OCR Engine Tests
+# ============================================================================
+
+
+class TestOCREngine:
+    @classmethod
+    def teardown_class(cls):
+        from services.ocr_engine import shutdown_pools
+
+        shutdown_pools()
+
+    def test_only_scanned_pages_are_ocred(self):
+        from services.ocr_engine import OCREngine, text_layer
+
+        pdf = _mixed_pdf()
+        texts, scanned = text_layer(pdf)
+        assert scanned == [1, 2]
+
+        pages = OCREngine(dpi=72, workers=2, ocr=fake_ocr).page_texts(pdf)
+        assert pages[0].startswith("Statement of account")
+        assert pages[1:3] == ["OCR 595x842", "OCR 595x842"]
+        assert pages[3].strip() == "End"
+
+    def test_dpi_sets_raster_size(self):
+        from services.ocr_engine import OCREngine
+
+        pages = OCREngine(dpi=144, workers=2, ocr=fake_ocr).page_texts(_mixed_pdf())
+        assert pages[1] == "OCR 1190x1684"
+
+    async def test_async_stream_in_page_order(self):
+        from services.ocr_engine import OCREngine, get_pool
+
+        engine = OCREngine(dpi=72, workers=2, ocr=fake_ocr)
+        streamed = [item async for item in engine.astream_pages(_mixed_pdf())]
+        assert [i for i, _ in streamed] == [0, 1, 2, 3]
+        assert streamed[2][1] == "OCR 595x842"
+        assert get_pool(2) is get_pool(2)
+
+    def test_text_only_pdf_never_starts_a_pool(self, monkeypatch):
+        import fitz
+        import services.ocr_engine as ocr_engine
+
+        def no_pool(workers):
+            raise AssertionError("OCR pool used for a text-layer PDF")
+
+        monkeypatch.setattr(ocr_engine, "get_pool", no_pool)
+        doc = fitz.open()
+        doc.new_page().insert_text((36, 36), TEXT_PAGE)
+        pages = ocr_engine.OCREngine(ocr=fake_ocr).page_texts(doc.tobytes())
+        assert pages[0].startswith("Statement of account")
@@ -1,7 +1,7 @@
 """
 Phase 2 Unit Tests for HELM Intelligence Pipeline.
 
-Tests: Tier Router, Pipeline Cache, Cost Tracker, Tradeoff Validator,
+Tests: Tier Router, LLM Gateway, Pipeline Cache, Cost Tracker, Tradeoff Validator,
        Golden Scoring Cases, new scoring policies, enriched templates,
        and DecisionRecord schema.
 """
@@ -79,6 +79,142 @@ class TestTierRouter:
         assert config.max_input_tokens == 800
         assert config.allow_llm is True
 
+    def test_get_client_binds_tier(self):
+        from services.intelligence.llm_gateway import FakeBackend, LLMGateway
+        from services.intelligence.tier_router import TierRouter
+        backend = FakeBackend()
+        router = TierRouter(
+            light_model=backend, api_key="test-key", gateway=LLMGateway()
+        )
+        assert router.get_client(0) is None
+        client = router.get_client(3)
+        assert client.tier == 3
+        assert client.backend is backend
+        assert TierRouter(light_model=backend, api_key="mock").get_client(1) is None
+
+
+# ============================================================================
+# LLM Gateway Tests
+# ============================================================================
+
+class TestLLMGateway:
+    """Tests for LLMGateway (concurrency limits, retries, cancellation, streaming)."""
+
+    def _make_gateway(self, **kwargs):
+        from services.intelligence.llm_gateway import LLMGateway
+        kwargs.setdefault("backoff_base_s", 0.001)
+        return LLMGateway(**kwargs)
+
+    async def test_generate_is_deterministic(self):
+        from services.intelligence.llm_gateway import FakeBackend
+        client = self._make_gateway().client(FakeBackend(), tier=1)
+        first = await client.generate("hello")
+        second = await client.generate("hello")
+        assert first.text == second.text
+        assert first.text != (await client.generate("goodbye")).text
+
+    async def test_concurrency_capped_per_tier_and_globally(self):
+        import asyncio
+        from services.intelligence.llm_gateway import FakeBackend
+        gateway = self._make_gateway(max_concurrency=5, tier_limits={1: 2, 3: 4})
+        backend = FakeBackend(latency_s=0.01)
+        light = gateway.client(backend, tier=1)
+        heavy = gateway.client(backend, tier=3)
+
+        await asyncio.gather(*(light.generate(f"q{i}") for i in range(10)))
+        assert gateway.stats()["peak_in_flight"] == 2
+
+        await asyncio.gather(
+            *(light.generate(f"a{i}") for i in range(10)),
+            *(heavy.generate(f"b{i}") for i in range(10)),
+        )
+        assert gateway.stats()["peak_in_flight"] == 5
+        assert gateway.stats()["in_flight"] == 0
+
+    async def test_rate_limit_retried_with_backoff(self):
+        from services.intelligence.llm_gateway import FakeBackend
+        gateway = self._make_gateway(max_retries=3)
+        client = gateway.client(FakeBackend(rate_limit_first=2), tier=1)
+        response = await client.generate("hello")
+        assert response.attempts == 3
+        assert gateway.stats()["rate_limited"] == 2
+
+    async def test_rate_limit_gives_up_after_max_retries(self):
+        from services.intelligence.llm_gateway import FakeBackend, RateLimitError
+        gateway = self._make_gateway(max_retries=1)
+        client = gateway.client(FakeBackend(rate_limit_first=5), tier=1)
+        with pytest.raises(RateLimitError):
+            await client.generate("hello")
+        assert gateway.stats()["errors"] == 1
+
+    async def test_timeout_cancels_call_and_frees_slot(self):
+        import asyncio
+        from services.intelligence.llm_gateway import FakeBackend
+        gateway = self._make_gateway(tier_limits={1: 1})
+        slow = gateway.client(FakeBackend(latency_s=5), tier=1)
+        with pytest.raises(asyncio.TimeoutError):
+            await slow.generate("hello", timeout=0.01)
+        assert gateway.stats()["timeouts"] == 1
+        assert gateway.stats()["in_flight"] == 0
+        # The single tier-1 slot was released
+        fast = gateway.client(FakeBackend(), tier=1)
+        assert (await asyncio.wait_for(fast.generate("hi"), 1)).text
+
+    async def test_caller_cancellation_propagates(self):
+        import asyncio
+        from services.intelligence.llm_gateway import FakeBackend
+        gateway = self._make_gateway()
+        client = gateway.client(FakeBackend(latency_s=5), tier=1)
+        task = asyncio.create_task(client.generate("hello"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert gateway.stats()["cancelled"] == 1
+        assert gateway.stats()["in_flight"] == 0
+
+    async def test_stream_yields_full_text(self):
+        from services.intelligence.llm_gateway import FakeBackend
+        gateway = self._make_gateway()
+        backend = FakeBackend(responder=lambda p: "one two three", rate_limit_first=1)
+        chunks = [c async for c in gateway.client(backend, tier=2).stream("q")]
+        assert chunks == ["one ", "two ", "three"]
+        assert gateway.stats()["retries"] == 1
+        assert gateway.stats()["in_flight"] == 0
+
+    async def test_stage_uses_gateway_client(self):
+        from services.intelligence.llm_gateway import FakeBackend
+        from services.intelligence.intent_classifier import IntentClassifier
+        from services.intelligence.input_processor import InputProcessor
+        backend = FakeBackend(
+            responder=lambda p: '{"intent": "check_balance", "confidence": 0.9}'
+        )
+        client = self._make_gateway().client(backend, tier=1)
+        classifier = IntentClassifier(llm_api_key="test-key", llm_client=client)
+        envelope = InputProcessor().process("zzqx blorp", user_id="u1")
+        result = await classifier.classify(envelope)
+        assert backend.calls == 1
+        assert result.intent == "check_balance"
+
+    async def test_gemini_usage_metadata_carried_through(self):
+        from types import SimpleNamespace
+        from services.intelligence.llm_gateway import FakeBackend
+
+        usage = SimpleNamespace(prompt_token_count=12, candidates_token_count=7)
+
+        class Model:
+            async def generate_content_async(self, prompt, **kwargs):
+                return SimpleNamespace(text="ok", usage_metadata=usage)
+
+        gateway = self._make_gateway()
+        response = await gateway.client(Model(), tier=1).generate("hello")
+        assert response.text == "ok"
+        assert response.usage_metadata.prompt_token_count == 12
+        assert response.usage_metadata.candidates_token_count == 7
+
+        fake = await gateway.client(FakeBackend(), tier=1).generate("hi")
+        assert fake.usage_metadata is None
+
 
 # ============================================================================
 # Pipeline Cache Tests
@@ -147,6 +283,36 @@ class TestPipelineCache:
         assert stats["backend"] == "memory"
         assert "entries" in stats
 
+    def test_memory_store_is_bounded_lru(self):
+        from services.intelligence.cache import PipelineCache
+        from services.intelligence.schemas import ContextFrame
+        cache = PipelineCache(redis_url=None, max_memory_entries=2)
+        model = self._make_model()
+        cache.set("resp", "a", model, user_id="u1")
+        cache.set("resp", "b", model, user_id="u1")
+        assert cache.get("resp", "a", ContextFrame) is not None  # a is now newest
+        cache.set("resp", "c", model, user_id="u2")
+        assert cache.get("resp", "b", ContextFrame) is None
+        assert cache.get("resp", "a", ContextFrame) is not None
+        stats = cache.stats()
+        assert stats["entries"] == 2 and stats["evictions"] == 1
+        assert cache._tag_store == {
+            "u1:resp": {"helm:resp:a"},
+            "u2:resp": {"helm:resp:c"},
+        }
+
+    def test_expired_entries_are_swept_on_write(self):
+        from services.intelligence import cache as cache_module
+        cache = self._make_cache()
+        model = self._make_model()
+        cache.set("intent", "old", model, ttl=1, user_id="u1")
+        cache._memory_store["helm:intent:old"] = ("{}", 0, "u1:intent")
+        cache._next_sweep = 0
+        cache.set("intent", "new", model)
+        assert list(cache._memory_store) == ["helm:intent:new"]
+        assert cache._tag_store == {}
+        assert cache._next_sweep > cache_module.time.time()
+
     def test_hash_key_deterministic(self):
         from services.intelligence.cache import PipelineCache
         h1 = PipelineCache.hash_key("a", "b", "c")
@@ -160,6 +326,113 @@ class TestPipelineCache:
         assert h1 != h2
 
 
+# ============================================================================
+# Context Cache Tests (shared LRU + TTL, single-flight)
+# ============================================================================
+
+class TestContextCache:
+    """Tests for the process-wide ContextCache."""
+
+    def _make_cache(self, **kwargs):
+        from services.intelligence.context_cache import ContextCache
+        return ContextCache(**kwargs)
+
+    def _make_model(self, user_id="u", name="Test"):
+        from services.intelligence.schemas import ContextFrame
+        return ContextFrame(user_id=user_id, user_name=name)
+
+    def test_hit_and_version_miss(self):
+        cache = self._make_cache()
+        cache.set("u1", self._make_model(), version=3)
+        assert cache.get("u1", 3).user_name == "Test"
+        assert cache.get("u1", 4) is None
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_lru_evicts_by_entry_count(self):
+        cache = self._make_cache(max_entries=2)
+        cache.set("a", self._make_model("a"))
+        cache.set("b", self._make_model("b"))
+        cache.get("a")  # a is now most recently used
+        cache.set("c", self._make_model("c"))
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_evicts_by_bytes(self):
+        one = len(self._make_model("a").model_dump_json())
+        cache = self._make_cache(max_bytes=one * 2)
+        for uid in ("a", "b", "c"):
+            cache.set(uid, self._make_model(uid))
+        stats = cache.stats()
+        assert stats["entries"] == 2
+        assert stats["bytes"] <= one * 2
+        assert cache.get("a") is None
+
+    def test_ttl_expiry(self, monkeypatch):
+        from services.intelligence import context_cache
+        cache = self._make_cache(ttl=10)
+        cache.set("u1", self._make_model())
+        now = time.time()
+        monkeypatch.setattr(context_cache.time, "time", lambda: now + 11)
+        assert cache.get("u1") is None
+        assert cache.stats()["expirations"] == 1
+
+    async def test_single_flight_collapses_concurrent_misses(self):
+        import asyncio
+        cache = self._make_cache()
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return self._make_model(name="Loaded")
+
+        results = await asyncio.gather(
+            *(cache.get_or_load("u1", 0, loader) for _ in range(10))
+        )
+        assert calls == 1
+        assert all(r.user_name == "Loaded" for r in results)
+        assert cache.stats()["coalesced"] == 9
+        assert cache.get("u1", 0) is not None
+
+    async def test_failed_load_propagates_and_is_not_cached(self):
+        import asyncio
+        cache = self._make_cache()
+
+        async def loader():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("db down")
+
+        results = await asyncio.gather(
+            *(cache.get_or_load("u1", 0, loader) for _ in range(3)),
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert cache.get("u1", 0) is None
+        assert cache.stats()["inflight"] == 0
+
+    async def test_pipeline_cache_shares_context_across_instances(self):
+        from services.intelligence.cache import PipelineCache
+        from services.intelligence.schemas import ContextFrame
+        shared = self._make_cache()
+        first = PipelineCache(redis_url=None, context_cache=shared)
+        second = PipelineCache(redis_url=None, context_cache=shared)
+
+        async def loader():
+            return self._make_model(name="Loaded")
+
+        await first.get_or_load_context("u1", ContextFrame, loader)
+        assert second.get("ctx", "u1", ContextFrame).user_name == "Loaded"
+
+        first.invalidate_user("u1")
+        assert second.get("ctx", "u1", ContextFrame) is None
+        assert second.stats()["context"]["loads"] == 1
+
+
 # ============================================================================
 # Cost Tracker Tests
 # ============================================================================
@@ -107,6 +107,139 @@ class TestCacheInvalidation:
         assert key == "helm:intent:some_hash"  # No version suffix
 
 
+# ============================================================================
+# Redis Backend Tests (fakeredis, round trips per operation)
+# ============================================================================
+
+class TestRedisPipelineCache:
+    """PipelineCache on Redis: pipelined reads, tag invalidation, compression."""
+
+    def _make_cache(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        from services.intelligence.cache import PipelineCache
+        from services.intelligence.context_cache import ContextCache
+
+        client = fakeredis.FakeRedis()
+        cache = PipelineCache(redis_client=client, context_cache=ContextCache())
+
+        # Every command / pipeline execute checks out one connection
+        pool = client.connection_pool
+        checkout = pool.get_connection
+        self.round_trips = 0
+
+        def counting_checkout(*args, **kwargs):
+            self.round_trips += 1
+            return checkout(*args, **kwargs)
+
+        pool.get_connection = counting_checkout
+        return cache, client
+
+    def _make_model(self, name="Test", goals=0):
+        from services.intelligence.schemas import ContextFrame
+        return ContextFrame(
+            user_id="user1",
+            user_name=name,
+            life_goals=[{"title": f"goal {i}", "target_amount": i} for i in range(goals)],
+        )
+
+    def _count(self, fn, *args, **kwargs):
+        self.round_trips = 0
+        result = fn(*args, **kwargs)
+        return result, self.round_trips
+
+    def test_backend_reports_redis(self):
+        cache, _ = self._make_cache()
+        assert cache.backend == "redis"
+
+    def test_ctx_read_is_one_round_trip(self):
+        from services.intelligence.schemas import ContextFrame
+        cache, _ = self._make_cache()
+        cache.set("ctx", "user1", self._make_model())
+        cache._context.clear()  # force the Redis path
+
+        result, trips = self._count(cache.get, "ctx", "user1", ContextFrame)
+        assert result.user_name == "Test"
+        assert trips == 1
+
+        # L1 hit still needs the version, nothing more
+        _, trips = self._count(cache.get, "ctx", "user1", ContextFrame)
+        assert trips == 1
+
+    def test_ctx_miss_after_version_bump(self):
+        from services.intelligence.schemas import ContextFrame
+        cache, _ = self._make_cache()
+        cache.set("ctx", "user1", self._make_model())
+        _, trips = self._count(cache.invalidate_user, "user1")
+        assert trips == 1  # INCR + EXPIRE pipelined
+        cache._context.clear()
+        assert cache.get("ctx", "user1", ContextFrame) is None
+
+    async def test_get_or_load_context_round_trips(self):
+        from services.intelligence.schemas import ContextFrame
+        cache, _ = self._make_cache()
+        loads = 0
+
+        async def loader():
+            nonlocal loads
+            loads += 1
+            return self._make_model(name="Loaded")
+
+        self.round_trips = 0
+        await cache.get_or_load_context("user1", ContextFrame, loader)
+        assert self.round_trips == 2  # pipelined read + pipelined write
+
+        cache._context.clear()
+        self.round_trips = 0
+        result = await cache.get_or_load_context("user1", ContextFrame, loader)
+        assert self.round_trips == 1  # served from Redis
+        assert result.user_name == "Loaded"
+        assert loads == 1
+
+    def test_event_invalidation_uses_tags_not_scan(self):
+        from services.intelligence.cache import InvalidationEvent
+        from services.intelligence.schemas import ContextFrame
+        cache, client = self._make_cache()
+        cache.set("intent", "h1", self._make_model(), user_id="user1")
+        cache.set("resp", "h2", self._make_model(), user_id="user1")
+        cache.set("resp", "h3", self._make_model(), user_id="user2")
+
+        scans = 0
+        original_scan = client.scan
+
+        def counting_scan(*args, **kwargs):
+            nonlocal scans
+            scans += 1
+            return original_scan(*args, **kwargs)
+
+        client.scan = counting_scan
+        _, trips = self._count(
+            cache.invalidate_on_event, "user1", InvalidationEvent.CRISIS_MODE_TOGGLED
+        )
+        assert scans == 0
+        assert trips == 2  # INCR/EXPIRE/SMEMBERS, then one DEL
+        assert cache.get("intent", "h1", ContextFrame) is None
+        assert cache.get("resp", "h2", ContextFrame) is None
+        assert cache.get("resp", "h3", ContextFrame) is not None  # other user kept
+
+    def test_large_values_are_compressed(self):
+        from services.intelligence.cache import COMPRESS_MIN_BYTES
+        from services.intelligence.schemas import ContextFrame
+        cache, client = self._make_cache()
+        model = self._make_model(goals=100)
+        assert len(model.model_dump_json()) >= COMPRESS_MIN_BYTES
+
+        cache.set("resp", "big", model)
+        stored = client.get("helm:resp:big")
+        assert stored[:1] == b"z"
+        assert len(stored) < len(model.model_dump_json())
+        assert len(cache.get("resp", "big", ContextFrame).life_goals) == 100
+
+    def test_small_values_stored_as_json(self):
+        cache, client = self._make_cache()
+        cache.set("resp", "small", self._make_model())
+        assert client.get("helm:resp:small")[:2] == b"j{"
+
+
 # ============================================================================
 # CLARIFY vs ESCALATE Boundary Tests
 # ============================================================================
@@ -0,0 +1,177 @@
+"""
+Unit Tests for geohash route bucketing and rolling route fare stats.
+
+Tests: nearby trips aggregating into one route, the default currency,
+rolling percentiles, rebuild/backfill parity, fare priors in
+MobilityAggregator and trips recorded by confirmed bookings.
+"""
+
+import sys
+import os
+import pytest
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+
+MALL = (25.19720, 55.27440)
+MALL_EXIT = (25.19760, 55.27410)  # ~50 m away, same cell
+AIRPORT = (25.25320, 55.36570)
+MARINA = (25.08000, 55.14000)
+
+
+@pytest.fixture
+def db(sqlite_sessionmaker):
+    import models.logging_models  # noqa: F401  (audit_logs for bookings)
+    from models.models import User
+
+    db = sqlite_sessionmaker()()
+    db.add(User(id="u1", email="alice@test.com", hashed_password="pw"))
+    db.add(User(id="u2", email="bob@test.com", hashed_password="pw"))
+    db.commit()
+    return db
+
+
+def _trip(start, end, price, user_id="u1", minutes_ago=0, currency="AED"):
+    from models.models import MobilityTrip
+
+    return MobilityTrip(
+        user_id=user_id,
+        provider="uber",
+        cost_amount=price,
+        currency=currency,
+        pickup_time=datetime.utcnow() - timedelta(minutes=minutes_ago),
+        origin_lat=start[0],
+        origin_lon=start[1],
+        destination_lat=end[0],
+        destination_lon=end[1],
+    )
+
+
+def _record(db, trips):
+    from services.mobility.route_stats import record_trips
+
+    db.add_all(trips)
+    record_trips(db, trips)
+    db.commit()
+
+
+# ============================================================================
+# Route Stats Tests
+# ============================================================================
+
+
+class TestRouteStats:
+    def test_nearby_trips_share_a_route(self, db):
+        from services.mobility.route_stats import fare_prior, popular_routes
+
+        _record(
+            db,
+            [
+                _trip(MALL, AIRPORT, 40.0),
+                _trip(MALL_EXIT, AIRPORT, 50.0),
+                _trip(MALL, AIRPORT, 60.0),
+                _trip(MALL, MARINA, 70.0),
+                _trip(MALL, AIRPORT, 99.0, user_id="u2"),
+            ],
+        )
+        _record(db, [_trip(MALL_EXIT, AIRPORT, 45.0)])
+
+        routes = popular_routes(db, "u1")
+        assert [r["count"] for r in routes] == [4, 1]
+        top = routes[0]
+        assert top["avg"] == 48.75
+        assert (top["p50"], top["p90"]) == (45.0, 60.0)
+        assert abs(top["start"]["lat"] - MALL[0]) < 0.01
+
+        prior = fare_prior(db, "u1", *MALL_EXIT, *AIRPORT)
+        assert prior["count"] == 4 and prior["currency"] == "AED"
+        assert fare_prior(db, "u1", *AIRPORT, *MALL) is None  # direction matters
+        assert fare_prior(db, "u1", *MALL, *AIRPORT, currency="USD") is None
+
+    def test_trips_without_currency_feed_the_default_prior(self, db):
+        from services.mobility.route_stats import DEFAULT_CURRENCY, fare_prior
+
+        trip = _trip(MALL, AIRPORT, 40.0, currency=None)
+        _record(db, [trip])
+
+        assert trip.currency == DEFAULT_CURRENCY
+        assert fare_prior(db, "u1", *MALL, *AIRPORT)["count"] == 1
+
+    def test_percentiles_roll_over_recent_fares(self, db):
+        from services.mobility.route_stats import PRICE_WINDOW, popular_routes
+
+        old = [_trip(MALL, AIRPORT, 10.0, minutes_ago=100) for _ in range(PRICE_WINDOW)]
+        _record(db, old)
+        _record(db, [_trip(MALL, AIRPORT, 30.0) for _ in range(PRICE_WINDOW // 2 + 1)])
+
+        route = popular_routes(db, "u1")[0]
+        assert route["count"] == PRICE_WINDOW * 3 // 2 + 1
+        assert route["p50"] == 30.0  # most of the window is the newer fares
+        assert route["avg"] < 30.0  # the average still covers every fare
+
+    def test_rebuild_matches_incremental_writes(self, db):
+        from models.models import MobilityTrip
+        from services.mobility.route_stats import popular_routes, rebuild_user
+
+        trips = [_trip(MALL, AIRPORT, 20.0 + i, minutes_ago=60 - i) for i in range(12)]
+        trips += [_trip(MARINA, MALL, 55.0), _trip(MARINA, MALL, 65.0)]
+        _record(db, trips)
+        incremental = popular_routes(db, "u1")
+
+        # Trips written before cells existed: no cells, no stats
+        db.query(MobilityTrip).update({"origin_cell": None, "destination_cell": None})
+        assert rebuild_user(db, "u1") == 2
+        db.commit()
+
+        rebuilt = popular_routes(db, "u1")
+        strip = [{k: v for k, v in r.items() if k != "last_trip_at"} for r in rebuilt]
+        assert strip == [
+            {k: v for k, v in r.items() if k != "last_trip_at"} for r in incremental
+        ]
+        unbucketed = db.query(MobilityTrip).filter(MobilityTrip.origin_cell.is_(None))
+        assert unbucketed.count() == 0
+
+
+class TestAggregatorRouteHistory:
+    def _aggregator(self, price):
+        from services.mobility.mobility_aggregator import MobilityAggregator
+
+        class _Provider:
+            async def get_price_estimates(self, *args, **kwargs):
+                return {
+                    "success": True,
+                    "prices": [
+                        {
+                            "display_name": "X",
+                            "low_estimate": price,
+                            "high_estimate": price,
+                        }
+                    ],
+                }
+
+            async def book_ride(self, user_id, ride_type, start, end, **kwargs):
+                return {"success": True, "ride_id": "r1", "estimated_cost": price}
+
+        aggregator = MobilityAggregator()
+        aggregator.providers = {"uber": _Provider()}
+        return aggregator
+
+    async def test_booking_records_trip_and_feeds_price_prior(self, db):
+        from models.models import MobilityTrip
+
+        aggregator = self._aggregator(42.0)
+        start = {"lat": MALL[0], "lng": MALL[1]}
+        end = {"lat": AIRPORT[0], "lng": AIRPORT[1]}
+
+        first = await aggregator.compare_prices("u1", *MALL, *AIRPORT, db=db)
+        assert first["price_prior"] is None
+
+        result = await aggregator.book_ride("u1", "uber", "UberX", start, end, db=db)
+        assert result["success"]
+        trip = db.query(MobilityTrip).one()
+        assert (trip.cost_amount, trip.trip_type) == (42.0, "UberX")
+        assert trip.origin_cell and trip.destination_cell
+
+        second = await aggregator.compare_prices("u1", *MALL_EXIT, *AIRPORT, db=db)
+        assert second["price_prior"]["count"] == 1
+        assert second["price_prior"]["p50"] == 42.0
@@ -0,0 +1,156 @@
+"""
+Unit Tests for the content-addressed parsed-statement cache.
+
+Tests: content and text-layer keys, LRU eviction under the size cap,
+StatementService skipping every parsing tier on a hit, hit/miss counters.
+"""
+
+import sys
+import os
+import json
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+
+
+def _pdf(title="statement", lines=30):
+    import fitz
+
+    doc = fitz.open()
+    page = doc.new_page()
+    rows = [f"2026-01-{i % 28 + 1:02d} Merchant {i} -{i}.00" for i in range(lines)]
+    page.insert_text((36, 36), "\n".join(rows), fontsize=8)
+    doc.set_metadata({"title": title})
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.fixture
+def db(sqlite_sessionmaker):
+    from models.models import ParsedStatementCache
+
+    return sqlite_sessionmaker(ParsedStatementCache)()
+
+
+def _parsed(n=1, balances=None):
+    return {
+        "metadata": {"bank_name": "Cached Bank"},
+        "transactions": [
+            {
+                "date": "2026-01-05",
+                "description": f"Row {i}",
+                "amount": -1.0,
+                "balance": balances[i] if balances else None,
+            }
+            for i in range(n)
+        ],
+    }
+
+
+def _service(db, backend):
+    from services.statement_cache import StatementCache
+    from services.statement_processing_service import (
+        GeminiParser,
+        LayoutParser,
+        StatementService,
+    )
+
+    service = StatementService.__new__(StatementService)
+    service.db = db
+    service.statement_cache = StatementCache(db)
+    service.layout_parser = LayoutParser()
+    service.gemini_parser = GeminiParser(backend=backend)
+    return service
+
+
+# ============================================================================
+# Statement Cache Tests
+# ============================================================================
+
+
+class TestStatementCache:
+    def setup_method(self):
+        from services.statement_cache import reset_counters
+
+        reset_counters()
+
+    def test_reexported_file_hits_on_text_layer(self, db):
+        from services.statement_cache import StatementCache, cache_keys
+
+        cache = StatementCache(db, max_bytes=1_000_000)
+        original, reexport = _pdf(title="first"), _pdf(title="second export")
+        assert original != reexport
+        keys = cache_keys(original)
+        other_keys = cache_keys(reexport)
+        assert keys[0] != other_keys[0]
+        assert keys[1] is not None and keys[1] == other_keys[1]
+
+        assert cache.get(*keys) is None
+        cache.put(*keys, _parsed())
+        assert cache.get(*keys)["metadata"]["bank_name"] == "Cached Bank"
+        assert cache.get(*other_keys) is not None
+
+        stats = cache.stats()
+        assert (stats["content_hits"], stats["text_hits"], stats["misses"]) == (1, 1, 1)
+        assert stats["hit_rate"] == pytest.approx(0.667)
+        assert stats["lifetime_hits"] == 2
+
+    def test_short_text_layer_uses_content_key_only(self):
+        from services.statement_cache import cache_keys
+
+        assert cache_keys(_pdf(lines=2))[1] is None
+        assert cache_keys(b"not a pdf")[1] is None
+
+    def test_lru_eviction_under_size_cap(self, db):
+        from datetime import datetime, timedelta
+        from models.models import ParsedStatementCache
+        from services.statement_cache import StatementCache
+
+        entry_size = len(json.dumps(_parsed(20)))
+        cache = StatementCache(db, max_bytes=3 * entry_size)
+        for key in ("a", "b", "c"):
+            cache.put(key, None, _parsed(20))
+        # Age the entries so the access order is unambiguous
+        for age, key in enumerate(("c", "b", "a")):
+            db.get(ParsedStatementCache, key).last_used_at = (
+                datetime.utcnow() - timedelta(minutes=10 + age)
+            )
+        db.commit()
+        assert cache.get("a") is not None  # "a" becomes most recently used
+
+        cache.put("d", None, _parsed(20))
+        remaining = {row.content_hash for row in db.query(ParsedStatementCache)}
+        assert remaining == {"a", "c", "d"}
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["size_bytes"] <= 3 * entry_size
+
+    async def test_hit_skips_every_parsing_tier(self, db):
+        from services.intelligence.llm_gateway import FakeBackend
+
+        backend = FakeBackend(responder=lambda prompt: json.dumps(_parsed(3)))
+        service = _service(db, backend)
+
+        first = await service.process_pdf(_pdf(), None, persist=False)
+        second = await service.process_pdf(_pdf(), None, persist=False)
+
+        assert (first["cached"], second["cached"]) == (False, True)
+        assert backend.calls == 1
+        assert second["data"]["transactions"] == first["data"]["transactions"]
+        assert service.statement_cache.stats()["hits"] == 1
+
+    async def test_unreconciled_parse_is_not_cached(self, db):
+        from services.intelligence.llm_gateway import FakeBackend
+
+        # 100 - 1 != 90: the second row's balance does not follow
+        bad = _parsed(2, balances=[100.0, 90.0])
+        backend = FakeBackend(responder=lambda prompt: json.dumps(bad))
+        service = _service(db, backend)
+
+        first = await service.process_pdf(_pdf(), None, persist=False)
+        second = await service.process_pdf(_pdf(), None, persist=False)
+
+        assert first["status"] == "success"
+        assert (first["cached"], second["cached"]) == (False, False)
+        assert backend.calls == 2
+        assert service.statement_cache.stats()["entries"] == 0
@@ -0,0 +1,294 @@
+"""
+Unit Tests for page-chunked statement parsing.
+
+Tests: page ranges and text chunking, overlap merge and balance
+reconciliation, concurrent chunk parsing, text fallback without
+truncation, JobManager progress.
+"""
+
+import sys
+import os
+import json
+import re
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+
+ROWS_PER_PAGE = 3
+
+
+def _page_rows(page):
+    """Deterministic rows for a 0-based page, with a running balance."""
+    rows = []
+    for r in range(ROWS_PER_PAGE):
+        n = page * ROWS_PER_PAGE + r
+        rows.append(
+            {
+                "date": f"2026-01-{page + 1:02d}",
+                "description": f"Shop p{page} r{r}",
+                "amount": -float(n + 1),
+                "category": "Shopping",
+                "balance": 10000.0 - (n + 1) * (n + 2) / 2,
+            }
+        )
+    return rows
+
+
+def _pdf(pages, lines_per_page=None):
+    import fitz
+
+    doc = fitz.open()
+    for p in range(pages):
+        page = doc.new_page()
+        lines = lines_per_page(p) if lines_per_page else [f"Statement page {p + 1}"]
+        page.insert_text((36, 36), "\n".join(lines), fontsize=6)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _chunk_responder(prompt):
+    """Answers chunk prompts from the page range named in the prompt."""
+    m = re.search(r"pages (\d+)-(\d+) of a (\d+)-page", prompt)
+    first, last = (int(m.group(1)), int(m.group(2))) if m else (1, 1)
+    rows = [row for p in range(first - 1, last) for row in _page_rows(p)]
+    return json.dumps(
+        {
+            "metadata": {"bank_name": "Test Bank" if first == 1 else None},
+            "transactions": rows,
+        }
+    )
+
+
+def _txn(day, desc, amount, balance=None):
+    from datetime import date
+    from services.statement_processing_service import TransactionModel
+
+    return TransactionModel(
+        date=date(2026, 1, day), description=desc, amount=amount, balance=balance
+    )
+
+
+# ============================================================================
+# Chunking Helpers
+# ============================================================================
+
+
+class TestChunkingHelpers:
+    def test_page_ranges_overlap_by_one_page(self):
+        from services.statement_processing_service import page_ranges
+
+        assert page_ranges(10, 4, 1) == [(0, 4), (3, 8), (7, 10)]
+        assert page_ranges(4, 4, 1) == [(0, 4)]
+        assert page_ranges(0, 4, 1) == []
+
+    def test_text_chunks_keep_every_line(self):
+        from services.statement_processing_service import text_chunks
+
+        pages = [
+            "\n".join(f"p{p} line {i} " + "x" * 40 for i in range(300))
+            for p in range(6)
+        ]
+        chunks = text_chunks(pages, 20_000)
+        assert len(chunks) > 1
+        assert all(len(c) <= 20_000 + 300 for c in chunks)
+        joined = "\n".join(chunks)
+        for p in range(6):
+            for i in (0, 150, 299):
+                assert f"p{p} line {i} " in joined
+
+
+# ============================================================================
+# Merge & Reconciliation
+# ============================================================================
+
+
+class TestChunkMerge:
+    def _chunk(self, txns, bank=None):
+        return {
+            "metadata": {"bank_name": bank},
+            "transactions": [t.dict() for t in txns],
+        }
+
+    def test_overlap_rows_dropped_once(self):
+        from services.statement_processing_service import merge_parsed_chunks
+
+        a = [_txn(1, "A", -1.0), _txn(2, "B", -2.0), _txn(3, "C", -3.0)]
+        b = [_txn(2, "B", -2.0), _txn(3, "C", -3.0), _txn(4, "D", -4.0)]
+        merged = merge_parsed_chunks([self._chunk(a, "Bank"), self._chunk(b)])
+        assert [t.description for t in merged.transactions] == ["A", "B", "C", "D"]
+        assert merged.reconciliation["overlap_dropped"] == 2
+        assert merged.metadata.bank_name == "Bank"
+        assert merged.metadata.total_debits == 10.0
+
+    def test_balance_keeps_genuine_repeat_at_seam(self):
+        from services.statement_processing_service import merge_parsed_chunks
+
+        # Two identical coffees; the second chunk starts with the second one
+        a = [_txn(1, "Rent", -100.0, 900.0), _txn(2, "Coffee", -5.0, 895.0)]
+        b = [_txn(2, "Coffee", -5.0, 890.0), _txn(3, "Food", -10.0, 880.0)]
+        merged = merge_parsed_chunks([self._chunk(a), self._chunk(b)])
+        assert len(merged.transactions) == 4
+        assert merged.reconciliation["balance_mismatches"] == []
+
+    def test_fallback_when_overlap_rendered_differently(self):
+        from services.statement_processing_service import merge_parsed_chunks
+
+        a = [_txn(1, "A", -1.0), _txn(2, "B", -2.0), _txn(2, "C", -3.0)]
+        # Second chunk's reading of the overlap page lost "B"
+        b = [_txn(2, "C", -3.0), _txn(3, "D", -4.0)]
+        merged = merge_parsed_chunks([self._chunk(a), self._chunk(b)])
+        assert [t.description for t in merged.transactions] == ["A", "B", "C", "D"]
+
+    def test_fallback_limited_to_overlap_window(self):
+        from services.statement_processing_service import merge_parsed_chunks
+
+        # Chunk a = two pages; b re-reads the second page but lost "B2", and
+        # its new page has a same-day coffee identical to one on a's first page
+        rows = {d: _txn(5, d, -float(i + 1)) for i, d in enumerate("XYZWV")}
+        rows.update(B1=_txn(5, "B1", -11.0), B2=_txn(5, "B2", -12.0))
+        rows.update(B3=_txn(5, "B3", -13.0), Coffee=_txn(5, "Coffee", -5.0))
+        a = [rows[k] for k in ("Coffee", "X", "Y", "B1", "B2", "B3")]
+        b = [rows[k] for k in ("B1", "B3", "Coffee", "Z", "W", "V")]
+        chunks = [self._chunk(a), self._chunk(b)]
+
+        unbounded = merge_parsed_chunks(chunks)
+        assert unbounded.reconciliation["overlap_dropped"] == 3
+
+        merged = merge_parsed_chunks(chunks, overlap_shares=[0.5])
+        assert merged.reconciliation["overlap_dropped"] == 2
+        descriptions = [t.description for t in merged.transactions]
+        assert descriptions.count("Coffee") == 2
+        assert descriptions[-4:] == ["Coffee", "Z", "W", "V"]
+
+    def test_reconcile_flags_gap(self):
+        from services.statement_processing_service import reconcile_balances
+
+        txns = [
+            _txn(1, "A", -10.0, 90.0),
+            _txn(2, "B", -10.0, 80.0),
+            # A -10 row is missing here
+            _txn(4, "D", -10.0, 60.0),
+        ]
+        report = reconcile_balances(txns)
+        assert report == {"balance_checked": 2, "balance_mismatches": [2]}
+
+        newest_first = list(reversed(txns[:2]))
+        assert reconcile_balances(newest_first)["balance_mismatches"] == []
+
+
+# ============================================================================
+# Chunked Parsing
+# ============================================================================
+
+
+class TestChunkedParsing:
+    async def test_chunks_parsed_concurrently_and_merged(self):
+        from services.intelligence.llm_gateway import FakeBackend
+        from services.statement_processing_service import GeminiParser
+
+        backend = FakeBackend(responder=_chunk_responder, latency_s=0.2)
+        parser = GeminiParser(backend=backend)
+        progress = []
+
+        start = time.monotonic()
+        parsed = await parser.parse_pdf(
+            _pdf(14), on_progress=lambda d, t: progress.append((d, t))
+        )
+        elapsed = time.monotonic() - start
+
+        expected = [row["description"] for p in range(14) for row in _page_rows(p)]
+        assert [t.description for t in parsed.transactions] == expected
+        assert backend.calls == 4
+        assert elapsed < 0.2 * 4 * 0.75  # Bounded by the slowest chunk, not the sum
+        assert progress[-1] == (4, 4)
+        assert parsed.metadata.bank_name == "Test Bank"
+        assert parsed.reconciliation["chunks"] == 4
+        assert parsed.reconciliation["balance_mismatches"] == []
+        assert parsed.reconciliation["overlap_dropped"] == 3 * ROWS_PER_PAGE
+
+    async def test_short_statement_single_call(self):
+        from services.intelligence.llm_gateway import FakeBackend
+        from services.statement_processing_service import GeminiParser
+
+        backend = FakeBackend(responder=_chunk_responder)
+        parsed = await GeminiParser(backend=backend).parse_pdf(_pdf(3))
+        assert backend.calls == 1
+        assert parsed.reconciliation is None
+
+    async def test_text_fallback_is_not_truncated(self):
+        from services.intelligence.llm_gateway import FakeBackend
+        from services.statement_processing_service import GeminiParser
+
+        def lines(page):
+            return [
+                f"ROW|2026-02-{page + 1:02d}|Merchant {page}-{i}|-{i + 1}.00"
+                for i in range(90)  # All fit on one page at fontsize 6
+            ]
+
+        def responder(prompt):
+            if "application/pdf" in prompt:
+                raise RuntimeError("multimodal unavailable")
+            rows = re.findall(r"ROW\|([\d-]+)\|([^|]+)\|(-?[\d.]+)", prompt)
+            return json.dumps(
+                {
+                    "metadata": {},
+                    "transactions": [
+                        {"date": d, "description": desc, "amount": float(a)}
+                        for d, desc, a in rows
+                    ],
+                }
+            )
+
+        pdf = _pdf(5, lines_per_page=lines)
+        parser = GeminiParser(backend=FakeBackend(responder=responder))
+        import services.statement_processing_service as sps
+
+        original = sps.TEXT_CHUNK_CHARS
+        sps.TEXT_CHUNK_CHARS = 8_000  # Force several text chunks
+        try:
+            parsed = await parser.parse_pdf(pdf)
+        finally:
+            sps.TEXT_CHUNK_CHARS = original
+
+        assert len(parsed.transactions) == 5 * 90
+        assert parsed.reconciliation["chunks"] > 1
+
+
+# ============================================================================
+# Job Progress
+# ============================================================================
+
+
+class TestStatementJobProgress:
+    async def test_process_pdf_reports_chunk_progress(self, sqlite_sessionmaker):
+        from models.models import ParsedStatementCache, User
+        from services.intelligence.llm_gateway import FakeBackend
+        from services.statement_cache import StatementCache
+        from services.statement_processing_service import (
+            PARSE_PROGRESS_SHARE,
+            GeminiParser,
+            LayoutParser,
+            StatementService,
+        )
+
+        db = sqlite_sessionmaker(User, ParsedStatementCache)()
+
+        service = StatementService.__new__(StatementService)
+        service.db = db
+        service.statement_cache = StatementCache(db)
+        service.layout_parser = LayoutParser()
+        service.gemini_parser = GeminiParser(
+            backend=FakeBackend(responder=_chunk_responder)
+        )
+
+        progress = []
+        result = await service.process_pdf(
+            _pdf(10), None, progress_callback=progress.append
+        )
+
+        assert result["status"] == "success"
+        assert len(result["data"]["transactions"]) == 10 * ROWS_PER_PAGE
+        assert progress == sorted(progress)
+        assert progress[0] == 0 and len(progress) == 1 + 3  # start + 3 chunks
+        assert progress[-1] == PARSE_PROGRESS_SHARE
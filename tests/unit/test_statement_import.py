@@ -0,0 +1,197 @@
+"""
+Unit Tests for the bulk, deduplicated statement transaction import.
+
+Tests: duplicate accounting, chunked round trips, conflict handling,
+process_pdf persistence.
+"""
+
+import sys
+import os
+import pytest
+from unittest.mock import AsyncMock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+
+
+@pytest.fixture
+def db(sqlite_sessionmaker):
+    from models.models import (
+        FinancialAccount,
+        FinancialDailyAggregate,
+        FinancialTransaction,
+        ParsedStatementCache,
+        Statement,
+        User,
+    )
+
+    db = sqlite_sessionmaker(
+        User,
+        FinancialAccount,
+        Statement,
+        FinancialTransaction,
+        FinancialDailyAggregate,
+        ParsedStatementCache,
+    )()
+    db.add(User(id="u1", email="alice@test.com", hashed_password="pw"))
+    db.add(User(id="u2", email="bob@test.com", hashed_password="pw"))
+    db.commit()
+    return db
+
+
+# ============================================================================
+# Bulk Import Tests
+# ============================================================================
+
+
+class TestImportTransactions:
+    """Tests for import_transactions against in-memory SQLite."""
+
+    def _parsed(self, n, offset=0):
+        from datetime import date, timedelta
+        from services.statement_processing_service import TransactionModel
+
+        return [
+            TransactionModel(
+                date=date(2026, 1, 1) + timedelta(days=(i + offset) % 28),
+                description=f"Merchant {i + offset}",
+                amount=-(1.0 + i + offset),
+                category="Shopping",
+            )
+            for i in range(n)
+        ]
+
+    def test_counts_new_and_duplicate_rows(self, db):
+        from models.models import FinancialTransaction
+        from services.statement_processing_service import import_transactions
+
+        first = import_transactions(db, "u1", None, self._parsed(50))
+        db.commit()
+        assert len(first.transactions) == 50
+        assert first.duplicates == 0
+
+        # 30 already imported + 20 new
+        second = import_transactions(db, "u1", None, self._parsed(50, offset=30))
+        db.commit()
+        assert len(second.transactions) == 30
+        assert second.duplicates == 20
+        assert db.query(FinancialTransaction).count() == 80
+
+        tx = db.query(FinancialTransaction).filter_by(description="Merchant 0").one()
+        assert tx.user_id == "u1"
+        assert tx.category_primary == "Shopping"
+        assert tx.currency_code == "USD"
+
+    def test_repeated_row_within_statement_imported_once(self, db):
+        from services.statement_processing_service import import_transactions
+
+        parsed = self._parsed(5)
+        result = import_transactions(db, "u1", None, parsed + parsed[:2])
+        db.commit()
+        assert len(result.transactions) == 5
+        assert result.duplicates == 2
+
+    def test_round_trips_scale_with_chunks_not_rows(self, sqlite_engine, db):
+        from sqlalchemy import event
+        from services.statement_processing_service import import_transactions
+
+        statements = []
+        event.listen(
+            sqlite_engine, "before_cursor_execute", lambda *a: statements.append(a[2])
+        )
+        result = import_transactions(db, "u1", None, self._parsed(1000), chunk_size=250)
+        db.commit()
+        assert len(result.transactions) == 1000
+        lookups = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+        inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT")]
+        assert len(lookups) == 4
+        assert len(inserts) <= 4 * 2  # insertmanyvalues may split a batch
+
+    def test_other_users_identical_rows_are_imported(self, db):
+        from models.models import FinancialTransaction
+        from services.statement_processing_service import import_transactions
+
+        parsed = self._parsed(10)
+        import_transactions(db, "u2", None, parsed[:4])
+        db.commit()
+
+        result = import_transactions(db, "u1", None, parsed)
+        db.commit()
+        assert len(result.transactions) == 10
+        assert result.duplicates == 0
+        assert db.query(FinancialTransaction).filter_by(user_id="u1").count() == 10
+
+    def test_conflicting_key_counted_as_duplicate(self, db, monkeypatch):
+        from services import statement_processing_service as sps
+
+        parsed = self._parsed(10)
+        sps.import_transactions(db, "u1", None, parsed[:4])
+        db.commit()
+
+        # Rows the lookup missed (a concurrent upload by the same user) are
+        # skipped by ON CONFLICT DO NOTHING instead of failing the import
+        chunks = sps._chunks
+        lookup_keys = []
+
+        def blind_lookup(items, size):
+            if items and isinstance(items[0], str):  # the dedup-key lookup
+                lookup_keys.extend(items)
+                return iter(())
+            return chunks(items, size)
+
+        monkeypatch.setattr(sps, "_chunks", blind_lookup)
+        result = sps.import_transactions(db, "u1", None, parsed)
+        db.commit()
+        assert len(lookup_keys) == 10
+        assert len(result.transactions) == 6
+        assert result.duplicates == 4
+
+
+# ============================================================================
+# process_pdf Persistence Tests
+# ============================================================================
+
+
+class TestProcessPdfImport:
+    """process_pdf persists through the bulk path and maintains aggregates."""
+
+    async def test_process_pdf_imports_and_aggregates(self, db):
+        from datetime import date
+        from services.financial_aggregates import get_window
+        from services.statement_processing_service import (
+            LayoutParser,
+            ParsedStatement,
+            StatementMetadata,
+            StatementService,
+        )
+        from models.models import FinancialTransaction, Statement
+        from services.statement_cache import StatementCache
+
+        parsed = ParsedStatement(
+            metadata=StatementMetadata(
+                bank_name="Test Bank",
+                period_start=date.today(),
+                period_end=date.today(),
+            ),
+            transactions=TestImportTransactions()._parsed(3),
+        )
+        parsed.transactions[0].date = date.today()
+
+        service = StatementService.__new__(StatementService)
+        service.db = db
+        service.statement_cache = StatementCache(db)
+        service.layout_parser = LayoutParser()
+        service.gemini_parser = AsyncMock()
+        service.gemini_parser.parse_pdf = AsyncMock(return_value=parsed)
+
+        result = await service.process_pdf(b"%PDF", "u1")
+        assert result["status"] == "success"
+        assert db.query(Statement).count() == 1
+        assert db.query(FinancialTransaction).count() == 3
+        assert get_window(db, "u1", days=1).expense_total == pytest.approx(1.0)
+
+        # Uploading the same statement again is served from the cache and
+        # adds nothing
+        again = await service.process_pdf(b"%PDF", "u1")
+        assert again["cached"] is True
+        assert service.gemini_parser.parse_pdf.await_count == 1
+        assert db.query(FinancialTransaction).count() == 3
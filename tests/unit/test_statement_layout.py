@@ -0,0 +1,262 @@
+"""
+Unit Tests for the deterministic statement layout tier.
+
+Tests: amount/date conventions, header-driven table extraction with
+continuation lines, reconciliation against printed totals, escalation to
+GeminiParser, per-bank templates from the registry.
+"""
+
+import sys
+import os
+import json
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+
+# x positions of the generic statement's columns
+COLUMNS = {"date": 40, "description": 110, "debit": 330, "credit": 400, "balance": 470}
+
+ROWS = [
+    ("05/01/2026", ["Salary ACME Corp"], None, "3,000.00", "4,000.00"),
+    ("06/01/2026", ["Carrefour Mall of", "the Emirates"], "234.50", None, "3,765.50"),
+    ("09/01/2026", ["DEWA Utilities"], "500.00", None, "3,265.50"),
+    ("12/01/2026", ["Transfer to savings"], "500.00", None, "2,765.50"),
+]
+
+
+def _statement_pdf(total_debits="1,234.50", pages=None, totals=True):
+    """
+    Date/Description/Debit/Credit/Balance statement, two pages of ROWS by
+    default. totals=False leaves out the opening/closing balances and totals.
+    """
+    import fitz
+
+    doc = fitz.open()
+    pages = pages or [ROWS[:2], ROWS[2:]]
+    for number, rows in enumerate(pages):
+        page = doc.new_page()
+        page.insert_text((40, 40), f"Test Bank statement, page {number + 1}")
+        if number == 0 and totals:
+            page.insert_text((40, 60), "Opening Balance 1,000.00")
+        y = 100
+        for column, x in COLUMNS.items():
+            page.insert_text((x, y), column.title())
+        for day, description, debit, credit, balance in rows:
+            y += 16
+            page.insert_text((COLUMNS["date"], y), day)
+            page.insert_text((COLUMNS["description"], y), description[0])
+            for column, value in (("debit", debit), ("credit", credit)):
+                if value:
+                    page.insert_text((COLUMNS[column], y), value)
+            page.insert_text((COLUMNS["balance"], y), balance)
+            for extra in description[1:]:
+                y += 11
+                page.insert_text((COLUMNS["description"], y), extra)
+        if number == len(pages) - 1 and totals:
+            page.insert_text((40, y + 40), "Total Credits 3,000.00")
+            page.insert_text((40, y + 56), f"Total Debits {total_debits}")
+            page.insert_text((40, y + 72), "Closing Balance 2,765.50")
+        page.insert_text((40, 800), f"Page {number + 1} of {len(pages)}")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.fixture
+def make_service(sqlite_sessionmaker):
+    from models.models import ParsedStatementCache
+    from services.statement_cache import StatementCache
+    from services.statement_processing_service import (
+        GeminiParser,
+        LayoutParser,
+        StatementService,
+    )
+
+    def make(backend):
+        service = StatementService.__new__(StatementService)
+        service.db = sqlite_sessionmaker(ParsedStatementCache)()
+        service.statement_cache = StatementCache(service.db)
+        service.layout_parser = LayoutParser()
+        service.gemini_parser = GeminiParser(backend=backend)
+        return service
+
+    return make
+
+
+def _llm_responder(prompt):
+    return json.dumps(
+        {
+            "metadata": {"bank_name": "From LLM"},
+            "transactions": [
+                {"date": "2026-01-05", "description": "Salary", "amount": 3000.0}
+            ],
+        }
+    )
+
+
+# ============================================================================
+# Cell Parsing
+# ============================================================================
+
+
+class TestCellParsing:
+    def test_amount_conventions(self):
+        from services.statement_layout import BankTemplate, parse_amount
+
+        assert parse_amount("1,234.50") == 1234.50
+        assert parse_amount("(45.00)") == -45.0
+        assert parse_amount("45.00-") == -45.0
+        assert parse_amount("-$12.30") == -12.30
+        assert parse_amount("AED 99.99") == 99.99
+        assert parse_amount("250.00 DR") == -250.0
+        assert parse_amount("250.00CR") == 250.0
+        assert parse_amount("Store 1234") is None
+        assert parse_amount("1234") is None  # Reference numbers are not money
+
+        european = BankTemplate(name="eu", thousands_sep=".", decimal_sep=",")
+        assert parse_amount("1.234,56", european) == 1234.56
+
+    def test_yearless_dates_take_statement_year(self):
+        from datetime import date
+        from services.statement_layout import BankTemplate, parse_date
+
+        template = BankTemplate(name="t", date_formats=["%d %b"])
+        assert parse_date("29 Feb", template, year=2024) == date(2024, 2, 29)
+        assert parse_date("Salary", template, year=2024) is None
+
+
+# ============================================================================
+# Layout Tier
+# ============================================================================
+
+
+class TestLayoutTier:
+    def test_generic_statement_reconciles(self):
+        from services.statement_processing_service import LayoutParser
+
+        parsed = LayoutParser().parse_pdf(_statement_pdf())
+
+        assert parsed is not None
+        assert [t.amount for t in parsed.transactions] == [
+            3000.0,
+            -234.5,
+            -500.0,
+            -500.0,
+        ]
+        assert parsed.transactions[1].description == "Carrefour Mall of the Emirates"
+        assert parsed.transactions[3].balance == 2765.5
+        assert parsed.metadata.total_debits == 1234.5
+        assert parsed.reconciliation["tier"] == "layout"
+        assert set(parsed.reconciliation["checks"]) == {
+            "total_credits",
+            "total_debits",
+            "closing_balance",
+            "running_balance",
+        }
+
+    async def test_reconciled_parse_skips_llm(self, make_service):
+        from services.intelligence.llm_gateway import FakeBackend
+
+        backend = FakeBackend(responder=_llm_responder)
+        result = await make_service(backend).process_pdf(
+            _statement_pdf(), None, persist=False
+        )
+
+        assert result["status"] == "success"
+        assert len(result["data"]["transactions"]) == 4
+        assert backend.calls == 0
+
+    async def test_totals_mismatch_escalates_to_llm(self, make_service):
+        from services.intelligence.llm_gateway import FakeBackend
+        from services.statement_processing_service import LayoutParser
+
+        pdf = _statement_pdf(total_debits="1,334.50")
+        assert LayoutParser().parse_pdf(pdf) is None
+
+        backend = FakeBackend(responder=_llm_responder)
+        result = await make_service(backend).process_pdf(pdf, None, persist=False)
+        assert result["status"] == "success"
+        assert result["data"]["metadata"]["bank_name"] == "From LLM"
+        assert backend.calls == 1
+
+    async def test_single_row_without_totals_escalates_to_llm(self, make_service):
+        from services.intelligence.llm_gateway import FakeBackend
+        from services.statement_processing_service import LayoutParser
+
+        # One balance has nothing to chain from, so nothing reconciles
+        pdf = _statement_pdf(pages=[ROWS[:1]], totals=False)
+        assert LayoutParser().parse_pdf(pdf) is None
+
+        backend = FakeBackend(responder=_llm_responder)
+        result = await make_service(backend).process_pdf(pdf, None, persist=False)
+        assert result["status"] == "success"
+        assert result["data"]["metadata"]["bank_name"] == "From LLM"
+        assert backend.calls == 1
+
+    def test_no_text_layer_escalates(self):
+        import fitz
+        from services.statement_processing_service import LayoutParser
+
+        doc = fitz.open()
+        doc.new_page()
+        assert LayoutParser().parse_pdf(doc.tobytes()) is None
+
+
+# ============================================================================
+# Template Registry
+# ============================================================================
+
+
+class TestTemplateRegistry:
+    def test_json_template_with_fixed_columns(self, tmp_path, monkeypatch):
+        import fitz
+        import services.statement_layout as layout
+        from services.statement_processing_service import LayoutParser
+
+        monkeypatch.setattr(layout, "_REGISTRY", {})
+        path = tmp_path / "templates.json"
+        path.write_text(
+            json.dumps(
+                [
+                    {
+                        "name": "acme",
+                        "match": ["ACME BANK"],
+                        "bank_name": "Acme Bank",
+                        "date_formats": ["%d %b"],
+                        "thousands_sep": ".",
+                        "decimal_sep": ",",
+                        "columns": {
+                            "date": [30, 80],
+                            "description": [90, 300],
+                            "amount": [320, 400],
+                            "balance": [420, 500],
+                        },
+                    }
+                ]
+            )
+        )
+        assert layout.load_templates(str(path)) == 1
+
+        doc = fitz.open()
+        page = doc.new_page()
+        page.insert_text((30, 40), "ACME BANK - Kontoauszug März 2026")
+        rows = [
+            ("02 Mar", "Gehalt", "2.500,00", "3.500,00"),
+            ("03 Mar", "Miete", "1.200,00-", "2.300,00"),
+            ("05 Mar", "Supermarkt", "85,40-", "2.214,60"),
+        ]
+        for i, (day, description, amount, balance) in enumerate(rows):
+            y = 80 + i * 14
+            page.insert_text((30, y), day)
+            page.insert_text((90, y), description)
+            page.insert_text((330, y), amount)
+            page.insert_text((430, y), balance)
+        pdf = doc.tobytes()
+
+        parsed = LayoutParser().parse_pdf(pdf)
+        assert parsed is not None
+        assert parsed.reconciliation["template"] == "acme"
+        assert parsed.reconciliation["checks"] == ["running_balance"]
+        assert parsed.metadata.bank_name == "Acme Bank"
+        assert [t.amount for t in parsed.transactions] == [2500.0, -1200.0, -85.4]
+        assert parsed.transactions[0].date.isoformat() == "2026-03-02"